@@ -55,6 +55,12 @@ ROOT_URLCONF = "config.urls"
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# Requêtes SQL préparées côté serveur (weather/data_sources/sql_shapes.py) :
+# binding des paramètres côté serveur, et préparation automatique par psycopg
+# des autres requêtes après 5 exécutions sur une connexion. À désactiver
+# derrière un pooler en mode transaction (pgbouncer), qui ne les conserve pas.
+DB_PREPARED_STATEMENTS = env.bool("DB_PREPARED_STATEMENTS", default=True)
+
 # Database - TimescaleDB connection
 DATABASES = {
     "default": {
@@ -66,10 +72,73 @@ DATABASES = {
         "PORT": env("DB_PORT", default="5432"),
         "OPTIONS": {
             "options": "-c search_path=public",
+            "server_side_binding": True,
+            "prepare_threshold": 5 if DB_PREPARED_STATEMENTS else None,
         },
+        # Connexion vérifiée (SELECT 1 / check du pool) avant réutilisation.
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Pool de connexions psycopg (support natif Django, voir weather/db_pool.py).
+# Un pool par process : chaque worker gunicorn (threads de requêtes, plus les
+# threads de lectures parallèles ci-dessous) ouvre son pool à la première
+# requête et garde entre DB_POOL_MIN_SIZE et DB_POOL_MAX_SIZE connexions,
+# recyclées après DB_POOL_MAX_LIFETIME secondes (fermées au-delà de
+# DB_POOL_MAX_IDLE d'inactivité). Total côté Postgres : workers x
+# DB_POOL_MAX_SIZE au plus.
+# Pool désactivé : connexions persistantes par thread (DB_CONN_MAX_AGE).
+DB_POOL_ENABLED = env.bool("DB_POOL_ENABLED", default=True)
+if DB_POOL_ENABLED:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "name": "weather",
+        "min_size": env.int("DB_POOL_MIN_SIZE", default=1),
+        "max_size": env.int("DB_POOL_MAX_SIZE", default=8),
+        "max_lifetime": env.float("DB_POOL_MAX_LIFETIME", default=1800.0),
+        "max_idle": env.float("DB_POOL_MAX_IDLE", default=300.0),
+        "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=600)
+# Journalise les statistiques du pool toutes les N requêtes par worker (0 : jamais).
+DB_POOL_STATS_EVERY = env.int("DB_POOL_STATS_EVERY", default=0)
+
+# Lectures indépendantes d'une même requête (hot/cold, national/stations)
+# lancées en parallèle, chacune sur sa connexion (weather/utils/concurrency.py).
+# Nombre de threads partagés par worker ; 0 : lectures séquentielles.
+CONCURRENT_FETCHES_MAX_WORKERS = env.int("CONCURRENT_FETCHES_MAX_WORKERS", default=4)
+
+# Registre data_version (cutoff_date des records, dates de rafraîchissement) lu
+# une fois par worker et gardé ce nombre de secondes
+# (voir weather/data_sources/data_version.py).
+DATA_VERSION_TTL_S = env.float("DATA_VERSION_TTL_S", default=30.0)
+
+# Cache serveur des réponses /temperature/* (voir weather/response_cache.py).
+# Backend fichier local par défaut ; RESPONSE_CACHE_BACKEND / LOCATION permettent
+# de pointer vers un Redis partagé (django.core.cache.backends.redis.RedisCache).
+RESPONSE_CACHE_ENABLED = env.bool("RESPONSE_CACHE_ENABLED", default=True)
+RESPONSE_CACHE_ALIAS = "responses"
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    RESPONSE_CACHE_ALIAS: {
+        "BACKEND": env(
+            "RESPONSE_CACHE_BACKEND",
+            default="django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": env(
+            "RESPONSE_CACHE_LOCATION", default=str(BASE_DIR / ".cache" / "responses")
+        ),
+        "TIMEOUT": 86_400,
+    },
+}
+
+# Réponses /temperature/* encodées sans passer par les serializers DRF (voir
+# weather/json_response.py). Si actif, chaque réponse est aussi validée par son
+# serializer et comparée : coûteux, réservé au debug et aux tests.
+RESPONSE_SCHEMA_CHECK = env.bool("RESPONSE_SCHEMA_CHECK", default=DEBUG)
+
 # No migrations
 MIGRATION_MODULES = {
     "weather": None,
@@ -13,3 +13,6 @@ export PGPASSWORD="${DB_PASSWORD}"
 
 psql -h "${DB_HOST}" -p "${DB_PORT}" -U "${DB_USER}" -d "${DB_NAME}" -v ON_ERROR_STOP=1 \
   -f "${ROOT_DIR}/sql/tables/001_table_ref_department_region.sql"
+
+psql -h "${DB_HOST}" -p "${DB_PORT}" -U "${DB_USER}" -d "${DB_NAME}" -v ON_ERROR_STOP=1 \
+  -f "${ROOT_DIR}/sql/tables/002_table_data_version.sql"
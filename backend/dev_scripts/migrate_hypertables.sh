@@ -0,0 +1,203 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+# ---------------------------------------------------------------------------
+# Usage: migrate_hypertables.sh [--no-refresh] [--exclude REGEX] [--verify-only]
+#
+# Convertit les tables sources en hypertables compressées
+# (sql/schemas/002_source_hypertables.sql) sur une base existante, et vérifie
+# que chaque relation v_* / mv_* du schéma public renvoie exactement les mêmes
+# lignes avant et après.
+#
+# Empreinte d'une relation : nombre de lignes + somme des md5 de chaque ligne
+# (indépendante de l'ordre de lecture), stockées dans
+# public.views_fingerprint avec la durée du scan, ce qui donne aussi le gain
+# d'I/O par vue.
+#
+#   --no-refresh     Ne rafraîchit pas les vues matérialisées avant chaque
+#                    empreinte (les mv_* sont alors comparées telles quelles).
+#   --exclude REGEX  Relations à ignorer (ex. '^v_.*realtime$' si l'ingestion
+#                    temps réel tourne pendant la migration).
+#   --verify-only    Ne migre pas : compare seulement deux empreintes
+#                    successives (contrôle du bruit temps réel).
+#
+# mv_records_battus n'est jamais rafraîchie (snapshot lié à sa cutoff_date) ;
+# v_records_battus, calculée à la volée, couvre la même logique.
+# ---------------------------------------------------------------------------
+REFRESH=1
+EXCLUDE_REGEX='^$'
+MIGRATE=1
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --no-refresh)
+            REFRESH=0
+            shift
+            ;;
+        --exclude)
+            EXCLUDE_REGEX="$2"
+            shift 2
+            ;;
+        --verify-only)
+            MIGRATE=0
+            shift
+            ;;
+        *)
+            echo "Unknown argument: $1" >&2
+            echo "Usage: $0 [--no-refresh] [--exclude REGEX] [--verify-only]" >&2
+            exit 1
+            ;;
+    esac
+done
+
+: "${DB_HOST:?DB_HOST is required}"
+: "${DB_PORT:?DB_PORT is required}"
+: "${DB_NAME:?DB_NAME is required}"
+: "${DB_USER:?DB_USER is required}"
+: "${DB_PASSWORD:?DB_PASSWORD is required}"
+
+export PGPASSWORD="${DB_PASSWORD}"
+
+psql_base=(psql -h "${DB_HOST}" -p "${DB_PORT}" -U "${DB_USER}" -d "${DB_NAME}" -v ON_ERROR_STOP=1)
+
+HYPERTABLES_SQL="${ROOT_DIR}/sql/schemas/002_source_hypertables.sql"
+
+[[ -f "${HYPERTABLES_SQL}" ]] || { echo "Missing file: ${HYPERTABLES_SQL}" >&2; exit 1; }
+
+refresh_materialized_views() {
+    [[ "${REFRESH}" == "1" ]] || return 0
+    echo "Refreshing materialized views..."
+    # Ordre des dépendances (numérotation des fichiers sql/materialized_views).
+    "${psql_base[@]}" <<'SQL'
+DO $$
+DECLARE
+    v_name text;
+BEGIN
+    FOREACH v_name IN ARRAY ARRAY[
+        'mv_quotidienne_realtime',
+        'mv_mensuelle_realtime',
+        'mv_first_temperature_date',
+        'mv_baseline_station_daily_mean_1991_2020',
+        'mv_itn_daily_1991_2020_real',
+        'mv_records_absolus_par_mois'
+    ]
+    LOOP
+        IF EXISTS (
+            SELECT 1 FROM pg_matviews
+            WHERE schemaname = 'public' AND matviewname = v_name
+        ) THEN
+            EXECUTE format('REFRESH MATERIALIZED VIEW public.%I', v_name);
+        END IF;
+    END LOOP;
+
+    IF to_regprocedure('public.refresh_itn_daily_all_years(date)') IS NOT NULL THEN
+        PERFORM public.refresh_itn_daily_all_years('1947-01-01');
+    END IF;
+END $$;
+SQL
+}
+
+take_fingerprint() {
+    local phase="$1"
+    echo "Fingerprinting v_* / mv_* relations (${phase})..."
+    "${psql_base[@]}" \
+        -c "SET views_fingerprint.phase = '${phase}'" \
+        -c "SET views_fingerprint.exclude = '${EXCLUDE_REGEX}'" \
+        -f - <<'SQL'
+CREATE TABLE IF NOT EXISTS public.views_fingerprint (
+    phase       text    NOT NULL,
+    relname     text    NOT NULL,
+    row_count   bigint  NOT NULL,
+    row_hash    numeric NOT NULL,
+    elapsed_ms  numeric NOT NULL,
+    PRIMARY KEY (phase, relname)
+);
+
+DELETE FROM public.views_fingerprint
+WHERE phase = current_setting('views_fingerprint.phase');
+
+DO $$
+DECLARE
+    v_rel      record;
+    v_rows     bigint;
+    v_hash     numeric;
+    v_started  timestamptz;
+BEGIN
+    FOR v_rel IN
+        SELECT c.relname
+        FROM pg_class c
+            INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public'
+          AND c.relkind IN ('v', 'm', 'r')
+          AND c.relname ~ '^(v|mv)_'
+          AND c.relname !~ current_setting('views_fingerprint.exclude')
+        ORDER BY c.relname
+    LOOP
+        v_started := clock_timestamp();
+        EXECUTE format(
+            'SELECT COUNT(*), COALESCE(SUM((''x'' || left(md5(t::text), 15))::bit(60)::bigint::numeric), 0)'
+            ' FROM public.%I t',
+            v_rel.relname
+        ) INTO v_rows, v_hash;
+        INSERT INTO public.views_fingerprint
+        VALUES (
+            current_setting('views_fingerprint.phase'),
+            v_rel.relname,
+            v_rows,
+            v_hash,
+            round((EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000)::numeric, 1)
+        );
+    END LOOP;
+END $$;
+SQL
+}
+
+refresh_materialized_views
+take_fingerprint before
+
+if [[ "${MIGRATE}" == "1" ]]; then
+    echo "Converting source tables to hypertables..."
+    "${psql_base[@]}" -f "${HYPERTABLES_SQL}"
+    refresh_materialized_views
+fi
+
+take_fingerprint after
+
+echo "Comparing fingerprints:"
+"${psql_base[@]}" <<'SQL'
+SELECT
+    COALESCE(b.relname, a.relname) AS relation,
+    b.row_count                    AS rows_before,
+    a.row_count                    AS rows_after,
+    b.elapsed_ms                   AS ms_before,
+    a.elapsed_ms                   AS ms_after,
+    CASE
+        WHEN b.relname IS NULL OR a.relname IS NULL THEN 'MISSING'
+        WHEN b.row_count <> a.row_count OR b.row_hash <> a.row_hash THEN 'DIFF'
+        ELSE 'ok'
+    END                            AS status
+FROM (SELECT * FROM public.views_fingerprint WHERE phase = 'before') b
+    FULL JOIN (SELECT * FROM public.views_fingerprint WHERE phase = 'after') a
+        ON a.relname = b.relname
+ORDER BY status = 'ok', relation;
+
+DO $$
+DECLARE
+    v_diff integer;
+BEGIN
+    SELECT COUNT(*) INTO v_diff
+    FROM (SELECT * FROM public.views_fingerprint WHERE phase = 'before') b
+        FULL JOIN (SELECT * FROM public.views_fingerprint WHERE phase = 'after') a
+            ON a.relname = b.relname
+    WHERE b.relname IS NULL
+       OR a.relname IS NULL
+       OR b.row_count <> a.row_count
+       OR b.row_hash <> a.row_hash;
+    IF v_diff > 0 THEN
+        RAISE EXCEPTION '% relation(s) v_* / mv_* divergente(s) après migration', v_diff;
+    END IF;
+END $$;
+SQL
+
+echo "Hypertables migration verified."
@@ -50,6 +50,9 @@ SQL
 echo "== Create tables (schema) =="
 "${psql_base[@]}" -f "$SCHEMA_SQL"
 
+echo "== Convert source tables to compressed hypertables =="
+"${psql_base[@]}" -f "${ROOT_DIR}/sql/schemas/002_source_hypertables.sql"
+
 echo "== Create additional reference tables =="
 bash "${ROOT_DIR}/dev_scripts/create_extra_tables.sh"
 
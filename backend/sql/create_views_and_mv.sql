@@ -1,4 +1,11 @@
-DROP MATERIALIZED VIEW IF EXISTS public.mv_itn_daily_all_years CASCADE;
+DO $$ BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'public' AND matviewname = 'mv_itn_daily_all_years'
+    ) THEN
+        DROP MATERIALIZED VIEW public.mv_itn_daily_all_years CASCADE;
+    END IF;
+END $$;
 
 DROP MATERIALIZED VIEW IF EXISTS public.mv_itn_daily_1991_2020_real CASCADE;
 
@@ -6,7 +13,15 @@ DROP MATERIALIZED VIEW IF EXISTS public.mv_baseline_station_daily_mean_1991_2020
 
 DROP MATERIALIZED VIEW IF EXISTS public.mv_records_absolus_par_mois CASCADE;
 
-DROP MATERIALIZED VIEW IF EXISTS public.mv_records_battus;
+DO $$ BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'public' AND matviewname = 'mv_records_battus'
+    ) THEN
+        DROP MATERIALIZED VIEW public.mv_records_battus;
+    END IF;
+END $$;
+DROP TABLE IF EXISTS public.mv_records_battus;
 
 DROP MATERIALIZED VIEW IF EXISTS public.mv_mensuelle_realtime CASCADE;
 
@@ -689,6 +704,527 @@ FROM public.v_baseline_station_daily_mean_1991_2020;
 CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_baseline_station_daily_mean
 ON public.mv_baseline_station_daily_mean_1991_2020 (station_code, month, day);
 
+/*
+===============================================================================
+ROLLUPS MENSUELS / ANNUELS PAR STATION (écarts à la normale, graphes min/max)
+===============================================================================
+
+OBJECTIF
+--------
+Les graphes d'écart à la normale et min/max lisent, pour une granularité mois
+ou année, tous les points journaliers de la période puis les moyennent en
+Python : un graphe annuel sur 30 ans lit ~11 000 lignes par station.
+
+Ces tables stockent les sommes et effectifs par bucket (mois, année), ce qui
+suffit à reconstruire exactement les moyennes : le même graphe lit ~30 lignes
+par station. Équivalent des continuous aggregates TimescaleDB, maintenu par une
+fonction plpgsql (même principe que 006 / records_battus_state).
+
+TABLES
+------
+station_temperature_rollups (granularity 'month' | 'year', station_code, bucket_start)
+  - n_tntxm, sum_tntxm, sum_baseline : jours où TNTXM et la baseline station
+    1991-2020 du (mois, jour) existent (mêmes jours que le graphe d'écart)
+  - n_tn, sum_tn, min_tn / n_tx, sum_tx, max_tx : jours où TN (resp. TX) existe
+
+national_minmax_rollups (granularity, bucket_start)
+  - n_days, sum_tmin, sum_tmax : somme des moyennes journalières nationales
+    AVG(TN) / AVG(TX) (jours et stations où TN et TX existent)
+
+temperature_rollups_meta (closed_before)
+  - les rollups couvrent les jours < closed_before (début de mois). Les jours
+    suivants (temps réel, relève Quotidienne) sont lus à chaud par les sources.
+
+MAINTENANCE
+-----------
+refresh_temperature_rollups(p_since) recalcule les mois >= p_since (et ceux
+fermés depuis le dernier appel) jusqu'à closed_before = début du mois de
+CURRENT_DATE - 7 jours, puis les années touchées à partir des mois.
+p_since NULL => reconstruction complète (à relancer après un import historique
+ou un recalcul de mv_baseline_station_daily_mean_1991_2020).
+Les buckets de la fenêtre sont upsertés (seules les valeurs modifiées sont
+réécrites) et ceux qui ont disparu supprimés : upserted + deleted vaut 0 si
+rien n'a changé, et le job pg_cron ne touche alors pas data_version.
+===============================================================================
+*/
+
+CREATE TABLE IF NOT EXISTS public.station_temperature_rollups (
+    granularity   text             NOT NULL,
+    station_code  char(8)          NOT NULL,
+    bucket_start  date             NOT NULL,
+    n_tntxm       integer          NOT NULL,
+    sum_tntxm     double precision,
+    sum_baseline  double precision,
+    n_tn          integer          NOT NULL,
+    sum_tn        double precision,
+    min_tn        double precision,
+    n_tx          integer          NOT NULL,
+    sum_tx        double precision,
+    max_tx        double precision,
+    CONSTRAINT station_temperature_rollups_pkey
+        PRIMARY KEY (granularity, station_code, bucket_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_station_temperature_rollups_bucket
+    ON public.station_temperature_rollups (granularity, bucket_start);
+
+CREATE TABLE IF NOT EXISTS public.national_minmax_rollups (
+    granularity   text             NOT NULL,
+    bucket_start  date             NOT NULL,
+    n_days        integer          NOT NULL,
+    sum_tmin      double precision NOT NULL,
+    sum_tmax      double precision NOT NULL,
+    CONSTRAINT national_minmax_rollups_pkey PRIMARY KEY (granularity, bucket_start)
+);
+
+CREATE TABLE IF NOT EXISTS public.temperature_rollups_meta (
+    closed_before date NOT NULL
+);
+
+-- Colonnes de retour modifiées (upserted / deleted) : l'ancienne version est
+-- supprimée.
+DROP FUNCTION IF EXISTS public.refresh_temperature_rollups(date);
+
+CREATE FUNCTION public.refresh_temperature_rollups(
+    p_since date DEFAULT NULL
+)
+RETURNS TABLE (
+    window_start  date,
+    closed_before date,
+    months        integer,
+    upserted      integer,
+    deleted       integer,
+    elapsed_ms    numeric
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_started   timestamptz := clock_timestamp();
+    v_previous  date;
+    v_upserted  integer;
+    v_deleted   integer;
+BEGIN
+    closed_before := date_trunc('month', CURRENT_DATE - 7)::date;
+    upserted := 0;
+    deleted := 0;
+
+    SELECT m.closed_before INTO v_previous
+    FROM public.temperature_rollups_meta m
+    LIMIT 1;
+
+    -- Jamais calculé ou reconstruction demandée : tout l'historique.
+    IF p_since IS NULL OR v_previous IS NULL THEN
+        TRUNCATE public.station_temperature_rollups, public.national_minmax_rollups;
+        window_start := date_trunc(
+            'month',
+            COALESCE((SELECT MIN(q."AAAAMMJJ") FROM public."Quotidienne" q), CURRENT_DATE)
+        )::date;
+    ELSE
+        window_start := LEAST(date_trunc('month', p_since)::date, v_previous);
+    END IF;
+
+    -- Mois : depuis Quotidienne (les jours < closed_before sont hors de la
+    -- fenêtre temps réel de v_quotidienne).
+    -- Sommes et moyennes en numeric : exactes, donc indépendantes de l'ordre
+    -- d'agrégation. En double precision, un rejeu sans révision pourrait
+    -- différer au dernier bit et être compté comme un changement.
+    WITH fresh AS (
+        SELECT
+            q."NUM_POSTE" AS station_code,
+            date_trunc('month', q."AAAAMMJJ")::date AS bucket_start,
+            COUNT(*) FILTER (WHERE q."TNTXM" IS NOT NULL AND b.baseline_mean_tntxm IS NOT NULL) AS n_tntxm,
+            SUM(q."TNTXM"::numeric) FILTER (WHERE b.baseline_mean_tntxm IS NOT NULL)::double precision AS sum_tntxm,
+            SUM(b.baseline_mean_tntxm) FILTER (WHERE q."TNTXM" IS NOT NULL)::double precision AS sum_baseline,
+            COUNT(q."TN") AS n_tn,
+            SUM(q."TN"::numeric)::double precision AS sum_tn,
+            MIN(q."TN") AS min_tn,
+            COUNT(q."TX") AS n_tx,
+            SUM(q."TX"::numeric)::double precision AS sum_tx,
+            MAX(q."TX") AS max_tx
+        FROM public."Quotidienne" q
+            LEFT JOIN public.mv_baseline_station_daily_mean_1991_2020 b
+                ON  b.station_code = q."NUM_POSTE"
+                AND b.month        = EXTRACT(MONTH FROM q."AAAAMMJJ")::int
+                AND b.day          = EXTRACT(DAY FROM q."AAAAMMJJ")::int
+        WHERE q."AAAAMMJJ" >= window_start
+          AND q."AAAAMMJJ" <  closed_before
+          AND (q."TNTXM" IS NOT NULL OR q."TN" IS NOT NULL OR q."TX" IS NOT NULL)
+        GROUP BY q."NUM_POSTE", date_trunc('month', q."AAAAMMJJ")
+    ),
+    removed AS (
+        DELETE FROM public.station_temperature_rollups r
+        WHERE r.granularity = 'month'
+          AND r.bucket_start >= window_start
+          AND NOT EXISTS (
+              SELECT 1 FROM fresh f
+              WHERE f.station_code = r.station_code AND f.bucket_start = r.bucket_start
+          )
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.station_temperature_rollups AS r (
+            granularity, station_code, bucket_start,
+            n_tntxm, sum_tntxm, sum_baseline,
+            n_tn, sum_tn, min_tn,
+            n_tx, sum_tx, max_tx
+        )
+        SELECT
+            'month', station_code, bucket_start,
+            n_tntxm, sum_tntxm, sum_baseline,
+            n_tn, sum_tn, min_tn,
+            n_tx, sum_tx, max_tx
+        FROM fresh
+        ON CONFLICT (granularity, station_code, bucket_start) DO UPDATE
+            SET n_tntxm = EXCLUDED.n_tntxm, sum_tntxm = EXCLUDED.sum_tntxm,
+                sum_baseline = EXCLUDED.sum_baseline,
+                n_tn = EXCLUDED.n_tn, sum_tn = EXCLUDED.sum_tn, min_tn = EXCLUDED.min_tn,
+                n_tx = EXCLUDED.n_tx, sum_tx = EXCLUDED.sum_tx, max_tx = EXCLUDED.max_tx
+            WHERE (r.n_tntxm, r.sum_tntxm, r.sum_baseline,
+                   r.n_tn, r.sum_tn, r.min_tn,
+                   r.n_tx, r.sum_tx, r.max_tx)
+                IS DISTINCT FROM
+                  (EXCLUDED.n_tntxm, EXCLUDED.sum_tntxm, EXCLUDED.sum_baseline,
+                   EXCLUDED.n_tn, EXCLUDED.sum_tn, EXCLUDED.min_tn,
+                   EXCLUDED.n_tx, EXCLUDED.sum_tx, EXCLUDED.max_tx)
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM fresh),
+        (SELECT COUNT(*) FROM written),
+        (SELECT COUNT(*) FROM removed)
+    INTO months, v_upserted, v_deleted;
+    upserted := upserted + v_upserted;
+    deleted := deleted + v_deleted;
+
+    WITH fresh AS (
+        SELECT
+            date_trunc('month', d.day)::date AS bucket_start,
+            COUNT(*) AS n_days,
+            SUM(d.tmin)::double precision AS sum_tmin,
+            SUM(d.tmax)::double precision AS sum_tmax
+        FROM (
+            SELECT
+                q."AAAAMMJJ"  AS day,
+                AVG(q."TN"::numeric) AS tmin,
+                AVG(q."TX"::numeric) AS tmax
+            FROM public."Quotidienne" q
+            WHERE q."AAAAMMJJ" >= window_start
+              AND q."AAAAMMJJ" <  closed_before
+              AND q."TN" IS NOT NULL
+              AND q."TX" IS NOT NULL
+            GROUP BY q."AAAAMMJJ"
+        ) d
+        GROUP BY date_trunc('month', d.day)
+    ),
+    removed AS (
+        DELETE FROM public.national_minmax_rollups r
+        WHERE r.granularity = 'month'
+          AND r.bucket_start >= window_start
+          AND NOT EXISTS (SELECT 1 FROM fresh f WHERE f.bucket_start = r.bucket_start)
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.national_minmax_rollups AS r
+            (granularity, bucket_start, n_days, sum_tmin, sum_tmax)
+        SELECT 'month', bucket_start, n_days, sum_tmin, sum_tmax
+        FROM fresh
+        ON CONFLICT (granularity, bucket_start) DO UPDATE
+            SET n_days = EXCLUDED.n_days, sum_tmin = EXCLUDED.sum_tmin,
+                sum_tmax = EXCLUDED.sum_tmax
+            WHERE (r.n_days, r.sum_tmin, r.sum_tmax)
+                IS DISTINCT FROM (EXCLUDED.n_days, EXCLUDED.sum_tmin, EXCLUDED.sum_tmax)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM written), (SELECT COUNT(*) FROM removed)
+    INTO v_upserted, v_deleted;
+    upserted := upserted + v_upserted;
+    deleted := deleted + v_deleted;
+
+    -- Années : agrégées depuis les mois, uniquement si l'année est close.
+    WITH fresh AS (
+        SELECT
+            r.station_code,
+            date_trunc('year', r.bucket_start)::date AS bucket_start,
+            SUM(r.n_tntxm) AS n_tntxm,
+            SUM(r.sum_tntxm::numeric)::double precision AS sum_tntxm,
+            SUM(r.sum_baseline::numeric)::double precision AS sum_baseline,
+            SUM(r.n_tn) AS n_tn,
+            SUM(r.sum_tn::numeric)::double precision AS sum_tn,
+            MIN(r.min_tn) AS min_tn,
+            SUM(r.n_tx) AS n_tx,
+            SUM(r.sum_tx::numeric)::double precision AS sum_tx,
+            MAX(r.max_tx) AS max_tx
+        FROM public.station_temperature_rollups r
+        WHERE r.granularity = 'month'
+          AND r.bucket_start >= date_trunc('year', window_start)::date
+          AND r.bucket_start <  date_trunc('year', closed_before)::date
+        GROUP BY r.station_code, date_trunc('year', r.bucket_start)
+    ),
+    removed AS (
+        DELETE FROM public.station_temperature_rollups r
+        WHERE r.granularity = 'year'
+          AND r.bucket_start >= date_trunc('year', window_start)::date
+          AND NOT EXISTS (
+              SELECT 1 FROM fresh f
+              WHERE f.station_code = r.station_code AND f.bucket_start = r.bucket_start
+          )
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.station_temperature_rollups AS r (
+            granularity, station_code, bucket_start,
+            n_tntxm, sum_tntxm, sum_baseline,
+            n_tn, sum_tn, min_tn,
+            n_tx, sum_tx, max_tx
+        )
+        SELECT
+            'year', station_code, bucket_start,
+            n_tntxm, sum_tntxm, sum_baseline,
+            n_tn, sum_tn, min_tn,
+            n_tx, sum_tx, max_tx
+        FROM fresh
+        ON CONFLICT (granularity, station_code, bucket_start) DO UPDATE
+            SET n_tntxm = EXCLUDED.n_tntxm, sum_tntxm = EXCLUDED.sum_tntxm,
+                sum_baseline = EXCLUDED.sum_baseline,
+                n_tn = EXCLUDED.n_tn, sum_tn = EXCLUDED.sum_tn, min_tn = EXCLUDED.min_tn,
+                n_tx = EXCLUDED.n_tx, sum_tx = EXCLUDED.sum_tx, max_tx = EXCLUDED.max_tx
+            WHERE (r.n_tntxm, r.sum_tntxm, r.sum_baseline,
+                   r.n_tn, r.sum_tn, r.min_tn,
+                   r.n_tx, r.sum_tx, r.max_tx)
+                IS DISTINCT FROM
+                  (EXCLUDED.n_tntxm, EXCLUDED.sum_tntxm, EXCLUDED.sum_baseline,
+                   EXCLUDED.n_tn, EXCLUDED.sum_tn, EXCLUDED.min_tn,
+                   EXCLUDED.n_tx, EXCLUDED.sum_tx, EXCLUDED.max_tx)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM written), (SELECT COUNT(*) FROM removed)
+    INTO v_upserted, v_deleted;
+    upserted := upserted + v_upserted;
+    deleted := deleted + v_deleted;
+
+    WITH fresh AS (
+        SELECT
+            date_trunc('year', r.bucket_start)::date AS bucket_start,
+            SUM(r.n_days) AS n_days,
+            SUM(r.sum_tmin::numeric)::double precision AS sum_tmin,
+            SUM(r.sum_tmax::numeric)::double precision AS sum_tmax
+        FROM public.national_minmax_rollups r
+        WHERE r.granularity = 'month'
+          AND r.bucket_start >= date_trunc('year', window_start)::date
+          AND r.bucket_start <  date_trunc('year', closed_before)::date
+        GROUP BY date_trunc('year', r.bucket_start)
+    ),
+    removed AS (
+        DELETE FROM public.national_minmax_rollups r
+        WHERE r.granularity = 'year'
+          AND r.bucket_start >= date_trunc('year', window_start)::date
+          AND NOT EXISTS (SELECT 1 FROM fresh f WHERE f.bucket_start = r.bucket_start)
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.national_minmax_rollups AS r
+            (granularity, bucket_start, n_days, sum_tmin, sum_tmax)
+        SELECT 'year', bucket_start, n_days, sum_tmin, sum_tmax
+        FROM fresh
+        ON CONFLICT (granularity, bucket_start) DO UPDATE
+            SET n_days = EXCLUDED.n_days, sum_tmin = EXCLUDED.sum_tmin,
+                sum_tmax = EXCLUDED.sum_tmax
+            WHERE (r.n_days, r.sum_tmin, r.sum_tmax)
+                IS DISTINCT FROM (EXCLUDED.n_days, EXCLUDED.sum_tmin, EXCLUDED.sum_tmax)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM written), (SELECT COUNT(*) FROM removed)
+    INTO v_upserted, v_deleted;
+    upserted := upserted + v_upserted;
+    deleted := deleted + v_deleted;
+
+    DELETE FROM public.temperature_rollups_meta;
+    INSERT INTO public.temperature_rollups_meta (closed_before) VALUES (closed_before);
+
+    elapsed_ms := round(
+        (EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000)::numeric, 1
+    );
+    RAISE NOTICE 'refresh_temperature_rollups : mois >= %, fermés avant %, % buckets station-mois, % upsertés, % supprimés, % ms',
+        window_start, closed_before, months, upserted, deleted, elapsed_ms;
+    RETURN NEXT;
+END;
+$$;
+
+SELECT * FROM public.refresh_temperature_rollups();
+
+/*
+===============================================================================
+SOMMES CUMULÉES PAR STATION (vue d'ensemble des écarts à la normale)
+===============================================================================
+
+OBJECTIF
+--------
+La vue d'ensemble des écarts (fetch_station_overview) calcule, pour chaque
+station et une période [date_start, date_end] quelconque, la moyenne de TNTXM
+et de la baseline station 1991-2020 sur les jours observés. Agréger
+v_quotidienne x baseline à chaque requête coûte proportionnellement à la
+longueur de la période (30 ans ~ 11 000 jours par station).
+
+station_deviation_cumsum stocke, pour chaque (station, jour observé), les
+sommes cumulées depuis le premier jour de la station :
+  - cum_days     : nombre de jours où TNTXM et la baseline du (mois, jour) existent
+  - cum_tntxm    : somme de TNTXM sur ces jours
+  - cum_baseline : somme de la baseline sur ces jours
+
+Sommes sur [date_start, date_end] = dernier cumul <= date_end - dernier cumul
+< date_start : deux lectures d'index par station, quelle que soit la période.
+
+station_deviation_cumsum_meta (closed_before)
+  - les cumuls couvrent les jours < closed_before (CURRENT_DATE - 7 au dernier
+    refresh). Les jours suivants (temps réel, relève Quotidienne) sont agrégés
+    à chaud par la requête.
+
+MAINTENANCE
+-----------
+refresh_station_deviation_cumsum(p_since) recalcule les cumuls des jours
+>= p_since (et de ceux clos depuis le dernier appel) à partir du dernier cumul
+antérieur de chaque station. Une révision d'un jour décale tous les cumuls
+suivants de la station : p_since doit être <= au jour révisé.
+p_since NULL => reconstruction complète (après un import historique ou un
+recalcul de mv_baseline_station_daily_mean_1991_2020).
+Les cumuls de la fenêtre sont upsertés (seuls ceux qui changent sont
+réécrits) et ceux des jours disparus supprimés : upserted + deleted vaut 0 si
+rien n'a changé, et le job pg_cron ne touche alors pas data_version.
+===============================================================================
+*/
+
+CREATE TABLE IF NOT EXISTS public.station_deviation_cumsum (
+    station_code  char(8)          NOT NULL,
+    date          date             NOT NULL,
+    cum_days      integer          NOT NULL,
+    cum_tntxm     double precision NOT NULL,
+    cum_baseline  double precision NOT NULL,
+    CONSTRAINT station_deviation_cumsum_pkey PRIMARY KEY (station_code, date)
+);
+
+CREATE TABLE IF NOT EXISTS public.station_deviation_cumsum_meta (
+    closed_before date NOT NULL
+);
+
+-- Colonnes de retour modifiées (inserted -> upserted / deleted) : l'ancienne
+-- version est supprimée.
+DROP FUNCTION IF EXISTS public.refresh_station_deviation_cumsum(date);
+
+CREATE FUNCTION public.refresh_station_deviation_cumsum(
+    p_since date DEFAULT NULL
+)
+RETURNS TABLE (
+    window_start  date,
+    closed_before date,
+    upserted      integer,
+    deleted       integer,
+    elapsed_ms    numeric
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_started   timestamptz := clock_timestamp();
+    v_previous  date;
+BEGIN
+    closed_before := CURRENT_DATE - 7;
+
+    SELECT m.closed_before INTO v_previous
+    FROM public.station_deviation_cumsum_meta m
+    LIMIT 1;
+
+    -- Jamais calculé ou reconstruction demandée : tout l'historique.
+    IF p_since IS NULL OR v_previous IS NULL THEN
+        TRUNCATE public.station_deviation_cumsum;
+        window_start := COALESCE(
+            (SELECT MIN(q."AAAAMMJJ")::date FROM public."Quotidienne" q),
+            CURRENT_DATE
+        );
+    ELSE
+        window_start := LEAST(p_since, v_previous);
+    END IF;
+
+    -- Jours < closed_before : hors de la fenêtre temps réel de v_quotidienne,
+    -- lus directement dans Quotidienne.
+    WITH days AS (
+        SELECT
+            q."NUM_POSTE"                             AS station_code,
+            q."AAAAMMJJ"::date                        AS date,
+            q."TNTXM"                                 AS tntxm,
+            b.baseline_mean_tntxm::double precision   AS baseline
+        FROM public."Quotidienne" q
+            INNER JOIN public.mv_baseline_station_daily_mean_1991_2020 b
+                ON  b.station_code = q."NUM_POSTE"
+                AND b.month        = EXTRACT(MONTH FROM q."AAAAMMJJ")::int
+                AND b.day          = EXTRACT(DAY FROM q."AAAAMMJJ")::int
+        WHERE q."AAAAMMJJ" >= window_start
+          AND q."AAAAMMJJ" <  closed_before
+          AND q."TNTXM" IS NOT NULL
+          AND b.baseline_mean_tntxm IS NOT NULL
+    ),
+    previous AS (
+        SELECT s.station_code, p.cum_days, p.cum_tntxm, p.cum_baseline
+        FROM (SELECT DISTINCT d.station_code FROM days d) s
+            CROSS JOIN LATERAL (
+                SELECT c.cum_days, c.cum_tntxm, c.cum_baseline
+                FROM public.station_deviation_cumsum c
+                WHERE c.station_code = s.station_code
+                  AND c.date < window_start
+                ORDER BY c.date DESC
+                LIMIT 1
+            ) p
+    ),
+    fresh AS (
+        SELECT
+            d.station_code,
+            d.date,
+            COALESCE(p.cum_days, 0)     + COUNT(*)          OVER w AS cum_days,
+            COALESCE(p.cum_tntxm, 0)    + SUM(d.tntxm)      OVER w AS cum_tntxm,
+            COALESCE(p.cum_baseline, 0) + SUM(d.baseline)   OVER w AS cum_baseline
+        FROM days d
+            LEFT JOIN previous p ON p.station_code = d.station_code
+        WINDOW w AS (PARTITION BY d.station_code ORDER BY d.date)
+    ),
+    removed AS (
+        DELETE FROM public.station_deviation_cumsum c
+        WHERE c.date >= window_start
+          AND NOT EXISTS (
+              SELECT 1 FROM fresh f
+              WHERE f.station_code = c.station_code AND f.date = c.date
+          )
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.station_deviation_cumsum AS c
+            (station_code, date, cum_days, cum_tntxm, cum_baseline)
+        SELECT station_code, date, cum_days, cum_tntxm, cum_baseline
+        FROM fresh
+        ON CONFLICT (station_code, date) DO UPDATE
+            SET cum_days     = EXCLUDED.cum_days,
+                cum_tntxm    = EXCLUDED.cum_tntxm,
+                cum_baseline = EXCLUDED.cum_baseline
+            WHERE (c.cum_days, c.cum_tntxm, c.cum_baseline)
+                IS DISTINCT FROM
+                  (EXCLUDED.cum_days, EXCLUDED.cum_tntxm, EXCLUDED.cum_baseline)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM written), (SELECT COUNT(*) FROM removed)
+    INTO upserted, deleted;
+
+    DELETE FROM public.station_deviation_cumsum_meta;
+    INSERT INTO public.station_deviation_cumsum_meta (closed_before)
+    VALUES (closed_before);
+
+    elapsed_ms := round(
+        (EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000)::numeric, 1
+    );
+    RAISE NOTICE 'refresh_station_deviation_cumsum : jours >= %, clos avant %, % upsertés, % supprimés, % ms',
+        window_start, closed_before, upserted, deleted, elapsed_ms;
+    RETURN NEXT;
+END;
+$$;
+
+SELECT * FROM public.refresh_station_deviation_cumsum();
+
 CREATE OR REPLACE VIEW public.v_station_itn AS
 SELECT
     s.station_code,
@@ -978,7 +1514,7 @@ FROM normalized n
 GROUP BY n.date
 HAVING COUNT(DISTINCT n.station_code) >= 29;
 
-CREATE MATERIALIZED VIEW public.mv_itn_daily_all_years AS
+CREATE TABLE IF NOT EXISTS public.mv_itn_daily_all_years AS
 SELECT
     date,
     year,
@@ -987,17 +1523,84 @@ SELECT
     is_fictive,
     itn
 FROM public.v_itn_daily_all_years
-ORDER BY date;
+WITH NO DATA;
 
 CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_itn_daily_all_years_date
     ON public.mv_itn_daily_all_years (date);
 
+CREATE INDEX IF NOT EXISTS idx_mv_itn_daily_all_years_day_of_month
+    ON public.mv_itn_daily_all_years (day_of_month);
+
 CREATE INDEX IF NOT EXISTS idx_mv_itn_daily_all_years_month_day
     ON public.mv_itn_daily_all_years (month, day_of_month);
 
 CREATE INDEX IF NOT EXISTS idx_mv_itn_daily_all_years_year
     ON public.mv_itn_daily_all_years (year);
 
+CREATE OR REPLACE FUNCTION public.refresh_itn_daily_all_years(
+    p_since date DEFAULT NULL
+)
+RETURNS TABLE (
+    window_start date,
+    upserted     integer,
+    deleted      integer,
+    elapsed_ms   numeric
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_started timestamptz := clock_timestamp();
+BEGIN
+    -- Marge de 7 jours, comme records_battus_state : le jour qui quitte la
+    -- fenêtre temps réel (bascule vers Quotidienne) et les révisions tardives
+    -- de Quotidienne sont recalculés.
+    window_start := COALESCE(
+        p_since,
+        LEAST(
+            (SELECT MIN(r.date)::date FROM public.mv_quotidienne_realtime r),
+            CURRENT_DATE - 7
+        )
+    );
+
+    -- Le filtre sur date (colonne de GROUP BY) est poussé jusqu'à v_quotidienne :
+    -- seule la fenêtre est agrégée.
+    WITH fresh AS (
+        SELECT v.date, v.year, v.month, v.day_of_month, v.is_fictive, v.itn
+        FROM public.v_itn_daily_all_years v
+        WHERE v.date >= window_start
+    ),
+    removed AS (
+        DELETE FROM public.mv_itn_daily_all_years t
+        WHERE t.date >= window_start
+          AND NOT EXISTS (SELECT 1 FROM fresh f WHERE f.date = t.date)
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.mv_itn_daily_all_years
+            (date, year, month, day_of_month, is_fictive, itn)
+        SELECT date, year, month, day_of_month, is_fictive, itn
+        FROM fresh
+        ON CONFLICT (date) DO UPDATE
+            SET itn = EXCLUDED.itn
+            WHERE public.mv_itn_daily_all_years.itn IS DISTINCT FROM EXCLUDED.itn
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM written),
+        (SELECT COUNT(*) FROM removed)
+    INTO upserted, deleted;
+
+    elapsed_ms := round(
+        (EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000)::numeric, 1
+    );
+    RAISE NOTICE 'refresh_itn_daily_all_years : jours >= %, % upsertés, % supprimés, % ms',
+        window_start, upserted, deleted, elapsed_ms;
+    RETURN NEXT;
+END;
+$$;
+
+SELECT * FROM public.refresh_itn_daily_all_years('1947-01-01');
+
 CREATE OR REPLACE VIEW public.v_itn_daily_all_years_with_feb29 AS
 WITH feb29_fictive AS (
     SELECT
@@ -1035,6 +1638,70 @@ SELECT
 FROM public.v_itn_daily_all_years_with_feb29
 GROUP BY month, day_of_month;
 
+CREATE TABLE IF NOT EXISTS public.itn_absolute_extremes_daily (
+    month         integer          NOT NULL,
+    day_of_month  integer          NOT NULL,
+    absolute_min  double precision NOT NULL,
+    absolute_max  double precision NOT NULL,
+    CONSTRAINT itn_absolute_extremes_daily_pkey PRIMARY KEY (month, day_of_month)
+);
+
+-- Renvoie le nombre de jours calendaires dont les extremes ont changé (le job
+-- pg_cron ne touche data_version que s'il est non nul). Type de retour modifié :
+-- l'ancienne version (void) est supprimée.
+DROP FUNCTION IF EXISTS public.refresh_itn_absolute_extremes_daily(date);
+
+CREATE FUNCTION public.refresh_itn_absolute_extremes_daily(
+    p_since date DEFAULT NULL
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_changed integer;
+BEGIN
+    IF p_since IS NULL THEN
+        TRUNCATE public.itn_absolute_extremes_daily;
+    END IF;
+
+    WITH touched AS (
+        SELECT DISTINCT month, day_of_month
+        FROM public.mv_itn_daily_all_years
+        WHERE p_since IS NULL OR date >= p_since
+    ),
+    touched_with_feb29 AS (
+        SELECT month, day_of_month FROM touched
+        UNION
+        SELECT 2, 29
+        FROM touched
+        WHERE (month, day_of_month) IN ((2, 28), (3, 1))
+    )
+    INSERT INTO public.itn_absolute_extremes_daily
+        (month, day_of_month, absolute_min, absolute_max)
+    SELECT
+        d.month,
+        d.day_of_month,
+        MIN(d.itn),
+        MAX(d.itn)
+    FROM public.v_itn_daily_all_years_with_feb29 d
+        INNER JOIN touched_with_feb29 t
+            ON  t.month        = d.month
+            AND t.day_of_month = d.day_of_month
+    GROUP BY d.month, d.day_of_month
+    ON CONFLICT (month, day_of_month) DO UPDATE
+        SET absolute_min = EXCLUDED.absolute_min,
+            absolute_max = EXCLUDED.absolute_max
+        WHERE (public.itn_absolute_extremes_daily.absolute_min,
+               public.itn_absolute_extremes_daily.absolute_max)
+            IS DISTINCT FROM (EXCLUDED.absolute_min, EXCLUDED.absolute_max);
+
+    GET DIAGNOSTICS v_changed = ROW_COUNT;
+    RETURN v_changed;
+END;
+$$;
+
+SELECT public.refresh_itn_absolute_extremes_daily();
+
 CREATE OR REPLACE VIEW public.v_itn_absolute_extremes_monthly AS
 WITH monthly_itn AS (
     SELECT
@@ -1301,7 +1968,126 @@ FROM tn_seasonal r
 WHERE (r.prev_val IS NULL OR r.val < r.prev_val)
     AND r."AAAAMMJJ" >= s.first_temperature_date + interval '50 years';
 
-CREATE MATERIALIZED VIEW public.mv_records_battus AS
+CREATE OR REPLACE FUNCTION public.records_battus_single_scan(
+    p_station_from text DEFAULT NULL,
+    p_station_to   text DEFAULT NULL
+)
+RETURNS TABLE (
+    period_type   text,
+    period_value  text,
+    record_type   text,
+    station_code  char(8),
+    station_name  text,
+    department    integer,
+    record_value  double precision,
+    record_date   timestamp(3)
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    st          record;
+    d           record;
+    v_from      timestamp;
+    v_month     int;
+    v_season    int;
+    v_tx_all    double precision;
+    v_tn_all    double precision;
+    v_tx_month  double precision[];
+    v_tn_month  double precision[];
+    v_tx_season double precision[];
+    v_tn_season double precision[];
+    c_seasons   CONSTANT text[] := ARRAY['winter', 'spring', 'summer', 'autumn'];
+BEGIN
+    FOR st IN
+        SELECT s.station_code, s.name, s.departement, s.first_temperature_date
+        FROM public.v_station_records s
+        WHERE (p_station_from IS NULL OR s.station_code >= p_station_from)
+          AND (p_station_to IS NULL OR s.station_code < p_station_to)
+        ORDER BY s.station_code
+    LOOP
+        station_code := st.station_code;
+        station_name := st.name;
+        department   := st.departement;
+        v_from       := st.first_temperature_date + interval '50 years';
+        v_tx_all     := NULL;
+        v_tn_all     := NULL;
+        v_tx_month   := array_fill(NULL::double precision, ARRAY[12]);
+        v_tn_month   := array_fill(NULL::double precision, ARRAY[12]);
+        v_tx_season  := array_fill(NULL::double precision, ARRAY[4]);
+        v_tn_season  := array_fill(NULL::double precision, ARRAY[4]);
+
+        -- Série de la station dans l'ordre des dates (index de Quotidienne).
+        FOR d IN
+            SELECT q.date, q.tx, q.tn
+            FROM public.v_quotidienne q
+            WHERE q.station_code = st.station_code
+            ORDER BY q.date
+        LOOP
+            v_month  := EXTRACT(MONTH FROM d.date)::int;
+            v_season := (v_month % 12) / 3 + 1;  -- 12, 1, 2 => 1 (winter)
+            record_date := d.date;
+
+            IF d.tx IS NOT NULL THEN
+                record_type  := 'TX';
+                record_value := d.tx;
+                -- Record strictement supérieur au maximum courant ; l'état
+                -- avance aussi avant first_temperature_date + 50 ans, seule
+                -- l'émission est filtrée.
+                IF v_tx_all IS NULL OR d.tx > v_tx_all THEN
+                    v_tx_all := d.tx;
+                    IF d.date >= v_from THEN
+                        period_type := 'all_time'; period_value := NULL;
+                        RETURN NEXT;
+                    END IF;
+                END IF;
+                IF v_tx_month[v_month] IS NULL OR d.tx > v_tx_month[v_month] THEN
+                    v_tx_month[v_month] := d.tx;
+                    IF d.date >= v_from THEN
+                        period_type := 'month'; period_value := v_month::text;
+                        RETURN NEXT;
+                    END IF;
+                END IF;
+                IF v_tx_season[v_season] IS NULL OR d.tx > v_tx_season[v_season] THEN
+                    v_tx_season[v_season] := d.tx;
+                    IF d.date >= v_from THEN
+                        period_type := 'season'; period_value := c_seasons[v_season];
+                        RETURN NEXT;
+                    END IF;
+                END IF;
+            END IF;
+
+            IF d.tn IS NOT NULL THEN
+                record_type  := 'TN';
+                record_value := d.tn;
+                IF v_tn_all IS NULL OR d.tn < v_tn_all THEN
+                    v_tn_all := d.tn;
+                    IF d.date >= v_from THEN
+                        period_type := 'all_time'; period_value := NULL;
+                        RETURN NEXT;
+                    END IF;
+                END IF;
+                IF v_tn_month[v_month] IS NULL OR d.tn < v_tn_month[v_month] THEN
+                    v_tn_month[v_month] := d.tn;
+                    IF d.date >= v_from THEN
+                        period_type := 'month'; period_value := v_month::text;
+                        RETURN NEXT;
+                    END IF;
+                END IF;
+                IF v_tn_season[v_season] IS NULL OR d.tn < v_tn_season[v_season] THEN
+                    v_tn_season[v_season] := d.tn;
+                    IF d.date >= v_from THEN
+                        period_type := 'season'; period_value := c_seasons[v_season];
+                        RETURN NEXT;
+                    END IF;
+                END IF;
+            END IF;
+        END LOOP;
+    END LOOP;
+END;
+$$;
+
+CREATE TABLE public.mv_records_battus AS
 SELECT
     period_type,
     period_value,
@@ -1311,7 +2097,7 @@ SELECT
     department,
     record_value,
     record_date
-FROM public.v_records_battus;
+FROM public.records_battus_single_scan();
 
 CREATE UNIQUE INDEX IF NOT EXISTS idx_uq_mv_records_battus_query
 ON public.mv_records_battus (record_type, period_type, period_value, station_code, record_date);
@@ -1321,3 +2107,332 @@ ON public.mv_records_battus (record_type, period_type, period_value);
 
 CREATE INDEX IF NOT EXISTS idx_mv_records_battus_station
 ON public.mv_records_battus (station_code);
+
+CREATE OR REPLACE FUNCTION public.prepare_records_battus_shadow()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DROP TABLE IF EXISTS public.mv_records_battus_shadow;
+    CREATE TABLE public.mv_records_battus_shadow (LIKE public.mv_records_battus);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.fill_records_battus_shadow(
+    p_station_from text,
+    p_station_to   text DEFAULT NULL
+)
+RETURNS bigint
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows bigint;
+BEGIN
+    INSERT INTO public.mv_records_battus_shadow (
+        period_type, period_value, record_type, station_code,
+        station_name, department, record_value, record_date
+    )
+    SELECT
+        r.period_type,
+        r.period_value,
+        r.record_type,
+        r.station_code,
+        r.station_name,
+        r.department,
+        r.record_value,
+        r.record_date
+    FROM public.records_battus_single_scan(p_station_from, p_station_to) r;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.index_records_battus_shadow()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    CREATE UNIQUE INDEX idx_uq_mv_records_battus_shadow_query
+    ON public.mv_records_battus_shadow (record_type, period_type, period_value, station_code, record_date);
+
+    CREATE INDEX idx_mv_records_battus_shadow_query
+    ON public.mv_records_battus_shadow (record_type, period_type, period_value);
+
+    CREATE INDEX idx_mv_records_battus_shadow_station
+    ON public.mv_records_battus_shadow (station_code);
+
+    ANALYZE public.mv_records_battus_shadow;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.swap_records_battus_shadow(p_cutoff date)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_old_kind "char";
+BEGIN
+    -- Premier verrou pris : ACCESS EXCLUSIVE sur la table lue.
+    ALTER TABLE public.mv_records_battus RENAME TO mv_records_battus_old;
+    SELECT c.relkind INTO v_old_kind
+    FROM pg_class c
+    WHERE c.oid = 'public.mv_records_battus_old'::regclass;
+
+    ALTER INDEX IF EXISTS public.idx_uq_mv_records_battus_query
+        RENAME TO idx_uq_mv_records_battus_old_query;
+    ALTER INDEX IF EXISTS public.idx_mv_records_battus_query
+        RENAME TO idx_mv_records_battus_old_query;
+    ALTER INDEX IF EXISTS public.idx_mv_records_battus_station
+        RENAME TO idx_mv_records_battus_old_station;
+
+    ALTER TABLE public.mv_records_battus_shadow RENAME TO mv_records_battus;
+    ALTER INDEX public.idx_uq_mv_records_battus_shadow_query
+        RENAME TO idx_uq_mv_records_battus_query;
+    ALTER INDEX public.idx_mv_records_battus_shadow_query
+        RENAME TO idx_mv_records_battus_query;
+    ALTER INDEX public.idx_mv_records_battus_shadow_station
+        RENAME TO idx_mv_records_battus_station;
+
+    -- DELETE plutôt que TRUNCATE : pas de verrou exclusif sur la table meta.
+    DELETE FROM public.mv_records_battus_meta;
+    INSERT INTO public.mv_records_battus_meta (cutoff_date) VALUES (p_cutoff);
+
+    -- Vue matérialisée avant la première reconstruction, table ensuite.
+    IF v_old_kind = 'm' THEN
+        DROP MATERIALIZED VIEW public.mv_records_battus_old;
+    ELSE
+        DROP TABLE public.mv_records_battus_old;
+    END IF;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS public.records_battus_state (
+    station_code  char(8)          NOT NULL,
+    record_type   text             NOT NULL,
+    period_type   text             NOT NULL,
+    period_value  text,
+    seed_value    double precision,
+    seed_date     date,
+    record_value  double precision,
+    record_date   date,
+    CONSTRAINT records_battus_state_uq UNIQUE NULLS NOT DISTINCT
+        (station_code, record_type, period_type, period_value)
+);
+
+CREATE TABLE IF NOT EXISTS public.records_battus_recents (
+    period_type   text             NOT NULL,
+    period_value  text,
+    record_type   text             NOT NULL,
+    station_code  char(8)          NOT NULL,
+    record_value  double precision NOT NULL,
+    record_date   date             NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_uq_records_battus_recents_query
+ON public.records_battus_recents (record_type, period_type, period_value, station_code, record_date);
+
+CREATE TABLE IF NOT EXISTS public.records_battus_state_meta (
+    cutoff_date        date NOT NULL,
+    processed_through  date
+);
+
+-- Type de retour modifié (void -> integer) : l'ancienne version est supprimée.
+DROP FUNCTION IF EXISTS public.refresh_records_battus_state(date);
+
+CREATE FUNCTION public.refresh_records_battus_state(
+    p_since date DEFAULT NULL
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_cutoff        date;
+    v_state_cutoff  date;
+    v_processed     date;
+    v_from          date;
+    v_last          date;
+    v_before        public.records_battus_recents[] := '{}';
+    v_changed       integer;
+BEGIN
+    SELECT cutoff_date INTO v_cutoff FROM public.mv_records_battus_meta LIMIT 1;
+    IF v_cutoff IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    SELECT cutoff_date, processed_through
+    INTO v_state_cutoff, v_processed
+    FROM public.records_battus_state_meta
+    LIMIT 1;
+
+    IF p_since IS NULL OR v_state_cutoff IS DISTINCT FROM v_cutoff THEN
+        TRUNCATE public.records_battus_state,
+                 public.records_battus_recents,
+                 public.records_battus_state_meta;
+
+        -- Seed : même amorçage que le calcul à chaud (records progressifs de
+        -- la MV + records absolus, ces derniers couvrant les stations dont le
+        -- record est antérieur à first_temp + 50 ans).
+        INSERT INTO public.records_battus_state (
+            station_code, record_type, period_type, period_value,
+            seed_value, seed_date, record_value, record_date
+        )
+        SELECT DISTINCT ON (station_code, record_type, period_type, period_value)
+            station_code, record_type, period_type, period_value,
+            record_value, record_date, record_value, record_date
+        FROM (
+            SELECT station_code, record_type, period_type, period_value,
+                   record_value, record_date::date AS record_date
+            FROM public.mv_records_battus
+            UNION ALL
+            SELECT station_code, record_type, period_type, period_value,
+                   record_value, record_date::date
+            FROM public.v_records_absolus_par_type
+            WHERE record_value IS NOT NULL
+        ) seeds
+        ORDER BY station_code, record_type, period_type, period_value,
+            CASE WHEN record_type = 'TX' THEN record_value ELSE -record_value END DESC,
+            record_date;
+
+        INSERT INTO public.records_battus_state_meta (cutoff_date, processed_through)
+        VALUES (v_cutoff, NULL);
+        v_from := v_cutoff;
+    ELSE
+        v_from := GREATEST(
+            v_cutoff,
+            LEAST(p_since, COALESCE(v_processed + 1, v_cutoff))
+        );
+
+        -- Journal de la fenêtre avant rejeu, pour compter ce qui change.
+        SELECT COALESCE(array_agg(r), '{}') INTO v_before
+        FROM public.records_battus_recents r
+        WHERE r.record_date >= v_from;
+
+        -- Rembobinage : oublie les records de la fenêtre rejouée.
+        DELETE FROM public.records_battus_recents WHERE record_date >= v_from;
+
+        UPDATE public.records_battus_state s
+        SET record_value = COALESCE(prev.record_value, s.seed_value),
+            record_date  = COALESCE(prev.record_date, s.seed_date)
+        FROM public.records_battus_state s0
+            LEFT JOIN LATERAL (
+                SELECT r.record_value, r.record_date
+                FROM public.records_battus_recents r
+                WHERE r.record_type  = s0.record_type
+                  AND r.period_type  = s0.period_type
+                  AND r.period_value IS NOT DISTINCT FROM s0.period_value
+                  AND r.station_code = s0.station_code
+                ORDER BY r.record_date DESC
+                LIMIT 1
+            ) prev ON TRUE
+        WHERE s0.station_code = s.station_code
+          AND s0.record_type  = s.record_type
+          AND s0.period_type  = s.period_type
+          AND s0.period_value IS NOT DISTINCT FROM s.period_value
+          AND s.record_date >= v_from;
+    END IF;
+
+    -- Rejeu de la fenêtre : les 6 combinaisons (TX/TN × all_time/month/season)
+    -- en un seul passage. TN est traité en valeur négée pour n'avoir qu'un MAX.
+    WITH days AS (
+        SELECT
+            q.station_code,
+            q.date::date AS date,
+            r.record_type,
+            p.period_type,
+            p.period_value,
+            r.signed_val
+        FROM public.v_quotidienne q
+            CROSS JOIN LATERAL (
+                VALUES
+                    ('TX', q.tx::double precision),
+                    ('TN', -q.tn::double precision)
+            ) r (record_type, signed_val)
+            CROSS JOIN LATERAL (
+                VALUES
+                    ('all_time', NULL::text),
+                    ('month', EXTRACT(MONTH FROM q.date)::text),
+                    ('season', CASE
+                        WHEN EXTRACT(MONTH FROM q.date) IN (12, 1, 2) THEN 'winter'
+                        WHEN EXTRACT(MONTH FROM q.date) IN (3, 4, 5) THEN 'spring'
+                        WHEN EXTRACT(MONTH FROM q.date) IN (6, 7, 8) THEN 'summer'
+                        ELSE 'autumn'
+                    END)
+            ) p (period_type, period_value)
+        WHERE q.date >= v_from
+          AND r.signed_val IS NOT NULL
+    ),
+    ordered AS (
+        SELECT
+            d.*,
+            GREATEST(
+                COALESCE(
+                    CASE WHEN d.record_type = 'TX' THEN s.record_value ELSE -s.record_value END,
+                    '-Infinity'::double precision
+                ),
+                COALESCE(
+                    MAX(d.signed_val) OVER (
+                        PARTITION BY d.station_code, d.record_type, d.period_type, d.period_value
+                        ORDER BY d.date
+                        ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                    ),
+                    '-Infinity'::double precision
+                )
+            ) AS prev_val
+        FROM days d
+            LEFT JOIN public.records_battus_state s
+                ON  s.station_code = d.station_code
+                AND s.record_type  = d.record_type
+                AND s.period_type  = d.period_type
+                AND s.period_value IS NOT DISTINCT FROM d.period_value
+    )
+    INSERT INTO public.records_battus_recents (
+        period_type, period_value, record_type, station_code, record_value, record_date
+    )
+    SELECT
+        period_type,
+        period_value,
+        record_type,
+        station_code,
+        CASE WHEN record_type = 'TX' THEN signed_val ELSE -signed_val END,
+        date
+    FROM ordered
+    WHERE signed_val > prev_val;
+
+    -- Avance l'état au dernier record battu de la fenêtre.
+    INSERT INTO public.records_battus_state (
+        station_code, record_type, period_type, period_value, record_value, record_date
+    )
+    SELECT DISTINCT ON (station_code, record_type, period_type, period_value)
+        station_code, record_type, period_type, period_value, record_value, record_date
+    FROM public.records_battus_recents
+    WHERE record_date >= v_from
+    ORDER BY station_code, record_type, period_type, period_value, record_date DESC
+    ON CONFLICT (station_code, record_type, period_type, period_value) DO UPDATE
+        SET record_value = EXCLUDED.record_value,
+            record_date  = EXCLUDED.record_date;
+
+    SELECT MAX(date)::date INTO v_last
+    FROM public.v_quotidienne
+    WHERE date >= v_from;
+
+    UPDATE public.records_battus_state_meta
+    SET processed_through = COALESCE(v_last, v_from - 1);
+
+    SELECT COUNT(*) INTO v_changed
+    FROM (
+        (
+            SELECT * FROM unnest(v_before)
+            EXCEPT ALL
+            SELECT * FROM public.records_battus_recents WHERE record_date >= v_from
+        )
+        UNION ALL
+        (
+            SELECT * FROM public.records_battus_recents WHERE record_date >= v_from
+            EXCEPT ALL
+            SELECT * FROM unnest(v_before)
+        )
+    ) diff;
+    RETURN v_changed;
+END;
+$$;
@@ -1,11 +1,78 @@
 CREATE EXTENSION IF NOT EXISTS pg_cron;
 
+-- data_version (sql/tables/002) n'est touché que pour les sources modifiées, et
+-- le NOTIFY (relayé au cache de réponses par `manage.py invalidate_response_cache
+-- --listen`) n'est émis que si l'une d'elles l'a été : sans nouvelle donnée, les
+-- clés de cache et les ETag restent valides.
 SELECT cron.schedule(
    'refresh-mv-quotidienne-realtime',
    '*/6 * * * *',
    $$
-   REFRESH MATERIALIZED VIEW CONCURRENTLY mv_quotidienne_realtime;
-   REFRESH MATERIALIZED VIEW CONCURRENTLY mv_mensuelle_realtime;
-   REFRESH MATERIALIZED VIEW CONCURRENTLY mv_itn_daily_all_years;
+   DO $refresh$
+   DECLARE
+       v_before   bigint;
+       v_itn      record;
+       v_changed  text[] := '{}';
+   BEGIN
+       v_before := public.relation_changes('public.mv_quotidienne_realtime');
+       REFRESH MATERIALIZED VIEW CONCURRENTLY public.mv_quotidienne_realtime;
+       IF public.relation_changes('public.mv_quotidienne_realtime') > v_before THEN
+           v_changed := v_changed || 'mv_quotidienne_realtime';
+       END IF;
+
+       v_before := public.relation_changes('public.mv_mensuelle_realtime');
+       REFRESH MATERIALIZED VIEW CONCURRENTLY public.mv_mensuelle_realtime;
+       IF public.relation_changes('public.mv_mensuelle_realtime') > v_before THEN
+           v_changed := v_changed || 'mv_mensuelle_realtime';
+       END IF;
+
+       -- Incrémental : fenêtre temps réel et 7 derniers jours.
+       SELECT * INTO v_itn FROM public.refresh_itn_daily_all_years();
+       IF v_itn.upserted + v_itn.deleted > 0 THEN
+           v_changed := v_changed || 'mv_itn_daily_all_years';
+       END IF;
+
+       IF public.refresh_itn_absolute_extremes_daily(CURRENT_DATE - 31) > 0 THEN
+           v_changed := v_changed || 'itn_absolute_extremes_daily';
+       END IF;
+
+       -- Fenêtre rejouée : temps réel (4 jours) + relève Quotidienne qui le remplace.
+       IF public.refresh_records_battus_state(CURRENT_DATE - 7) > 0 THEN
+           v_changed := v_changed || 'records_battus_state';
+       END IF;
+
+       PERFORM public.touch_data_version(source) FROM unnest(v_changed) source;
+       IF cardinality(v_changed) > 0 THEN
+           PERFORM pg_notify('response_cache_invalidation', 'realtime');
+       END IF;
+   END
+   $refresh$;
+   $$
+);
+
+-- Rollups mensuels / annuels : le mois qui vient de se clore (et ses révisions).
+-- Cumuls de la vue d'ensemble des écarts : les jours clos depuis la veille.
+-- Comme ci-dessus, data_version n'est touché que si des lignes ont changé.
+SELECT cron.schedule(
+   'refresh-temperature-rollups',
+   '15 3 * * *',
+   $$
+   DO $refresh$
+   DECLARE
+       v_refresh  record;
+   BEGIN
+       SELECT * INTO v_refresh
+       FROM public.refresh_temperature_rollups(CURRENT_DATE - 45);
+       IF v_refresh.upserted + v_refresh.deleted > 0 THEN
+           PERFORM public.touch_data_version('temperature_rollups');
+       END IF;
+
+       SELECT * INTO v_refresh
+       FROM public.refresh_station_deviation_cumsum(CURRENT_DATE - 14);
+       IF v_refresh.upserted + v_refresh.deleted > 0 THEN
+           PERFORM public.touch_data_version('station_deviation_cumsum');
+       END IF;
+   END
+   $refresh$;
    $$
 );
@@ -0,0 +1,347 @@
+/*
+===============================================================================
+ROLLUPS MENSUELS / ANNUELS PAR STATION (écarts à la normale, graphes min/max)
+===============================================================================
+
+OBJECTIF
+--------
+Les graphes d'écart à la normale et min/max lisent, pour une granularité mois
+ou année, tous les points journaliers de la période puis les moyennent en
+Python : un graphe annuel sur 30 ans lit ~11 000 lignes par station.
+
+Ces tables stockent les sommes et effectifs par bucket (mois, année), ce qui
+suffit à reconstruire exactement les moyennes : le même graphe lit ~30 lignes
+par station. Équivalent des continuous aggregates TimescaleDB, maintenu par une
+fonction plpgsql (même principe que 006 / records_battus_state).
+
+TABLES
+------
+station_temperature_rollups (granularity 'month' | 'year', station_code, bucket_start)
+  - n_tntxm, sum_tntxm, sum_baseline : jours où TNTXM et la baseline station
+    1991-2020 du (mois, jour) existent (mêmes jours que le graphe d'écart)
+  - n_tn, sum_tn, min_tn / n_tx, sum_tx, max_tx : jours où TN (resp. TX) existe
+
+national_minmax_rollups (granularity, bucket_start)
+  - n_days, sum_tmin, sum_tmax : somme des moyennes journalières nationales
+    AVG(TN) / AVG(TX) (jours et stations où TN et TX existent)
+
+temperature_rollups_meta (closed_before)
+  - les rollups couvrent les jours < closed_before (début de mois). Les jours
+    suivants (temps réel, relève Quotidienne) sont lus à chaud par les sources.
+
+MAINTENANCE
+-----------
+refresh_temperature_rollups(p_since) recalcule les mois >= p_since (et ceux
+fermés depuis le dernier appel) jusqu'à closed_before = début du mois de
+CURRENT_DATE - 7 jours, puis les années touchées à partir des mois.
+p_since NULL => reconstruction complète (à relancer après un import historique
+ou un recalcul de mv_baseline_station_daily_mean_1991_2020).
+Les buckets de la fenêtre sont upsertés (seules les valeurs modifiées sont
+réécrites) et ceux qui ont disparu supprimés : upserted + deleted vaut 0 si
+rien n'a changé, et le job pg_cron ne touche alors pas data_version.
+===============================================================================
+*/
+
+CREATE TABLE IF NOT EXISTS public.station_temperature_rollups (
+    granularity   text             NOT NULL,
+    station_code  char(8)          NOT NULL,
+    bucket_start  date             NOT NULL,
+    n_tntxm       integer          NOT NULL,
+    sum_tntxm     double precision,
+    sum_baseline  double precision,
+    n_tn          integer          NOT NULL,
+    sum_tn        double precision,
+    min_tn        double precision,
+    n_tx          integer          NOT NULL,
+    sum_tx        double precision,
+    max_tx        double precision,
+    CONSTRAINT station_temperature_rollups_pkey
+        PRIMARY KEY (granularity, station_code, bucket_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_station_temperature_rollups_bucket
+    ON public.station_temperature_rollups (granularity, bucket_start);
+
+CREATE TABLE IF NOT EXISTS public.national_minmax_rollups (
+    granularity   text             NOT NULL,
+    bucket_start  date             NOT NULL,
+    n_days        integer          NOT NULL,
+    sum_tmin      double precision NOT NULL,
+    sum_tmax      double precision NOT NULL,
+    CONSTRAINT national_minmax_rollups_pkey PRIMARY KEY (granularity, bucket_start)
+);
+
+CREATE TABLE IF NOT EXISTS public.temperature_rollups_meta (
+    closed_before date NOT NULL
+);
+
+-- Colonnes de retour modifiées (upserted / deleted) : l'ancienne version est
+-- supprimée.
+DROP FUNCTION IF EXISTS public.refresh_temperature_rollups(date);
+
+CREATE FUNCTION public.refresh_temperature_rollups(
+    p_since date DEFAULT NULL
+)
+RETURNS TABLE (
+    window_start  date,
+    closed_before date,
+    months        integer,
+    upserted      integer,
+    deleted       integer,
+    elapsed_ms    numeric
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_started   timestamptz := clock_timestamp();
+    v_previous  date;
+    v_upserted  integer;
+    v_deleted   integer;
+BEGIN
+    closed_before := date_trunc('month', CURRENT_DATE - 7)::date;
+    upserted := 0;
+    deleted := 0;
+
+    SELECT m.closed_before INTO v_previous
+    FROM public.temperature_rollups_meta m
+    LIMIT 1;
+
+    -- Jamais calculé ou reconstruction demandée : tout l'historique.
+    IF p_since IS NULL OR v_previous IS NULL THEN
+        TRUNCATE public.station_temperature_rollups, public.national_minmax_rollups;
+        window_start := date_trunc(
+            'month',
+            COALESCE((SELECT MIN(q."AAAAMMJJ") FROM public."Quotidienne" q), CURRENT_DATE)
+        )::date;
+    ELSE
+        window_start := LEAST(date_trunc('month', p_since)::date, v_previous);
+    END IF;
+
+    -- Mois : depuis Quotidienne (les jours < closed_before sont hors de la
+    -- fenêtre temps réel de v_quotidienne).
+    -- Sommes et moyennes en numeric : exactes, donc indépendantes de l'ordre
+    -- d'agrégation. En double precision, un rejeu sans révision pourrait
+    -- différer au dernier bit et être compté comme un changement.
+    WITH fresh AS (
+        SELECT
+            q."NUM_POSTE" AS station_code,
+            date_trunc('month', q."AAAAMMJJ")::date AS bucket_start,
+            COUNT(*) FILTER (WHERE q."TNTXM" IS NOT NULL AND b.baseline_mean_tntxm IS NOT NULL) AS n_tntxm,
+            SUM(q."TNTXM"::numeric) FILTER (WHERE b.baseline_mean_tntxm IS NOT NULL)::double precision AS sum_tntxm,
+            SUM(b.baseline_mean_tntxm) FILTER (WHERE q."TNTXM" IS NOT NULL)::double precision AS sum_baseline,
+            COUNT(q."TN") AS n_tn,
+            SUM(q."TN"::numeric)::double precision AS sum_tn,
+            MIN(q."TN") AS min_tn,
+            COUNT(q."TX") AS n_tx,
+            SUM(q."TX"::numeric)::double precision AS sum_tx,
+            MAX(q."TX") AS max_tx
+        FROM public."Quotidienne" q
+            LEFT JOIN public.mv_baseline_station_daily_mean_1991_2020 b
+                ON  b.station_code = q."NUM_POSTE"
+                AND b.month        = EXTRACT(MONTH FROM q."AAAAMMJJ")::int
+                AND b.day          = EXTRACT(DAY FROM q."AAAAMMJJ")::int
+        WHERE q."AAAAMMJJ" >= window_start
+          AND q."AAAAMMJJ" <  closed_before
+          AND (q."TNTXM" IS NOT NULL OR q."TN" IS NOT NULL OR q."TX" IS NOT NULL)
+        GROUP BY q."NUM_POSTE", date_trunc('month', q."AAAAMMJJ")
+    ),
+    removed AS (
+        DELETE FROM public.station_temperature_rollups r
+        WHERE r.granularity = 'month'
+          AND r.bucket_start >= window_start
+          AND NOT EXISTS (
+              SELECT 1 FROM fresh f
+              WHERE f.station_code = r.station_code AND f.bucket_start = r.bucket_start
+          )
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.station_temperature_rollups AS r (
+            granularity, station_code, bucket_start,
+            n_tntxm, sum_tntxm, sum_baseline,
+            n_tn, sum_tn, min_tn,
+            n_tx, sum_tx, max_tx
+        )
+        SELECT
+            'month', station_code, bucket_start,
+            n_tntxm, sum_tntxm, sum_baseline,
+            n_tn, sum_tn, min_tn,
+            n_tx, sum_tx, max_tx
+        FROM fresh
+        ON CONFLICT (granularity, station_code, bucket_start) DO UPDATE
+            SET n_tntxm = EXCLUDED.n_tntxm, sum_tntxm = EXCLUDED.sum_tntxm,
+                sum_baseline = EXCLUDED.sum_baseline,
+                n_tn = EXCLUDED.n_tn, sum_tn = EXCLUDED.sum_tn, min_tn = EXCLUDED.min_tn,
+                n_tx = EXCLUDED.n_tx, sum_tx = EXCLUDED.sum_tx, max_tx = EXCLUDED.max_tx
+            WHERE (r.n_tntxm, r.sum_tntxm, r.sum_baseline,
+                   r.n_tn, r.sum_tn, r.min_tn,
+                   r.n_tx, r.sum_tx, r.max_tx)
+                IS DISTINCT FROM
+                  (EXCLUDED.n_tntxm, EXCLUDED.sum_tntxm, EXCLUDED.sum_baseline,
+                   EXCLUDED.n_tn, EXCLUDED.sum_tn, EXCLUDED.min_tn,
+                   EXCLUDED.n_tx, EXCLUDED.sum_tx, EXCLUDED.max_tx)
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM fresh),
+        (SELECT COUNT(*) FROM written),
+        (SELECT COUNT(*) FROM removed)
+    INTO months, v_upserted, v_deleted;
+    upserted := upserted + v_upserted;
+    deleted := deleted + v_deleted;
+
+    WITH fresh AS (
+        SELECT
+            date_trunc('month', d.day)::date AS bucket_start,
+            COUNT(*) AS n_days,
+            SUM(d.tmin)::double precision AS sum_tmin,
+            SUM(d.tmax)::double precision AS sum_tmax
+        FROM (
+            SELECT
+                q."AAAAMMJJ"  AS day,
+                AVG(q."TN"::numeric) AS tmin,
+                AVG(q."TX"::numeric) AS tmax
+            FROM public."Quotidienne" q
+            WHERE q."AAAAMMJJ" >= window_start
+              AND q."AAAAMMJJ" <  closed_before
+              AND q."TN" IS NOT NULL
+              AND q."TX" IS NOT NULL
+            GROUP BY q."AAAAMMJJ"
+        ) d
+        GROUP BY date_trunc('month', d.day)
+    ),
+    removed AS (
+        DELETE FROM public.national_minmax_rollups r
+        WHERE r.granularity = 'month'
+          AND r.bucket_start >= window_start
+          AND NOT EXISTS (SELECT 1 FROM fresh f WHERE f.bucket_start = r.bucket_start)
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.national_minmax_rollups AS r
+            (granularity, bucket_start, n_days, sum_tmin, sum_tmax)
+        SELECT 'month', bucket_start, n_days, sum_tmin, sum_tmax
+        FROM fresh
+        ON CONFLICT (granularity, bucket_start) DO UPDATE
+            SET n_days = EXCLUDED.n_days, sum_tmin = EXCLUDED.sum_tmin,
+                sum_tmax = EXCLUDED.sum_tmax
+            WHERE (r.n_days, r.sum_tmin, r.sum_tmax)
+                IS DISTINCT FROM (EXCLUDED.n_days, EXCLUDED.sum_tmin, EXCLUDED.sum_tmax)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM written), (SELECT COUNT(*) FROM removed)
+    INTO v_upserted, v_deleted;
+    upserted := upserted + v_upserted;
+    deleted := deleted + v_deleted;
+
+    -- Années : agrégées depuis les mois, uniquement si l'année est close.
+    WITH fresh AS (
+        SELECT
+            r.station_code,
+            date_trunc('year', r.bucket_start)::date AS bucket_start,
+            SUM(r.n_tntxm) AS n_tntxm,
+            SUM(r.sum_tntxm::numeric)::double precision AS sum_tntxm,
+            SUM(r.sum_baseline::numeric)::double precision AS sum_baseline,
+            SUM(r.n_tn) AS n_tn,
+            SUM(r.sum_tn::numeric)::double precision AS sum_tn,
+            MIN(r.min_tn) AS min_tn,
+            SUM(r.n_tx) AS n_tx,
+            SUM(r.sum_tx::numeric)::double precision AS sum_tx,
+            MAX(r.max_tx) AS max_tx
+        FROM public.station_temperature_rollups r
+        WHERE r.granularity = 'month'
+          AND r.bucket_start >= date_trunc('year', window_start)::date
+          AND r.bucket_start <  date_trunc('year', closed_before)::date
+        GROUP BY r.station_code, date_trunc('year', r.bucket_start)
+    ),
+    removed AS (
+        DELETE FROM public.station_temperature_rollups r
+        WHERE r.granularity = 'year'
+          AND r.bucket_start >= date_trunc('year', window_start)::date
+          AND NOT EXISTS (
+              SELECT 1 FROM fresh f
+              WHERE f.station_code = r.station_code AND f.bucket_start = r.bucket_start
+          )
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.station_temperature_rollups AS r (
+            granularity, station_code, bucket_start,
+            n_tntxm, sum_tntxm, sum_baseline,
+            n_tn, sum_tn, min_tn,
+            n_tx, sum_tx, max_tx
+        )
+        SELECT
+            'year', station_code, bucket_start,
+            n_tntxm, sum_tntxm, sum_baseline,
+            n_tn, sum_tn, min_tn,
+            n_tx, sum_tx, max_tx
+        FROM fresh
+        ON CONFLICT (granularity, station_code, bucket_start) DO UPDATE
+            SET n_tntxm = EXCLUDED.n_tntxm, sum_tntxm = EXCLUDED.sum_tntxm,
+                sum_baseline = EXCLUDED.sum_baseline,
+                n_tn = EXCLUDED.n_tn, sum_tn = EXCLUDED.sum_tn, min_tn = EXCLUDED.min_tn,
+                n_tx = EXCLUDED.n_tx, sum_tx = EXCLUDED.sum_tx, max_tx = EXCLUDED.max_tx
+            WHERE (r.n_tntxm, r.sum_tntxm, r.sum_baseline,
+                   r.n_tn, r.sum_tn, r.min_tn,
+                   r.n_tx, r.sum_tx, r.max_tx)
+                IS DISTINCT FROM
+                  (EXCLUDED.n_tntxm, EXCLUDED.sum_tntxm, EXCLUDED.sum_baseline,
+                   EXCLUDED.n_tn, EXCLUDED.sum_tn, EXCLUDED.min_tn,
+                   EXCLUDED.n_tx, EXCLUDED.sum_tx, EXCLUDED.max_tx)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM written), (SELECT COUNT(*) FROM removed)
+    INTO v_upserted, v_deleted;
+    upserted := upserted + v_upserted;
+    deleted := deleted + v_deleted;
+
+    WITH fresh AS (
+        SELECT
+            date_trunc('year', r.bucket_start)::date AS bucket_start,
+            SUM(r.n_days) AS n_days,
+            SUM(r.sum_tmin::numeric)::double precision AS sum_tmin,
+            SUM(r.sum_tmax::numeric)::double precision AS sum_tmax
+        FROM public.national_minmax_rollups r
+        WHERE r.granularity = 'month'
+          AND r.bucket_start >= date_trunc('year', window_start)::date
+          AND r.bucket_start <  date_trunc('year', closed_before)::date
+        GROUP BY date_trunc('year', r.bucket_start)
+    ),
+    removed AS (
+        DELETE FROM public.national_minmax_rollups r
+        WHERE r.granularity = 'year'
+          AND r.bucket_start >= date_trunc('year', window_start)::date
+          AND NOT EXISTS (SELECT 1 FROM fresh f WHERE f.bucket_start = r.bucket_start)
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.national_minmax_rollups AS r
+            (granularity, bucket_start, n_days, sum_tmin, sum_tmax)
+        SELECT 'year', bucket_start, n_days, sum_tmin, sum_tmax
+        FROM fresh
+        ON CONFLICT (granularity, bucket_start) DO UPDATE
+            SET n_days = EXCLUDED.n_days, sum_tmin = EXCLUDED.sum_tmin,
+                sum_tmax = EXCLUDED.sum_tmax
+            WHERE (r.n_days, r.sum_tmin, r.sum_tmax)
+                IS DISTINCT FROM (EXCLUDED.n_days, EXCLUDED.sum_tmin, EXCLUDED.sum_tmax)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM written), (SELECT COUNT(*) FROM removed)
+    INTO v_upserted, v_deleted;
+    upserted := upserted + v_upserted;
+    deleted := deleted + v_deleted;
+
+    DELETE FROM public.temperature_rollups_meta;
+    INSERT INTO public.temperature_rollups_meta (closed_before) VALUES (closed_before);
+
+    elapsed_ms := round(
+        (EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000)::numeric, 1
+    );
+    RAISE NOTICE 'refresh_temperature_rollups : mois >= %, fermés avant %, % buckets station-mois, % upsertés, % supprimés, % ms',
+        window_start, closed_before, months, upserted, deleted, elapsed_ms;
+    RETURN NEXT;
+END;
+$$;
+
+SELECT * FROM public.refresh_temperature_rollups();
@@ -0,0 +1,172 @@
+/*
+===============================================================================
+SOMMES CUMULÉES PAR STATION (vue d'ensemble des écarts à la normale)
+===============================================================================
+
+OBJECTIF
+--------
+La vue d'ensemble des écarts (fetch_station_overview) calcule, pour chaque
+station et une période [date_start, date_end] quelconque, la moyenne de TNTXM
+et de la baseline station 1991-2020 sur les jours observés. Agréger
+v_quotidienne x baseline à chaque requête coûte proportionnellement à la
+longueur de la période (30 ans ~ 11 000 jours par station).
+
+station_deviation_cumsum stocke, pour chaque (station, jour observé), les
+sommes cumulées depuis le premier jour de la station :
+  - cum_days     : nombre de jours où TNTXM et la baseline du (mois, jour) existent
+  - cum_tntxm    : somme de TNTXM sur ces jours
+  - cum_baseline : somme de la baseline sur ces jours
+
+Sommes sur [date_start, date_end] = dernier cumul <= date_end - dernier cumul
+< date_start : deux lectures d'index par station, quelle que soit la période.
+
+station_deviation_cumsum_meta (closed_before)
+  - les cumuls couvrent les jours < closed_before (CURRENT_DATE - 7 au dernier
+    refresh). Les jours suivants (temps réel, relève Quotidienne) sont agrégés
+    à chaud par la requête.
+
+MAINTENANCE
+-----------
+refresh_station_deviation_cumsum(p_since) recalcule les cumuls des jours
+>= p_since (et de ceux clos depuis le dernier appel) à partir du dernier cumul
+antérieur de chaque station. Une révision d'un jour décale tous les cumuls
+suivants de la station : p_since doit être <= au jour révisé.
+p_since NULL => reconstruction complète (après un import historique ou un
+recalcul de mv_baseline_station_daily_mean_1991_2020).
+Les cumuls de la fenêtre sont upsertés (seuls ceux qui changent sont
+réécrits) et ceux des jours disparus supprimés : upserted + deleted vaut 0 si
+rien n'a changé, et le job pg_cron ne touche alors pas data_version.
+===============================================================================
+*/
+
+CREATE TABLE IF NOT EXISTS public.station_deviation_cumsum (
+    station_code  char(8)          NOT NULL,
+    date          date             NOT NULL,
+    cum_days      integer          NOT NULL,
+    cum_tntxm     double precision NOT NULL,
+    cum_baseline  double precision NOT NULL,
+    CONSTRAINT station_deviation_cumsum_pkey PRIMARY KEY (station_code, date)
+);
+
+CREATE TABLE IF NOT EXISTS public.station_deviation_cumsum_meta (
+    closed_before date NOT NULL
+);
+
+-- Colonnes de retour modifiées (inserted -> upserted / deleted) : l'ancienne
+-- version est supprimée.
+DROP FUNCTION IF EXISTS public.refresh_station_deviation_cumsum(date);
+
+CREATE FUNCTION public.refresh_station_deviation_cumsum(
+    p_since date DEFAULT NULL
+)
+RETURNS TABLE (
+    window_start  date,
+    closed_before date,
+    upserted      integer,
+    deleted       integer,
+    elapsed_ms    numeric
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_started   timestamptz := clock_timestamp();
+    v_previous  date;
+BEGIN
+    closed_before := CURRENT_DATE - 7;
+
+    SELECT m.closed_before INTO v_previous
+    FROM public.station_deviation_cumsum_meta m
+    LIMIT 1;
+
+    -- Jamais calculé ou reconstruction demandée : tout l'historique.
+    IF p_since IS NULL OR v_previous IS NULL THEN
+        TRUNCATE public.station_deviation_cumsum;
+        window_start := COALESCE(
+            (SELECT MIN(q."AAAAMMJJ")::date FROM public."Quotidienne" q),
+            CURRENT_DATE
+        );
+    ELSE
+        window_start := LEAST(p_since, v_previous);
+    END IF;
+
+    -- Jours < closed_before : hors de la fenêtre temps réel de v_quotidienne,
+    -- lus directement dans Quotidienne.
+    WITH days AS (
+        SELECT
+            q."NUM_POSTE"                             AS station_code,
+            q."AAAAMMJJ"::date                        AS date,
+            q."TNTXM"                                 AS tntxm,
+            b.baseline_mean_tntxm::double precision   AS baseline
+        FROM public."Quotidienne" q
+            INNER JOIN public.mv_baseline_station_daily_mean_1991_2020 b
+                ON  b.station_code = q."NUM_POSTE"
+                AND b.month        = EXTRACT(MONTH FROM q."AAAAMMJJ")::int
+                AND b.day          = EXTRACT(DAY FROM q."AAAAMMJJ")::int
+        WHERE q."AAAAMMJJ" >= window_start
+          AND q."AAAAMMJJ" <  closed_before
+          AND q."TNTXM" IS NOT NULL
+          AND b.baseline_mean_tntxm IS NOT NULL
+    ),
+    previous AS (
+        SELECT s.station_code, p.cum_days, p.cum_tntxm, p.cum_baseline
+        FROM (SELECT DISTINCT d.station_code FROM days d) s
+            CROSS JOIN LATERAL (
+                SELECT c.cum_days, c.cum_tntxm, c.cum_baseline
+                FROM public.station_deviation_cumsum c
+                WHERE c.station_code = s.station_code
+                  AND c.date < window_start
+                ORDER BY c.date DESC
+                LIMIT 1
+            ) p
+    ),
+    fresh AS (
+        SELECT
+            d.station_code,
+            d.date,
+            COALESCE(p.cum_days, 0)     + COUNT(*)          OVER w AS cum_days,
+            COALESCE(p.cum_tntxm, 0)    + SUM(d.tntxm)      OVER w AS cum_tntxm,
+            COALESCE(p.cum_baseline, 0) + SUM(d.baseline)   OVER w AS cum_baseline
+        FROM days d
+            LEFT JOIN previous p ON p.station_code = d.station_code
+        WINDOW w AS (PARTITION BY d.station_code ORDER BY d.date)
+    ),
+    removed AS (
+        DELETE FROM public.station_deviation_cumsum c
+        WHERE c.date >= window_start
+          AND NOT EXISTS (
+              SELECT 1 FROM fresh f
+              WHERE f.station_code = c.station_code AND f.date = c.date
+          )
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.station_deviation_cumsum AS c
+            (station_code, date, cum_days, cum_tntxm, cum_baseline)
+        SELECT station_code, date, cum_days, cum_tntxm, cum_baseline
+        FROM fresh
+        ON CONFLICT (station_code, date) DO UPDATE
+            SET cum_days     = EXCLUDED.cum_days,
+                cum_tntxm    = EXCLUDED.cum_tntxm,
+                cum_baseline = EXCLUDED.cum_baseline
+            WHERE (c.cum_days, c.cum_tntxm, c.cum_baseline)
+                IS DISTINCT FROM
+                  (EXCLUDED.cum_days, EXCLUDED.cum_tntxm, EXCLUDED.cum_baseline)
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM written), (SELECT COUNT(*) FROM removed)
+    INTO upserted, deleted;
+
+    DELETE FROM public.station_deviation_cumsum_meta;
+    INSERT INTO public.station_deviation_cumsum_meta (closed_before)
+    VALUES (closed_before);
+
+    elapsed_ms := round(
+        (EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000)::numeric, 1
+    );
+    RAISE NOTICE 'refresh_station_deviation_cumsum : jours >= %, clos avant %, % upsertés, % supprimés, % ms',
+        window_start, closed_before, upserted, deleted, elapsed_ms;
+    RETURN NEXT;
+END;
+$$;
+
+SELECT * FROM public.refresh_station_deviation_cumsum();
@@ -1,10 +1,28 @@
--- Vue matérialisée : ITN journalier sur toutes les années disponibles (>= 1946).
--- Équivalent de 610_001_mv_itn_daily_1991_2020_real.sql sans la restriction de période.
--- Accepte les jours avec au moins 29 stations sur 30 (HAVING COUNT >= 29).
--- Le filtre date >= 1946-01-01 est appliqué ici sur la colonne indexée de v_quotidienne.
-DROP MATERIALIZED VIEW IF EXISTS public.mv_itn_daily_all_years;
+-- Table : ITN journalier sur toutes les années disponibles (>= 1947).
+-- Ancienne vue matérialisée, devenue table ordinaire (même nom, mêmes colonnes, mêmes
+-- index) pour ne plus être recalculée intégralement par le job pg_cron : seuls les
+-- derniers jours peuvent changer.
+-- Accepte les jours avec au moins 29 stations sur 30 (HAVING COUNT >= 29, voir 006).
+--
+-- Maintenance incrémentale : refresh_itn_daily_all_years(p_since) recalcule via
+-- v_itn_daily_all_years les seuls jours >= p_since (par défaut : la fenêtre couverte par
+-- mv_quotidienne_realtime, étendue à CURRENT_DATE - 7), upserte ceux qui ont changé et
+-- supprime ceux qui ne passent plus le seuil de stations. Renvoie (et trace en NOTICE)
+-- la fenêtre, le nombre de lignes touchées et la durée.
+-- Reconstruction complète : SELECT * FROM public.refresh_itn_daily_all_years('1947-01-01');
 
-CREATE MATERIALIZED VIEW public.mv_itn_daily_all_years AS
+-- Migration depuis la vue matérialisée. CASCADE supprime aussi 007+ qui la lisent :
+-- les fichiers suivants les recréent.
+DO $$ BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'public' AND matviewname = 'mv_itn_daily_all_years'
+    ) THEN
+        DROP MATERIALIZED VIEW public.mv_itn_daily_all_years CASCADE;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS public.mv_itn_daily_all_years AS
 SELECT
     date,
     year,
@@ -13,16 +31,80 @@ SELECT
     is_fictive,
     itn
 FROM public.v_itn_daily_all_years
-ORDER BY date;
+WITH NO DATA;
 
-CREATE UNIQUE INDEX idx_mv_itn_daily_all_years_date
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_itn_daily_all_years_date
     ON public.mv_itn_daily_all_years (date);
 
-CREATE INDEX idx_mv_itn_daily_all_years_day_of_month
+CREATE INDEX IF NOT EXISTS idx_mv_itn_daily_all_years_day_of_month
     ON public.mv_itn_daily_all_years (day_of_month);
 
-CREATE INDEX idx_mv_itn_daily_all_years_month_day
+CREATE INDEX IF NOT EXISTS idx_mv_itn_daily_all_years_month_day
     ON public.mv_itn_daily_all_years (month, day_of_month);
 
-CREATE INDEX idx_mv_itn_daily_all_years_year
+CREATE INDEX IF NOT EXISTS idx_mv_itn_daily_all_years_year
     ON public.mv_itn_daily_all_years (year);
+
+CREATE OR REPLACE FUNCTION public.refresh_itn_daily_all_years(
+    p_since date DEFAULT NULL
+)
+RETURNS TABLE (
+    window_start date,
+    upserted     integer,
+    deleted      integer,
+    elapsed_ms   numeric
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_started timestamptz := clock_timestamp();
+BEGIN
+    -- Marge de 7 jours, comme records_battus_state : le jour qui quitte la
+    -- fenêtre temps réel (bascule vers Quotidienne) et les révisions tardives
+    -- de Quotidienne sont recalculés.
+    window_start := COALESCE(
+        p_since,
+        LEAST(
+            (SELECT MIN(r.date)::date FROM public.mv_quotidienne_realtime r),
+            CURRENT_DATE - 7
+        )
+    );
+
+    -- Le filtre sur date (colonne de GROUP BY) est poussé jusqu'à v_quotidienne :
+    -- seule la fenêtre est agrégée.
+    WITH fresh AS (
+        SELECT v.date, v.year, v.month, v.day_of_month, v.is_fictive, v.itn
+        FROM public.v_itn_daily_all_years v
+        WHERE v.date >= window_start
+    ),
+    removed AS (
+        DELETE FROM public.mv_itn_daily_all_years t
+        WHERE t.date >= window_start
+          AND NOT EXISTS (SELECT 1 FROM fresh f WHERE f.date = t.date)
+        RETURNING 1
+    ),
+    written AS (
+        INSERT INTO public.mv_itn_daily_all_years
+            (date, year, month, day_of_month, is_fictive, itn)
+        SELECT date, year, month, day_of_month, is_fictive, itn
+        FROM fresh
+        ON CONFLICT (date) DO UPDATE
+            SET itn = EXCLUDED.itn
+            WHERE public.mv_itn_daily_all_years.itn IS DISTINCT FROM EXCLUDED.itn
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM written),
+        (SELECT COUNT(*) FROM removed)
+    INTO upserted, deleted;
+
+    elapsed_ms := round(
+        (EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000)::numeric, 1
+    );
+    RAISE NOTICE 'refresh_itn_daily_all_years : jours >= %, % upsertés, % supprimés, % ms',
+        window_start, upserted, deleted, elapsed_ms;
+    RETURN NEXT;
+END;
+$$;
+
+SELECT * FROM public.refresh_itn_daily_all_years('1947-01-01');
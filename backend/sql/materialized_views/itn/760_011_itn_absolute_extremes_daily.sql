@@ -0,0 +1,74 @@
+-- Table : extremes absolus de l'ITN par jour calendaire, pré-calculés.
+-- Même contenu que v_itn_absolute_extremes_daily (008), mais stocké et indexé par
+-- (month, day_of_month) : la lecture d'un sous-ensemble de jours ne dépend plus de la
+-- profondeur de l'historique.
+--
+-- Maintenance incrémentale : refresh_itn_absolute_extremes_daily(p_since) ne recalcule que
+-- les jours calendaires touchés par des lignes de mv_itn_daily_all_years datées >= p_since
+-- (le 29 fév fictif dépend du 28 fév et du 1er mars, il est recalculé avec eux).
+-- Le MIN/MAX est recalculé sur tout l'historique du jour calendaire, ce qui reste exact
+-- si une valeur déjà ingérée est révisée à la baisse.
+-- p_since NULL => reconstruction complète.
+CREATE TABLE IF NOT EXISTS public.itn_absolute_extremes_daily (
+    month         integer          NOT NULL,
+    day_of_month  integer          NOT NULL,
+    absolute_min  double precision NOT NULL,
+    absolute_max  double precision NOT NULL,
+    CONSTRAINT itn_absolute_extremes_daily_pkey PRIMARY KEY (month, day_of_month)
+);
+
+-- Renvoie le nombre de jours calendaires dont les extremes ont changé (le job
+-- pg_cron ne touche data_version que s'il est non nul). Type de retour modifié :
+-- l'ancienne version (void) est supprimée.
+DROP FUNCTION IF EXISTS public.refresh_itn_absolute_extremes_daily(date);
+
+CREATE FUNCTION public.refresh_itn_absolute_extremes_daily(
+    p_since date DEFAULT NULL
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_changed integer;
+BEGIN
+    IF p_since IS NULL THEN
+        TRUNCATE public.itn_absolute_extremes_daily;
+    END IF;
+
+    WITH touched AS (
+        SELECT DISTINCT month, day_of_month
+        FROM public.mv_itn_daily_all_years
+        WHERE p_since IS NULL OR date >= p_since
+    ),
+    touched_with_feb29 AS (
+        SELECT month, day_of_month FROM touched
+        UNION
+        SELECT 2, 29
+        FROM touched
+        WHERE (month, day_of_month) IN ((2, 28), (3, 1))
+    )
+    INSERT INTO public.itn_absolute_extremes_daily
+        (month, day_of_month, absolute_min, absolute_max)
+    SELECT
+        d.month,
+        d.day_of_month,
+        MIN(d.itn),
+        MAX(d.itn)
+    FROM public.v_itn_daily_all_years_with_feb29 d
+        INNER JOIN touched_with_feb29 t
+            ON  t.month        = d.month
+            AND t.day_of_month = d.day_of_month
+    GROUP BY d.month, d.day_of_month
+    ON CONFLICT (month, day_of_month) DO UPDATE
+        SET absolute_min = EXCLUDED.absolute_min,
+            absolute_max = EXCLUDED.absolute_max
+        WHERE (public.itn_absolute_extremes_daily.absolute_min,
+               public.itn_absolute_extremes_daily.absolute_max)
+            IS DISTINCT FROM (EXCLUDED.absolute_min, EXCLUDED.absolute_max);
+
+    GET DIAGNOSTICS v_changed = ROW_COUNT;
+    RETURN v_changed;
+END;
+$$;
+
+SELECT public.refresh_itn_absolute_extremes_daily();
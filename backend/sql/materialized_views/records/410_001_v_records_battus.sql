@@ -29,6 +29,10 @@ L'endpoint /api/v1/temperature/records lit directement cette MV via
 MaterializedTemperatureRecordsDataSource. La query devient un simple SELECT
 avec filtres indexés.
 
+Définition de référence : mv_records_battus est calculée par
+records_battus_single_scan (405_009), qui produit les mêmes lignes en un seul
+parcours de v_quotidienne.
+
 RAFRAÎCHISSEMENT
 ----------------
 Commande Django : python manage.py refresh_records_mv
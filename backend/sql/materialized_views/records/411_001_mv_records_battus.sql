@@ -1,6 +1,6 @@
 /*
 ===============================================================================
-VUE MATÉRIALISÉE : RECORDS PROGRESSIFS PAR STATION
+TABLE : RECORDS PROGRESSIFS PAR STATION
 ===============================================================================
 
 OBJECTIF
@@ -32,19 +32,37 @@ avec filtres indexés.
 RAFRAÎCHISSEMENT
 ----------------
 Commande Django : python manage.py refresh_records_mv
-À exécuter après chaque import de nouvelles données quotidiennes.
+À exécuter après chaque import de nouvelles données quotidiennes. Les lecteurs
+ne sont jamais bloqués : calcul dans mv_records_battus_shadow, puis échange
+atomique avec la mise à jour de mv_records_battus_meta (voir 412_008).
 
 PERFORMANCE
 -----------
-- Création : quelques minutes sur dataset complet (opération offline)
+- Création : records_battus_single_scan (405_009), un parcours par station
+  au lieu des six window functions de v_records_battus
 - Lecture : < 10 ms (index sur record_type, period_type, period_value)
 - Volume estimé : ~170k lignes pour 1000 stations (toutes périodes confondues)
 ===============================================================================
 */
 
-DROP MATERIALIZED VIEW IF EXISTS public.mv_records_battus;
+-- Ancienne vue matérialisée, devenue table ordinaire (même nom, mêmes colonnes,
+-- mêmes index) : refresh_records_mv la reconstruit dans une table fantôme
+-- remplie en parallèle puis échangée par renommage (voir 412_008), sans le
+-- verrou exclusif d'un REFRESH MATERIALIZED VIEW pendant tout le calcul.
+-- Ce script la recrée toujours (vue matérialisée ou table) : seed_records_mv.sh
+-- pose ensuite la cutoff_date à MAX(Quotidienne), la table doit donc être
+-- recalculée jusque-là.
+DO $$ BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = 'public' AND matviewname = 'mv_records_battus'
+    ) THEN
+        DROP MATERIALIZED VIEW public.mv_records_battus;
+    END IF;
+END $$;
+DROP TABLE IF EXISTS public.mv_records_battus;
 
-CREATE MATERIALIZED VIEW public.mv_records_battus AS
+CREATE TABLE public.mv_records_battus AS
 
 SELECT
     period_type,
@@ -55,7 +73,7 @@ SELECT
     department,
     record_value,
     record_date
-FROM public.v_records_battus;
+FROM public.records_battus_single_scan();
 
 -- ============================================================================
 -- INDEX
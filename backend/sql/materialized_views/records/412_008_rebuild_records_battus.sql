@@ -0,0 +1,137 @@
+/*
+===============================================================================
+FONCTIONS : RECONSTRUCTION SANS INTERRUPTION DE mv_records_battus
+===============================================================================
+
+OBJECTIF
+--------
+Un REFRESH MATERIALIZED VIEW non concurrent garde un verrou ACCESS EXCLUSIVE
+pendant tout le calcul : les endpoints records restaient bloqués plusieurs
+minutes. La reconstruction se fait désormais hors de la table lue :
+
+  1. prepare_records_battus_shadow()          : crée mv_records_battus_shadow
+                                                (mêmes colonnes, sans index) ;
+  2. fill_records_battus_shadow(from, to)     : calcule les records des
+                                                stations [from, to) ; appelée
+                                                en parallèle par plages de
+                                                stations, une connexion chacune ;
+  3. index_records_battus_shadow()            : index + ANALYZE de la table
+                                                fantôme ;
+  4. swap_records_battus_shadow(cutoff)       : dans une seule transaction,
+                                                échange par renommage et met à
+                                                jour mv_records_battus_meta.
+
+Chaque plage est calculée par records_battus_single_scan (405_009) : un seul
+parcours de la série de chaque station, dans l'ordre des dates.
+
+VERROUS
+-------
+Étapes 1 à 3 : aucun verrou sur mv_records_battus. Étape 4 : ACCESS EXCLUSIVE
+le temps des renommages (quelques ms). La commande l'exécute avec un
+lock_timeout court et réessaie : une lecture longue en cours ne fait jamais
+attendre les suivantes plus que ce délai.
+
+UTILISATION
+-----------
+Commande Django : python manage.py refresh_records_mv [--workers N]
+===============================================================================
+*/
+
+CREATE OR REPLACE FUNCTION public.prepare_records_battus_shadow()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DROP TABLE IF EXISTS public.mv_records_battus_shadow;
+    CREATE TABLE public.mv_records_battus_shadow (LIKE public.mv_records_battus);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.fill_records_battus_shadow(
+    p_station_from text,
+    p_station_to   text DEFAULT NULL
+)
+RETURNS bigint
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows bigint;
+BEGIN
+    INSERT INTO public.mv_records_battus_shadow (
+        period_type, period_value, record_type, station_code,
+        station_name, department, record_value, record_date
+    )
+    SELECT
+        r.period_type,
+        r.period_value,
+        r.record_type,
+        r.station_code,
+        r.station_name,
+        r.department,
+        r.record_value,
+        r.record_date
+    FROM public.records_battus_single_scan(p_station_from, p_station_to) r;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.index_records_battus_shadow()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    CREATE UNIQUE INDEX idx_uq_mv_records_battus_shadow_query
+    ON public.mv_records_battus_shadow (record_type, period_type, period_value, station_code, record_date);
+
+    CREATE INDEX idx_mv_records_battus_shadow_query
+    ON public.mv_records_battus_shadow (record_type, period_type, period_value);
+
+    CREATE INDEX idx_mv_records_battus_shadow_station
+    ON public.mv_records_battus_shadow (station_code);
+
+    ANALYZE public.mv_records_battus_shadow;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.swap_records_battus_shadow(p_cutoff date)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_old_kind "char";
+BEGIN
+    -- Premier verrou pris : ACCESS EXCLUSIVE sur la table lue.
+    ALTER TABLE public.mv_records_battus RENAME TO mv_records_battus_old;
+    SELECT c.relkind INTO v_old_kind
+    FROM pg_class c
+    WHERE c.oid = 'public.mv_records_battus_old'::regclass;
+
+    ALTER INDEX IF EXISTS public.idx_uq_mv_records_battus_query
+        RENAME TO idx_uq_mv_records_battus_old_query;
+    ALTER INDEX IF EXISTS public.idx_mv_records_battus_query
+        RENAME TO idx_mv_records_battus_old_query;
+    ALTER INDEX IF EXISTS public.idx_mv_records_battus_station
+        RENAME TO idx_mv_records_battus_old_station;
+
+    ALTER TABLE public.mv_records_battus_shadow RENAME TO mv_records_battus;
+    ALTER INDEX public.idx_uq_mv_records_battus_shadow_query
+        RENAME TO idx_uq_mv_records_battus_query;
+    ALTER INDEX public.idx_mv_records_battus_shadow_query
+        RENAME TO idx_mv_records_battus_query;
+    ALTER INDEX public.idx_mv_records_battus_shadow_station
+        RENAME TO idx_mv_records_battus_station;
+
+    -- DELETE plutôt que TRUNCATE : pas de verrou exclusif sur la table meta.
+    DELETE FROM public.mv_records_battus_meta;
+    INSERT INTO public.mv_records_battus_meta (cutoff_date) VALUES (p_cutoff);
+
+    -- Vue matérialisée avant la première reconstruction, table ensuite.
+    IF v_old_kind = 'm' THEN
+        DROP MATERIALIZED VIEW public.mv_records_battus_old;
+    ELSE
+        DROP TABLE public.mv_records_battus_old;
+    END IF;
+END;
+$$;
@@ -0,0 +1,270 @@
+/*
+===============================================================================
+TABLES : ÉTAT COURANT DES RECORDS PROGRESSIFS APRÈS CUTOFF
+===============================================================================
+
+OBJECTIF
+--------
+mv_records_battus est un snapshot figé à mv_records_battus_meta.cutoff_date.
+Les records battus depuis étaient recalculés à chaque requête par une window
+function sur tous les jours post-cutoff de v_quotidienne : la latence
+croissait avec l'ancienneté du dernier refresh_records_mv.
+
+Ici, un job incrémental maintient :
+  - records_battus_state   : record courant par (station, record_type,
+                             period_type, period_value), amorcé à la cutoff
+                             (seed_*) puis avancé à chaque record battu ;
+  - records_battus_recents : journal des records battus depuis la cutoff
+                             (mêmes colonnes de clé que mv_records_battus) ;
+  - records_battus_state_meta : cutoff d'amorçage + dernier jour traité.
+
+Le journal contient tous les dépassements, filtre 50 ans NON appliqué (il
+dépend de v_station_records et est appliqué à la lecture, comme pour le
+calcul à chaud). Côté API, seuls les jours > processed_through restent
+calculés à chaud, amorcés par records_battus_state.
+
+RAFRAÎCHISSEMENT
+----------------
+refresh_records_battus_state(p_since) :
+  - p_since NULL, ou cutoff de mv_records_battus_meta différente de celle de
+    l'état (refresh_records_mv passé entre-temps) => ré-amorçage complet ;
+  - sinon, retraite les jours >= LEAST(p_since, processed_through + 1) : les
+    records du journal sur cette fenêtre sont supprimés, l'état est rembobiné
+    au dernier record antérieur (ou au seed), puis la fenêtre est rejouée.
+    Exact si des jours déjà traités sont révisés (temps réel en cours de
+    journée, import Quotidienne qui remplace le temps réel).
+Coût proportionnel à la fenêtre rejouée, indépendant de l'âge de la cutoff.
+Renvoie le nombre de lignes du journal ajoutées ou retirées (0 si le rejeu
+n'a rien changé : le job pg_cron ne touche alors pas data_version).
+===============================================================================
+*/
+
+CREATE TABLE IF NOT EXISTS public.records_battus_state (
+    station_code  char(8)          NOT NULL,
+    record_type   text             NOT NULL,
+    period_type   text             NOT NULL,
+    period_value  text,
+    seed_value    double precision,
+    seed_date     date,
+    record_value  double precision,
+    record_date   date,
+    CONSTRAINT records_battus_state_uq UNIQUE NULLS NOT DISTINCT
+        (station_code, record_type, period_type, period_value)
+);
+
+CREATE TABLE IF NOT EXISTS public.records_battus_recents (
+    period_type   text             NOT NULL,
+    period_value  text,
+    record_type   text             NOT NULL,
+    station_code  char(8)          NOT NULL,
+    record_value  double precision NOT NULL,
+    record_date   date             NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_uq_records_battus_recents_query
+ON public.records_battus_recents (record_type, period_type, period_value, station_code, record_date);
+
+CREATE TABLE IF NOT EXISTS public.records_battus_state_meta (
+    cutoff_date        date NOT NULL,
+    processed_through  date
+);
+
+-- Type de retour modifié (void -> integer) : l'ancienne version est supprimée.
+DROP FUNCTION IF EXISTS public.refresh_records_battus_state(date);
+
+CREATE FUNCTION public.refresh_records_battus_state(
+    p_since date DEFAULT NULL
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_cutoff        date;
+    v_state_cutoff  date;
+    v_processed     date;
+    v_from          date;
+    v_last          date;
+    v_before        public.records_battus_recents[] := '{}';
+    v_changed       integer;
+BEGIN
+    SELECT cutoff_date INTO v_cutoff FROM public.mv_records_battus_meta LIMIT 1;
+    IF v_cutoff IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    SELECT cutoff_date, processed_through
+    INTO v_state_cutoff, v_processed
+    FROM public.records_battus_state_meta
+    LIMIT 1;
+
+    IF p_since IS NULL OR v_state_cutoff IS DISTINCT FROM v_cutoff THEN
+        TRUNCATE public.records_battus_state,
+                 public.records_battus_recents,
+                 public.records_battus_state_meta;
+
+        -- Seed : même amorçage que le calcul à chaud (records progressifs de
+        -- la MV + records absolus, ces derniers couvrant les stations dont le
+        -- record est antérieur à first_temp + 50 ans).
+        INSERT INTO public.records_battus_state (
+            station_code, record_type, period_type, period_value,
+            seed_value, seed_date, record_value, record_date
+        )
+        SELECT DISTINCT ON (station_code, record_type, period_type, period_value)
+            station_code, record_type, period_type, period_value,
+            record_value, record_date, record_value, record_date
+        FROM (
+            SELECT station_code, record_type, period_type, period_value,
+                   record_value, record_date::date AS record_date
+            FROM public.mv_records_battus
+            UNION ALL
+            SELECT station_code, record_type, period_type, period_value,
+                   record_value, record_date::date
+            FROM public.v_records_absolus_par_type
+            WHERE record_value IS NOT NULL
+        ) seeds
+        ORDER BY station_code, record_type, period_type, period_value,
+            CASE WHEN record_type = 'TX' THEN record_value ELSE -record_value END DESC,
+            record_date;
+
+        INSERT INTO public.records_battus_state_meta (cutoff_date, processed_through)
+        VALUES (v_cutoff, NULL);
+        v_from := v_cutoff;
+    ELSE
+        v_from := GREATEST(
+            v_cutoff,
+            LEAST(p_since, COALESCE(v_processed + 1, v_cutoff))
+        );
+
+        -- Journal de la fenêtre avant rejeu, pour compter ce qui change.
+        SELECT COALESCE(array_agg(r), '{}') INTO v_before
+        FROM public.records_battus_recents r
+        WHERE r.record_date >= v_from;
+
+        -- Rembobinage : oublie les records de la fenêtre rejouée.
+        DELETE FROM public.records_battus_recents WHERE record_date >= v_from;
+
+        UPDATE public.records_battus_state s
+        SET record_value = COALESCE(prev.record_value, s.seed_value),
+            record_date  = COALESCE(prev.record_date, s.seed_date)
+        FROM public.records_battus_state s0
+            LEFT JOIN LATERAL (
+                SELECT r.record_value, r.record_date
+                FROM public.records_battus_recents r
+                WHERE r.record_type  = s0.record_type
+                  AND r.period_type  = s0.period_type
+                  AND r.period_value IS NOT DISTINCT FROM s0.period_value
+                  AND r.station_code = s0.station_code
+                ORDER BY r.record_date DESC
+                LIMIT 1
+            ) prev ON TRUE
+        WHERE s0.station_code = s.station_code
+          AND s0.record_type  = s.record_type
+          AND s0.period_type  = s.period_type
+          AND s0.period_value IS NOT DISTINCT FROM s.period_value
+          AND s.record_date >= v_from;
+    END IF;
+
+    -- Rejeu de la fenêtre : les 6 combinaisons (TX/TN × all_time/month/season)
+    -- en un seul passage. TN est traité en valeur négée pour n'avoir qu'un MAX.
+    WITH days AS (
+        SELECT
+            q.station_code,
+            q.date::date AS date,
+            r.record_type,
+            p.period_type,
+            p.period_value,
+            r.signed_val
+        FROM public.v_quotidienne q
+            CROSS JOIN LATERAL (
+                VALUES
+                    ('TX', q.tx::double precision),
+                    ('TN', -q.tn::double precision)
+            ) r (record_type, signed_val)
+            CROSS JOIN LATERAL (
+                VALUES
+                    ('all_time', NULL::text),
+                    ('month', EXTRACT(MONTH FROM q.date)::text),
+                    ('season', CASE
+                        WHEN EXTRACT(MONTH FROM q.date) IN (12, 1, 2) THEN 'winter'
+                        WHEN EXTRACT(MONTH FROM q.date) IN (3, 4, 5) THEN 'spring'
+                        WHEN EXTRACT(MONTH FROM q.date) IN (6, 7, 8) THEN 'summer'
+                        ELSE 'autumn'
+                    END)
+            ) p (period_type, period_value)
+        WHERE q.date >= v_from
+          AND r.signed_val IS NOT NULL
+    ),
+    ordered AS (
+        SELECT
+            d.*,
+            GREATEST(
+                COALESCE(
+                    CASE WHEN d.record_type = 'TX' THEN s.record_value ELSE -s.record_value END,
+                    '-Infinity'::double precision
+                ),
+                COALESCE(
+                    MAX(d.signed_val) OVER (
+                        PARTITION BY d.station_code, d.record_type, d.period_type, d.period_value
+                        ORDER BY d.date
+                        ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                    ),
+                    '-Infinity'::double precision
+                )
+            ) AS prev_val
+        FROM days d
+            LEFT JOIN public.records_battus_state s
+                ON  s.station_code = d.station_code
+                AND s.record_type  = d.record_type
+                AND s.period_type  = d.period_type
+                AND s.period_value IS NOT DISTINCT FROM d.period_value
+    )
+    INSERT INTO public.records_battus_recents (
+        period_type, period_value, record_type, station_code, record_value, record_date
+    )
+    SELECT
+        period_type,
+        period_value,
+        record_type,
+        station_code,
+        CASE WHEN record_type = 'TX' THEN signed_val ELSE -signed_val END,
+        date
+    FROM ordered
+    WHERE signed_val > prev_val;
+
+    -- Avance l'état au dernier record battu de la fenêtre.
+    INSERT INTO public.records_battus_state (
+        station_code, record_type, period_type, period_value, record_value, record_date
+    )
+    SELECT DISTINCT ON (station_code, record_type, period_type, period_value)
+        station_code, record_type, period_type, period_value, record_value, record_date
+    FROM public.records_battus_recents
+    WHERE record_date >= v_from
+    ORDER BY station_code, record_type, period_type, period_value, record_date DESC
+    ON CONFLICT (station_code, record_type, period_type, period_value) DO UPDATE
+        SET record_value = EXCLUDED.record_value,
+            record_date  = EXCLUDED.record_date;
+
+    SELECT MAX(date)::date INTO v_last
+    FROM public.v_quotidienne
+    WHERE date >= v_from;
+
+    UPDATE public.records_battus_state_meta
+    SET processed_through = COALESCE(v_last, v_from - 1);
+
+    SELECT COUNT(*) INTO v_changed
+    FROM (
+        (
+            SELECT * FROM unnest(v_before)
+            EXCEPT ALL
+            SELECT * FROM public.records_battus_recents WHERE record_date >= v_from
+        )
+        UNION ALL
+        (
+            SELECT * FROM public.records_battus_recents WHERE record_date >= v_from
+            EXCEPT ALL
+            SELECT * FROM unnest(v_before)
+        )
+    ) diff;
+    RETURN v_changed;
+END;
+$$;
@@ -0,0 +1,132 @@
+/*
+===============================================================================
+TABLES SOURCES -> HYPERTABLES TIMESCALEDB COMPRESSÉES
+===============================================================================
+
+OBJECTIF
+--------
+001_source_tables.sql crée Quotidienne, Horaire, HoraireTempsReel et
+InfrahoraireTempsReel comme tables PostgreSQL ordinaires. Les scans
+historiques complets (v_records_battus, baselines, first_temperature_date)
+lisent alors toutes les lignes non compressées.
+
+Ce script les convertit en hypertables découpées sur leur colonne de temps
+et active la compression native (colonnes) des chunks anciens, segmentée
+par station : un scan par station ne décompresse que ses segments.
+
+  table                 | colonne de temps | chunk    | compression après
+  ----------------------+------------------+----------+------------------
+  Quotidienne           | AAAAMMJJ         | 5 ans    | 1 an
+  Horaire               | AAAAMMJJHH       | 3 mois   | 30 jours
+  HoraireTempsReel      | validity_time    | 7 jours  | 7 jours
+  InfrahoraireTempsReel | validity_time    | 1 jour   | 2 jours
+
+Les fenêtres temps réel (mv_quotidienne_realtime : 4 derniers jours) restent
+dans des chunks non compressés. Les clés primaires (station, temps) sont
+compatibles : station en segmentby, temps en orderby.
+
+UTILISATION
+-----------
+- Base neuve : exécuté par dev_scripts/seed_dev.sh juste après
+  001_source_tables.sql (tables vides, conversion immédiate).
+- Base existante : dev_scripts/migrate_hypertables.sh, qui encadre ce
+  script d'une comparaison des vues v_* / mv_* avant / après.
+  migrate_data => true recopie les lignes existantes dans les chunks, sous
+  verrou exclusif : à lancer hors période d'ingestion.
+
+Idempotent (if_not_exists, compress_chunk sur chunks non compressés).
+===============================================================================
+*/
+
+CREATE EXTENSION IF NOT EXISTS timescaledb;
+
+-- ============================================================================
+-- HYPERTABLES
+-- ============================================================================
+
+SELECT create_hypertable(
+    'public."Quotidienne"',
+    by_range('AAAAMMJJ', INTERVAL '5 years'),
+    create_default_indexes => false,
+    if_not_exists => true,
+    migrate_data => true
+);
+
+SELECT create_hypertable(
+    'public."Horaire"',
+    by_range('AAAAMMJJHH', INTERVAL '3 months'),
+    create_default_indexes => false,
+    if_not_exists => true,
+    migrate_data => true
+);
+
+SELECT create_hypertable(
+    'public."HoraireTempsReel"',
+    by_range('validity_time', INTERVAL '7 days'),
+    create_default_indexes => false,
+    if_not_exists => true,
+    migrate_data => true
+);
+
+SELECT create_hypertable(
+    'public."InfrahoraireTempsReel"',
+    by_range('validity_time', INTERVAL '1 day'),
+    create_default_indexes => false,
+    if_not_exists => true,
+    migrate_data => true
+);
+
+-- ============================================================================
+-- COMPRESSION
+-- ============================================================================
+
+ALTER TABLE public."Quotidienne" SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = '"NUM_POSTE"',
+    timescaledb.compress_orderby = '"AAAAMMJJ" DESC'
+);
+
+ALTER TABLE public."Horaire" SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = '"NUM_POSTE"',
+    timescaledb.compress_orderby = '"AAAAMMJJHH" DESC'
+);
+
+ALTER TABLE public."HoraireTempsReel" SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'geo_id_insee',
+    timescaledb.compress_orderby = 'validity_time DESC'
+);
+
+ALTER TABLE public."InfrahoraireTempsReel" SET (
+    timescaledb.compress,
+    timescaledb.compress_segmentby = 'geo_id_insee',
+    timescaledb.compress_orderby = 'validity_time DESC'
+);
+
+SELECT add_compression_policy(
+    'public."Quotidienne"', compress_after => INTERVAL '1 year', if_not_exists => true
+);
+SELECT add_compression_policy(
+    'public."Horaire"', compress_after => INTERVAL '30 days', if_not_exists => true
+);
+SELECT add_compression_policy(
+    'public."HoraireTempsReel"', compress_after => INTERVAL '7 days', if_not_exists => true
+);
+SELECT add_compression_policy(
+    'public."InfrahoraireTempsReel"', compress_after => INTERVAL '2 days', if_not_exists => true
+);
+
+-- Compression immédiate de l'historique déjà présent (sinon laissée au job
+-- de la policy).
+SELECT compress_chunk(c, if_not_compressed => true)
+FROM show_chunks('public."Quotidienne"', older_than => INTERVAL '1 year') c;
+
+SELECT compress_chunk(c, if_not_compressed => true)
+FROM show_chunks('public."Horaire"', older_than => INTERVAL '30 days') c;
+
+SELECT compress_chunk(c, if_not_compressed => true)
+FROM show_chunks('public."HoraireTempsReel"', older_than => INTERVAL '7 days') c;
+
+SELECT compress_chunk(c, if_not_compressed => true)
+FROM show_chunks('public."InfrahoraireTempsReel"', older_than => INTERVAL '2 days') c;
@@ -1,3 +1,26 @@
 CREATE TABLE IF NOT EXISTS public.mv_records_battus_meta (
     cutoff_date DATE NOT NULL
 );
+
+-- Toute écriture de la cutoff_date (refresh_records_mv, seed) est recopiée
+-- dans le registre data_version (sql/tables/002), lu par l'API.
+CREATE OR REPLACE FUNCTION public.mv_records_battus_meta_to_data_version()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM public.touch_data_version(
+        'mv_records_battus',
+        (SELECT MAX(cutoff_date) FROM public.mv_records_battus_meta)
+    );
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS mv_records_battus_meta_data_version
+ON public.mv_records_battus_meta;
+
+CREATE TRIGGER mv_records_battus_meta_data_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.mv_records_battus_meta
+FOR EACH STATEMENT
+EXECUTE FUNCTION public.mv_records_battus_meta_to_data_version();
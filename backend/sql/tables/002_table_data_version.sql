@@ -0,0 +1,60 @@
+/*
+===============================================================================
+TABLE : REGISTRE DES VERSIONS DE DONNÉES
+===============================================================================
+
+OBJECTIF
+--------
+Une ligne par source de données dont dépendent les réponses de l'API : date
+du dernier rafraîchissement, et cutoff_date pour mv_records_battus. L'API le
+lit une fois par worker (cache de DATA_VERSION_TTL_S secondes, voir
+weather/data_sources/data_version.py) au lieu d'interroger
+mv_records_battus_meta à chaque requête ; il entre dans les clés du cache de
+réponses.
+
+SOURCES
+-------
+  - mv_records_battus : recopiée depuis mv_records_battus_meta par le trigger
+                        de sql/schemas/records/001 (refresh_records_mv, seed) ;
+  - MV et tables rafraîchies par pg_cron : touchées par les jobs (sql/cron)
+                        seulement si le rafraîchissement a modifié des lignes
+                        (sinon le jeton, donc les clés de cache et les ETag,
+                        changerait à chaque passage) ;
+  - ingestion         : à appeler par l'import des données quotidiennes
+                        (hors de ce dépôt) en fin de lot :
+                        SELECT public.touch_data_version('ingestion');
+===============================================================================
+*/
+
+CREATE TABLE IF NOT EXISTS public.data_version (
+    source        text        PRIMARY KEY,
+    refreshed_at  timestamptz NOT NULL DEFAULT now(),
+    cutoff_date   date
+);
+
+CREATE OR REPLACE FUNCTION public.touch_data_version(
+    p_source      text,
+    p_cutoff_date date DEFAULT NULL
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+    INSERT INTO public.data_version (source, refreshed_at, cutoff_date)
+    VALUES (p_source, clock_timestamp(), p_cutoff_date)
+    ON CONFLICT (source) DO UPDATE
+        SET refreshed_at = EXCLUDED.refreshed_at,
+            cutoff_date  = EXCLUDED.cutoff_date;
+$$;
+
+-- Lignes insérées, modifiées ou supprimées dans p_relation par la transaction
+-- courante. Comparé avant / après un REFRESH MATERIALIZED VIEW CONCURRENTLY
+-- (qui n'écrit que la différence) : non nul seulement si la MV a changé.
+CREATE OR REPLACE FUNCTION public.relation_changes(p_relation regclass)
+RETURNS bigint
+LANGUAGE sql
+VOLATILE
+AS $$
+    SELECT pg_stat_get_xact_tuples_inserted(p_relation)
+         + pg_stat_get_xact_tuples_updated(p_relation)
+         + pg_stat_get_xact_tuples_deleted(p_relation);
+$$;
@@ -1,7 +1,13 @@
 from django.apps import AppConfig
+from django.core.signals import request_finished
 
 
 class WeatherConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "weather"
     verbose_name = "Donnees Meteorologiques"
+
+    def ready(self):
+        from weather.db_pool import log_pool_stats
+
+        request_finished.connect(log_pool_stats, dispatch_uid="weather.db_pool")
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from django.conf import settings
+
+from weather.services.temperature_export.protocols import DailyExportDataSource
+
+
+def _default_builder() -> DailyExportDataSource:
+    from weather.data_sources.temperature_export_fake import FakeDailyExportDataSource
+    from weather.data_sources.timescale import TimescaleDailyExportDataSource
+
+    if settings.MOCKED_DATA:
+        return FakeDailyExportDataSource()
+    return TimescaleDailyExportDataSource()
+
+
+class TemperatureExportDependencyProvider:
+    _builder: Callable[[], DailyExportDataSource] = _default_builder
+
+    @classmethod
+    def set_builder(cls, builder: Callable[[], DailyExportDataSource]) -> None:
+        cls._builder = builder
+
+    @classmethod
+    def get_dep(cls) -> DailyExportDataSource:
+        return cls._builder()
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._builder = _default_builder
@@ -9,21 +9,54 @@ Deux profils :
                       string. Si la plage est antérieure à ``today - N jours``,
                       TTL long ; sinon TTL court (la plage peut inclure J/J-1).
 
-Aucune émission sur les réponses non-200 ni sur les méthodes autres que GET.
+Aucune émission sur les réponses non-200 (hormis les 304 de revalidation) ni
+sur les méthodes autres que GET.
+
+Revalidation : chaque réponse 200 porte un ETag fort calculé avant la vue à
+partir du chemin, de la représentation négociée, de la query string
+normalisée (clés triées) et du jeton du registre data_version (voir
+weather/data_sources/data_version.py) restreint aux sources déclarées par la
+vue. Un ``If-None-Match`` qui le contient reçoit un 304 sans qu'aucune source
+de données ne soit appelée. Le jeton change quand l'une de ces sources est
+rafraîchie ; en profil ``by_date_end``, un ``date_end`` antérieur à la fenêtre
+temps réel en écarte les sources temps réel, pour que les plages historiques
+gardent leur ETag.
 """
 
 from __future__ import annotations
 
 import datetime as dt
+import hashlib
+import json
 import logging
 from typing import Literal
 
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from weather.data_sources.data_version import (
+    REALTIME_WINDOW_DAYS,
+    REALTIME_WINDOW_SOURCES,
+    data_version,
+)
+
 logger = logging.getLogger(__name__)
 
 CacheProfile = Literal["long", "by_date_end"]
 ByDateEndFallback = Literal["long", "short"]
 
 
+class _NotModifiedError(Exception):
+    """Levée par ``initial`` quand l'ETag courant figure dans If-None-Match."""
+
+
+def _weak(etag: str) -> str:
+    # If-None-Match se compare en mode faible (RFC 9110 §13.1.2) : un
+    # intermédiaire qui compresse la réponse peut avoir affaibli l'ETag.
+    return etag.removeprefix("W/")
+
+
 class CacheControlMixin:
     """Ajoute `Cache-Control` aux réponses 200 d'une APIView / ViewSet DRF.
 
@@ -41,6 +74,16 @@ class CacheControlMixin:
             à ``"short"`` pour les endpoints dont la source de données évolue
             indépendamment d'un ``date_end`` explicite (ex. matview rafraîchie
             en continu).
+        cache_data_version_sources : sources du registre data_version dont
+            dépend la réponse (constantes ``SOURCE_*``). ``None`` : tout le
+            registre.
+        cache_realtime_window_sources : sources écartées de l'ETag quand
+            ``date_end`` précède la fenêtre temps réel (profil
+            ``by_date_end``). À restreindre pour une vue qui lit aussi ces
+            sources hors de sa plage de dates.
+
+    L'ETag (voir module docstring) est posé sur les mêmes réponses que
+    `Cache-Control`, et sur les 304.
     """
 
     cache_profile: CacheProfile | None = None
@@ -51,6 +94,28 @@ class CacheControlMixin:
     cache_date_end_threshold_days: int = 2
     cache_date_end_query_param: str = "date_end"
     cache_by_date_end_fallback: ByDateEndFallback = "long"
+    cache_data_version_sources: tuple[str, ...] | None = None
+    cache_realtime_window_sources: frozenset[str] = REALTIME_WINDOW_SOURCES
+
+    _cache_etag: str | None = None
+
+    def initial(self, request, *args, **kwargs):
+        # Après la négociation de contenu (représentation dans l'ETag), avant
+        # le handler : un 304 ne coûte que la lecture du registre, en cache.
+        super().initial(request, *args, **kwargs)
+        if self.cache_profile is None or request.method != "GET":
+            return
+        self._cache_etag = self._compute_etag(request)
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and _weak(self._cache_etag) in {
+            _weak(etag) for etag in parse_etags(if_none_match)
+        }:
+            raise _NotModifiedError
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModifiedError):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
 
     def finalize_response(self, request, response, *args, **kwargs):
         response = super().finalize_response(request, response, *args, **kwargs)
@@ -58,12 +123,54 @@ class CacheControlMixin:
             return response
         if request.method != "GET":
             return response
-        if response.status_code != 200:
+        if response.status_code not in (200, 304):
             return response
         s_maxage, max_age = self._compute_cache_ttls(request)
         response["Cache-Control"] = f"public, s-maxage={s_maxage}, max-age={max_age}"
+        if self._cache_etag is not None:
+            response["ETag"] = self._cache_etag
         return response
 
+    def _compute_etag(self, request) -> str:
+        renderer = getattr(request, "accepted_renderer", None)
+        query = {
+            key: request.query_params.getlist(key)
+            for key in sorted(request.query_params)
+        }
+        payload = json.dumps(
+            [
+                request.path,
+                getattr(renderer, "format", "json"),
+                query,
+                self._data_version_token(request),
+            ],
+            separators=(",", ":"),
+        )
+        return quote_etag(hashlib.sha256(payload.encode()).hexdigest()[:32])
+
+    def _data_version_token(self, request) -> str:
+        snapshot = data_version.get()
+        sources = self.cache_data_version_sources
+        if sources is None:
+            return snapshot.token
+        if self.cache_profile == "by_date_end" and self._before_realtime_window(
+            request
+        ):
+            sources = tuple(
+                s for s in sources if s not in self.cache_realtime_window_sources
+            )
+        return snapshot.token_for(sources)
+
+    def _before_realtime_window(self, request) -> bool:
+        raw = request.query_params.get(self.cache_date_end_query_param)
+        if not raw:
+            return False
+        try:
+            date_end = dt.date.fromisoformat(raw)
+        except ValueError:
+            return False
+        return date_end < self._today() - dt.timedelta(days=REALTIME_WINDOW_DAYS)
+
     def _compute_cache_ttls(self, request) -> tuple[int, int]:
         if self.cache_profile == "long":
             return self.cache_long_s_maxage, self.cache_long_max_age
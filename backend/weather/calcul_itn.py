@@ -1,6 +1,7 @@
 import datetime
 from calendar import monthrange
 from collections.abc import Iterable
+from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
@@ -44,6 +45,9 @@ DEFAULT_ITN_STATIONS_LIST = (
 REIMS_PRUNAY_ID = "51449002"
 REIMS_COURCY_ID = "51183001"
 
+BASELINE_START_YEAR = 1991
+BASELINE_END_YEAR = 2020
+
 
 # --------------------------------------------------------------------
 def separate_by_station(
@@ -198,6 +202,90 @@ def compute_itn(
         return daily_records_by_station, itn
 
 
+# --------------------------------------------------------------------
+def _period_keys(dates: pd.DatetimeIndex, freq: str) -> np.ndarray:
+    """
+    Integer key of the month (YYYYMM) or year (YYYY) of each date.
+    """
+
+    if freq == "monthly":
+        return dates.year.to_numpy() * 100 + dates.month.to_numpy()
+    elif freq == "yearly":
+        return dates.year.to_numpy()
+    raise ValueError(f"Unknown frequency: {freq!r}")
+
+
+# --------------------------------------------------------------------
+def _period_labels(keys: np.ndarray, freq: str) -> list[str]:
+    """
+    Labels ('%Y-%m' or '%Y') of the integer keys built by _period_keys.
+    """
+
+    if freq == "monthly":
+        return [f"{key // 100:04d}-{key % 100:02d}" for key in keys]
+    return [f"{key:04d}" for key in keys]
+
+
+# --------------------------------------------------------------------
+def _grouped_means(
+    keys: np.ndarray, sums: np.ndarray, counts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mean by key of values given as per-row sums and counts of valid values.
+
+    Parameters
+    ----------
+    keys: numpy.ndarray
+          group key of each row
+    sums: numpy.ndarray
+          sum of the valid values of each row
+    counts: numpy.ndarray
+          number of valid values of each row
+
+    Returns
+    -------
+    unique_keys: numpy.ndarray
+          sorted unique keys
+    means: numpy.ndarray
+          mean of each group, NaN for groups without any valid value
+    """
+
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    totals = np.bincount(inverse, weights=sums, minlength=len(unique_keys))
+    sizes = np.bincount(inverse, weights=counts, minlength=len(unique_keys))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return unique_keys, totals / sizes
+
+
+# --------------------------------------------------------------------
+def _daily_midrange_sums(
+    daily_records_by_station: pd.DataFrame,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    For each day, sum and number of the valid (Tmin + Tmax) / 2 values
+    of the station x day matrix.
+    """
+
+    temp_min = daily_records_by_station["temp_min"].to_numpy()
+    temp_max = daily_records_by_station["temp_max"].to_numpy()
+    midrange = (temp_min + temp_max) / 2
+    valid = ~np.isnan(midrange)
+
+    return np.where(valid, midrange, 0.0).sum(axis=1), valid.sum(axis=1)
+
+
+# --------------------------------------------------------------------
+def _series_grouped_means(
+    values: np.ndarray, keys: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mean by key of a 1D series, ignoring NaN values.
+    """
+
+    valid = ~np.isnan(values)
+    return _grouped_means(keys, np.where(valid, values, 0.0), valid)
+
+
 # --------------------------------------------------------------------
 def average_itn_calculation(
     read_protocol: ReadTemperaturesGateway,
@@ -229,7 +317,7 @@ def average_itn_calculation(
     Returns
     -------
     pandas.core.frame.DataFrame
-          computed monthly or yealry ITN
+          computed monthly or yealry ITN, NaN for the periods without data
     """
     daily_records_by_station = compute_itn(
         read_protocol, stations_itn, start_date, end_date
@@ -240,19 +328,148 @@ def average_itn_calculation(
     except ValueError:
         daterange = daily_records_by_station.index
 
-    if freq == "monthly":
-        index = np.unique(daterange.strftime("%Y-%m"))
-    elif freq == "yearly":
-        index = np.unique(daterange.strftime("%Y"))
+    index = _period_labels(np.unique(_period_keys(daterange, freq)), freq)
+
+    # Single pass over the station x day matrix: per-day sums and counts of
+    # the valid values, then summed by period.
+    sums, counts = _daily_midrange_sums(daily_records_by_station)
+    keys, means = _grouped_means(
+        _period_keys(daily_records_by_station.index, freq), sums, counts
+    )
+    avg_itn = pd.Series(means, index=_period_labels(keys, freq), dtype=float)
+
+    return pd.DataFrame({"avg_itn": avg_itn.reindex(index)}, dtype=float)
+
+
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class ITNSummary:
+    """
+    Daily, monthly and yearly ITN with their 1991-2020 baselines.
+
+    Attributes
+    ----------
+    daily: pandas.core.series.Series
+          daily ITN, as returned by compute_itn
+    monthly: pandas.core.frame.DataFrame
+          monthly ITN ('avg_itn', indexed by '%Y-%m')
+    yearly: pandas.core.frame.DataFrame
+          yearly ITN ('avg_itn', indexed by '%Y')
+    baseline_daily: pandas.core.series.Series
+          mean of the daily ITN by calendar day, indexed by '%m-%d'
+    baseline_monthly: pandas.core.series.Series
+          mean of the monthly ITN by calendar month, indexed by 1..12
+    baseline_yearly: float
+          mean of the yearly ITN
+    """
+
+    daily: pd.Series
+    monthly: pd.DataFrame
+    yearly: pd.DataFrame
+    baseline_daily: pd.Series
+    baseline_monthly: pd.Series
+    baseline_yearly: float
+
+
+# --------------------------------------------------------------------
+def itn_summary(
+    *,
+    read_protocol: ReadTemperaturesGateway,
+    stations_itn: Iterable | None = None,
+    start_date: str | pd.Timestamp | datetime.datetime | None = None,
+    end_date: str | pd.Timestamp | datetime.datetime | None = None,
+) -> ITNSummary:
+    """
+    Compute the daily, monthly and yearly ITN and the 1991-2020 baselines
+    from a single read of the temperatures and a single pass over the
+    station x day matrix, instead of one call of itn, monthly_itn and
+    annual_itn each.
+
+    The baselines are plain means over the baseline years present in the
+    read period (NaN if none). The SQL views v_itn_baseline_*_1991_2020,
+    which interpolate February 29 and discard incomplete days, remain the
+    reference used by the API.
+
+    Parameters
+    ----------
+    read_protocol: ReadTemperaturesGateway
+          protocol used to read the data
+    stations_itn: Iterable
+          list of the unique ID of the meteorological stations to be
+          considered to calculate the ITN.
+    start_date: str or pd.Timestamp or datetime.datetime
+          beginning of the time period to consider
+    end_date: str or pd.Timestamp or datetime.datetime
+          end of the time period to consider
+
+    Returns
+    -------
+    ITNSummary
+          the ITN at the three frequencies and their baselines
+    """
+
+    # by default, calculate ITN for France
+    if stations_itn is None:
+        stations_itn = DEFAULT_ITN_STATIONS_LIST
 
-    avg_itn = pd.DataFrame(columns=["avg_itn"], index=index, dtype=float)
+    daily_records_by_station, daily = compute_itn(
+        read_protocol, stations_itn, start_date, end_date
+    )
+    dates = daily_records_by_station.index
+
+    sums, counts = _daily_midrange_sums(daily_records_by_station)
+    month_keys, monthly_means = _grouped_means(
+        _period_keys(dates, "monthly"), sums, counts
+    )
+    year_keys, yearly_means = _grouped_means(
+        _period_keys(dates, "yearly"), sums, counts
+    )
+
+    in_baseline = (dates.year >= BASELINE_START_YEAR) & (
+        dates.year <= BASELINE_END_YEAR
+    )
+    day_of_year_keys, baseline_daily = _series_grouped_means(
+        daily.to_numpy()[in_baseline],
+        (dates.month * 100 + dates.day).to_numpy()[in_baseline],
+    )
 
-    for id in index:
-        temp_min = daily_records_by_station["temp_min"].loc[id].values
-        temp_max = daily_records_by_station["temp_max"].loc[id].values
-        avg_itn.loc[id] = np.nanmean((temp_min + temp_max) / 2)
+    months_in_baseline = (month_keys // 100 >= BASELINE_START_YEAR) & (
+        month_keys // 100 <= BASELINE_END_YEAR
+    )
+    calendar_months, baseline_monthly = _series_grouped_means(
+        monthly_means[months_in_baseline], month_keys[months_in_baseline] % 100
+    )
 
-    return avg_itn
+    years_in_baseline = (year_keys >= BASELINE_START_YEAR) & (
+        year_keys <= BASELINE_END_YEAR
+    )
+    baseline_years = yearly_means[years_in_baseline]
+    baseline_years = baseline_years[~np.isnan(baseline_years)]
+
+    return ITNSummary(
+        daily=daily,
+        monthly=pd.DataFrame(
+            {"avg_itn": monthly_means},
+            index=_period_labels(month_keys, "monthly"),
+            dtype=float,
+        ),
+        yearly=pd.DataFrame(
+            {"avg_itn": yearly_means},
+            index=_period_labels(year_keys, "yearly"),
+            dtype=float,
+        ),
+        baseline_daily=pd.Series(
+            baseline_daily,
+            index=[f"{key // 100:02d}-{key % 100:02d}" for key in day_of_year_keys],
+            dtype=float,
+        ),
+        baseline_monthly=pd.Series(
+            baseline_monthly, index=calendar_months.astype(int), dtype=float
+        ),
+        baseline_yearly=(
+            float(baseline_years.mean()) if len(baseline_years) else float("nan")
+        ),
+    )
 
 
 # --------------------------------------------------------------------
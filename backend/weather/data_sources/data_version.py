@@ -0,0 +1,127 @@
+"""
+Registre des versions de données (table ``data_version``, sql/tables/002).
+
+Une ligne par source (MV, table rafraîchie par pg_cron, ingestion) : date du
+dernier rafraîchissement, plus la cutoff_date de mv_records_battus. Chaque
+worker le lit une fois et le garde ``DATA_VERSION_TTL_S`` secondes : les
+sources hybrides y prennent la cutoff_date au lieu d'interroger
+mv_records_battus_meta à chaque requête, ``token`` entre dans les clés du
+cache de réponses et ``token_for(sources)``, restreint aux sources dont
+dépend une vue, dans ses ETag.
+
+Une cutoff vue en retard (au plus le TTL après refresh_records_mv) reste
+correcte : les records post-cutoff recalculés à chaud sont dédupliqués avec
+ceux de la MV, seul le coût augmente.
+
+Invalidation : ``data_version.invalidate()`` force une relecture au prochain
+accès (refresh_records_mv dans son process, tests).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection
+
+# Source portant la cutoff_date (recopiée depuis mv_records_battus_meta).
+SOURCE_RECORDS = "mv_records_battus"
+# Lot d'import des données quotidiennes (et MV rafraîchies avec lui).
+SOURCE_INGESTION = "ingestion"
+# Job pg_cron temps réel (sql/cron/001).
+SOURCE_QUOTIDIENNE_REALTIME = "mv_quotidienne_realtime"
+SOURCE_MENSUELLE_REALTIME = "mv_mensuelle_realtime"
+SOURCE_ITN_DAILY = "mv_itn_daily_all_years"
+SOURCE_ITN_EXTREMES = "itn_absolute_extremes_daily"
+SOURCE_RECORDS_STATE = "records_battus_state"
+# Job pg_cron quotidien des rollups (sql/cron/001).
+SOURCE_ROLLUPS = "temperature_rollups"
+SOURCE_DEVIATION_CUMSUM = "station_deviation_cumsum"
+
+# Sources temps réel dont un rafraîchissement ne réécrit que des jours datés
+# d'au plus REALTIME_WINDOW_DAYS jours (fenêtres du job pg_cron). Une réponse
+# arrêtée avant cette fenêtre n'en dépend pas. itn_absolute_extremes_daily
+# n'en fait pas partie : un extrême du jour vaut pour toutes les années.
+REALTIME_WINDOW_SOURCES = frozenset(
+    {
+        SOURCE_QUOTIDIENNE_REALTIME,
+        SOURCE_MENSUELLE_REALTIME,
+        SOURCE_ITN_DAILY,
+        SOURCE_RECORDS_STATE,
+    }
+)
+REALTIME_WINDOW_DAYS = 7
+
+
+@dataclass(frozen=True)
+class DataVersionSnapshot:
+    refreshed_at: dict[str, dt.datetime]
+    records_cutoff: dt.date | None
+
+    @property
+    def token(self) -> str:
+        """Empreinte courte du registre, composante de clé de cache."""
+        return self.token_for(self.refreshed_at)
+
+    def token_for(self, sources: Iterable[str]) -> str:
+        """Empreinte restreinte à ``sources`` (absentes du registre : ignorées)."""
+        payload = ";".join(
+            f"{source}={self.refreshed_at[source].isoformat()}"
+            for source in sorted(set(sources))
+            if source in self.refreshed_at
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _load_snapshot() -> DataVersionSnapshot:
+    with connection.cursor() as cur:
+        cur.execute("SELECT source, refreshed_at, cutoff_date FROM public.data_version")
+        rows = cur.fetchall()
+    return DataVersionSnapshot(
+        refreshed_at={source: refreshed_at for source, refreshed_at, _ in rows},
+        records_cutoff=next(
+            (cutoff for source, _, cutoff in rows if source == SOURCE_RECORDS), None
+        ),
+    )
+
+
+class DataVersionStore:
+    """Lecture du registre gardée ``DATA_VERSION_TTL_S`` secondes par process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (registre, instant de lecture time.monotonic()).
+        self._loaded: tuple[DataVersionSnapshot, float] | None = None
+
+    def _fresh(self) -> DataVersionSnapshot | None:
+        loaded = self._loaded
+        if loaded is None:
+            return None
+        snapshot, loaded_at = loaded
+        if time.monotonic() - loaded_at >= settings.DATA_VERSION_TTL_S:
+            return None
+        return snapshot
+
+    def get(self) -> DataVersionSnapshot:
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            snapshot = self._fresh()
+            if snapshot is None:
+                snapshot = _load_snapshot()
+                self._loaded = (snapshot, time.monotonic())
+            return snapshot
+
+    def invalidate(self) -> None:
+        """Oublie le registre lu : le prochain accès le relit en base."""
+        with self._lock:
+            self._loaded = None
+
+
+data_version = DataVersionStore()
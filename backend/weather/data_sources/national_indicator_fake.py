@@ -140,6 +140,22 @@ class FakeNationalIndicatorDataSource(
 
         return _baseline_point_from_mean_std(mean=mean, stddev=stddev)
 
+    def fetch_daily_baselines(
+        self,
+        month_day_pairs: set[tuple[int, int]],
+    ) -> dict[tuple[int, int], BaselinePoint]:
+        # Année de référence non bissextile (comme les autres helpers du fake),
+        # sauf pour le 29/02.
+        return {
+            (m, d): self.fetch_daily_baseline(
+                dt.date(2000 if (m, d) == (2, 29) else 2001, m, d)
+            )
+            for m, d in month_day_pairs
+        }
+
+    def fetch_monthly_baselines(self, months: set[int]) -> dict[int, BaselinePoint]:
+        return {month: self.fetch_monthly_baseline(month) for month in months}
+
 
 def _absolute_extremes_for_day(month: int, day_of_month: int) -> AbsoluteExtremes:
     """
@@ -0,0 +1,255 @@
+"""
+Référentiel climatologique 1991-2020 chargé une fois par process.
+
+Les tables de baseline (ITN journalière / mensuelle / annuelle et moyenne
+journalière par station) sont importées au seed et ne changent pas entre deux
+déploiements. Plutôt que de les relire à chaque requête, chaque worker les
+charge une seule fois dans des tableaux NumPy compacts :
+
+- ITN journalière  : tableaux (366,) indexés par la position du (mois, jour)
+                     dans une année bissextile ;
+- ITN mensuelle    : tableaux (13,) indexés par le numéro de mois ;
+- station × jour   : matrice (n_stations, 366), une ligne par station.
+
+Les valeurs absentes sont stockées en NaN et renvoyées comme ``None``.
+
+Invalidation : ``reference_data.invalidate()`` force un rechargement au
+prochain accès (après un re-seed des baselines, ou entre deux tests). Chaque
+chargement incrémente ``version``, utilisable comme composante de clé de cache.
+
+Les extremes absolus ITN ne sont volontairement pas gérés ici : ils dépendent
+de l'historique complet et évoluent à chaque ingestion.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import sys
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from weather.models import (
+    BaselineStationDailyMean19912020,
+    ITNBaselineDaily19912020,
+    ITNBaselineMonthly19912020,
+    ITNBaselineYearly19912020,
+)
+
+logger = logging.getLogger(__name__)
+
+DAYS_IN_LEAP_YEAR = 366
+
+
+def _build_month_day_index() -> np.ndarray:
+    index = np.full((13, 32), -1, dtype=np.int16)
+    first = dt.date(2000, 1, 1)
+    for offset in range(DAYS_IN_LEAP_YEAR):
+        day = first + dt.timedelta(days=offset)
+        index[day.month, day.day] = offset
+    return index
+
+
+# (mois, jour) -> position 0..365 dans une année bissextile (-1 si invalide).
+_MONTH_DAY_INDEX = _build_month_day_index()
+# Position 0..365 -> (mois, jour), pour reconstruire des listes ordonnées.
+_MONTH_DAY_BY_INDEX: tuple[tuple[int, int], ...] = tuple(
+    (month, day)
+    for month in range(1, 13)
+    for day in range(1, 32)
+    if _MONTH_DAY_INDEX[month, day] >= 0
+)
+
+
+def month_day_index(month: int, day: int) -> int:
+    """Position du (mois, jour) dans une année bissextile (0..365)."""
+    idx = int(_MONTH_DAY_INDEX[month, day])
+    if idx < 0:
+        raise ValueError(f"(mois, jour) invalide : ({month}, {day})")
+    return idx
+
+
+def _float_or_none(value: np.floating) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+@dataclass(frozen=True)
+class ReferenceDataSnapshot:
+    """Photo immuable du référentiel 1991-2020 à un instant donné."""
+
+    version: int
+    itn_daily_mean: np.ndarray
+    itn_daily_stddev: np.ndarray
+    itn_monthly_mean: np.ndarray
+    itn_monthly_stddev: np.ndarray
+    itn_yearly_mean: float | None
+    itn_yearly_stddev: float | None
+    station_index: dict[str, int]
+    station_daily_mean: np.ndarray
+
+    def itn_daily(self, month: int, day: int) -> tuple[float, float] | None:
+        """(moyenne, écart-type) ITN du (mois, jour), ou None si absent."""
+        idx = month_day_index(month, day)
+        mean = _float_or_none(self.itn_daily_mean[idx])
+        if mean is None:
+            return None
+        return mean, float(self.itn_daily_stddev[idx])
+
+    def itn_daily_items(self) -> list[tuple[int, int, float, float]]:
+        """(mois, jour, moyenne, écart-type) présents, triés par (mois, jour)."""
+        return [
+            (month, day, float(mean), float(std))
+            for (month, day), mean, std in zip(
+                _MONTH_DAY_BY_INDEX,
+                self.itn_daily_mean,
+                self.itn_daily_stddev,
+                strict=True,
+            )
+            if not np.isnan(mean)
+        ]
+
+    def itn_monthly(self, month: int) -> tuple[float, float] | None:
+        """(moyenne, écart-type) ITN du mois, ou None si absent."""
+        mean = _float_or_none(self.itn_monthly_mean[month])
+        if mean is None:
+            return None
+        return mean, float(self.itn_monthly_stddev[month])
+
+    def itn_monthly_items(self) -> list[tuple[int, float, float]]:
+        """(mois, moyenne, écart-type) présents, triés par mois."""
+        return [
+            (
+                month,
+                float(self.itn_monthly_mean[month]),
+                float(self.itn_monthly_stddev[month]),
+            )
+            for month in range(1, 13)
+            if not np.isnan(self.itn_monthly_mean[month])
+        ]
+
+    def itn_yearly(self) -> tuple[float, float] | None:
+        """(moyenne, écart-type) ITN annuelle, ou None si absente."""
+        if self.itn_yearly_mean is None or self.itn_yearly_stddev is None:
+            return None
+        return self.itn_yearly_mean, self.itn_yearly_stddev
+
+    def station_daily_row(self, station_code: str) -> np.ndarray | None:
+        """Baselines journalières (366,) d'une station, ou None si inconnue."""
+        row = self.station_index.get(station_code)
+        if row is None:
+            return None
+        return self.station_daily_mean[row]
+
+    def station_daily(self, station_code: str, month: int, day: int) -> float | None:
+        """Baseline journalière d'une station pour un (mois, jour)."""
+        row = self.station_daily_row(station_code)
+        if row is None:
+            return None
+        return _float_or_none(row[month_day_index(month, day)])
+
+    def memory_footprint(self) -> dict[str, int]:
+        """Empreinte mémoire approximative (octets) par table chargée."""
+        station_index_bytes = sys.getsizeof(self.station_index) + sum(
+            sys.getsizeof(code) for code in self.station_index
+        )
+        return {
+            "itn_daily": self.itn_daily_mean.nbytes + self.itn_daily_stddev.nbytes,
+            "itn_monthly": (
+                self.itn_monthly_mean.nbytes + self.itn_monthly_stddev.nbytes
+            ),
+            "station_daily": self.station_daily_mean.nbytes + station_index_bytes,
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self.memory_footprint().values())
+
+
+def _load_snapshot(version: int) -> ReferenceDataSnapshot:
+    itn_daily_mean = np.full(DAYS_IN_LEAP_YEAR, np.nan)
+    itn_daily_stddev = np.full(DAYS_IN_LEAP_YEAR, np.nan)
+    for month, day, mean, std in ITNBaselineDaily19912020.objects.values_list(
+        "month", "day_of_month", "itn_mean", "itn_stddev"
+    ):
+        idx = month_day_index(month, day)
+        itn_daily_mean[idx] = mean
+        itn_daily_stddev[idx] = std
+
+    itn_monthly_mean = np.full(13, np.nan)
+    itn_monthly_stddev = np.full(13, np.nan)
+    for month, mean, std in ITNBaselineMonthly19912020.objects.values_list(
+        "month", "itn_mean", "itn_stddev"
+    ):
+        itn_monthly_mean[month] = mean
+        itn_monthly_stddev[month] = std
+
+    yearly = ITNBaselineYearly19912020.objects.values_list(
+        "itn_mean", "itn_stddev"
+    ).first()
+
+    station_rows = list(
+        BaselineStationDailyMean19912020.objects.order_by().values_list(
+            "station_code", "month", "day", "baseline_mean_tntxm"
+        )
+    )
+    station_index: dict[str, int] = {}
+    for station_code, _, _, _ in station_rows:
+        station_index.setdefault(station_code, len(station_index))
+    station_daily_mean = np.full((len(station_index), DAYS_IN_LEAP_YEAR), np.nan)
+    for station_code, month, day, mean in station_rows:
+        if mean is not None:
+            station_daily_mean[
+                station_index[station_code], month_day_index(month, day)
+            ] = mean
+
+    return ReferenceDataSnapshot(
+        version=version,
+        itn_daily_mean=itn_daily_mean,
+        itn_daily_stddev=itn_daily_stddev,
+        itn_monthly_mean=itn_monthly_mean,
+        itn_monthly_stddev=itn_monthly_stddev,
+        itn_yearly_mean=float(yearly[0]) if yearly is not None else None,
+        itn_yearly_stddev=float(yearly[1]) if yearly is not None else None,
+        station_index=station_index,
+        station_daily_mean=station_daily_mean,
+    )
+
+
+class ReferenceDataStore:
+    """Chargement paresseux et thread-safe du référentiel, une fois par process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: ReferenceDataSnapshot | None = None
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Numéro du dernier chargement (0 tant que rien n'a été chargé)."""
+        return self._version
+
+    def get(self) -> ReferenceDataSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                self._version += 1
+                self._snapshot = _load_snapshot(self._version)
+                logger.info(
+                    "Référentiel 1991-2020 chargé (version %d) : %d stations, %d octets",
+                    self._version,
+                    len(self._snapshot.station_index),
+                    self._snapshot.nbytes,
+                )
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Oublie le référentiel chargé : le prochain accès le relit en base."""
+        with self._lock:
+            self._snapshot = None
+
+
+reference_data = ReferenceDataStore()
@@ -0,0 +1,108 @@
+"""
+Registre des « formes » de requêtes SQL construites à la main (timescale.py).
+
+Les requêtes brutes sont assemblées à chaque appel (clauses de filtre
+optionnelles, ORDER BY, placeholders de territoire, CTE hybrides). Pour un même
+jeu de clauses actives, le texte produit est identique à l'indentation près :
+c'est une forme. ``canonical_sql`` la réduit à une chaîne stable (lignes
+blanches et indentation retirées, commentaires ``--`` préservés).
+
+``sql_shapes.execute(cur, name, sql, params)`` exécute la forme canonique en
+requête préparée côté serveur (binding serveur psycopg, voir
+``DATABASES["default"]["OPTIONS"]``) dès sa première exécution sur une
+connexion : les suivantes, sur la même connexion (pool, voir
+weather/db_pool.py), sautent l'analyse, et PostgreSQL peut réutiliser un plan
+générique après quelques exécutions. Si les requêtes préparées sont
+désactivées (``prepare_threshold=None``), la forme est exécutée normalement.
+
+Compteurs par forme (``sql_shapes.snapshot()``) : exécutions préparant la
+requête sur une connexion (analyse + plan + exécution) et autres exécutions
+(requête déjà préparée, ou préparation désactivée), avec leur durée cumulée
+côté client.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from dataclasses import dataclass, replace
+from typing import Any
+
+
+def canonical_sql(sql: str) -> str:
+    """Texte stable d'une forme : une ligne par ligne non vide, sans indentation."""
+    return "\n".join(line.strip() for line in sql.splitlines() if line.strip())
+
+
+@dataclass
+class SqlShapeStats:
+    name: str
+    sql: str
+    preparations: int = 0
+    prepare_ms: float = 0.0
+    executions: int = 0
+    execute_ms: float = 0.0
+
+    @property
+    def mean_prepare_ms(self) -> float | None:
+        return self.prepare_ms / self.preparations if self.preparations else None
+
+    @property
+    def mean_execute_ms(self) -> float | None:
+        return self.execute_ms / self.executions if self.executions else None
+
+
+class SqlShapeRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._shapes: dict[tuple[str, str], SqlShapeStats] = {}
+        # Connexion psycopg -> formes déjà préparées sur cette connexion.
+        self._prepared: weakref.WeakKeyDictionary[Any, set[tuple[str, str]]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def execute(self, cur, name: str, sql: str, params: Any = None) -> None:
+        """Exécute ``sql`` sur le curseur Django ``cur``, préparé sous la forme ``name``."""
+        key = (name, canonical_sql(sql))
+        raw_conn = cur.cursor.connection
+        with self._lock:
+            shape = self._shapes.get(key)
+            if shape is None:
+                shape = self._shapes[key] = SqlShapeStats(*key)
+            prepared = self._prepared.setdefault(raw_conn, set())
+        threshold = raw_conn.prepare_threshold
+        first = threshold is not None and key not in prepared
+
+        if threshold is not None:
+            raw_conn.prepare_threshold = 0
+        started = time.perf_counter()
+        try:
+            cur.execute(shape.sql, params)
+        finally:
+            raw_conn.prepare_threshold = threshold
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            if first:
+                prepared.add(key)
+                shape.preparations += 1
+                shape.prepare_ms += elapsed_ms
+            else:
+                shape.executions += 1
+                shape.execute_ms += elapsed_ms
+
+    def snapshot(self) -> list[SqlShapeStats]:
+        """Copie des compteurs, formes les plus coûteuses en premier."""
+        with self._lock:
+            shapes = [replace(shape) for shape in self._shapes.values()]
+        return sorted(shapes, key=lambda s: s.prepare_ms + s.execute_ms, reverse=True)
+
+    def reset(self) -> None:
+        """Remet les compteurs à zéro (les requêtes restent préparées)."""
+        with self._lock:
+            for key, shape in self._shapes.items():
+                self._shapes[key] = SqlShapeStats(shape.name, shape.sql)
+
+
+sql_shapes = SqlShapeRegistry()
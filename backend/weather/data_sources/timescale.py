@@ -1,21 +1,23 @@
 from __future__ import annotations
 
+import base64
 import datetime as dt
+import functools
+import json
 from collections import defaultdict
-from typing import Any
+from collections.abc import Callable, Iterator
+from typing import Any, Literal, TypeVar
 
-from django.db import connection
-from django.db.models import IntegerField, OuterRef, Subquery
-from django.db.models.functions import Cast, ExtractDay, ExtractMonth
+import numpy as np
+from django.db import connection, transaction
+from psycopg.rows import RowFactory, args_row, kwargs_row
 
+from weather.data_sources.data_version import data_version
+from weather.data_sources.reference_data import month_day_index, reference_data
+from weather.data_sources.sql_shapes import sql_shapes
 from weather.models import (
-    BaselineStationDailyMean19912020,
-    ITNAbsoluteExtremesDaily,
     ITNAbsoluteExtremesMonthly,
     ITNAbsoluteExtremesYearly,
-    ITNBaselineDaily19912020,
-    ITNBaselineMonthly19912020,
-    ITNBaselineYearly19912020,
     Quotidienne,
     QuotidienneDeviation,
     StationQualifieeHexagone,
@@ -83,6 +85,8 @@ from weather.services.temperature_deviation.types import (
     TemperatureDeviationOverviewStation,
     YearlyBaselinePoint,
 )
+from weather.services.temperature_export.protocols import DailyExportDataSource
+from weather.services.temperature_export.types import DailyExportQuery, DailyExportRow
 from weather.services.temperature_minmax.protocols import MinMaxGraphDataSource
 from weather.services.temperature_minmax.types import (
     DailyMinMaxPoint,
@@ -102,6 +106,8 @@ from weather.services.temperature_records.types import (
 from weather.services.temperature_records.types import (
     Pagination as PaginationRecord,
 )
+from weather.utils.concurrency import run_concurrently
+from weather.utils.date_range import complete_periods_span, period_start
 
 
 def normalize_department(department: int) -> str:
@@ -112,6 +118,33 @@ def _float_or_none(value) -> float | None:
     return float(value) if value is not None else None
 
 
+Row = TypeVar("Row")
+
+
+def _fetch_with(cur, row_factory: RowFactory[Row]) -> list[Row]:
+    raw = cur.cursor
+    default = raw.row_factory
+    raw.row_factory = row_factory
+    try:
+        return cur.fetchall()
+    finally:
+        raw.row_factory = default
+
+
+def _fetch_all(cur, make_row: Callable[..., Row]) -> list[Row]:
+    """
+    Lignes du dernier ``execute``, construites au décodage par
+    ``make_row(*colonnes)`` (row factory psycopg) : ni liste de tuples ni
+    dicts intermédiaires. Les dates sont castées en ``::date`` dans le SQL.
+    """
+    return _fetch_with(cur, args_row(make_row))
+
+
+def _fetch_all_by_name(cur, make_row: Callable[..., Row]) -> list[Row]:
+    """Comme `_fetch_all`, colonnes passées par nom (``SELECT *``, ``d.*``)."""
+    return _fetch_with(cur, kwargs_row(make_row))
+
+
 def _normalize_reims(
     day: dt.date, station_code_to_temp_map: dict[str, float]
 ) -> dict[str, float]:
@@ -126,42 +159,6 @@ def _normalize_reims(
     return m
 
 
-def _station_daily_baseline_subquery():
-    return BaselineStationDailyMean19912020.objects.filter(
-        station_code=OuterRef("station_code"),
-        month=OuterRef("month"),
-        day=OuterRef("day"),
-    ).values("baseline_mean_tntxm")[:1]
-
-
-def _station_name_subquery():
-    return StationQualifieeHexagone.objects.filter(
-        station_code=OuterRef("station_code")
-    ).values("name")[:1]
-
-
-def _daily_station_queryset(
-    date_start: dt.date,
-    date_end: dt.date,
-):
-    baseline_sq = _station_daily_baseline_subquery()
-
-    return (
-        QuotidienneDeviation.objects.filter(
-            date__gte=date_start,
-            date__lte=date_end,
-        )
-        .annotate(
-            month=ExtractMonth("date"),
-            day=ExtractDay("date"),
-        )
-        .annotate(
-            baseline_mean_day=Subquery(baseline_sq),
-        )
-        .filter(baseline_mean_day__isnull=False)
-    )
-
-
 def _mean(values: list[float]) -> float:
     if not values:
         return 0.0
@@ -191,19 +188,106 @@ def compute_itn_for_day(
     return sum(station_code_to_temp_map.values()) / float(len(station_code_to_temp_map))
 
 
+# Premier jour couvert par mv_itn_daily_all_years (filtre de 006).
+ITN_DAILY_ALL_YEARS_START = dt.date(1947, 1, 1)
+
+
+def _get_itn_daily_last_date() -> dt.date | None:
+    """
+    Dernier jour présent dans mv_itn_daily_all_years, ou None si la table est
+    vide.
+    """
+    with connection.cursor() as cur:
+        cur.execute("SELECT MAX(date)::date FROM public.mv_itn_daily_all_years")
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
 class TimescaleNationalIndicatorObservedDataSource(NationalIndicatorObservedDataSource):
+    """
+    ITN journalier observé, lu dans mv_itn_daily_all_years (même règle
+    29-sur-30 stations et même normalisation Reims que compute_itn_for_day),
+    rafraîchie incrémentalement par le job pg_cron.
+
+    Les jours hors de la table (avant 1947, ou après son dernier jour tant que
+    le refresh n'est pas passé) sont recalculés en Python depuis Quotidienne,
+    de même que toute la période si la table est vide.
+    """
+
     def fetch_daily_series(
         self,
         query: DailySeriesQuery,
+    ) -> list[NationalObservedPoint]:
+        last_date = _get_itn_daily_last_date()
+        if last_date is None:
+            return self._compute_daily_series(
+                query.date_start, query.date_end, query.target_dates
+            )
+
+        table_start = max(query.date_start, ITN_DAILY_ALL_YEARS_START)
+        table_end = min(query.date_end, last_date)
+        one_day = dt.timedelta(days=1)
+
+        out: list[NationalObservedPoint] = []
+        if query.date_start < table_start:
+            out += self._compute_daily_series(
+                query.date_start,
+                min(query.date_end, table_start - one_day),
+                query.target_dates,
+            )
+        if table_start <= table_end:
+            out += self._read_daily_series(table_start, table_end, query.target_dates)
+        if table_end < query.date_end:
+            out += self._compute_daily_series(
+                max(query.date_start, table_end + one_day),
+                query.date_end,
+                query.target_dates,
+            )
+        return out
+
+    def _read_daily_series(
+        self,
+        date_start: dt.date,
+        date_end: dt.date,
+        target_dates: tuple[dt.date, ...] | None,
+    ) -> list[NationalObservedPoint]:
+        where_clauses = ["o.date BETWEEN %(date_start)s AND %(date_end)s"]
+        params: dict = {"date_start": date_start, "date_end": date_end}
+
+        # Dates cibles liées en un seul paramètre tableau (et non une liste
+        # de littéraux IN (...)).
+        if target_dates is not None:
+            where_clauses.append("o.date = ANY(%(target_dates)s::date[])")
+            params["target_dates"] = list(target_dates)
+
+        with connection.cursor() as cur:
+            sql_shapes.execute(
+                cur,
+                "national_indicator.observed",
+                f"""
+                SELECT o.date::date, o.itn::double precision
+                FROM public.mv_itn_daily_all_years o
+                WHERE {" AND ".join(where_clauses)}
+                ORDER BY o.date
+                """,
+                params,
+            )
+            return _fetch_all(cur, NationalObservedPoint)
+
+    def _compute_daily_series(
+        self,
+        date_start: dt.date,
+        date_end: dt.date,
+        target_dates: tuple[dt.date, ...] | None,
     ) -> list[NationalObservedPoint]:
         qs = Quotidienne.objects.filter(
-            date__gte=query.date_start,
-            date__lte=query.date_end,
+            date__gte=date_start,
+            date__lte=date_end,
             station_code__in=ITN_STATION_CODES_FOR_QUERY,
         )
 
-        if query.target_dates is not None:
-            qs = qs.filter(date__in=query.target_dates)
+        if target_dates is not None:
+            qs = qs.filter(date__in=target_dates)
 
         rows = qs.order_by("date", "station_code").values(
             "date", "station_code", "tntxm"
@@ -234,26 +318,48 @@ class TimescaleNationalIndicatorObservedDataSource(NationalIndicatorObservedData
 
 class TimescaleNationalIndicatorBaselineDataSource(NationalIndicatorBaselineDataSource):
     """
-    Source baseline ITN basée sur les MV Timescale.
+    Source baseline ITN 1991-2020, servie depuis le référentiel chargé une fois
+    par process (voir weather.data_sources.reference_data).
     """
 
     def fetch_daily_baseline(self, day: dt.date) -> BaselinePoint:
-        row = ITNBaselineDaily19912020.objects.get(
-            month=day.month,
-            day_of_month=day.day,
-        )
-
-        return self._map(row.itn_mean, row.itn_stddev)
+        values = reference_data.get().itn_daily(day.month, day.day)
+        if values is None:
+            raise ValueError(f"Baseline journalière ITN introuvable pour {day}")
+        return self._map(*values)
 
     def fetch_monthly_baseline(self, month: int) -> BaselinePoint:
-        row = ITNBaselineMonthly19912020.objects.get(month=month)
-        return self._map(row.itn_mean, row.itn_stddev)
+        values = reference_data.get().itn_monthly(month)
+        if values is None:
+            raise ValueError(f"Baseline mensuelle ITN introuvable pour le mois {month}")
+        return self._map(*values)
 
     def fetch_yearly_baseline(self) -> BaselinePoint:
-        row = ITNBaselineYearly19912020.objects.first()
-        if row is None:
+        values = reference_data.get().itn_yearly()
+        if values is None:
             raise ValueError("Baseline yearly ITN introuvable")
-        return self._map(row.itn_mean, row.itn_stddev)
+        return self._map(*values)
+
+    def fetch_daily_baselines(
+        self,
+        month_day_pairs: set[tuple[int, int]],
+    ) -> dict[tuple[int, int], BaselinePoint]:
+        snapshot = reference_data.get()
+        out: dict[tuple[int, int], BaselinePoint] = {}
+        for month, day in month_day_pairs:
+            values = snapshot.itn_daily(month, day)
+            if values is not None:
+                out[(month, day)] = self._map(*values)
+        return out
+
+    def fetch_monthly_baselines(self, months: set[int]) -> dict[int, BaselinePoint]:
+        snapshot = reference_data.get()
+        out: dict[int, BaselinePoint] = {}
+        for month in months:
+            values = snapshot.itn_monthly(month)
+            if values is not None:
+                out[month] = self._map(*values)
+        return out
 
     @staticmethod
     def _map(mean: float, std: float) -> BaselinePoint:
@@ -268,9 +374,10 @@ class TimescaleNationalIndicatorAbsoluteExtremesDataSource(
     NationalIndicatorAbsoluteExtremesDataSource
 ):
     """
-    Lit les extremes absolus historiques de l'ITN depuis les vues matérialisées
-    v_itn_absolute_extremes_daily/monthly/yearly.
-    Ces MV sont rafraîchies via pg_cron toutes les 6 min (même job que mv_quotidienne_realtime).
+    Lit les extremes absolus historiques de l'ITN :
+    - journaliers depuis la table itn_absolute_extremes_daily, maintenue
+      incrémentalement par refresh_itn_absolute_extremes_daily (job pg_cron) ;
+    - mensuels/annuels depuis les vues v_itn_absolute_extremes_monthly/yearly.
     """
 
     def fetch_daily_absolute_extremes(
@@ -279,14 +386,35 @@ class TimescaleNationalIndicatorAbsoluteExtremesDataSource(
     ) -> dict[tuple[int, int], AbsoluteExtremes]:
         if not month_day_pairs:
             return {}
-        rows = ITNAbsoluteExtremesDaily.objects.all()
+        # Le filtre est poussé en base via une jointure sur les paires demandées,
+        # passées en deux tableaux : seules ces lignes sont lues (lookup sur la
+        # clé primaire), avec une seule forme de requête quel que soit leur nombre.
+        pairs = sorted(month_day_pairs)
+        params = {
+            "months": [month for month, _ in pairs],
+            "days": [day for _, day in pairs],
+        }
+        with connection.cursor() as cur:
+            sql_shapes.execute(
+                cur,
+                "national_indicator.absolute_extremes",
+                """
+                SELECT e.month, e.day_of_month, e.absolute_min, e.absolute_max
+                FROM unnest(%(months)s::int[], %(days)s::int[])
+                        AS req(month, day_of_month)
+                    INNER JOIN public.itn_absolute_extremes_daily e
+                        ON  e.month        = req.month
+                        AND e.day_of_month = req.day_of_month
+                """,
+                params,
+            )
+            rows = cur.fetchall()
         return {
-            (r.month, r.day_of_month): AbsoluteExtremes(
-                absolute_min=float(r.absolute_min),
-                absolute_max=float(r.absolute_max),
+            (month, day): AbsoluteExtremes(
+                absolute_min=float(absolute_min),
+                absolute_max=float(absolute_max),
             )
-            for r in rows
-            if (r.month, r.day_of_month) in month_day_pairs
+            for month, day, absolute_min, absolute_max in rows
         }
 
     def fetch_monthly_absolute_extremes(
@@ -370,7 +498,9 @@ class TimescaleNationalIndicatorKpiDataSource(NationalIndicatorKpiDataSource):
         previous_end: dt.date,
     ) -> NationalIndicatorKpiResult:
         with connection.cursor() as cur:
-            cur.execute(
+            sql_shapes.execute(
+                cur,
+                "national_indicator.kpi",
                 self._SQL,
                 {
                     "current_start": current_start,
@@ -406,16 +536,90 @@ class TimescaleNationalIndicatorKpiDataSource(NationalIndicatorKpiDataSource):
         )
 
 
+_CLOSED_BEFORE_SQL = {
+    "temperature_rollups_meta": (
+        "SELECT closed_before FROM public.temperature_rollups_meta LIMIT 1"
+    ),
+    "station_deviation_cumsum_meta": (
+        "SELECT closed_before FROM public.station_deviation_cumsum_meta LIMIT 1"
+    ),
+}
+
+
+def _get_closed_before(
+    meta_table: Literal["temperature_rollups_meta", "station_deviation_cumsum_meta"],
+) -> dt.date | None:
+    """
+    Borne (exclue) des jours couverts par une table pré-agrégée
+    (rollups 530, cumuls 540), ou None si elle n'a jamais été calculée.
+    """
+    with connection.cursor() as cur:
+        cur.execute(_CLOSED_BEFORE_SQL[meta_table])
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _rollup_span(
+    date_start: dt.date, date_end: dt.date, granularity: str | None
+) -> tuple[dt.date, dt.date] | None:
+    """
+    Buckets [début, fin) à lire dans les rollups : entièrement compris dans
+    [date_start, date_end] et clos (antérieurs à closed_before). Le reste de la
+    fenêtre (buckets partiels en bordure, mois / année en cours) est lu à chaud.
+    """
+    if granularity not in ("month", "year"):
+        return None
+
+    closed_before = _get_closed_before("temperature_rollups_meta")
+    if closed_before is None:
+        return None
+
+    span = complete_periods_span(date_start, date_end, granularity)
+    if span is None:
+        return None
+
+    end = min(span[1], period_start(closed_before, granularity))
+    if span[0] >= end:
+        return None
+    return span[0], end
+
+
+def _station_deviation_point(
+    station_code: str,
+    station_name: str,
+    date: dt.date,
+    temperature,
+    baseline_mean,
+) -> tuple[str, str, DailyDeviationPoint]:
+    return (
+        station_code.strip(),
+        station_name,
+        DailyDeviationPoint(
+            date=date,
+            temperature=float(temperature),
+            baseline_mean=float(baseline_mean),
+        ),
+    )
+
+
 class TimescaleTemperatureDeviationDailyDataSource(
     TemperatureDeviationDailyDataSource,
     TemperatureDeviationOverviewDataSource,
 ):
-    def _baseline_subquery(self):
-        return BaselineStationDailyMean19912020.objects.filter(
-            station_code=OuterRef("station_code"),
-            month=OuterRef("month"),
-            day=OuterRef("day"),
-        ).values("baseline_mean_tntxm")[:1]
+    """
+    Deux chemins pour les séries journalières station
+    (`fetch_stations_daily_series`) :
+    - ``baseline_in_sql=True`` (défaut) : une seule requête ensembliste joint
+      v_quotidienne_deviation à mv_baseline_station_daily_mean_1991_2020 sur
+      la clé (station, mois, jour) et renvoie le nom de la station.
+    - ``baseline_in_sql=False`` : lecture ORM des observations, baselines lues
+      dans le référentiel en mémoire, noms via une seconde requête.
+
+    Les deux chemins sont comparés par la commande benchmark_deviation_series.
+    """
+
+    def __init__(self, *, baseline_in_sql: bool = True) -> None:
+        self._baseline_in_sql = baseline_in_sql
 
     def fetch_stations_daily_series(
         self, query: DailyDeviationSeriesQuery
@@ -423,8 +627,108 @@ class TimescaleTemperatureDeviationDailyDataSource(
         if not query.station_ids:
             return []
 
-        baseline_sq = self._baseline_subquery()
+        span = _rollup_span(query.date_start, query.date_end, query.bucket)
+        if self._baseline_in_sql:
+            rows = self._fetch_joined_daily_points(query, span)
+        else:
+            rows = self._fetch_snapshot_daily_points(query, span)
+
+        station_names: dict[str, str] = {}
+        grouped: dict[str, list[DailyDeviationPoint]] = defaultdict(list)
+        for station_code, station_name, point in rows:
+            station_names[station_code] = station_name
+            grouped[station_code].append(point)
+
+        if span is not None:
+            for station_code, station_name, point in self._fetch_bucket_points(
+                query, span
+            ):
+                station_names.setdefault(station_code, station_name)
+                grouped[station_code].append(point)
+            for points in grouped.values():
+                points.sort(key=lambda p: p.date)
+
+        return [
+            StationDailySeries(
+                station_id=station_id,
+                station_name=station_names.get(station_id, station_id),
+                points=grouped[station_id],
+            )
+            for station_id in query.station_ids
+            if station_id in grouped
+        ]
+
+    def _fetch_joined_daily_points(
+        self,
+        query: DailyDeviationSeriesQuery,
+        span: tuple[dt.date, dt.date] | None,
+    ) -> list[tuple[str, str, DailyDeviationPoint]]:
+        """
+        Points journaliers ayant une baseline, triés par (station, date).
+
+        Les clés (mois, jour) sont calculées une fois par ligne journalière
+        puis jointes en bloc à l'index unique (station_code, month, day) de la
+        baseline, au lieu d'une recherche par ligne.
+        """
+        where_clauses = [
+            "q.station_code = ANY(%(station_ids)s)",
+            "q.date >= %(date_start)s",
+            "q.date <= %(date_end)s",
+        ]
+        params: dict = {
+            "station_ids": list(query.station_ids),
+            "date_start": query.date_start,
+            "date_end": query.date_end,
+        }
+
+        if query.target_dates is not None:
+            where_clauses.append("q.date = ANY(%(target_dates)s)")
+            params["target_dates"] = list(query.target_dates)
+
+        if span is not None:
+            where_clauses.append(
+                "NOT (q.date >= %(span_start)s AND q.date < %(span_end)s)"
+            )
+            params["span_start"] = span[0]
+            params["span_end"] = span[1]
+
+        sql = f"""
+            SELECT
+                q.station_code,
+                COALESCE(s.name, q.station_code)            AS station_name,
+                q.date::date                                AS date,
+                q.tntxm,
+                b.baseline_mean_tntxm::double precision     AS baseline_mean
+            FROM public.v_quotidienne_deviation q
+                CROSS JOIN LATERAL (
+                    SELECT
+                        EXTRACT(MONTH FROM q.date)::int AS month,
+                        EXTRACT(DAY FROM q.date)::int   AS day
+                ) k
+                INNER JOIN public.mv_baseline_station_daily_mean_1991_2020 b
+                    ON  b.station_code = q.station_code
+                    AND b.month        = k.month
+                    AND b.day          = k.day
+                LEFT JOIN public.v_station_qualifiee_hexagone s
+                    ON s.station_code = q.station_code
+            WHERE {" AND ".join(where_clauses)}
+              AND b.baseline_mean_tntxm IS NOT NULL
+            ORDER BY q.station_code, q.date
+        """
+
+        with connection.cursor() as cur:
+            sql_shapes.execute(cur, "deviation.daily_points", sql, params)
+            return _fetch_all(cur, _station_deviation_point)
 
+    def _fetch_snapshot_daily_points(
+        self,
+        query: DailyDeviationSeriesQuery,
+        span: tuple[dt.date, dt.date] | None,
+    ) -> list[tuple[str, str, DailyDeviationPoint]]:
+        """
+        Même résultat que `_fetch_joined_daily_points`, baselines lues dans le
+        référentiel en mémoire.
+        """
         qs = QuotidienneDeviation.objects.filter(
             date__gte=query.date_start,
             date__lte=query.date_end,
@@ -434,17 +738,11 @@ class TimescaleTemperatureDeviationDailyDataSource(
         if query.target_dates is not None:
             qs = qs.filter(date__in=query.target_dates)
 
-        rows = (
-            qs.annotate(
-                month=Cast(ExtractMonth("date"), IntegerField()),
-                day=Cast(ExtractDay("date"), IntegerField()),
-            )
-            .annotate(
-                baseline_mean=Subquery(baseline_sq),
-            )
-            .filter(baseline_mean__isnull=False)
-            .order_by("station_code", "date")
-            .values("station_code", "date", "tntxm", "baseline_mean")
+        if span is not None:
+            qs = qs.exclude(date__gte=span[0], date__lt=span[1])
+
+        rows = qs.order_by("station_code", "date").values_list(
+            "station_code", "date", "tntxm"
         )
 
         station_names = {
@@ -454,26 +752,73 @@ class TimescaleTemperatureDeviationDailyDataSource(
             ).only("station_code", "name")
         }
 
-        grouped: dict[str, list[DailyDeviationPoint]] = defaultdict(list)
+        snapshot = reference_data.get()
+        points: list[tuple[str, str, DailyDeviationPoint]] = []
 
-        for row in rows:
-            grouped[row["station_code"]].append(
-                DailyDeviationPoint(
-                    date=row["date"],
-                    temperature=float(row["tntxm"]),
-                    baseline_mean=float(row["baseline_mean"]),
+        for station_code, date, tntxm in rows:
+            baseline_row = snapshot.station_daily_row(station_code)
+            if baseline_row is None:
+                continue
+            baseline_mean = baseline_row[month_day_index(date.month, date.day)]
+            if np.isnan(baseline_mean):
+                continue
+            points.append(
+                (
+                    station_code,
+                    station_names.get(station_code, station_code),
+                    DailyDeviationPoint(
+                        date=date,
+                        temperature=float(tntxm),
+                        baseline_mean=float(baseline_mean),
+                    ),
                 )
             )
 
-        return [
-            StationDailySeries(
-                station_id=station_id,
-                station_name=station_names.get(station_id, station_id),
-                points=grouped[station_id],
-            )
-            for station_id in query.station_ids
-            if station_id in grouped
+        return points
+
+    def _fetch_bucket_points(
+        self, query: DailyDeviationSeriesQuery, span: tuple[dt.date, dt.date]
+    ) -> list[tuple[str, str, DailyDeviationPoint]]:
+        """
+        Un point par bucket clos (moyennes des jours ayant une baseline),
+        lu dans station_temperature_rollups.
+        """
+        where_clauses = [
+            "r.granularity = %(bucket)s",
+            "r.station_code = ANY(%(station_ids)s)",
+            "r.bucket_start >= %(span_start)s",
+            "r.bucket_start < %(span_end)s",
+            "r.n_tntxm > 0",
         ]
+        params: dict = {
+            "bucket": query.bucket,
+            "station_ids": list(query.station_ids),
+            "span_start": span[0],
+            "span_end": span[1],
+        }
+
+        if query.target_dates is not None:
+            where_clauses.append("r.bucket_start = ANY(%(bucket_starts)s)")
+            params["bucket_starts"] = sorted(
+                {period_start(d, query.bucket) for d in query.target_dates}
+            )
+
+        sql = f"""
+            SELECT
+                r.station_code,
+                s.name,
+                r.bucket_start,
+                r.sum_tntxm / r.n_tntxm     AS temperature,
+                r.sum_baseline / r.n_tntxm  AS baseline_mean
+            FROM public.station_temperature_rollups r
+                INNER JOIN public.v_station_deviation s
+                    ON s.station_code = r.station_code
+            WHERE {" AND ".join(where_clauses)}
+        """
+
+        with connection.cursor() as cur:
+            sql_shapes.execute(cur, "deviation.bucket_points", sql, params)
+            return _fetch_all(cur, _station_deviation_point)
 
     def fetch_national_observed_series(
         self, query: DailyDeviationSeriesQuery
@@ -497,34 +842,23 @@ class TimescaleTemperatureDeviationDailyDataSource(
         ]
 
     def fetch_national_daily_baseline(self) -> list[DailyBaselinePoint]:
-        rows = ITNBaselineDaily19912020.objects.all().order_by("month", "day_of_month")
-
         return [
-            DailyBaselinePoint(
-                month=row.month,
-                day_of_month=row.day_of_month,
-                mean=float(row.itn_mean),
-            )
-            for row in rows
+            DailyBaselinePoint(month=month, day_of_month=day, mean=mean)
+            for month, day, mean, _ in reference_data.get().itn_daily_items()
         ]
 
     def fetch_national_monthly_baseline(self) -> list[MonthlyBaselinePoint]:
-        rows = ITNBaselineMonthly19912020.objects.all().order_by("month")
-
         return [
-            MonthlyBaselinePoint(
-                month=row.month,
-                mean=float(row.itn_mean),
-            )
-            for row in rows
+            MonthlyBaselinePoint(month=month, mean=mean)
+            for month, mean, _ in reference_data.get().itn_monthly_items()
         ]
 
     def fetch_national_yearly_baseline(self) -> YearlyBaselinePoint | None:
-        row = ITNBaselineYearly19912020.objects.first()
-        if row is None:
+        values = reference_data.get().itn_yearly()
+        if values is None:
             return None
 
-        return YearlyBaselinePoint(mean=float(row.itn_mean))
+        return YearlyBaselinePoint(mean=values[0])
 
     def fetch_national_mean_deviation(
         self,
@@ -545,16 +879,14 @@ class TimescaleTemperatureDeviationDailyDataSource(
         if not observed_points:
             return 0.0
 
-        baseline_by_day = {
-            (row.month, row.day_of_month): float(row.itn_mean)
-            for row in ITNBaselineDaily19912020.objects.all()
-        }
+        snapshot = reference_data.get()
 
         deviations = []
         for point in observed_points:
-            baseline_mean = baseline_by_day.get((point.date.month, point.date.day))
-            if baseline_mean is None:
+            baseline = snapshot.itn_daily(point.date.month, point.date.day)
+            if baseline is None:
                 continue
+            baseline_mean = baseline[0]
             deviations.append(float(point.temperature) - baseline_mean)
 
         if not deviations:
@@ -674,20 +1006,70 @@ class TimescaleTemperatureDeviationDailyDataSource(
         if where_clauses:
             filtered_where_sql = "WHERE " + " AND ".join(where_clauses)
 
-        base_cte = """
-            WITH station_agg AS (
+        # Jours clos : différence de deux cumuls par station (540). Jours
+        # suivants (ou tous si les cumuls ne sont pas calculés) : agrégés à chaud.
+        closed_before = _get_closed_before("station_deviation_cumsum_meta")
+        params["live_start"] = (
+            max(query.date_start, closed_before)
+            if closed_before is not None
+            else query.date_start
+        )
+
+        prefix_agg_sql = ""
+        if closed_before is not None:
+            params["closed_before"] = closed_before
+            prefix_agg_sql = """
+                SELECT
+                    s.station_code AS station_id,
+                    hi.cum_days - COALESCE(lo.cum_days, 0) AS n_days,
+                    hi.cum_tntxm - COALESCE(lo.cum_tntxm, 0) AS sum_tntxm,
+                    hi.cum_baseline - COALESCE(lo.cum_baseline, 0) AS sum_baseline
+                FROM v_station_deviation s
+                    CROSS JOIN LATERAL (
+                        SELECT c.cum_days, c.cum_tntxm, c.cum_baseline
+                        FROM station_deviation_cumsum c
+                        WHERE c.station_code = s.station_code
+                            AND c.date <= %(date_end)s
+                            AND c.date < %(closed_before)s
+                        ORDER BY c.date DESC
+                        LIMIT 1
+                    ) hi
+                    LEFT JOIN LATERAL (
+                        SELECT c.cum_days, c.cum_tntxm, c.cum_baseline
+                        FROM station_deviation_cumsum c
+                        WHERE c.station_code = s.station_code
+                            AND c.date < %(date_start)s
+                        ORDER BY c.date DESC
+                        LIMIT 1
+                    ) lo ON TRUE
+                UNION ALL
+            """
+
+        station_enriched_sql = f"""
+            WITH station_sums AS (
+                {prefix_agg_sql}
                 SELECT
                     q.station_code AS station_id,
-                    AVG(q.tntxm)::double precision AS temperature_mean,
-                    AVG(b.baseline_mean_tntxm)::double precision AS baseline_mean
+                    COUNT(*) AS n_days,
+                    SUM(q.tntxm)::double precision AS sum_tntxm,
+                    SUM(b.baseline_mean_tntxm)::double precision AS sum_baseline
                 FROM v_quotidienne q
                     JOIN mv_baseline_station_daily_mean_1991_2020 b
                         ON b.station_code = q.station_code
                             AND b.month = EXTRACT(MONTH FROM q.date)::int
                             AND b.day = EXTRACT(DAY FROM q.date)::int
-                WHERE %(date_start)s <= q.date AND q.date <= %(date_end)s
+                WHERE %(live_start)s <= q.date AND q.date <= %(date_end)s
                 GROUP BY q.station_code
             ),
+            station_agg AS (
+                SELECT
+                    station_id,
+                    SUM(sum_tntxm) / SUM(n_days) AS temperature_mean,
+                    SUM(sum_baseline) / SUM(n_days) AS baseline_mean
+                FROM station_sums
+                GROUP BY station_id
+                HAVING SUM(n_days) > 0
+            ),
             station_enriched AS (
                 SELECT
                     a.station_id,
@@ -709,72 +1091,40 @@ class TimescaleTemperatureDeviationDailyDataSource(
                     LEFT JOIN ref_department_region r
                         ON r.departement = s.departement
             )
-        """
-
-        count_sql = (
-            base_cte
-            + f"""
-            SELECT COUNT(*)
+            SELECT *
             FROM station_enriched
             {filtered_where_sql}
-            """
-        )
+        """
 
         params["limit"] = query.limit
         params["offset"] = query.offset
 
-        page_sql = (
-            base_cte
-            + f"""
-            SELECT
-                station_id,
-                station_name,
-                lat,
-                lon,
-                department,
-                alt,
-                region,
-                temperature_mean,
-                baseline_mean,
-                deviation,
-                classe_recente,
-                annee_de_creation,
-                annee_de_fermeture
-            FROM station_enriched
-            {filtered_where_sql}
+        # Total et page en une seule requête (COUNT(*) OVER () avant LIMIT).
+        page_sql = f"""
+            SELECT e.*, COUNT(*) OVER () AS total_count
+            FROM ({station_enriched_sql}) e
             ORDER BY {order_sql}
             LIMIT %(limit)s OFFSET %(offset)s
-            """
-        )
+        """
 
         with connection.cursor() as cur:
-            cur.execute(count_sql, params)
-            total_count = cur.fetchone()[0]
+            sql_shapes.execute(cur, "deviation.overview_page", page_sql, params)
+            rows = _fetch_all_by_name(cur, _overview_station_row)
+            if rows:
+                total_count = rows[0][1]
+            elif query.offset > 0:
+                # Page au-delà de la fin : le total n'est porté par aucune ligne.
+                sql_shapes.execute(
+                    cur,
+                    "deviation.overview_count",
+                    f"SELECT COUNT(*) FROM ({station_enriched_sql}) e",
+                    params,
+                )
+                total_count = cur.fetchone()[0]
+            else:
+                total_count = 0
 
-            cur.execute(page_sql, params)
-            columns = [col[0] for col in cur.description]
-            rows = [dict(zip(columns, row, strict=False)) for row in cur.fetchall()]
-
-        stations = [
-            TemperatureDeviationOverviewStation(
-                station_id=row["station_id"],
-                station_name=row["station_name"],
-                lat=row["lat"],
-                lon=row["lon"],
-                department=str(row["department"])
-                if row["department"] is not None
-                else None,
-                alt=row["alt"],
-                region=row["region"],
-                temperature_mean=float(row["temperature_mean"]),
-                baseline_mean=float(row["baseline_mean"]),
-                deviation=float(row["deviation"]),
-                classe_recente=row["classe_recente"],
-                date_de_creation=_date_de_creation(row["annee_de_creation"]),
-                date_de_fermeture=_date_de_fermeture(row["annee_de_fermeture"]),
-            )
-            for row in rows
-        ]
+        stations = [station for station, _ in rows]
 
         return TemperatureDeviationOverviewResult(
             national_deviation_mean=0.0,  # ignoré par le service
@@ -787,6 +1137,41 @@ class TimescaleTemperatureDeviationDailyDataSource(
         )
 
 
+def _overview_station_row(
+    *,
+    station_id: str,
+    station_name: str,
+    lat: float | None,
+    lon: float | None,
+    department: int | None,
+    alt: float | None,
+    region: str | None,
+    temperature_mean,
+    baseline_mean,
+    deviation,
+    classe_recente: int,
+    annee_de_creation: int,
+    annee_de_fermeture: int | None,
+    total_count: int,
+) -> tuple[TemperatureDeviationOverviewStation, int]:
+    station = TemperatureDeviationOverviewStation(
+        station_id=station_id,
+        station_name=station_name,
+        lat=lat,
+        lon=lon,
+        department=str(department) if department is not None else None,
+        alt=alt,
+        region=region,
+        temperature_mean=float(temperature_mean),
+        baseline_mean=float(baseline_mean),
+        deviation=float(deviation),
+        classe_recente=classe_recente,
+        date_de_creation=_date_de_creation(annee_de_creation),
+        date_de_fermeture=_date_de_fermeture(annee_de_fermeture),
+    )
+    return station, total_count
+
+
 class TimescaleTemperatureRecordsDataSource:
     """
     Data source réelle : calcule les records progressifs via window function SQL.
@@ -893,7 +1278,7 @@ class TimescaleTemperatureRecordsDataSource:
         )
 
         with connection.cursor() as cur:
-            cur.execute(count_sql, params)
+            sql_shapes.execute(cur, "records.count", count_sql, params)
             total_count = cur.fetchone()[0]
 
         total_pages = (total_count + page_size - 1) // page_size if page_size else 1
@@ -909,7 +1294,7 @@ class TimescaleTemperatureRecordsDataSource:
                 s.name,
                 s.departement,
                 o."{col}",
-                o."AAAAMMJJ",
+                o."AAAAMMJJ"::date,
                 s.lat,
                 s.lon,
                 s.alt,
@@ -927,29 +1312,8 @@ class TimescaleTemperatureRecordsDataSource:
         )
 
         with connection.cursor() as cur:
-            cur.execute(data_sql, params)
-
-            cols = [c.name for c in cur.description]
-            rows = [dict(zip(cols, row, strict=False)) for row in cur.fetchall()]
-
-        results = [
-            TemperatureRecordEntry(
-                station_id=row["NUM_POSTE"].strip(),
-                station_name=row["name"],
-                department=normalize_department(row["departement"]),
-                record_value=float(row[col]),
-                record_date=row["AAAAMMJJ"].date()
-                if isinstance(row["AAAAMMJJ"], dt.datetime)
-                else row["AAAAMMJJ"],
-                lat=row["lat"],
-                lon=row["lon"],
-                alt=row["alt"],
-                classe_recente=row["classe_recente"],
-                date_de_creation=_date_de_creation(row["annee_de_creation"]),
-                date_de_fermeture=_date_de_fermeture(row["annee_de_fermeture"]),
-            )
-            for row in rows
-        ]
+            sql_shapes.execute(cur, "records.page", data_sql, params)
+            results = _fetch_all(cur, _record_entry)
 
         return TemperatureRecordsResult(
             entries=results,
@@ -1085,49 +1449,356 @@ def _hybrid_period_sql_parts(
     return derived, "", "TRUE", {}, None
 
 
-def _dedup_table_entries(
-    entries: list,
-    keep_max: bool,
-) -> list:
+def _get_records_state_watermark(cutoff_date: dt.date) -> dt.date | None:
     """
-    Dedup TemperatureRecordEntry par (station_id, record_date), en
-    conservant la valeur max (chaud) ou min (froid). Utilisé pour fusionner
-    les résultats MV et post-cutoff quand un record apparaît dans les deux.
+    Dernier jour traité par refresh_records_battus_state pour cette cutoff,
+    ou None si l'état n'est pas amorcé (ou amorcé pour une autre cutoff).
     """
-    by_key: dict[tuple[str, dt.date], object] = {}
-    for e in entries:
-        key = (e.station_id, e.record_date)
-        prev = by_key.get(key)
-        if (
-            prev is None
-            or (keep_max and e.record_value > prev.record_value)
-            or (not keep_max and e.record_value < prev.record_value)
-        ):
-            by_key[key] = e
-    return list(by_key.values())
+    with connection.cursor() as cur:
+        cur.execute(
+            """
+            SELECT processed_through
+            FROM public.records_battus_state_meta
+            WHERE cutoff_date = %s
+            LIMIT 1
+            """,
+            [cutoff_date],
+        )
+        row = cur.fetchone()
+    return row[0] if row else None
 
 
-def _dedup_graph_records(
-    records: list,
-) -> list:
+def _progressive_records_after_cutoff_sql(
+    request: Any,
+    type_records: str,
+    cutoff_date: dt.date,
+    processed_through: dt.date | None,
+) -> tuple[str, dict]:
     """
-    Dedup RecordsGraphRecord par (station_id, date, type_records), en
-    conservant la valeur max pour "hot" et min pour "cold". Couvre le cas
-    où un record apparaît à la fois dans mv_records_battus et dans
-    v_quotidienne (par ex. MV figée avec une valeur plus stale).
+    SELECT (station_code, record_value, record_date) des records progressifs
+    battus depuis cutoff_date pour la période demandée, avant filtre 50 ans et
+    filtres station (à appliquer par l'appelant via v_station_records).
+
+    - processed_through None : calcul à chaud complet, window function sur
+      tous les jours post-cutoff de v_quotidienne amorcée par mv_records_battus
+      et v_records_absolus_par_type.
+    - sinon : journal records_battus_recents (maintenu par
+      refresh_records_battus_state) + window function limitée aux jours
+      > processed_through, amorcée par records_battus_state.
     """
-    by_key: dict[tuple[str, dt.date, str], object] = {}
-    for r in records:
-        key = (r.station_id, r.date, r.type_records)
-        prev = by_key.get(key)
-        keep_max = r.type_records == "hot"
-        if (
-            prev is None
-            or (keep_max and r.valeur > prev.valeur)
-            or (not keep_max and r.valeur < prev.valeur)
-        ):
-            by_key[key] = r
-    return list(by_key.values())
+    hot = type_records == "hot"
+    col = "tx" if hot else "tn"
+    agg = "MAX" if hot else "MIN"
+    cmp = ">" if hot else "<"
+    extremum_fn = "GREATEST" if hot else "LEAST"
+    neutral_val = (
+        "'-Infinity'::double precision" if hot else "'Infinity'::double precision"
+    )
+
+    (
+        derived_period_expr,
+        seeds_value_clause,
+        date_period_clause,
+        period_named_params,
+        period_value,
+    ) = _hybrid_period_sql_parts(request)
+
+    params: dict = {
+        "record_type": "TX" if hot else "TN",
+        "period_type": request.period_type,
+        **period_named_params,
+    }
+    if period_value is not None:
+        params["period_value"] = period_value
+
+    if processed_through is None:
+        seeds_sql = f"""
+                SELECT station_code, period_value, {agg}(seed_val) AS seed_val
+                FROM (
+                    -- Records progressifs (post-50-ans). Peut être vide pour
+                    -- une station dont le record absolu date d'avant
+                    -- first_temp + 50 ans.
+                    SELECT station_code, period_value, {agg}(record_value) AS seed_val
+                    FROM public.mv_records_battus
+                    WHERE record_type = %(record_type)s
+                      AND period_type = %(period_type)s
+                      {seeds_value_clause}
+                    GROUP BY station_code, period_value
+                    UNION ALL
+                    -- Records absolus (sans filtre 50-ans sur la date du
+                    -- record). Couvre le cas où le record absolu est trop
+                    -- ancien pour figurer dans mv_records_battus.
+                    SELECT station_code, period_value, record_value AS seed_val
+                    FROM public.v_records_absolus_par_type
+                    WHERE record_type = %(record_type)s
+                      AND period_type = %(period_type)s
+                      {seeds_value_clause}
+                ) combined
+                GROUP BY station_code, period_value
+        """
+        window_start_clause = "q.date >= %(cutoff_date)s"
+        params["cutoff_date"] = cutoff_date
+        recents_sql = ""
+    else:
+        seeds_sql = f"""
+                SELECT station_code, period_value, record_value AS seed_val
+                FROM public.records_battus_state
+                WHERE record_type = %(record_type)s
+                  AND period_type = %(period_type)s
+                  {seeds_value_clause}
+        """
+        window_start_clause = "q.date > %(processed_through)s"
+        params["processed_through"] = processed_through
+        recents_sql = f"""
+            SELECT station_code, record_value, record_date
+            FROM public.records_battus_recents
+            WHERE record_type = %(record_type)s
+              AND period_type = %(period_type)s
+              {seeds_value_clause}
+            UNION ALL"""
+
+    sql = f"""
+        WITH seeds AS ({seeds_sql}),
+        ordered AS (
+            SELECT
+                q.station_code,
+                q.date,
+                q.{col},
+                {extremum_fn}(
+                    COALESCE(s.seed_val, {neutral_val}),
+                    COALESCE(
+                        {agg}(q.{col}) OVER (
+                            PARTITION BY q.station_code, {derived_period_expr}
+                            ORDER BY q.date
+                            ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                        ),
+                        {neutral_val}
+                    )
+                ) AS prev_val
+            FROM public.v_quotidienne q
+                LEFT JOIN seeds s
+                    ON s.station_code = q.station_code
+                    AND s.period_value IS NOT DISTINCT FROM {derived_period_expr}
+            WHERE {window_start_clause}
+                AND {date_period_clause}
+                AND q.{col} IS NOT NULL
+        )
+        {recents_sql}
+        SELECT
+            station_code,
+            {col}::double precision AS record_value,
+            date::date AS record_date
+        FROM ordered
+        WHERE {col} {cmp} prev_val
+    """
+    return sql, params
+
+
+def _dedup_table_entries(
+    entries: list,
+    keep_max: bool,
+) -> list:
+    """
+    Dedup TemperatureRecordEntry par (station_id, record_date), en
+    conservant la valeur max (chaud) ou min (froid). Utilisé pour fusionner
+    les résultats MV et post-cutoff quand un record apparaît dans les deux.
+    """
+    by_key: dict[tuple[str, dt.date], object] = {}
+    for e in entries:
+        key = (e.station_id, e.record_date)
+        prev = by_key.get(key)
+        if (
+            prev is None
+            or (keep_max and e.record_value > prev.record_value)
+            or (not keep_max and e.record_value < prev.record_value)
+        ):
+            by_key[key] = e
+    return list(by_key.values())
+
+
+def _dedup_graph_records(
+    records: list,
+) -> list:
+    """
+    Dedup RecordsGraphRecord par (station_id, date, type_records), en
+    conservant la valeur max pour "hot" et min pour "cold". Couvre le cas
+    où un record apparaît à la fois dans mv_records_battus et dans
+    v_quotidienne (par ex. MV figée avec une valeur plus stale).
+    """
+    by_key: dict[tuple[str, dt.date, str], object] = {}
+    for r in records:
+        key = (r.station_id, r.date, r.type_records)
+        prev = by_key.get(key)
+        keep_max = r.type_records == "hot"
+        if (
+            prev is None
+            or (keep_max and r.valeur > prev.valeur)
+            or (not keep_max and r.valeur < prev.valeur)
+        ):
+            by_key[key] = r
+    return list(by_key.values())
+
+
+_RECORDS_SORT_COLUMNS = {
+    "record_value": "record_value",
+    "station_name": "station_name",
+    "record_date": "record_date",
+    "department": "department",
+}
+_RECORDS_DEFAULT_ORDER = [
+    ("record_value", "DESC"),
+    ("station_name", "ASC"),
+    ("record_date", "ASC"),
+]
+# Tris compatibles avec un curseur keyset (``after=``), complétés par un
+# départage (station_code, record_date) pour obtenir un ordre total.
+_RECORDS_KEYSET_FIELDS = {"record_value", "record_date", "station_name"}
+_RECORDS_KEYSET_TIEBREAK = [("station_code", "ASC"), ("record_date", "ASC")]
+# Colonne SQL -> attribut de TemperatureRecordEntry, quand ils diffèrent.
+_RECORDS_ENTRY_ATTRS = {"station_code": "station_id"}
+# Colonne de tri -> expression dans le WHERE de v_records_absolus_par_type (r).
+_ABSOLUTE_RECORDS_KEYSET_COLUMNS = {
+    "record_value": "r.record_value::double precision",
+    "record_date": "r.record_date::date",
+    "station_name": "r.station_name",
+    "station_code": "r.station_code",
+}
+
+
+def _parse_records_sort(sort: str) -> list[tuple[str, str]]:
+    """
+    Traduit le paramètre ``sort`` (``-record_value,station_name``…) en liste
+    (colonne, ASC|DESC) sur les colonnes normalisées des requêtes records. Les
+    champs inconnus sont ignorés ; tri par défaut si aucun n'est reconnu.
+    """
+    order = []
+    for sort_part in (s.strip() for s in sort.split(",")):
+        sort_field = sort_part.lstrip("-")
+        sort_order = "DESC" if sort_part.startswith("-") else "ASC"
+        if sort_field in _RECORDS_SORT_COLUMNS:
+            order.append((_RECORDS_SORT_COLUMNS[sort_field], sort_order))
+    return order or list(_RECORDS_DEFAULT_ORDER)
+
+
+def _records_order_sql(sort: str) -> str:
+    return ", ".join(
+        f"{col} {direction}" for col, direction in _parse_records_sort(sort)
+    )
+
+
+def _records_keyset_order(sort: str) -> list[tuple[str, str]] | None:
+    """Ordre total pour la pagination keyset, ou None si le tri ne s'y prête pas."""
+    order = _parse_records_sort(sort)
+    if any(col not in _RECORDS_KEYSET_FIELDS for col, _ in order):
+        return None
+    used = {col for col, _ in order}
+    return order + [(c, d) for c, d in _RECORDS_KEYSET_TIEBREAK if c not in used]
+
+
+def _encode_records_cursor(
+    order: list[tuple[str, str]], entry: TemperatureRecordEntry, total_count: int
+) -> str:
+    """
+    Curseur opaque : tri + valeurs des colonnes de tri de la dernière ligne +
+    total de la requête, que les pages suivantes n'ont pas à recompter.
+    """
+    key = []
+    for col, _ in order:
+        value = getattr(entry, _RECORDS_ENTRY_ATTRS.get(col, col))
+        key.append(value.isoformat() if isinstance(value, dt.date) else value)
+    payload = json.dumps(
+        {"order": order, "key": key, "total": total_count}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_records_cursor(
+    cursor: str, order: list[tuple[str, str]]
+) -> tuple[list[Any], int | None]:
+    """(valeurs des colonnes de tri, total ou None s'il n'est pas porté)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if [tuple(o) for o in payload["order"]] != order:
+            raise ValueError("tri différent")
+        values = []
+        for (col, _), value in zip(order, payload["key"], strict=True):
+            if col == "record_date":
+                values.append(dt.date.fromisoformat(value))
+            elif col == "record_value":
+                values.append(float(value))
+            else:
+                values.append(str(value))
+        total = payload.get("total")
+        return values, None if total is None else int(total)
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError(
+            "Curseur 'after' invalide ou incompatible avec le tri demandé."
+        ) from exc
+
+
+def _keyset_clause(
+    order: list[tuple[str, str]],
+    values: list[Any],
+    columns: dict[str, str] | None = None,
+) -> tuple[str, dict]:
+    """
+    Condition « strictement après » pour un ordre à directions mixtes :
+    (a > x) OR (a = x AND b < y) OR …
+
+    ``columns`` traduit une colonne de tri en expression SQL, pour poser la
+    condition dans le WHERE de la requête source plutôt que sur ses alias.
+    """
+    columns = columns or {}
+    params = {f"after_{i}": v for i, v in enumerate(values)}
+    disjuncts = []
+    for i, (col, direction) in enumerate(order):
+        op = ">" if direction == "ASC" else "<"
+        terms = [
+            f"{columns.get(c, c)} = %(after_{j})s" for j, (c, _) in enumerate(order[:i])
+        ]
+        terms.append(f"{columns.get(col, col)} {op} %(after_{i})s")
+        disjuncts.append("(" + " AND ".join(terms) + ")")
+    return "(" + " OR ".join(disjuncts) + ")", params
+
+
+def _record_entry(
+    station_code: str,
+    station_name: str,
+    department: int,
+    record_value,
+    record_date: dt.date,
+    lat: float,
+    lon: float,
+    alt: float,
+    classe_recente: int,
+    annee_de_creation: int,
+    annee_de_fermeture: int | None,
+    **_ignored,
+) -> TemperatureRecordEntry:
+    """
+    Colonnes normalisées des requêtes records, dans l'ordre du SELECT
+    (`_fetch_all`) ou par nom (`_fetch_all_by_name`, colonnes en plus ignorées).
+    """
+    return TemperatureRecordEntry(
+        station_id=station_code.strip(),
+        station_name=station_name,
+        department=normalize_department(department),
+        record_value=float(record_value),
+        record_date=record_date,
+        lat=lat,
+        lon=lon,
+        alt=alt,
+        classe_recente=classe_recente,
+        date_de_creation=_date_de_creation(annee_de_creation),
+        date_de_fermeture=_date_de_fermeture(annee_de_fermeture),
+    )
+
+
+def _record_entry_with_total(
+    *, total_count: int, **columns
+) -> tuple[TemperatureRecordEntry, int]:
+    return _record_entry(**columns), total_count
 
 
 class MaterializedTemperatureRecordsDataSource:
@@ -1145,29 +1816,18 @@ class MaterializedTemperatureRecordsDataSource:
     def fetch_records(
         self, request: TemperatureRecordsRequest
     ) -> list[TemperatureRecordEntry]:
-        record_type = "TX" if request.type_records == "hot" else "TN"
-
-        sort_parts = [s.strip() for s in request.sort.split(",")]
-
-        field_mapping = {
-            "record_value": "record_value",
-            "station_name": "station_name",
-            "record_date": "record_date",
-            "department": "department",
-        }
-
-        order_clauses = []
-        for sort_part in sort_parts:
-            sort_field = sort_part.lstrip("-")
-            sort_order = "DESC" if sort_part.startswith("-") else "ASC"
-
-            if sort_field in field_mapping:
-                order_clauses.append(f"{field_mapping[sort_field]} {sort_order}")
+        select_sql, params = self._select_sql(request)
+        sql = f"""
+            {select_sql}
+            ORDER BY {_records_order_sql(request.sort)}
+            """
+        with connection.cursor() as cur:
+            sql_shapes.execute(cur, "records.materialized", sql, params)
+            return _fetch_all(cur, _record_entry)
 
-        if order_clauses:
-            order_sql = ", ".join(order_clauses)
-        else:
-            order_sql = "record_value DESC, station_name ASC, record_date ASC"
+    def _select_sql(self, request: TemperatureRecordsRequest) -> tuple[str, dict]:
+        """SELECT (sans ORDER BY) des records de la MV, colonnes normalisées."""
+        record_type = "TX" if request.type_records == "hot" else "TN"
 
         clauses = [
             "record_type = %(record_type)s",
@@ -1245,8 +1905,8 @@ class MaterializedTemperatureRecordsDataSource:
                 m.station_code,
                 m.station_name,
                 m.department,
-                m.record_value,
-                m.record_date,
+                m.record_value::double precision AS record_value,
+                m.record_date::date AS record_date,
                 vs.lat,
                 vs.lon,
                 vs.alt,
@@ -1257,31 +1917,8 @@ class MaterializedTemperatureRecordsDataSource:
                 INNER JOIN public.v_station_records vs
                      ON vs.station_code = m.station_code
             WHERE {where}
-            ORDER BY {order_sql}
             """
-        with connection.cursor() as cur:
-            cur.execute(sql, params)
-
-            cols = [c.name for c in cur.description]
-            rows = [dict(zip(cols, row, strict=False)) for row in cur.fetchall()]
-        return [
-            TemperatureRecordEntry(
-                station_id=row["station_code"].strip(),
-                station_name=row["station_name"],
-                department=normalize_department(row["department"]),
-                record_value=float(row["record_value"]),
-                record_date=row["record_date"].date()
-                if isinstance(row["record_date"], dt.datetime)
-                else row["record_date"],
-                lat=row["lat"],
-                lon=row["lon"],
-                alt=row["alt"],
-                classe_recente=row["classe_recente"],
-                date_de_creation=_date_de_creation(row["annee_de_creation"]),
-                date_de_fermeture=_date_de_fermeture(row["annee_de_fermeture"]),
-            )
-            for row in rows
-        ]
+        return sql, params
 
 
 class HybridTemperatureRecordsDataSource(TemperatureRecordsDataSource):
@@ -1290,25 +1927,33 @@ class HybridTemperatureRecordsDataSource(TemperatureRecordsDataSource):
     (snapshot figé) et complète à chaud les nouvelles données (après cutoff_date)
     via une window function amorcée par les records actuels de la MV.
 
-    La MV n'est jamais rafraîchie. La cutoff_date est stockée dans
-    mv_records_battus_meta au moment de la création de la MV.
+    La cutoff_date (celle du dernier refresh_records_mv) est lue dans le
+    registre data_version, mis en cache par worker. Sans cutoff enregistrée
+    (env de dev sans script de seed exécuté) : MV seule.
 
-    Fallback silencieux vers la MV seule si mv_records_battus_meta est absente
-    ou vide (env de dev sans script de seed exécuté).
+    Post-cutoff incrémental : si refresh_records_battus_state a amorcé l'état
+    pour la cutoff courante, les records déjà traités sont lus dans
+    records_battus_recents et seuls les jours > processed_through sont
+    calculés à chaud. Sinon, window function sur tous les jours post-cutoff.
 
+    Deux modes de pagination :
+    - ``paginate_in_sql=True`` (défaut) : MV et post-cutoff sont unis, dédupliqués
+      (DISTINCT ON) et paginés en une seule requête (ORDER BY … LIMIT/OFFSET,
+      total via COUNT(*) OVER ()). Seule la page demandée remonte en Python.
+    - ``paginate_in_sql=False`` : chargement complet, dédup et tri en Python.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, paginate_in_sql: bool = True) -> None:
         self._mv_source = MaterializedTemperatureRecordsDataSource()
+        self._paginate_in_sql = paginate_in_sql
 
     def fetch_records(
         self, request: TemperatureRecordsRequest
     ) -> TemperatureRecordsResult:
+        if self._paginate_in_sql:
+            return self._fetch_page(request)
         mv_entries = self._mv_source.fetch_records(request)
-        try:
-            cutoff = self._get_cutoff_date()
-        except Exception:
-            return self._paginate(mv_entries, request)
+        cutoff = data_version.get().records_cutoff
         if cutoff is None:
             return self._paginate(mv_entries, request)
         hot_results = self._fetch_records_after_cutoff(request, cutoff)
@@ -1317,6 +1962,66 @@ class HybridTemperatureRecordsDataSource(TemperatureRecordsDataSource):
         )
         return self._paginate(all_entries, request)
 
+    def _fetch_page(
+        self, request: TemperatureRecordsRequest
+    ) -> TemperatureRecordsResult:
+        mv_sql, params = self._mv_source._select_sql(request)
+        sources = [f"SELECT 0 AS source, mv.* FROM ({mv_sql}) mv"]
+        cutoff = data_version.get().records_cutoff
+        if cutoff is not None:
+            hot_sql, hot_params = self._after_cutoff_sql(request, cutoff)
+            sources.append(f"SELECT 1 AS source, hot.* FROM ({hot_sql}) hot")
+            params = {**params, **hot_params}
+
+        # Même règle que _dedup_table_entries : une ligne par (station, date),
+        # valeur max (chaud) / min (froid), la MV gagnant à égalité.
+        value_order = "DESC" if request.type_records == "hot" else "ASC"
+        union_sql = "\n                UNION ALL\n                ".join(sources)
+        deduped_sql = f"""
+            SELECT DISTINCT ON (station_code, record_date) *
+            FROM (
+                {union_sql}
+            ) combined
+            ORDER BY station_code, record_date, record_value {value_order}, source
+        """
+        page = request.page
+        page_size = request.page_size
+        sql = f"""
+            SELECT d.*, COUNT(*) OVER () AS total_count
+            FROM ({deduped_sql}) d
+            ORDER BY {_records_order_sql(request.sort)}, station_code, record_date
+            LIMIT %(page_limit)s OFFSET %(page_offset)s
+        """
+        params["page_limit"] = page_size
+        params["page_offset"] = (page - 1) * page_size
+
+        with connection.cursor() as cur:
+            sql_shapes.execute(cur, "records.hybrid_page", sql, params)
+            rows = _fetch_all_by_name(cur, _record_entry_with_total)
+            if rows:
+                total_count = rows[0][1]
+            elif page > 1:
+                # Page au-delà de la fin : le total n'est porté par aucune ligne.
+                sql_shapes.execute(
+                    cur,
+                    "records.hybrid_count",
+                    f"SELECT COUNT(*) FROM ({deduped_sql}) d",
+                    params,
+                )
+                total_count = cur.fetchone()[0]
+            else:
+                total_count = 0
+
+        return TemperatureRecordsResult(
+            entries=[entry for entry, _ in rows],
+            pagination=PaginationRecord(
+                total_count=total_count,
+                page=page,
+                page_size=page_size,
+                total_pages=(total_count + page_size - 1) // page_size,
+            ),
+        )
+
     def _paginate(
         self,
         entries: list[TemperatureRecordEntry],
@@ -1378,32 +2083,28 @@ class HybridTemperatureRecordsDataSource(TemperatureRecordsDataSource):
             ),
         )
 
-    def _get_cutoff_date(self) -> dt.date | None:
-        with connection.cursor() as cur:
-            cur.execute("SELECT cutoff_date FROM public.mv_records_battus_meta LIMIT 1")
-            row = cur.fetchone()
-        return row[0] if row else None
-
     def _fetch_records_after_cutoff(
         self, request: TemperatureRecordsRequest, cutoff_date: dt.date
     ) -> list[TemperatureRecordEntry]:
-        hot = request.type_records == "hot"
-        col = "tx" if hot else "tn"
-        agg = "MAX" if hot else "MIN"
-        cmp = ">" if hot else "<"
-        extremum_fn = "GREATEST" if hot else "LEAST"
-        neutral_val = (
-            "'-Infinity'::double precision" if hot else "'Infinity'::double precision"
-        )
-        record_type = "TX" if hot else "TN"
+        select_sql, params = self._after_cutoff_sql(request, cutoff_date)
+        sql = f"""
+            {select_sql}
+            ORDER BY station_name, record_date
+        """
+        with connection.cursor() as cur:
+            sql_shapes.execute(cur, "records.hybrid_after_cutoff", sql, params)
+            return _fetch_all_by_name(cur, _record_entry)
 
-        (
-            derived_period_expr,
-            seeds_value_clause,
-            date_period_clause,
-            period_named_params,
-            period_value,
-        ) = _hybrid_period_sql_parts(request)
+    def _after_cutoff_sql(
+        self, request: TemperatureRecordsRequest, cutoff_date: dt.date
+    ) -> tuple[str, dict]:
+        """SELECT (sans ORDER BY) des records battus après cutoff, mêmes colonnes que la MV."""
+        progressive_sql, params = _progressive_records_after_cutoff_sql(
+            request,
+            request.type_records,
+            cutoff_date,
+            _get_records_state_watermark(cutoff_date),
+        )
 
         terr_clause, terr_named_params = _territoire_clause_named(
             request.territoire,
@@ -1413,9 +2114,9 @@ class HybridTemperatureRecordsDataSource(TemperatureRecordsDataSource):
 
         date_filter_parts = []
         if request.date_start:
-            date_filter_parts.append("AND o.date >= %(date_start)s")
+            date_filter_parts.append("AND o.record_date >= %(date_start)s")
         if request.date_end:
-            date_filter_parts.append("AND o.date <= %(date_end)s")
+            date_filter_parts.append("AND o.record_date <= %(date_end)s")
         date_filter_clauses = "\n              ".join(date_filter_parts)
         terr_filter_clause = f"AND {terr_clause}" if terr_clause else ""
 
@@ -1457,115 +2158,37 @@ class HybridTemperatureRecordsDataSource(TemperatureRecordsDataSource):
         station_filter_clauses = "\n              ".join(station_filter_parts)
 
         sql = f"""
-            WITH mv_seeds AS (
-                SELECT station_code, period_value, {agg}(seed_val) AS seed_val
-                FROM (
-                    -- Records progressifs (post-50-ans). Peut être vide pour
-                    -- une station dont le record absolu date d'avant
-                    -- first_temp + 50 ans.
-                    SELECT station_code, period_value, {agg}(record_value) AS seed_val
-                    FROM public.mv_records_battus
-                    WHERE record_type = %(record_type)s
-                      AND period_type = %(period_type)s
-                      {seeds_value_clause}
-                    GROUP BY station_code, period_value
-                    UNION ALL
-                    -- Records absolus (sans filtre 50-ans sur la date du
-                    -- record). Couvre le cas où le record absolu est trop
-                    -- ancien pour figurer dans mv_records_battus.
-                    SELECT station_code, period_value, record_value AS seed_val
-                    FROM public.v_records_absolus_par_type
-                    WHERE record_type = %(record_type)s
-                      AND period_type = %(period_type)s
-                      {seeds_value_clause}
-                ) combined
-                GROUP BY station_code, period_value
-            ),
-            ordered AS (
-                SELECT
-                    q.station_code,
-                    q.date,
-                    q.{col},
-                    {extremum_fn}(
-                        COALESCE(s.seed_val, {neutral_val}),
-                        COALESCE(
-                            {agg}(q.{col}) OVER (
-                                PARTITION BY q.station_code, {derived_period_expr}
-                                ORDER BY q.date
-                                ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-                            ),
-                            {neutral_val}
-                        )
-                    ) AS prev_val
-                FROM public.v_quotidienne q
-                    LEFT JOIN mv_seeds s
-                        ON s.station_code = q.station_code
-                        AND s.period_value IS NOT DISTINCT FROM {derived_period_expr}
-                WHERE q.date >= %(cutoff_date)s
-                    AND {date_period_clause}
-                    AND q.{col} IS NOT NULL
-            )
             SELECT
                 o.station_code,
-                vs.name,
-                vs.departement,
-                o.{col} AS record_value,
-                o.date,
+                vs.name AS station_name,
+                vs.departement AS department,
+                o.record_value,
+                o.record_date,
                 vs.lat,
                 vs.lon,
                 vs.alt,
                 vs.classe_recente,
                 vs.annee_de_creation,
                 vs.annee_de_fermeture
-            FROM ordered o
+            FROM ({progressive_sql}) o
                 INNER JOIN public.v_station_records vs
                     ON vs.station_code = o.station_code
-            WHERE o.{col} {cmp} o.prev_val
-                AND o.date >= vs.first_temperature_date + interval '50 years'
+            WHERE o.record_date >= vs.first_temperature_date + interval '50 years'
                 {date_filter_clauses}
                 {terr_filter_clause}
                 {station_filter_clauses}
-            ORDER BY vs.name, o.date
         """
 
         params = {
-            "record_type": record_type,
-            "period_type": request.period_type,
-            "cutoff_date": cutoff_date,
-            **period_named_params,
+            **params,
             **terr_named_params,
             **station_filter_extra,
         }
-        if period_value is not None:
-            params["period_value"] = period_value
         if request.date_start:
             params["date_start"] = request.date_start
         if request.date_end:
             params["date_end"] = request.date_end
-
-        with connection.cursor() as cur:
-            cur.execute(sql, params)
-            cols = [c.name for c in cur.description]
-            rows = [dict(zip(cols, row, strict=False)) for row in cur.fetchall()]
-
-        return [
-            TemperatureRecordEntry(
-                station_id=row["station_code"].strip(),
-                station_name=row["name"],
-                department=normalize_department(row["departement"]),
-                record_value=float(row["record_value"]),
-                record_date=row["date"].date()
-                if isinstance(row["date"], dt.datetime)
-                else row["date"],
-                lat=row["lat"],
-                lon=row["lon"],
-                alt=row["alt"],
-                classe_recente=row["classe_recente"],
-                date_de_creation=_date_de_creation(row["annee_de_creation"]),
-                date_de_fermeture=_date_de_fermeture(row["annee_de_fermeture"]),
-            )
-            for row in rows
-        ]
+        return sql, params
 
 
 class TimescaleTemperatureAbsoluteRecordsDataSource(
@@ -1577,6 +2200,13 @@ class TimescaleTemperatureAbsoluteRecordsDataSource(
 
     Pré-requis : la MV doit exister en base. La créer avec :
         psql < backend/sql/materialized_views/records/450_006_v_records_absolus_par_type.sql
+
+    Pagination en SQL : LIMIT/OFFSET et total via COUNT(*) OVER () en une seule
+    requête. Pour les tris sur record_value / record_date / station_name, chaque
+    page porte un curseur keyset opaque (``next_cursor``) ; le repasser en
+    ``after`` lit la page suivante sans OFFSET : la condition keyset est posée
+    dans le WHERE de la requête source (index utilisable, pas de fenêtre sur
+    tout le résultat) et le total est repris du curseur.
     """
 
     def fetch_records(
@@ -1591,27 +2221,6 @@ class TimescaleTemperatureAbsoluteRecordsDataSource(
         else:
             period_value = None
 
-        sort_parts = [s.strip() for s in request.sort.split(",")]
-
-        field_mapping = {
-            "record_value": "record_value",
-            "station_name": "station_name",
-            "record_date": "record_date",
-            "department": "department",
-        }
-
-        order_clauses = []
-        for sort_part in sort_parts:
-            sort_field = sort_part.lstrip("-")
-            sort_order = "DESC" if sort_part.startswith("-") else "ASC"
-
-            if sort_field in field_mapping:
-                order_clauses.append(f"{field_mapping[sort_field]} {sort_order}")
-
-        if order_clauses:
-            order_sql = ", ".join(order_clauses)
-        else:
-            order_sql = "record_value DESC, station_name ASC, record_date ASC"
         clauses = [
             "record_type = %(record_type)s",
             "period_type = %(period_type)s",
@@ -1674,15 +2283,19 @@ class TimescaleTemperatureAbsoluteRecordsDataSource(
             )
             params["df_max"] = request.date_de_fermeture_max.year
 
-        where = " AND ".join(clauses)
+        keyset_order = _records_keyset_order(request.sort)
+        order = keyset_order or _parse_records_sort(request.sort)
+        order_sql = ", ".join(f"{col} {direction}" for col, direction in order)
+        params["page_limit"] = request.page_size + 1
 
-        sql = f"""
+        def _base_sql(where: str) -> str:
+            return f"""
             SELECT
                 r.station_code,
                 r.station_name,
                 r.department,
-                r.record_value,
-                r.record_date,
+                r.record_value::double precision AS record_value,
+                r.record_date::date AS record_date,
                 vs.lat,
                 vs.lon,
                 vs.alt,
@@ -1693,91 +2306,82 @@ class TimescaleTemperatureAbsoluteRecordsDataSource(
                 INNER JOIN public.v_station_records vs
                     ON vs.station_code = r.station_code
             WHERE {where}
-            ORDER BY {order_sql}
             """
-        with connection.cursor() as cur:
-            cur.execute(sql, params)
-
-            cols = [c.name for c in cur.description]
-            rows = [dict(zip(cols, row, strict=False)) for row in cur.fetchall()]
-        entries = [
-            TemperatureRecordEntry(
-                station_id=row["station_code"].strip(),
-                station_name=row["station_name"],
-                department=normalize_department(row["department"]),
-                record_value=float(row["record_value"]),
-                record_date=row["record_date"].date()
-                if isinstance(row["record_date"], dt.datetime)
-                else row["record_date"],
-                lat=row["lat"],
-                lon=row["lon"],
-                alt=row["alt"],
-                classe_recente=row["classe_recente"],
-                date_de_creation=_date_de_creation(row["annee_de_creation"]),
-                date_de_fermeture=_date_de_fermeture(row["annee_de_fermeture"]),
-            )
-            for row in rows
-        ]
-        return self._paginate(entries, request)
 
-    def _paginate(
-        self,
-        entries: list[TemperatureRecordEntry],
-        request: TemperatureRecordsRequest,
-    ) -> TemperatureRecordsResult:
-        if request.sort:
-            sort_parts = [s.strip() for s in request.sort.split(",")]
-
-            def _sort_key(entry: TemperatureRecordEntry) -> tuple[Any, ...]:
-                sort_values = []
-                for sort_part in sort_parts:
-                    sort_field = sort_part.lstrip("-")
-                    reverse = sort_part.startswith("-")
-
-                    if sort_field == "station_name":
-                        value = entry.station_name
-                    elif sort_field == "record_date":
-                        value = entry.record_date
-                    elif sort_field == "department":
-                        value = entry.department
-                    else:  # record_value
-                        value = entry.record_value
-
-                    if reverse:
-                        if isinstance(value, str):
-                            value = "".join(chr(255 - ord(c)) for c in value)
-                        elif isinstance(value, int | float):
-                            value = -value
-                        elif hasattr(value, "__neg__"):
-                            try:
-                                value = -value
-                            except TypeError:
-                                pass
-
-                    sort_values.append(value)
-
-                return tuple(sort_values)
-
-            entries = sorted(entries, key=_sort_key)
-
-        total_count = len(entries)
-        page = request.page
-        page_size = request.page_size
-
-        start = (page - 1) * page_size
-        end = start + page_size
-
-        paginated = entries[start:end]
+        where = " AND ".join(clauses)
 
-        total_pages = (total_count + page_size - 1) // page_size
+        if request.after:
+            if keyset_order is None:
+                raise ValueError(
+                    "Le curseur 'after' n'est disponible que pour les tris sur "
+                    "record_value, record_date et station_name."
+                )
+            after_values, total_count = _decode_records_cursor(
+                request.after, keyset_order
+            )
+            after_clause, after_params = _keyset_clause(
+                keyset_order, after_values, _ABSOLUTE_RECORDS_KEYSET_COLUMNS
+            )
+            params.update(after_params)
+            # Une ligne de plus que la page indique s'il y a une suite.
+            sql = f"""
+                {_base_sql(f"{where} AND {after_clause}")}
+                ORDER BY {order_sql}
+                LIMIT %(page_limit)s
+                """
+            with connection.cursor() as cur:
+                sql_shapes.execute(cur, "absolute_records.after", sql, params)
+                entries = _fetch_all_by_name(cur, _record_entry)
+                if total_count is None:
+                    sql_shapes.execute(
+                        cur,
+                        "absolute_records.count",
+                        f"SELECT COUNT(*) FROM ({_base_sql(where)}) b",
+                        params,
+                    )
+                    total_count = cur.fetchone()[0]
+        else:
+            offset = (request.page - 1) * request.page_size
+            sql = f"""
+                SELECT b.*, COUNT(*) OVER () AS total_count
+                FROM ({_base_sql(where)}) b
+                ORDER BY {order_sql}
+                LIMIT %(page_limit)s OFFSET %(page_offset)s
+                """
+            params["page_offset"] = offset
+
+            with connection.cursor() as cur:
+                sql_shapes.execute(cur, "absolute_records.page", sql, params)
+                rows = _fetch_all_by_name(cur, _record_entry_with_total)
+                if rows:
+                    total_count = rows[0][1]
+                elif offset > 0:
+                    sql_shapes.execute(
+                        cur,
+                        "absolute_records.count",
+                        f"SELECT COUNT(*) FROM ({_base_sql(where)}) b",
+                        params,
+                    )
+                    total_count = cur.fetchone()[0]
+                else:
+                    total_count = 0
+            entries = [entry for entry, _ in rows]
+
+        next_cursor = None
+        if keyset_order is not None and len(entries) > request.page_size:
+            next_cursor = _encode_records_cursor(
+                keyset_order, entries[request.page_size - 1], total_count
+            )
+        entries = entries[: request.page_size]
 
         return TemperatureRecordsResult(
-            entries=paginated,
+            entries=entries,
             pagination=PaginationRecord(
                 total_count=total_count,
-                page=page,
-                page_size=page_size,
-                total_pages=total_pages,
+                page=request.page,
+                page_size=request.page_size,
+                total_pages=(total_count + request.page_size - 1) // request.page_size,
+                next_cursor=next_cursor,
             ),
         )
 
@@ -1812,14 +2416,22 @@ class TimescaleRecordsDataSource(RecordsDataSource):
         hot_entries: list[TemperatureRecordEntry] = []
         cold_entries: list[TemperatureRecordEntry] = []
 
-        for type_records in types:
-            req = TemperatureRecordsRequest(
-                period_type=period_type,
-                type_records=type_records,
-                month=query.month,
-                season=query.season,
+        # Passages hot et cold indépendants : lancés en parallèle.
+        results = run_concurrently(
+            *(
+                functools.partial(
+                    self._hybrid.fetch_records,
+                    TemperatureRecordsRequest(
+                        period_type=period_type,
+                        type_records=type_records,
+                        month=query.month,
+                        season=query.season,
+                    ),
+                )
+                for type_records in types
             )
-            result_obj = self._hybrid.fetch_records(req)
+        )
+        for type_records, result_obj in zip(types, results, strict=True):
             if type_records == "hot":
                 hot_entries = result_obj.entries
             else:
@@ -1907,17 +2519,20 @@ class TimescaleRecordsDataSource(RecordsDataSource):
 
 
 class TimescaleTemperatureMinMaxDataSource(MinMaxGraphDataSource):
+    """
+    Pour les granularités mois / année, les buckets clos entièrement compris
+    dans la période sont lus dans les rollups (530) : un point par bucket,
+    pondéré par son nombre de jours. Le reste est lu jour par jour.
+    """
+
     def fetch_daily_series(
         self, query: MinMaxGraphQuery
     ) -> list[StationDailyMinMaxSeries]:
-        where_clauses = [
-            'q."AAAAMMJJ" BETWEEN %(date_start)s AND %(date_end)s',
-            '(q."TN" IS NOT NULL OR q."TX" IS NOT NULL)',
-        ]
+        where_clauses = ["TRUE"]
         params: dict = {"date_start": query.date_start, "date_end": query.date_end}
 
         if query.station_ids:
-            where_clauses.append('q."NUM_POSTE" = ANY(%(station_ids)s)')
+            where_clauses.append("src.station_code = ANY(%(station_ids)s)")
             params["station_ids"] = list(query.station_ids)
 
         if query.departments:
@@ -1930,42 +2545,74 @@ class TimescaleTemperatureMinMaxDataSource(MinMaxGraphDataSource):
 
         where_sql = " AND ".join(where_clauses)
 
+        span = _rollup_span(query.date_start, query.date_end, query.granularity)
+        daily_exclusion_sql = ""
+        rollup_sql = ""
+        if span is not None:
+            params.update(
+                granularity=query.granularity, span_start=span[0], span_end=span[1]
+            )
+            daily_exclusion_sql = """
+                    AND NOT (q."AAAAMMJJ" >= %(span_start)s AND q."AAAAMMJJ" < %(span_end)s)
+            """
+            rollup_sql = """
+                UNION ALL
+                SELECT
+                    u.station_code,
+                    u.bucket_start,
+                    u.sum_tn / NULLIF(u.n_tn, 0),
+                    u.sum_tx / NULLIF(u.n_tx, 0),
+                    u.n_tn,
+                    u.n_tx
+                FROM public.station_temperature_rollups u
+                WHERE u.granularity = %(granularity)s
+                    AND u.bucket_start >= %(span_start)s
+                    AND u.bucket_start < %(span_end)s
+                    AND (u.n_tn > 0 OR u.n_tx > 0)
+            """
+
         sql = f"""
+            WITH src AS (
+                SELECT
+                    q."NUM_POSTE"       AS station_code,
+                    q."AAAAMMJJ"::date  AS date,
+                    q."TN"              AS tmin,
+                    q."TX"              AS tmax,
+                    1                   AS tmin_count,
+                    1                   AS tmax_count
+                FROM public."Quotidienne" q
+                WHERE q."AAAAMMJJ" BETWEEN %(date_start)s AND %(date_end)s
+                    AND (q."TN" IS NOT NULL OR q."TX" IS NOT NULL)
+                    {daily_exclusion_sql}
+                {rollup_sql}
+            )
             SELECT
-                q."NUM_POSTE"   AS station_id,
-                s.name          AS station_name,
-                q."AAAAMMJJ"    AS date,
-                q."TN"          AS tmin,
-                q."TX"          AS tmax
-            FROM public."Quotidienne" q
+                src.station_code    AS station_id,
+                s.name              AS station_name,
+                src.date,
+                src.tmin,
+                src.tmax,
+                src.tmin_count,
+                src.tmax_count
+            FROM src
                 INNER JOIN public.v_station_qualifiee_hexagone s
-                    ON s.station_code = q."NUM_POSTE"
+                    ON s.station_code = src.station_code
                 LEFT JOIN public.ref_department_region r
                     ON r.departement = s.departement
             WHERE {where_sql}
-            ORDER BY q."NUM_POSTE", q."AAAAMMJJ"
+            ORDER BY src.station_code, src.date
         """
 
         with connection.cursor() as cur:
-            cur.execute(sql, params)
-            cols = [c.name for c in cur.description]
-            rows = [dict(zip(cols, row, strict=False)) for row in cur.fetchall()]
+            sql_shapes.execute(cur, "minmax.stations", sql, params)
+            rows = _fetch_all(cur, _station_minmax_point)
 
         grouped: dict[str, list[DailyMinMaxPoint]] = defaultdict(list)
         station_names: dict[str, str] = {}
 
-        for row in rows:
-            sid = row["station_id"].strip()
-            station_names[sid] = row["station_name"]
-            grouped[sid].append(
-                DailyMinMaxPoint(
-                    date=row["date"].date()
-                    if isinstance(row["date"], dt.datetime)
-                    else row["date"],
-                    tmin=_float_or_none(row["tmin"]),
-                    tmax=_float_or_none(row["tmax"]),
-                )
-            )
+        for sid, station_name, point in rows:
+            station_names[sid] = station_name
+            grouped[sid].append(point)
 
         return [
             StationDailyMinMaxSeries(
@@ -1979,36 +2626,138 @@ class TimescaleTemperatureMinMaxDataSource(MinMaxGraphDataSource):
     def fetch_national_daily_series(
         self, query: MinMaxGraphQuery
     ) -> list[DailyMinMaxPoint]:
-        sql = """
+        params: dict = {"date_start": query.date_start, "date_end": query.date_end}
+
+        span = _rollup_span(query.date_start, query.date_end, query.granularity)
+        daily_exclusion_sql = ""
+        rollup_sql = ""
+        if span is not None:
+            params.update(
+                granularity=query.granularity, span_start=span[0], span_end=span[1]
+            )
+            daily_exclusion_sql = """
+                AND NOT (q."AAAAMMJJ" >= %(span_start)s AND q."AAAAMMJJ" < %(span_end)s)
+            """
+            rollup_sql = """
+            UNION ALL
             SELECT
-                q."AAAAMMJJ"    AS date,
-                AVG(q."TN")     AS tmin,
-                AVG(q."TX")     AS tmax
+                u.bucket_start,
+                u.sum_tmin / u.n_days,
+                u.sum_tmax / u.n_days,
+                u.n_days,
+                u.n_days
+            FROM public.national_minmax_rollups u
+            WHERE u.granularity = %(granularity)s
+                AND u.bucket_start >= %(span_start)s
+                AND u.bucket_start < %(span_end)s
+            """
+
+        sql = f"""
+            SELECT
+                q."AAAAMMJJ"::date  AS date,
+                AVG(q."TN")         AS tmin,
+                AVG(q."TX")         AS tmax,
+                1                   AS tmin_count,
+                1                   AS tmax_count
             FROM public."Quotidienne" q
             WHERE q."AAAAMMJJ" BETWEEN %(date_start)s AND %(date_end)s
                 AND q."TN" IS NOT NULL
                 AND q."TX" IS NOT NULL
+                {daily_exclusion_sql}
             GROUP BY q."AAAAMMJJ"
-            ORDER BY q."AAAAMMJJ"
+            {rollup_sql}
+            ORDER BY date
         """
 
         with connection.cursor() as cur:
-            cur.execute(
-                sql, {"date_start": query.date_start, "date_end": query.date_end}
-            )
-            cols = [c.name for c in cur.description]
-            rows = [dict(zip(cols, row, strict=False)) for row in cur.fetchall()]
+            sql_shapes.execute(cur, "minmax.national", sql, params)
+            return _fetch_all(cur, _minmax_point)
+
+
+def _minmax_point(
+    date: dt.date, tmin, tmax, tmin_count: int, tmax_count: int
+) -> DailyMinMaxPoint:
+    return DailyMinMaxPoint(
+        date=date,
+        tmin=_float_or_none(tmin),
+        tmax=_float_or_none(tmax),
+        tmin_count=tmin_count,
+        tmax_count=tmax_count,
+    )
 
-        return [
-            DailyMinMaxPoint(
-                date=row["date"].date()
-                if isinstance(row["date"], dt.datetime)
-                else row["date"],
-                tmin=_float_or_none(row["tmin"]),
-                tmax=_float_or_none(row["tmax"]),
-            )
-            for row in rows
-        ]
+
+def _station_minmax_point(
+    station_id: str, station_name: str, *point
+) -> tuple[str, str, DailyMinMaxPoint]:
+    return station_id.strip(), station_name, _minmax_point(*point)
+
+
+class TimescaleDailyExportDataSource(DailyExportDataSource):
+    """
+    Lit v_quotidienne via un curseur côté serveur (``chunked_cursor``) : les
+    lignes arrivent par paquets de ``fetch_size``, la mémoire du worker ne
+    dépend pas de la période exportée. Le curseur vit dans une transaction
+    (sans WITH HOLD) pour que PostgreSQL produise les lignes à la demande au
+    lieu de matérialiser tout le résultat au premier commit.
+    """
+
+    def __init__(self, *, fetch_size: int = 2_000) -> None:
+        self.fetch_size = fetch_size
+
+    def iter_daily_rows(self, query: DailyExportQuery) -> Iterator[DailyExportRow]:
+        terr_clause, params = _territoire_clause_named(
+            query.territoire,
+            query.territoire_id,
+            dept_col="s.departement",
+            station_col="q.station_code",
+        )
+        where_clauses = [terr_clause or "TRUE"]
+        params.update(date_start=query.date_start, date_end=query.date_end)
+
+        if query.station_ids:
+            where_clauses.append("q.station_code = ANY(%(station_ids)s)")
+            params["station_ids"] = list(query.station_ids)
+
+        if query.departments:
+            where_clauses.append("s.departement = ANY(%(departments)s)")
+            params["departments"] = [int(d) for d in query.departments if d.isdigit()]
+
+        if query.regions:
+            where_clauses.append("r.region = ANY(%(regions)s)")
+            params["regions"] = list(query.regions)
+
+        sql = f"""
+            SELECT
+                q.station_code      AS station_id,
+                s.name              AS station_name,
+                s.departement       AS department,
+                q.date::date        AS date,
+                q.tn,
+                q.tx,
+                q.tntxm
+            FROM public.v_quotidienne q
+                INNER JOIN public.v_station_qualifiee_hexagone s
+                    ON s.station_code = q.station_code
+                LEFT JOIN public.ref_department_region r
+                    ON r.departement = s.departement
+            WHERE q.date BETWEEN %(date_start)s AND %(date_end)s
+                AND {" AND ".join(where_clauses)}
+            ORDER BY q.station_code, q.date
+        """
+
+        with transaction.atomic(), connection.chunked_cursor() as cur:
+            cur.execute(sql, params)
+            while rows := cur.fetchmany(self.fetch_size):
+                for station_id, name, department, date, tn, tx, tntxm in rows:
+                    yield DailyExportRow(
+                        station_id=station_id.strip(),
+                        station_name=name,
+                        department=department,
+                        date=date,
+                        tn=_float_or_none(tn),
+                        tx=_float_or_none(tx),
+                        tntxm=_float_or_none(tntxm),
+                    )
 
 
 def _date_de_creation(annee: int) -> dt.date:
@@ -2077,6 +2826,36 @@ def _generate_buckets(
     return _generate_buckets_year(date_start, date_end)
 
 
+_BUCKET_LABEL_FORMATS = {"day": "%Y-%m-%d", "month": "%Y-%m", "year": "%Y"}
+
+
+def _records_graph_record(
+    station_code: str,
+    station_name: str,
+    department: str,
+    record_value,
+    record_date: dt.date,
+    record_type: str,
+) -> RecordsGraphRecord:
+    return RecordsGraphRecord(
+        date=record_date,
+        station_id=station_code,
+        station_name=station_name,
+        department=department,
+        type_records="hot" if record_type == "TX" else "cold",
+        valeur=float(record_value),
+    )
+
+
+def _station_records_graph_record(
+    station_code: str, station_name: str, departement: int, *columns
+) -> RecordsGraphRecord:
+    """Records lus via v_station_records (code paddé, département numérique)."""
+    return _records_graph_record(
+        station_code.strip(), station_name, normalize_department(departement), *columns
+    )
+
+
 class TimescaleRecordsGraphDataSource(RecordsGraphDataSource):
     """
     Data source pour le graphe de records.
@@ -2141,29 +2920,22 @@ class TimescaleRecordsGraphDataSource(RecordsGraphDataSource):
                 station_name,
                 department,
                 record_value,
-                record_date,
+                record_date::date,
                 record_type
             FROM public.mv_records_battus
             WHERE {where}
             ORDER BY record_date
         """
 
+        label_format = _BUCKET_LABEL_FORMATS[date_trunc]
         with connection.cursor() as cur:
-            cur.execute(sql, params)
-            cols = [c[0] for c in cur.description]
+            sql_shapes.execute(cur, "records_graph.buckets", sql, params)
             bucket_rows = {
-                row["bucket_date"].strftime(
-                    "%Y-%m-%d"
-                    if date_trunc == "day"
-                    else "%Y-%m"
-                    if date_trunc == "month"
-                    else "%Y"
-                ): row["cnt"]
-                for row in (dict(zip(cols, r, strict=False)) for r in cur.fetchall())
+                bucket_date.strftime(label_format): cnt
+                for bucket_date, cnt in cur.fetchall()
             }
-            cur.execute(sql_records, params)
-            cols = [c[0] for c in cur.description]
-            record_rows = [dict(zip(cols, r, strict=False)) for r in cur.fetchall()]
+            sql_shapes.execute(cur, "records_graph.records", sql_records, params)
+            records = _fetch_all(cur, _records_graph_record)
 
         all_buckets = _generate_buckets(
             request.date_start, request.date_end, request.granularity
@@ -2172,19 +2944,6 @@ class TimescaleRecordsGraphDataSource(RecordsGraphDataSource):
             RecordsGraphBucket(bucket=b, nb_records_battus=bucket_rows.get(b, 0))
             for b in all_buckets
         ]
-        records = [
-            RecordsGraphRecord(
-                date=row["record_date"].date()
-                if hasattr(row["record_date"], "date")
-                else row["record_date"],
-                station_id=row["station_code"],
-                station_name=row["station_name"],
-                department=row["department"],
-                type_records="hot" if row["record_type"] == "TX" else "cold",
-                valeur=float(row["record_value"]),
-            )
-            for row in record_rows
-        ]
         return RecordsGraphResult(buckets=buckets, records=records)
 
 
@@ -2195,11 +2954,12 @@ class HybridRecordsGraphDataSource(RecordsGraphDataSource):
     données (après cutoff_date) via une window function amorcée par les records
     actuels de la MV.
 
-    La MV n'est jamais rafraîchie. La cutoff_date est stockée dans
-    mv_records_battus_meta au moment de la création de la MV.
+    La cutoff_date (celle du dernier refresh_records_mv) est lue dans le
+    registre data_version, mis en cache par worker. Sans cutoff enregistrée
+    (env de dev sans script de seed exécuté) : MV seule.
 
-    Fallback silencieux vers la MV seule si mv_records_battus_meta est absente
-    ou vide (env de dev sans script de seed exécuté).
+    Post-cutoff incrémental via records_battus_state / records_battus_recents,
+    comme HybridTemperatureRecordsDataSource.
     """
 
     def __init__(self) -> None:
@@ -2207,10 +2967,7 @@ class HybridRecordsGraphDataSource(RecordsGraphDataSource):
 
     def fetch_graph(self, request: RecordsGraphRequest) -> RecordsGraphResult:
         mv_result = self._mv_source.fetch_graph(request)
-        try:
-            cutoff = self._get_cutoff_date()
-        except Exception:
-            return mv_result
+        cutoff = data_version.get().records_cutoff
         if cutoff is None:
             return mv_result
         if request.date_end < cutoff:
@@ -2232,35 +2989,18 @@ class HybridRecordsGraphDataSource(RecordsGraphDataSource):
         buckets = self._compute_buckets(all_records, request)
         return RecordsGraphResult(buckets=buckets, records=all_records)
 
-    def _get_cutoff_date(self) -> dt.date | None:
-        with connection.cursor() as cur:
-            cur.execute("SELECT cutoff_date FROM public.mv_records_battus_meta LIMIT 1")
-            row = cur.fetchone()
-        return row[0] if row else None
-
     def _fetch_records_after_cutoff(
         self,
         request: RecordsGraphRequest,
         cutoff_date: dt.date,
         type_records: str,
     ) -> list[RecordsGraphRecord]:
-        hot = type_records == "hot"
-        col = "tx" if hot else "tn"
-        agg = "MAX" if hot else "MIN"
-        cmp = ">" if hot else "<"
-        extremum_fn = "GREATEST" if hot else "LEAST"
-        neutral_val = (
-            "'-Infinity'::double precision" if hot else "'Infinity'::double precision"
+        progressive_sql, params = _progressive_records_after_cutoff_sql(
+            request,
+            type_records,
+            cutoff_date,
+            _get_records_state_watermark(cutoff_date),
         )
-        record_type = "TX" if hot else "TN"
-
-        (
-            derived_period_expr,
-            seeds_value_clause,
-            date_period_clause,
-            period_named_params,
-            period_value,
-        ) = _hybrid_period_sql_parts(request)
 
         terr_clause, terr_named_params = _territoire_clause_named(
             request.territoire,
@@ -2270,100 +3010,32 @@ class HybridRecordsGraphDataSource(RecordsGraphDataSource):
         terr_filter_clause = f"AND {terr_clause}" if terr_clause else ""
 
         sql = f"""
-            WITH mv_seeds AS (
-                SELECT station_code, period_value, {agg}(seed_val) AS seed_val
-                FROM (
-                    -- Records progressifs (post-50-ans). Peut être vide pour
-                    -- une station dont le record absolu date d'avant
-                    -- first_temp + 50 ans.
-                    SELECT station_code, period_value, {agg}(record_value) AS seed_val
-                    FROM public.mv_records_battus
-                    WHERE record_type = %(record_type)s
-                      AND period_type = %(period_type)s
-                      {seeds_value_clause}
-                    GROUP BY station_code, period_value
-                    UNION ALL
-                    -- Records absolus (sans filtre 50-ans sur la date du
-                    -- record). Couvre le cas où le record absolu est trop
-                    -- ancien pour figurer dans mv_records_battus.
-                    SELECT station_code, period_value, record_value AS seed_val
-                    FROM public.v_records_absolus_par_type
-                    WHERE record_type = %(record_type)s
-                      AND period_type = %(period_type)s
-                      {seeds_value_clause}
-                ) combined
-                GROUP BY station_code, period_value
-            ),
-            ordered AS (
-                SELECT
-                    q.station_code,
-                    q.date,
-                    q.{col},
-                    {extremum_fn}(
-                        COALESCE(s.seed_val, {neutral_val}),
-                        COALESCE(
-                            {agg}(q.{col}) OVER (
-                                PARTITION BY q.station_code, {derived_period_expr}
-                                ORDER BY q.date
-                                ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-                            ),
-                            {neutral_val}
-                        )
-                    ) AS prev_val
-                FROM public.v_quotidienne q
-                    LEFT JOIN mv_seeds s
-                        ON s.station_code = q.station_code
-                        AND s.period_value IS NOT DISTINCT FROM {derived_period_expr}
-                WHERE q.date >= %(cutoff_date)s
-                    AND {date_period_clause}
-                    AND q.{col} IS NOT NULL
-            )
             SELECT
                 o.station_code,
                 vs.name,
                 vs.departement,
-                o.{col} AS record_value,
-                o.date
-            FROM ordered o
+                o.record_value,
+                o.record_date,
+                %(record_type)s AS record_type
+            FROM ({progressive_sql}) o
                 INNER JOIN public.v_station_records vs
                     ON vs.station_code = o.station_code
-            WHERE o.{col} {cmp} o.prev_val
-                AND o.date >= vs.first_temperature_date + interval '50 years'
-                AND o.date >= %(date_start)s
-                AND o.date <= %(date_end)s
+            WHERE o.record_date >= vs.first_temperature_date + interval '50 years'
+                AND o.record_date >= %(date_start)s
+                AND o.record_date <= %(date_end)s
                 {terr_filter_clause}
         """
 
         params = {
-            "record_type": record_type,
-            "period_type": request.period_type,
-            "cutoff_date": cutoff_date,
+            **params,
             "date_start": request.date_start,
             "date_end": request.date_end,
-            **period_named_params,
             **terr_named_params,
         }
-        if period_value is not None:
-            params["period_value"] = period_value
 
         with connection.cursor() as cur:
-            cur.execute(sql, params)
-            cols = [c.name for c in cur.description]
-            rows = [dict(zip(cols, row, strict=False)) for row in cur.fetchall()]
-
-        return [
-            RecordsGraphRecord(
-                date=row["date"].date()
-                if isinstance(row["date"], dt.datetime)
-                else row["date"],
-                station_id=row["station_code"].strip(),
-                station_name=row["name"],
-                department=normalize_department(row["departement"]),
-                type_records="hot" if hot else "cold",
-                valeur=float(row["record_value"]),
-            )
-            for row in rows
-        ]
+            sql_shapes.execute(cur, "records_graph.hybrid_after_cutoff", sql, params)
+            return _fetch_all(cur, _station_records_graph_record)
 
     def _compute_buckets(
         self,
@@ -2453,30 +3125,24 @@ class TimescaleAbsoluteRecordsGraphDataSource(AbsoluteRecordsGraphDataSource):
                 station_name,
                 department,
                 record_value,
-                record_date,
+                record_date::date,
                 record_type
             FROM public.v_records_absolus_par_type
             WHERE {where}
             ORDER BY record_date
         """
 
+        label_format = _BUCKET_LABEL_FORMATS[date_trunc]
         with connection.cursor() as cur:
-            cur.execute(sql, params)
-            cols = [c[0] for c in cur.description]
+            sql_shapes.execute(cur, "absolute_records_graph.buckets", sql, params)
             bucket_rows = {
-                row["bucket_date"].strftime(
-                    "%Y-%m-%d"
-                    if date_trunc == "day"
-                    else "%Y-%m"
-                    if date_trunc == "month"
-                    else "%Y"
-                ): row["cnt"]
-                for row in (dict(zip(cols, r, strict=False)) for r in cur.fetchall())
+                bucket_date.strftime(label_format): cnt
+                for bucket_date, cnt in cur.fetchall()
             }
-
-            cur.execute(sql_records, params)
-            cols = [c[0] for c in cur.description]
-            record_rows = [dict(zip(cols, r, strict=False)) for r in cur.fetchall()]
+            sql_shapes.execute(
+                cur, "absolute_records_graph.records", sql_records, params
+            )
+            records = _fetch_all(cur, _records_graph_record)
 
         all_buckets = _generate_buckets(
             request.date_start, request.date_end, request.granularity
@@ -2487,17 +3153,4 @@ class TimescaleAbsoluteRecordsGraphDataSource(AbsoluteRecordsGraphDataSource):
             )
             for b in all_buckets
         ]
-        records = [
-            RecordsGraphRecord(
-                date=row["record_date"].date()
-                if hasattr(row["record_date"], "date")
-                else row["record_date"],
-                station_id=row["station_code"],
-                station_name=row["station_name"],
-                department=row["department"],
-                type_records="hot" if row["record_type"] == "TX" else "cold",
-                valeur=float(row["record_value"]),
-            )
-            for row in record_rows
-        ]
         return AbsoluteRecordsGraphResult(buckets=buckets, records=records)
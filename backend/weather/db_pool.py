@@ -0,0 +1,49 @@
+"""Statistiques du pool de connexions psycopg (``settings.DB_POOL_*``).
+
+Le pool vit dans chaque process : ces statistiques sont celles du worker
+courant (connexions ouvertes / disponibles, requêtes mises en attente, temps
+d'attente, connexions perdues ou rejetées par le check…), voir
+``psycopg_pool.ConnectionPool.get_stats``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+_finished_requests = itertools.count(1)
+
+
+def connection_pool(alias: str = DEFAULT_DB_ALIAS):
+    """Pool de la connexion ``alias``, ``None`` si le pool n'est pas configuré."""
+    return getattr(connections[alias], "pool", None)
+
+
+def pool_stats(alias: str = DEFAULT_DB_ALIAS) -> dict[str, int] | None:
+    """Statistiques courantes du pool (compteurs depuis le dernier ``pop_stats``)."""
+    pool = connection_pool(alias)
+    return None if pool is None else pool.get_stats()
+
+
+def log_pool_stats(sender=None, **kwargs) -> None:
+    """
+    Handler de ``request_finished`` : journalise puis remet à zéro les compteurs
+    du pool toutes les ``DB_POOL_STATS_EVERY`` requêtes.
+    """
+    every = settings.DB_POOL_STATS_EVERY
+    if not every or next(_finished_requests) % every:
+        return
+    pool = connection_pool()
+    if pool is None:
+        return
+    stats = pool.pop_stats()
+    logger.info(
+        "pool %s : %s",
+        pool.name,
+        " ".join(f"{key}={value}" for key, value in sorted(stats.items())),
+    )
@@ -355,3 +355,55 @@ class ReadYearlyTemperaturesTests:
         temp_daily["date"] = pd.to_datetime(temp_daily["date"])
 
         return stations, temp_daily
+
+
+class ReadLongTemperaturesTests:
+    def read_temperatures(
+        self,
+        stations_itn: Iterable | None = None,
+        start_date: str | pd.Timestamp | datetime.datetime | None = None,
+        end_date: str | pd.Timestamp | datetime.datetime | None = None,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Read a seeded random dataset covering 1989-2022 and return two pandas
+        DataFrames that mimic the result of `read_temperatures_using_database`.
+
+        It spans the whole 1991-2020 baseline and the Reims transition, with
+        missing values scattered over every station and a month (February
+        2000) without any value.
+        """
+
+        rng = np.random.default_rng(2026)
+        dates = pd.date_range("1989-01-01", "2022-12-31", freq="D")
+        stations = pd.DataFrame(
+            [
+                {"id": REIMS_COURCY_ID, "code": REIMS_COURCY_ID, "nom": "Reims-Courcy"},
+                {"id": REIMS_PRUNAY_ID, "code": REIMS_PRUNAY_ID, "nom": "Reims-Prunay"},
+                {"id": "75114001", "code": "75114001", "nom": "Paris - Montsouris"},
+                {"id": "13054001", "code": "13054001", "nom": "Marseille - Marignane"},
+            ]
+        )
+
+        seasonal = 8 * np.sin(2 * np.pi * (dates.dayofyear.to_numpy() - 110) / 365.25)
+        frames = []
+        for offset, station_id in enumerate(stations["id"]):
+            temp_min = 5 + offset + seasonal + rng.normal(0, 3, len(dates))
+            temp_max = temp_min + rng.uniform(4, 14, len(dates))
+            missing = rng.random(len(dates)) < 0.05
+            missing |= (dates.year == 2000) & (dates.month == 2)
+            temp_min[missing] = np.nan
+            temp_max[rng.random(len(dates)) < 0.02] = np.nan
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "station_id": station_id,
+                        "nom": stations["nom"][offset],
+                        "date": dates,
+                        "temp_max": temp_max,
+                        "temp_min": temp_min,
+                        "tntxm": (temp_min + temp_max) / 2,
+                    }
+                )
+            )
+
+        return stations, pd.concat(frames, ignore_index=True)
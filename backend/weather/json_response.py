@@ -0,0 +1,301 @@
+"""Encodage rapide des réponses JSON des endpoints ``/temperature/*``.
+
+Les vues construisaient ``XxxResponseSerializer(data=payload)`` puis appelaient
+``is_valid()`` : chaque float et chaque date des séries (plusieurs dizaines de
+milliers de points) était re-parsé par les champs DRF, re-sérialisé, puis rendu
+par ``JSONRenderer``.
+
+Ici le payload produit par la couche service (dicts ou dataclasses) est encodé
+directement en octets par orjson, via un plan de conversion compilé une fois
+par serializer de réponse. Le plan reproduit ``serializer.data`` : mêmes clés
+(champ absent : sa valeur par défaut, ``null`` si ``allow_null``, sinon omis),
+mêmes types de sortie (float, int, str, booléen, date ISO), sans validation.
+
+Le serializer reste le contrat de la réponse (schéma OpenAPI) et sert
+d'assertion : si ``settings.RESPONSE_SCHEMA_CHECK`` est actif (DEBUG, tests),
+le payload est aussi validé par le serializer et les deux sorties comparées.
+
+Représentation en colonnes (endpoints graphes, ``ColumnarResponseMixin``) :
+négociée par ``Accept: application/vnd.meteo.columnar+json`` (ou
+``?format=columnar``), le JSON restant le défaut. Chaque liste de points
+(objets à champs scalaires : ``time_series``, ``data``, ``records``…) devient
+un objet de tableaux parallèles ``{"date": [...], "temperature": [...]}`` :
+les clés ne sont plus répétées à chaque point, et les dates de ces colonnes
+sont des entiers (jours depuis le 1970-01-01). Le reste de la réponse
+(metadata, identifiants de stations…) est inchangé.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime as dt
+import functools
+import json
+from collections.abc import Callable, Mapping
+from typing import Any
+
+import orjson
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework import serializers, status
+from rest_framework.fields import empty
+from rest_framework.renderers import JSONRenderer
+
+Converter = Callable[[Any], Any]
+
+JSON_MEDIA_TYPE = "application/json"
+COLUMNAR_MEDIA_TYPE = "application/vnd.meteo.columnar+json"
+
+_MISSING = object()
+_EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
+
+
+class JSONBytesResponse(HttpResponse):
+    """Réponse dont le corps JSON est déjà encodé (pas de passage par un renderer)."""
+
+    def __init__(
+        self,
+        content: bytes,
+        status: int = status.HTTP_200_OK,
+        content_type: str = JSON_MEDIA_TYPE,
+    ) -> None:
+        super().__init__(content, content_type=content_type, status=status)
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Déclare la représentation en colonnes auprès de la négociation DRF. Les
+    réponses 200 sont encodées par ``json_response`` ; ce renderer ne rend que
+    les erreurs (400, 501…), identiques au JSON.
+    """
+
+    media_type = COLUMNAR_MEDIA_TYPE
+    format = "columnar"
+
+
+class ColumnarResponseMixin:
+    """Vue proposant la représentation en colonnes en plus du JSON (défaut)."""
+
+    renderer_classes = [JSONRenderer, ColumnarJSONRenderer]
+
+    def columnar_requested(self) -> bool:
+        return isinstance(
+            getattr(self.request, "accepted_renderer", None), ColumnarJSONRenderer
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+
+def _date(value: Any) -> str:
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _epoch_day(value: Any) -> int:
+    if isinstance(value, str):
+        value = dt.date.fromisoformat(value)
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+# Équivalents rapides de ``field.to_representation`` (premier type correspondant).
+_SCALAR_CONVERTERS: tuple[tuple[type[serializers.Field], Converter], ...] = (
+    (serializers.BooleanField, bool),
+    (serializers.FloatField, float),
+    (serializers.IntegerField, int),
+    (serializers.DateField, _date),
+    (serializers.ChoiceField, _identity),
+    (serializers.CharField, str),
+)
+
+
+def _is_flat(serializer: serializers.Serializer) -> bool:
+    return not any(
+        isinstance(
+            field,
+            serializers.Serializer
+            | serializers.ListSerializer
+            | serializers.ListField
+            | serializers.DictField,
+        )
+        for field in serializer.fields.values()
+    )
+
+
+def _compile_field(field: serializers.Field, columnar: bool = False) -> Converter:
+    if isinstance(field, serializers.ListSerializer):
+        if columnar and _is_flat(field.child):
+            return _compile_columns(field.child)
+        convert_item = _compile_field(field.child, columnar)
+        return lambda items: [convert_item(item) for item in items]
+
+    if isinstance(field, serializers.Serializer):
+        return _compile_serializer(field, columnar)
+
+    if isinstance(field, serializers.ListField):
+        convert_item = _compile_field(field.child)
+        return lambda items: [
+            None if item is None else convert_item(item) for item in items
+        ]
+
+    if isinstance(field, serializers.DictField):
+        convert_value = _compile_field(field.child)
+        return lambda mapping: {
+            str(key): None if value is None else convert_value(value)
+            for key, value in mapping.items()
+        }
+
+    for field_class, converter in _SCALAR_CONVERTERS:
+        if isinstance(field, field_class):
+            return converter
+
+    # Champ sans équivalent rapide (enfant non typé d'un DictField, champ custom).
+    return field.to_representation
+
+
+def _value_if_missing(field: serializers.Field) -> Any:
+    # Comme Field.get_attribute : default, sinon None si allow_null, sinon omis.
+    if field.default is not empty:
+        return field.get_default()
+    if field.allow_null:
+        return None
+    return _MISSING
+
+
+def _compile_serializer(
+    serializer: serializers.Serializer, columnar: bool = False
+) -> Converter:
+    plan = [
+        (name, field.source, _compile_field(field, columnar), _value_if_missing(field))
+        for name, field in serializer.fields.items()
+        if not field.write_only
+    ]
+
+    def convert(obj: Any) -> dict[str, Any]:
+        if isinstance(obj, Mapping):
+            get = obj.get
+        else:
+            get = functools.partial(getattr, obj)
+        out = {}
+        for name, source, converter, if_missing in plan:
+            value = get(source, _MISSING)
+            if value is _MISSING:
+                if if_missing is _MISSING:
+                    continue
+                value = if_missing
+            out[name] = None if value is None else converter(value)
+        return out
+
+    return convert
+
+
+def _compile_columns(child: serializers.Serializer) -> Converter:
+    # Une valeur par point dans chaque colonne : un champ absent vaut null.
+    columns = []
+    for name, field in child.fields.items():
+        if field.write_only:
+            continue
+        if_missing = _value_if_missing(field)
+        if isinstance(field, serializers.DateField):
+            converter = _epoch_day
+        else:
+            converter = _compile_field(field)
+        columns.append(
+            (
+                name,
+                field.source,
+                converter,
+                None if if_missing is _MISSING else if_missing,
+            )
+        )
+
+    def convert(items: Any) -> dict[str, list[Any]]:
+        getters = [
+            item.get if isinstance(item, Mapping) else functools.partial(getattr, item)
+            for item in items
+        ]
+        out = {}
+        for name, source, converter, if_missing in columns:
+            column = []
+            for get in getters:
+                value = get(source, if_missing)
+                column.append(None if value is None else converter(value))
+            out[name] = column
+        return out
+
+    return convert
+
+
+@functools.cache
+def response_converter(
+    serializer_class: type[serializers.Serializer], columnar: bool = False
+) -> Converter:
+    """Plan de conversion (compilé une fois) du payload vers ``serializer.data``."""
+    return _compile_serializer(serializer_class(), columnar)
+
+
+def encode_response(
+    serializer_class: type[serializers.Serializer],
+    payload: Any,
+    *,
+    columnar: bool = False,
+) -> bytes:
+    """Encode ``payload`` en JSON selon le contrat de ``serializer_class``, sans validation."""
+    return orjson.dumps(response_converter(serializer_class, columnar)(payload))
+
+
+def _as_data(value: Any) -> Any:
+    """Dataclasses -> dicts, pour valider le payload via ``serializer(data=...)``."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: _as_data(getattr(value, f.name)) for f in dataclasses.fields(value)
+        }
+    if isinstance(value, Mapping):
+        return {key: _as_data(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_as_data(item) for item in value]
+    return value
+
+
+def check_response_schema(
+    serializer_class: type[serializers.Serializer], payload: Any, content: bytes
+) -> None:
+    """Valide ``payload`` par le serializer et compare sa sortie à ``content``."""
+    serializer = serializer_class(data=_as_data(payload))
+    serializer.is_valid(raise_exception=True)
+    expected = json.loads(JSONRenderer().render(serializer.data))
+    actual = orjson.loads(content)
+    if actual != expected:
+        raise AssertionError(
+            f"Encodage rapide divergent de {serializer_class.__name__}.data"
+        )
+
+
+def json_response(
+    serializer_class: type[serializers.Serializer],
+    payload: Any,
+    *,
+    columnar: bool = False,
+) -> JSONBytesResponse:
+    """Réponse 200 encodée via ``encode_response`` (contrôle du schéma si activé).
+
+    Le contrôle compare la forme en lignes : pour une réponse en colonnes, elle
+    n'est encodée que s'il est activé.
+    """
+    rows = None
+    if not columnar or settings.RESPONSE_SCHEMA_CHECK:
+        rows = encode_response(serializer_class, payload)
+    if settings.RESPONSE_SCHEMA_CHECK:
+        check_response_schema(serializer_class, payload, rows)
+    if not columnar:
+        return JSONBytesResponse(rows)
+    return JSONBytesResponse(
+        encode_response(serializer_class, payload, columnar=True),
+        content_type=COLUMNAR_MEDIA_TYPE,
+    )
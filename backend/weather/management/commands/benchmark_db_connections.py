@@ -0,0 +1,103 @@
+import copy
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, override_settings
+
+from weather.db_pool import pool_stats
+
+# Endpoints peu coûteux : le temps de connexion y pèse le plus.
+DEFAULT_PATHS = (
+    "/api/v1/stations/",
+    "/api/v1/temperature/national-indicator/kpi"
+    "?date_start=2024-01-01&date_end=2024-12-31",
+)
+
+_DEFAULT_POOL = {"name": "weather", "min_size": 1, "max_size": 4}
+
+
+def _percentile(timings: list[float], q: int) -> float:
+    return statistics.quantiles(timings, n=100, method="inclusive")[q - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare, sur la base courante, la latence (p50/p99) d'endpoints peu "
+        "coûteux avec une connexion ouverte par requête et avec le pool psycopg "
+        "(settings DB_POOL_*), cache des réponses désactivé"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            action="append",
+            default=None,
+            help="Chemin à appeler (répétable, défaut : /stations et KPI)",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+
+    def handle(self, *args, **options):
+        if options["requests"] < 2:
+            raise CommandError("--requests doit être >= 2.")
+        conn = connections[DEFAULT_DB_ALIAS]
+        if conn.in_atomic_block:
+            raise CommandError(
+                "À lancer hors transaction : chaque requête ferme sa connexion."
+            )
+
+        saved = copy.deepcopy(
+            {key: conn.settings_dict.get(key) for key in ("OPTIONS", "CONN_MAX_AGE")}
+        )
+        pool_options = saved["OPTIONS"].get("pool") or _DEFAULT_POOL
+        client = Client(HTTP_HOST=_allowed_host())
+        try:
+            with override_settings(RESPONSE_CACHE_ENABLED=False):
+                for path in options["path"] or DEFAULT_PATHS:
+                    self._compare(client, conn, path, options["requests"], pool_options)
+        finally:
+            conn.close()
+            conn.close_pool()
+            conn.settings_dict.update(saved)
+
+    def _compare(self, client, conn, path, requests, pool_options):
+        self.stdout.write(path)
+        for label, pool in (("connexion par requête", None), ("pool", pool_options)):
+            _configure(conn, pool)
+            timings = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = client.get(path)
+                # Fin de requête avec CONN_MAX_AGE=0 (le client de test ne ferme
+                # pas les connexions) : fermeture, ou retour au pool.
+                conn.close()
+                timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f"{path} : HTTP {response.status_code}.")
+            self.stdout.write(
+                f"  {label:<22} p50 {_percentile(timings, 50):8.2f} ms  "
+                f"p99 {_percentile(timings, 99):8.2f} ms"
+            )
+        stats = pool_stats()
+        self.stdout.write(
+            "  stats pool : "
+            + " ".join(f"{key}={value}" for key, value in sorted(stats.items()))
+        )
+
+
+def _allowed_host() -> str:
+    hosts = [host for host in settings.ALLOWED_HOSTS if "*" not in host]
+    return hosts[0].lstrip(".") if hosts else "localhost"
+
+
+def _configure(conn, pool_options) -> None:
+    conn.close()
+    conn.close_pool()
+    conn.settings_dict["CONN_MAX_AGE"] = 0
+    options = conn.settings_dict["OPTIONS"]
+    if pool_options is None:
+        options.pop("pool", None)
+    else:
+        options["pool"] = copy.deepcopy(pool_options)
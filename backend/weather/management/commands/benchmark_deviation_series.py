@@ -0,0 +1,103 @@
+import datetime as dt
+import math
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from weather.data_sources.reference_data import reference_data
+from weather.data_sources.timescale import TimescaleTemperatureDeviationDailyDataSource
+from weather.services.temperature_deviation.types import DailyDeviationSeriesQuery
+
+PATHS = {
+    "jointure SQL": True,
+    "référentiel en mémoire": False,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare les deux chemins de fetch_stations_daily_series (jointure "
+        "baseline en SQL / référentiel en mémoire) sur la base courante"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stations",
+            help="Codes station séparés par des virgules (défaut : --station-count "
+            "premières stations de v_station_deviation)",
+        )
+        parser.add_argument("--station-count", type=int, default=20)
+        parser.add_argument(
+            "--date-start", type=dt.date.fromisoformat, default=dt.date(1991, 1, 1)
+        )
+        parser.add_argument(
+            "--date-end", type=dt.date.fromisoformat, default=dt.date.today()
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if options["stations"]:
+            station_ids = tuple(options["stations"].split(","))
+        else:
+            with connection.cursor() as cur:
+                cur.execute(
+                    "SELECT station_code FROM public.v_station_deviation"
+                    " ORDER BY station_code LIMIT %s",
+                    [options["station_count"]],
+                )
+                station_ids = tuple(row[0] for row in cur.fetchall())
+        if not station_ids:
+            raise CommandError("Aucune station à comparer.")
+
+        query = DailyDeviationSeriesQuery(
+            date_start=options["date_start"],
+            date_end=options["date_end"],
+            station_ids=station_ids,
+            include_national=False,
+        )
+        self.stdout.write(
+            f"{len(station_ids)} stations, {query.date_start} -> {query.date_end}, "
+            f"{options['repeat']} exécutions par chemin"
+        )
+
+        # Chargement du référentiel hors mesure.
+        reference_data.get()
+
+        results = {}
+        for label, baseline_in_sql in PATHS.items():
+            ds = TimescaleTemperatureDeviationDailyDataSource(
+                baseline_in_sql=baseline_in_sql
+            )
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                series = ds.fetch_stations_daily_series(query)
+                timings.append((time.perf_counter() - started) * 1000)
+            results[label] = series
+            points = sum(len(s.points) for s in series)
+            self.stdout.write(
+                f"{label:<24} {points:>9} points  "
+                f"min {min(timings):9.1f} ms  "
+                f"médiane {statistics.median(timings):9.1f} ms"
+            )
+
+        joined, snapshot = results.values()
+        if not _same_series(joined, snapshot):
+            raise CommandError("Les deux chemins renvoient des séries différentes.")
+        self.stdout.write(self.style.SUCCESS("Séries identiques sur les deux chemins."))
+
+
+def _same_series(left, right) -> bool:
+    if [(s.station_id, s.station_name, len(s.points)) for s in left] != [
+        (s.station_id, s.station_name, len(s.points)) for s in right
+    ]:
+        return False
+    return all(
+        a.date == b.date
+        and math.isclose(a.temperature, b.temperature)
+        and math.isclose(a.baseline_mean, b.baseline_mean)
+        for sl, sr in zip(left, right, strict=True)
+        for a, b in zip(sl.points, sr.points, strict=True)
+    )
@@ -0,0 +1,119 @@
+import datetime as dt
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from weather.data_sources import timescale
+from weather.data_sources.sql_shapes import sql_shapes
+from weather.services.records_graph.types import RecordsGraphRequest
+from weather.services.temperature_deviation.types import (
+    TemperatureDeviationOverviewQuery,
+)
+from weather.services.temperature_minmax.types import MinMaxGraphQuery
+from weather.services.temperature_records.types import TemperatureRecordsRequest
+
+
+def _cases(date_start: dt.date, date_end: dt.date) -> dict:
+    records_request = TemperatureRecordsRequest(
+        period_type="month",
+        type_records="hot",
+        month=date_start.month,
+        date_start=date_start,
+        date_end=date_end,
+        page_size=20,
+    )
+    overview_query = TemperatureDeviationOverviewQuery(
+        date_start=date_start,
+        date_end=date_end,
+        ordering="station_name",
+        limit=20,
+        offset=0,
+    )
+    minmax_query = MinMaxGraphQuery(
+        date_start=date_start, date_end=date_end, granularity="day"
+    )
+    graph_request = RecordsGraphRequest(
+        date_start=date_start,
+        date_end=date_end,
+        granularity="day",
+        period_type="all_time",
+        type_records="all",
+    )
+    records = timescale.TimescaleTemperatureRecordsDataSource()
+    deviation = timescale.TimescaleTemperatureDeviationDailyDataSource()
+    minmax = timescale.TimescaleTemperatureMinMaxDataSource()
+    graph = timescale.TimescaleRecordsGraphDataSource()
+    return {
+        "records (progressifs)": lambda: records.fetch_records(records_request),
+        "deviation": lambda: deviation.fetch_station_overview(overview_query),
+        "extremes/graph national": lambda: minmax.fetch_national_daily_series(
+            minmax_query
+        ),
+        "records/graph": lambda: graph.fetch_graph(graph_request),
+    }
+
+
+def _median_ms(func, repeat: int) -> tuple[float, object]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare, sur une même connexion, les requêtes de timescale.py exécutées "
+        "sans préparation et en requêtes préparées (registre sql_shapes), puis "
+        "affiche les compteurs par forme"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date-start", type=dt.date.fromisoformat, default=dt.date(2024, 7, 1)
+        )
+        parser.add_argument(
+            "--date-end", type=dt.date.fromisoformat, default=dt.date(2024, 7, 31)
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        connection.ensure_connection()
+        raw_conn = connection.connection
+        threshold = raw_conn.prepare_threshold
+        if threshold is None:
+            raise CommandError("Requêtes préparées désactivées (prepare_threshold).")
+
+        repeat = options["repeat"]
+        cases = _cases(options["date_start"], options["date_end"])
+        raw_conn.prepare_threshold = None
+        try:
+            unprepared = {
+                name: _median_ms(func, repeat) for name, func in cases.items()
+            }
+        finally:
+            raw_conn.prepare_threshold = threshold
+
+        sql_shapes.reset()
+        for name, func in cases.items():
+            before_ms, before = unprepared[name]
+            after_ms, after = _median_ms(func, repeat)
+            if before != after:
+                raise CommandError(f"{name} : résultats différents.")
+            self.stdout.write(
+                f"{name:<24} non préparée {before_ms:8.2f} ms  "
+                f"préparée {after_ms:8.2f} ms"
+            )
+
+        self.stdout.write("Formes :")
+        for shape in sql_shapes.snapshot():
+            if not shape.preparations:
+                continue
+            self.stdout.write(
+                f"  {shape.name:<36} préparation {shape.preparations:>3} x "
+                f"{shape.mean_prepare_ms:8.2f} ms  "
+                f"exécution {shape.executions:>4} x {shape.mean_execute_ms:8.2f} ms"
+            )
@@ -0,0 +1,128 @@
+import datetime as dt
+import json
+import statistics
+import time
+
+import orjson
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from weather.json_response import encode_response
+from weather.serializers import (
+    AbsoluteRecordsGraphResponseSerializer,
+    NationalIndicatorKpiResponseSerializer,
+    NationalIndicatorResponseSerializer,
+    RecordsGraphResponseSerializer,
+    TemperatureDeviationOverviewResponseSerializer,
+    TemperatureDeviationResponseSerializer,
+    TemperatureMinMaxGraphResponseSerializer,
+    TemperatureRecordsResponseSerializer,
+)
+
+# Endpoint -> serializer de réponse.
+ENDPOINTS: dict[str, type[serializers.Serializer]] = {
+    "national-indicator": NationalIndicatorResponseSerializer,
+    "national-indicator/kpi": NationalIndicatorKpiResponseSerializer,
+    "deviation/graph": TemperatureDeviationResponseSerializer,
+    "deviation": TemperatureDeviationOverviewResponseSerializer,
+    "extremes/graph": TemperatureMinMaxGraphResponseSerializer,
+    "records": TemperatureRecordsResponseSerializer,
+    "records/graph": RecordsGraphResponseSerializer,
+    "records/absolute/graph": AbsoluteRecordsGraphResponseSerializer,
+}
+
+_FIRST_DAY = dt.date(1950, 1, 1)
+
+
+def sample_payload(field: serializers.Field, *, points: int, series: int, i: int = 0):
+    """
+    Payload synthétique valide pour ``field`` : ``series`` éléments pour une
+    liste de séries (stations), ``points`` pour une liste de points.
+    """
+    if isinstance(field, serializers.ListSerializer):
+        child = field.child
+        nested = any(
+            isinstance(f, serializers.ListSerializer) for f in child.fields.values()
+        )
+        size = series if nested else points
+        return [
+            sample_payload(child, points=points, series=series, i=n)
+            for n in range(size)
+        ]
+    if isinstance(field, serializers.Serializer):
+        return {
+            name: sample_payload(f, points=points, series=series, i=i)
+            for name, f in field.fields.items()
+        }
+    if isinstance(field, serializers.BooleanField):
+        return i % 2 == 0
+    if isinstance(field, serializers.FloatField):
+        return round(-5.0 + (i * 0.37) % 40, 2)
+    if isinstance(field, serializers.IntegerField):
+        return field.min_value if field.min_value is not None else i
+    if isinstance(field, serializers.DateField):
+        return _FIRST_DAY + dt.timedelta(days=i)
+    if isinstance(field, serializers.ChoiceField):
+        return next(iter(field.choices))
+    if isinstance(field, serializers.DictField):
+        return {}
+    return f"{field.field_name}-{i}"
+
+
+def _render_with_serializer(serializer_class, payload) -> bytes:
+    serializer = serializer_class(data=payload)
+    serializer.is_valid(raise_exception=True)
+    return JSONRenderer().render(serializer.data)
+
+
+def _timings_ms(repeat: int, func, *args) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare, par endpoint, la sérialisation des réponses via le serializer "
+        "DRF (validation + JSONRenderer) et l'encodage direct (json_response)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--points", type=int, default=10_000)
+        parser.add_argument("--series", type=int, default=5)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--endpoint", action="append", choices=sorted(ENDPOINTS), default=None
+        )
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        for endpoint in options["endpoint"] or ENDPOINTS:
+            serializer_class = ENDPOINTS[endpoint]
+            payload = sample_payload(
+                serializer_class(),
+                points=options["points"],
+                series=options["series"],
+            )
+
+            before = _render_with_serializer(serializer_class, payload)
+            after = encode_response(serializer_class, payload)
+            if json.loads(before) != orjson.loads(after):
+                raise CommandError(f"{endpoint} : sorties différentes.")
+
+            before_ms = statistics.median(
+                _timings_ms(repeat, _render_with_serializer, serializer_class, payload)
+            )
+            after_ms = statistics.median(
+                _timings_ms(repeat, encode_response, serializer_class, payload)
+            )
+            self.stdout.write(
+                f"{endpoint:<24} {len(after):>11} octets  "
+                f"serializer {before_ms:9.1f} ms  "
+                f"direct {after_ms:8.1f} ms  "
+                f"x{before_ms / max(after_ms, 1e-6):.1f}"
+            )
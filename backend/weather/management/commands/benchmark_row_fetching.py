@@ -0,0 +1,92 @@
+import datetime as dt
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from weather.data_sources import timescale
+from weather.services.records_graph.types import RecordsGraphRequest
+from weather.services.temperature_minmax.types import MinMaxGraphQuery
+
+
+def _dict_rows_then_build(cur, row_factory):
+    """Ancienne lecture : tuples, puis un dict par ligne, puis l'objet cible."""
+    cols = [c.name for c in cur.description]
+    rows = [dict(zip(cols, row, strict=False)) for row in cur.fetchall()]
+    make_row = row_factory(cur.cursor)
+    return [make_row(tuple(row.values())) for row in rows]
+
+
+def _cases(date_start: dt.date, date_end: dt.date) -> dict:
+    minmax_query = MinMaxGraphQuery(
+        date_start=date_start, date_end=date_end, granularity="day"
+    )
+    records_request = RecordsGraphRequest(
+        date_start=date_start,
+        date_end=date_end,
+        granularity="day",
+        period_type="all_time",
+        type_records="all",
+    )
+    minmax = timescale.TimescaleTemperatureMinMaxDataSource()
+    records = timescale.TimescaleRecordsGraphDataSource()
+    return {
+        "extremes/graph stations": lambda: minmax.fetch_daily_series(minmax_query),
+        "extremes/graph national": lambda: minmax.fetch_national_daily_series(
+            minmax_query
+        ),
+        "records/graph": lambda: records.fetch_graph(records_request),
+    }
+
+
+def _measure(func, repeat: int) -> tuple[float, float, object]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Pic mémoire mesuré à part : tracemalloc ralentit l'exécution.
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), peak / 2**20, result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare, sur la base courante, la lecture des lignes via row factory "
+        "psycopg (_fetch_all) et l'ancienne matérialisation dict(zip(cols, row)) : "
+        "latence médiane et pic mémoire Python"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date-start", type=dt.date.fromisoformat, default=dt.date(2000, 1, 1)
+        )
+        parser.add_argument(
+            "--date-end", type=dt.date.fromisoformat, default=dt.date(2020, 12, 31)
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        row_factory_fetch = timescale._fetch_with
+        for name, func in _cases(options["date_start"], options["date_end"]).items():
+            timescale._fetch_with = _dict_rows_then_build
+            try:
+                before_ms, before_mib, before = _measure(func, repeat)
+            finally:
+                timescale._fetch_with = row_factory_fetch
+            after_ms, after_mib, after = _measure(func, repeat)
+
+            if before != after:
+                raise CommandError(f"{name} : résultats différents.")
+            self.stdout.write(
+                f"{name:<24} dict {before_ms:9.1f} ms {before_mib:8.1f} Mio  "
+                f"row factory {after_ms:9.1f} ms {after_mib:8.1f} Mio"
+            )
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from weather.response_cache import ALL_TAGS, NOTIFY_CHANNEL, invalidate_response_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Invalide les entrées du cache de réponses /temperature/* par tag, "
+        "ou écoute les NOTIFY émis par le job pg_cron (--listen)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "tags",
+            nargs="*",
+            help=f"Tags à invalider parmi {', '.join(ALL_TAGS)} (tous par défaut).",
+        )
+        parser.add_argument(
+            "--listen",
+            action="store_true",
+            help=f"Écoute le canal {NOTIFY_CHANNEL} et invalide les tags reçus.",
+        )
+
+    def handle(self, *args, **options):
+        if options["listen"]:
+            self._listen()
+            return
+        tags = options["tags"] or ALL_TAGS
+        unknown = sorted(set(tags) - set(ALL_TAGS))
+        if unknown:
+            raise CommandError(f"Tags inconnus : {', '.join(unknown)}")
+        invalidate_response_cache(*tags)
+        self.stdout.write(self.style.SUCCESS(f"Tags invalidés : {', '.join(tags)}"))
+
+    def _listen(self):
+        connection.ensure_connection()
+        with connection.cursor() as cur:
+            cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        self.stdout.write(f"En écoute sur {NOTIFY_CHANNEL}...")
+        for notify in connection.connection.notifies():
+            tags = [t for t in notify.payload.split(",") if t in ALL_TAGS]
+            if tags:
+                invalidate_response_cache(*tags)
+                self.stdout.write(f"Tags invalidés : {', '.join(tags)}")
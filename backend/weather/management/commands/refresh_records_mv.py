@@ -1,23 +1,186 @@
-from django.core.management.base import BaseCommand
-from django.db import connection
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import psycopg
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+
+from weather import db_pool
+from weather.data_sources.data_version import data_version
+from weather.response_cache import TAG_RECORDS, invalidate_response_cache
+
+
+def _station_ranges(
+    station_codes: list[str], partitions: int
+) -> list[tuple[str, str | None]]:
+    """Plages [début, fin) de station_code, de tailles égales ; fin None = jusqu'au bout."""
+    if not station_codes:
+        return []
+    size = -(-len(station_codes) // max(1, partitions))
+    starts = station_codes[::size]
+    return list(zip(starts, [*starts[1:], None], strict=True))
+
+
+def _fill_range(station_range: tuple[str, str | None]) -> tuple[int, float]:
+    started = time.perf_counter()
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT public.fill_records_battus_shadow(%s, %s)", list(station_range)
+        )
+        rows = cur.fetchone()[0]
+    return rows, time.perf_counter() - started
+
+
+def _fill_range_with_own_connection(
+    station_range: tuple[str, str | None],
+) -> tuple[int, float]:
+    try:
+        return _fill_range(station_range)
+    finally:
+        connections.close_all()
 
 
 class Command(BaseCommand):
     help = (
-        "Rafraîchit la vue matérialisée mv_records_battus et met à jour la cutoff_date"
+        "Reconstruit mv_records_battus sans bloquer les lectures : calcul dans une "
+        "table fantôme par plages de stations en parallèle, puis échange atomique "
+        "avec la mise à jour de la cutoff_date"
     )
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Connexions calculant les plages de stations en parallèle.",
+        )
+        parser.add_argument(
+            "--partitions",
+            type=int,
+            default=None,
+            help="Nombre de plages de stations (défaut : 4 par worker).",
+        )
+        parser.add_argument(
+            "--lock-timeout-ms",
+            type=int,
+            default=500,
+            help="Attente maximale du verrou de l'échange avant nouvel essai.",
+        )
+        parser.add_argument("--swap-attempts", type=int, default=20)
+
     def handle(self, *args, **options):
-        self.stdout.write("Rafraîchissement de mv_records_battus...")
-        with connection.cursor() as cur:
-            cur.execute("REFRESH MATERIALIZED VIEW public.mv_records_battus")
-        self.stdout.write(self.style.SUCCESS("mv_records_battus rafraîchie."))
+        self._timings: list[tuple[str, float]] = []
+        workers = self._workers(options["workers"])
+        partitions = options["partitions"] or 4 * workers
 
-        self.stdout.write("Mise à jour de la cutoff_date...")
         with connection.cursor() as cur:
-            cur.execute("TRUNCATE public.mv_records_battus_meta;")
-            cur.execute("""
-                INSERT INTO public.mv_records_battus_meta (cutoff_date)
-                SELECT MAX("AAAAMMJJ")::date FROM public."Quotidienne";
-            """)
-        self.stdout.write(self.style.SUCCESS("cutoff_date mise à jour."))
+            cur.execute('SELECT MAX("AAAAMMJJ")::date FROM public."Quotidienne"')
+            cutoff = cur.fetchone()[0]
+        if cutoff is None:
+            raise CommandError("Quotidienne est vide : cutoff_date indéterminée.")
+
+        with self._stage("Préparation de mv_records_battus_shadow"):
+            with connection.cursor() as cur:
+                cur.execute("SELECT public.prepare_records_battus_shadow()")
+                cur.execute(
+                    "SELECT station_code FROM public.v_station_records "
+                    "ORDER BY station_code"
+                )
+                station_codes = [row[0] for row in cur.fetchall()]
+        ranges = _station_ranges(station_codes, partitions)
+
+        with self._stage(
+            f"Calcul des records ({len(station_codes)} stations, "
+            f"{len(ranges)} plages, {workers} workers)"
+        ):
+            results = self._fill(ranges, workers)
+        if results:
+            durations = [seconds for _, seconds in results]
+            self.stdout.write(
+                f"  {sum(rows for rows, _ in results)} lignes ; par plage : "
+                f"médiane {statistics.median(durations):.2f} s, "
+                f"max {max(durations):.2f} s"
+            )
+
+        with self._stage("Index et statistiques"):
+            with connection.cursor() as cur:
+                cur.execute("SELECT public.index_records_battus_shadow()")
+
+        with self._stage(f"Échange atomique (cutoff_date {cutoff})"):
+            attempts = self._swap(
+                cutoff, options["lock_timeout_ms"], options["swap_attempts"]
+            )
+        if attempts > 1:
+            self.stdout.write(f"  verrou obtenu au {attempts}e essai")
+        # Les autres workers voient la nouvelle cutoff au plus DATA_VERSION_TTL_S après.
+        data_version.invalidate()
+
+        with self._stage("Ré-amorçage de records_battus_state"):
+            with connection.cursor() as cur:
+                cur.execute("SELECT public.refresh_records_battus_state();")
+
+        invalidate_response_cache(TAG_RECORDS)
+        self.stdout.write(self.style.SUCCESS("Cache de réponses records invalidé."))
+
+        total = sum(seconds for _, seconds in self._timings)
+        self.stdout.write(
+            self.style.SUCCESS(f"mv_records_battus reconstruite en {total:.2f} s :")
+        )
+        for name, seconds in self._timings:
+            self.stdout.write(f"  {name:<60} {seconds:8.2f} s")
+
+    def _workers(self, requested: int) -> int:
+        # Dans une transaction (tests), les autres connexions ne verraient pas
+        # la table fantôme : calcul séquentiel sur la connexion courante.
+        if connection.in_atomic_block:
+            return 1
+        pool = db_pool.connection_pool()
+        if pool is not None:
+            # Une connexion reste tenue par le thread principal.
+            requested = min(requested, pool.max_size - 1)
+        return max(1, requested)
+
+    @contextmanager
+    def _stage(self, name: str):
+        self.stdout.write(f"{name}...")
+        started = time.perf_counter()
+        yield
+        self._timings.append((name, time.perf_counter() - started))
+
+    def _fill(
+        self, ranges: list[tuple[str, str | None]], workers: int
+    ) -> list[tuple[int, float]]:
+        if workers == 1:
+            return [_fill_range(station_range) for station_range in ranges]
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="records-rebuild"
+        ) as executor:
+            return list(executor.map(_fill_range_with_own_connection, ranges))
+
+    def _swap(self, cutoff, lock_timeout_ms: int, attempts: int) -> int:
+        """
+        Échange dans une transaction à lock_timeout court : si une lecture
+        longue tient encore la table, on abandonne vite (les lectures suivantes
+        ne restent pas en file derrière l'ACCESS EXCLUSIVE) et on réessaie.
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                with transaction.atomic(), connection.cursor() as cur:
+                    cur.execute(
+                        "SELECT set_config('lock_timeout', %s, true)",
+                        [f"{lock_timeout_ms}ms"],
+                    )
+                    cur.execute(
+                        "SELECT public.swap_records_battus_shadow(%s)", [cutoff]
+                    )
+                return attempt
+            except OperationalError as exc:
+                if not isinstance(exc.__cause__, psycopg.errors.LockNotAvailable):
+                    raise
+                time.sleep(min(0.1 * attempt, 1.0))
+        raise CommandError(
+            f"Verrou de mv_records_battus non obtenu après {attempts} essais ; "
+            "mv_records_battus_shadow est conservée."
+        )
@@ -225,7 +225,7 @@ class ITNAbsoluteExtremesDaily(models.Model):
 
     class Meta:
         managed = False
-        db_table = "v_itn_absolute_extremes_daily"
+        db_table = "itn_absolute_extremes_daily"
         unique_together = ("month", "day_of_month")
 
     def __str__(self) -> str:
@@ -0,0 +1,254 @@
+"""Cache serveur partagé des réponses des endpoints ``/temperature/*``.
+
+Complète `CacheControlMixin` : l'en-tête ``Cache-Control`` ne protège que
+l'edge ; ici la réponse calculée est conservée côté serveur dans le cache
+Django ``settings.RESPONSE_CACHE_ALIAS`` (fichier local par défaut, Redis
+partagé en prod), avec le même TTL que ``s-maxage`` (profils ``long`` /
+``by_date_end``).
+
+Clé : nom de la vue + représentation négociée (JSON, colonnes) + versions des
+tags + version des sources de données dont dépend la vue (registre
+data_version, même jeton que l'ETag, voir ``CacheControlMixin``) + hash des
+paramètres validés par le ``*QuerySerializer`` de la vue, normalisés (clés
+triées, dates ISO, ensembles triés). Deux query strings équivalentes
+partagent donc la même entrée.
+
+Invalidation par tag : chaque tag porte une version stockée dans le même
+cache. ``invalidate_response_cache(*tags)`` la renouvelle, ce qui rend
+inaccessibles toutes les entrées calculées avant (elles expirent ensuite par
+TTL). Déclencheurs :
+- ``refresh_records_mv`` invalide ``records`` en fin de commande ;
+- le job pg_cron émet ``NOTIFY response_cache_invalidation, 'realtime'``,
+  relayé par ``manage.py invalidate_response_cache --listen`` (service
+  docker compose ``cache-invalidation``, voir README). En profil
+  ``by_date_end``, une requête dont le ``date_end`` précède la fenêtre temps
+  réel n'est pas rattachée à ``realtime`` : le job ne réécrit que les derniers
+  jours, et les sources qu'elle lit au-delà restent dans la version des
+  données de la clé.
+
+Single-flight : N requêtes identiques concurrentes en miss ne déclenchent
+qu'un calcul. Dans un process, un verrou par clé ; entre process, un bail
+posé via ``cache.add`` pendant lequel les autres workers attendent le résultat.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import decimal
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, Literal
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from weather.cache_control import CacheControlMixin
+from weather.json_response import JSONBytesResponse
+
+logger = logging.getLogger(__name__)
+
+ResponseCacheTag = Literal["realtime", "records"]
+
+# Données rafraîchies par pg_cron (mv_quotidienne_realtime, mv_itn_daily_all_years…).
+TAG_REALTIME: ResponseCacheTag = "realtime"
+# mv_records_battus et sa cutoff_date (commande refresh_records_mv).
+TAG_RECORDS: ResponseCacheTag = "records"
+ALL_TAGS: tuple[ResponseCacheTag, ...] = (TAG_REALTIME, TAG_RECORDS)
+
+# Canal LISTEN/NOTIFY utilisé par le job pg_cron.
+NOTIFY_CHANNEL = "response_cache_invalidation"
+
+_KEY_PREFIX = "resp"
+
+
+def response_cache() -> BaseCache:
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def _tag_key(tag: str) -> str:
+    return f"{_KEY_PREFIX}:tag:{tag}"
+
+
+def _new_tag_version() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def invalidate_response_cache(*tags: str) -> None:
+    """Renouvelle la version des tags : les entrées existantes deviennent mortes."""
+    cache = response_cache()
+    cache.set_many({_tag_key(tag): _new_tag_version() for tag in tags}, timeout=None)
+    logger.info("Cache de réponses invalidé : %s", ", ".join(tags))
+
+
+def _tag_versions(cache: BaseCache, tags: Iterable[str]) -> str:
+    tags = sorted(tags)
+    versions = cache.get_many([_tag_key(tag) for tag in tags])
+    parts = []
+    for tag in tags:
+        key = _tag_key(tag)
+        version = versions.get(key)
+        if version is None:
+            # Tag jamais vu (ou évincé) : version neuve, add() pour ne pas écraser
+            # celle qu'un autre worker viendrait de poser.
+            cache.add(key, _new_tag_version(), timeout=None)
+            version = cache.get(key)
+        parts.append(f"{tag}={version}")
+    return ",".join(parts)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (set, frozenset)):
+        return sorted(_normalize(v) for v in value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (dt.date, dt.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+def _cached_body(response: Response | JSONBytesResponse) -> Any:
+    # Réponses déjà encodées : les octets (et leur type de contenu) sont
+    # conservés tels quels, un hit n'a plus rien à rendre.
+    if isinstance(response, JSONBytesResponse):
+        return (response["Content-Type"], response.content)
+    return response.data
+
+
+def _response_from_cache(cached: Any) -> Response | JSONBytesResponse:
+    if isinstance(cached, tuple):
+        content_type, content = cached
+        return JSONBytesResponse(content, content_type=content_type)
+    return Response(cached, status=status.HTTP_200_OK)
+
+
+def params_fingerprint(params: Mapping[str, Any]) -> str:
+    """Hash stable des paramètres validés (indépendant de l'ordre de la query string)."""
+    payload = json.dumps(_normalize(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _SingleFlight:
+    """Un verrou par clé, libéré dès qu'aucun appelant ne l'attend plus."""
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._locks: dict[str, tuple[threading.Lock, int]] = {}
+
+    def acquire(self, key: str) -> threading.Lock:
+        with self._guard:
+            lock, waiters = self._locks.get(key, (threading.Lock(), 0))
+            self._locks[key] = (lock, waiters + 1)
+        lock.acquire()
+        return lock
+
+    def release(self, key: str, lock: threading.Lock) -> None:
+        lock.release()
+        with self._guard:
+            _, waiters = self._locks[key]
+            if waiters <= 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, waiters - 1)
+
+
+_single_flight = _SingleFlight()
+
+
+class ResponseCacheMixin(CacheControlMixin):
+    """`CacheControlMixin` + cache serveur partagé des réponses 200.
+
+    Attributs de configuration par classe :
+        response_cache_tags : tags dont dépend la réponse (voir module docstring).
+        response_cache_lease_s : durée max du bail inter-process ; au-delà, un
+            worker en attente calcule lui-même la réponse.
+        response_cache_poll_s : intervalle de scrutation pendant l'attente.
+    """
+
+    response_cache_tags: tuple[ResponseCacheTag, ...] = (TAG_REALTIME,)
+    response_cache_lease_s: float = 30.0
+    response_cache_poll_s: float = 0.05
+
+    def cached_response(
+        self,
+        params: Mapping[str, Any],
+        build: Callable[[], Response | JSONBytesResponse],
+    ) -> Response | JSONBytesResponse:
+        """Renvoie la réponse en cache pour ``params`` ou la construit via ``build``.
+
+        Seules les réponses 200 sont conservées ; ``build`` peut renvoyer une
+        réponse d'erreur (400, 501…) qui est transmise telle quelle.
+        """
+        if not settings.RESPONSE_CACHE_ENABLED or self.cache_profile is None:
+            return build()
+
+        cache = response_cache()
+        key = self._response_cache_key(cache, params)
+        cached = cache.get(key)
+        if cached is not None:
+            return _response_from_cache(cached)
+
+        lock = _single_flight.acquire(key)
+        try:
+            cached = cache.get(key)
+            if cached is not None:
+                return _response_from_cache(cached)
+            return self._build_under_lease(cache, key, build)
+        finally:
+            _single_flight.release(key, lock)
+
+    def _response_cache_key(self, cache: BaseCache, params: Mapping[str, Any]) -> str:
+        versions = _tag_versions(cache, self._response_cache_tags_for_request())
+        renderer = getattr(self.request, "accepted_renderer", None)
+        representation = getattr(renderer, "format", "json")
+        return (
+            f"{_KEY_PREFIX}:{type(self).__name__}:{representation}:{versions}:"
+            f"{self._data_version_token(self.request)}:{params_fingerprint(params)}"
+        )
+
+    def _response_cache_tags_for_request(self) -> tuple[ResponseCacheTag, ...]:
+        tags = self.response_cache_tags
+        if self.cache_profile == "by_date_end" and self._before_realtime_window(
+            self.request
+        ):
+            return tuple(tag for tag in tags if tag != TAG_REALTIME)
+        return tags
+
+    def _build_under_lease(
+        self,
+        cache: BaseCache,
+        key: str,
+        build: Callable[[], Response | JSONBytesResponse],
+    ) -> Response | JSONBytesResponse:
+        lease_key = f"{key}:lease"
+        lease_timeout = max(1, int(self.response_cache_lease_s))
+        has_lease = cache.add(lease_key, 1, timeout=lease_timeout)
+        if not has_lease:
+            # Un autre worker calcule déjà : on attend son résultat.
+            deadline = time.monotonic() + self.response_cache_lease_s
+            while time.monotonic() < deadline:
+                time.sleep(self.response_cache_poll_s)
+                cached = cache.get(key)
+                if cached is not None:
+                    return _response_from_cache(cached)
+                if cache.get(lease_key) is None:
+                    break
+        try:
+            response = build()
+            if response.status_code == status.HTTP_200_OK:
+                s_maxage, _ = self._compute_cache_ttls(self.request)
+                cache.set(key, _cached_body(response), timeout=s_maxage)
+            return response
+        finally:
+            if has_lease:
+                cache.delete(lease_key)
@@ -425,6 +425,10 @@ class TemperatureRecordsQuerySerializer(serializers.Serializer):
         default="record_value",
         help_text="Champ(s) de tri avec ordre (ex: 'record_value', '-record_value', 'record_value,station_name', '-record_value,station_name')",
     )
+    after = serializers.CharField(
+        required=False,
+        help_text="Curseur keyset opaque (`pagination.next_cursor` de la page précédente)",
+    )
     date_start = serializers.DateField(required=False)
     date_end = serializers.DateField(required=False)
     territoire = serializers.ChoiceField(
@@ -737,6 +741,7 @@ class PaginationSerializer(serializers.Serializer):
     page = serializers.IntegerField()
     page_size = serializers.IntegerField()
     total_pages = serializers.IntegerField()
+    next_cursor = serializers.CharField(required=False, allow_null=True)
 
 
 class TemperatureRecordsResponseSerializer(serializers.Serializer):
@@ -917,3 +922,38 @@ class TemperatureMinMaxGraphResponseSerializer(serializers.Serializer):
     metadata = TemperatureMinMaxGraphMetadataSerializer()
     national = TemperatureMinMaxGraphNationalSerializer(required=False)
     stations = TemperatureMinMaxGraphStationSerializer(many=True)
+
+
+class TemperatureExportQuerySerializer(serializers.Serializer):
+    date_start = serializers.DateField(required=True)
+    date_end = serializers.DateField(required=True)
+    # Pas `format` : réservé par DRF à la négociation du renderer.
+    output = serializers.ChoiceField(
+        choices=["csv", "ndjson"], required=False, default="csv"
+    )
+
+    territoire = serializers.ChoiceField(
+        choices=["france", "region", "department", "station"],
+        required=False,
+        default="france",
+    )
+    territoire_id = serializers.CharField(required=False)
+    station_ids = CommaSeparatedStringListField(required=False)
+    departments = CommaSeparatedStringListField(required=False)
+    regions = CommaSeparatedStringListField(required=False)
+
+    def validate(self, attrs):
+        RecordsGraphQuerySerializer.check_date_range(
+            date_start=attrs["date_start"],
+            date_end=attrs["date_end"],
+        )
+        RecordsGraphQuerySerializer.check_territoire(
+            territoire=attrs["territoire"],
+            territoire_id=attrs.get("territoire_id"),
+        )
+
+        attrs["station_ids"] = attrs.get("station_ids", ())
+        attrs["departments"] = attrs.get("departments", ())
+        attrs["regions"] = attrs.get("regions", ())
+
+        return attrs
@@ -11,6 +11,10 @@ from .types import (
     ObservedPoint,
 )
 
+# Année bissextile de référence pour reconstruire une date à partir d'un
+# (mois, jour) : le 29/02 doit rester représentable.
+_LEAP_REFERENCE_YEAR = 2000
+
 
 class NationalIndicatorObservedDataSource(Protocol):
     """
@@ -34,6 +38,34 @@ class NationalIndicatorBaselineDataSource(Protocol):
 
     def fetch_yearly_baseline(self) -> BaselinePoint: ...
 
+    def fetch_daily_baselines(
+        self,
+        month_day_pairs: set[tuple[int, int]],
+    ) -> dict[tuple[int, int], BaselinePoint]:
+        """
+        Variante groupée de fetch_daily_baseline : une baseline par (mois, jour)
+        demandé.
+
+        L'implémentation par défaut délègue à fetch_daily_baseline (un appel par
+        clé) ; les sources adossées à la base la surchargent pour tout résoudre
+        en une seule requête.
+        """
+        return {
+            (month, day): self.fetch_daily_baseline(
+                dt.date(_LEAP_REFERENCE_YEAR, month, day)
+            )
+            for month, day in month_day_pairs
+        }
+
+    def fetch_monthly_baselines(
+        self,
+        months: set[int],
+    ) -> dict[int, BaselinePoint]:
+        """
+        Variante groupée de fetch_monthly_baseline : une baseline par mois demandé.
+        """
+        return {month: self.fetch_monthly_baseline(month) for month in months}
+
 
 class NationalIndicatorAbsoluteExtremesDataSource(Protocol):
     """
@@ -16,7 +16,13 @@ from .protocols import (
 )
 from .slicing import apply_slice
 from .source_window import compute_source_window
-from .types import AbsoluteExtremes, DailySeriesQuery, ObservedPoint, OutputPoint
+from .types import (
+    AbsoluteExtremes,
+    BaselinePoint,
+    DailySeriesQuery,
+    ObservedPoint,
+    OutputPoint,
+)
 
 
 def compute_target_dates(
@@ -67,29 +73,28 @@ def compute_target_dates(
     )
 
 
-def _baseline_for_output_point(
-    *,
-    point_date: dt.date,
-    granularity: str,
-    slice_type: str,
-    baseline_data_source: NationalIndicatorBaselineDataSource,
-):
+def _reference_granularity(*, granularity: str, slice_type: str) -> str:
+    """
+    Granularité des références (baseline 1991-2020 et extremes absolus) à
+    associer à chaque point de sortie : "daily" (clé (mois, jour)), "monthly"
+    (clé mois) ou "yearly" (valeur unique).
+    """
     if granularity == "day":
-        return baseline_data_source.fetch_daily_baseline(point_date)
+        return "daily"
 
     if granularity == "month":
         if slice_type == "full":
-            return baseline_data_source.fetch_monthly_baseline(point_date.month)
+            return "monthly"
         if slice_type == "day_of_month":
-            return baseline_data_source.fetch_daily_baseline(point_date)
+            return "daily"
 
     if granularity == "year":
         if slice_type == "full":
-            return baseline_data_source.fetch_yearly_baseline()
+            return "yearly"
         if slice_type == "month_of_year":
-            return baseline_data_source.fetch_monthly_baseline(point_date.month)
+            return "monthly"
         if slice_type == "day_of_month":
-            return baseline_data_source.fetch_daily_baseline(point_date)
+            return "daily"
 
     raise ValueError(
         f"Combinaison invalide granularity={granularity}, slice_type={slice_type}"
@@ -156,51 +161,51 @@ def compute_national_indicator(
         month_of_year=month_of_year,
     )
 
-    # 7. Fetch extremes absolus (une seule requête groupée)
+    # 7. Fetch baselines + extremes absolus (requêtes groupées, pas une par point)
+    reference_granularity = _reference_granularity(
+        granularity=granularity,
+        slice_type=slice_type,
+    )
+
+    baseline_map: (
+        dict[tuple[int, int], BaselinePoint] | dict[int, BaselinePoint] | BaselinePoint
+    )
     absolute_extremes_map: (
         dict[tuple[int, int], AbsoluteExtremes]
         | dict[int, AbsoluteExtremes]
         | AbsoluteExtremes
     )
-    if granularity == "day" or (
-        granularity in ("month", "year") and slice_type == "day_of_month"
-    ):
+    if reference_granularity == "daily":
         month_day_pairs = {(p.date.month, p.date.day) for p in observed_points}
+        baseline_map = baseline_data_source.fetch_daily_baselines(month_day_pairs)
         absolute_extremes_map = (
             absolute_extremes_data_source.fetch_daily_absolute_extremes(month_day_pairs)
         )
-    elif granularity == "month" or (
-        granularity == "year" and slice_type == "month_of_year"
-    ):
+    elif reference_granularity == "monthly":
         months = {p.date.month for p in observed_points}
+        baseline_map = baseline_data_source.fetch_monthly_baselines(months)
         absolute_extremes_map = (
             absolute_extremes_data_source.fetch_monthly_absolute_extremes(months)
         )
     else:
-        # granularity=year, slice_type=full
+        baseline_map = baseline_data_source.fetch_yearly_baseline()
         absolute_extremes_map = (
             absolute_extremes_data_source.fetch_yearly_absolute_extremes()
         )
 
-    def _get_absolute_extremes(p: ObservedPoint) -> AbsoluteExtremes:
-        if isinstance(absolute_extremes_map, AbsoluteExtremes):
-            return absolute_extremes_map
-        if granularity == "day" or (
-            granularity in ("month", "year") and slice_type == "day_of_month"
-        ):
-            return absolute_extremes_map[(p.date.month, p.date.day)]
-        return absolute_extremes_map[p.date.month]
+    def _reference_key(p: ObservedPoint) -> tuple[int, int] | int | None:
+        if reference_granularity == "daily":
+            return (p.date.month, p.date.day)
+        if reference_granularity == "monthly":
+            return p.date.month
+        return None
 
     # 8. Enrichissement baseline + extremes absolus
     points: list[OutputPoint] = []
     for p in observed_points:
-        b = _baseline_for_output_point(
-            point_date=p.date,
-            granularity=granularity,
-            slice_type=slice_type,
-            baseline_data_source=baseline_data_source,
-        )
-        ae = _get_absolute_extremes(p)
+        key = _reference_key(p)
+        b = baseline_map if key is None else baseline_map[key]
+        ae = absolute_extremes_map if key is None else absolute_extremes_map[key]
 
         points.append(
             OutputPoint(
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import datetime as dt
+import functools
 from collections import defaultdict
 
+from weather.utils.concurrency import run_concurrently
 from weather.utils.date_range import (
     clamp_day_to_month_end,
     days_in_month_in_range,
@@ -582,6 +584,21 @@ def compute_target_dates(
     )
 
 
+def _station_bucket(granularity: str, slice_type: str) -> str | None:
+    """
+    Bucket pré-agrégé que la source peut renvoyer pour les séries station :
+    uniquement quand chaque bucket du graphe couvre des mois ou années entiers
+    de la fenêtre source.
+    """
+    if slice_type == "full" and granularity in ("month", "year"):
+        return granularity
+
+    if granularity == "year" and slice_type == "month_of_year":
+        return "month"
+
+    return None
+
+
 def compute_temperature_deviation_series(
     *,
     data_source: TemperatureDeviationDailyDataSource,
@@ -617,29 +634,34 @@ def compute_temperature_deviation_series(
         station_ids=station_ids,
         include_national=include_national,
         target_dates=target_dates,
+        bucket=_station_bucket(granularity, slice_type),
     )
 
-    national = _compute_national_series(
-        data_source=data_source,
-        query=query,
-        date_start=date_start,
-        date_end=date_end,
-        granularity=granularity,
-        slice_type=slice_type,
-        month_of_year=month_of_year,
-        day_of_month=day_of_month,
-        include_national=include_national,
-    )
-
-    stations = _compute_station_series(
-        data_source=data_source,
-        query=query,
-        date_start=date_start,
-        date_end=date_end,
-        granularity=granularity,
-        slice_type=slice_type,
-        month_of_year=month_of_year,
-        day_of_month=day_of_month,
+    # Séries nationale et stations indépendantes : calculées en parallèle.
+    national, stations = run_concurrently(
+        functools.partial(
+            _compute_national_series,
+            data_source=data_source,
+            query=query,
+            date_start=date_start,
+            date_end=date_end,
+            granularity=granularity,
+            slice_type=slice_type,
+            month_of_year=month_of_year,
+            day_of_month=day_of_month,
+            include_national=include_national,
+        ),
+        functools.partial(
+            _compute_station_series,
+            data_source=data_source,
+            query=query,
+            date_start=date_start,
+            date_end=date_end,
+            granularity=granularity,
+            slice_type=slice_type,
+            month_of_year=month_of_year,
+            day_of_month=day_of_month,
+        ),
     )
 
     return TemperatureDeviationResult(
@@ -723,11 +745,14 @@ def compute_temperature_deviation_overview(
         offset=offset,
     )
 
-    national = data_source.fetch_national_mean_deviation(
-        date_start=date_start,
-        date_end=date_end,
+    national, result = run_concurrently(
+        functools.partial(
+            data_source.fetch_national_mean_deviation,
+            date_start=date_start,
+            date_end=date_end,
+        ),
+        functools.partial(data_source.fetch_station_overview, query),
     )
-    result = data_source.fetch_station_overview(query)
 
     return {
         "national": {
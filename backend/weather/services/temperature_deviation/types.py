@@ -17,6 +17,10 @@ class DailyDeviationSeriesQuery:
     station_ids: tuple[str, ...]
     include_national: bool = True
     target_dates: tuple[dt.date, ...] | None = None
+    # "month" / "year" : la source peut renvoyer un point par bucket (daté du
+    # début du bucket) au lieu des points journaliers, sans mélanger les deux
+    # dans un même bucket.
+    bucket: str | None = None
 
 
 @dataclass(frozen=True)
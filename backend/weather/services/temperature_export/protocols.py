@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Protocol
+
+from .types import DailyExportQuery, DailyExportRow
+
+
+class DailyExportDataSource(Protocol):
+    def iter_daily_rows(self, query: DailyExportQuery) -> Iterator[DailyExportRow]:
+        """Lignes triées par (station, date), produites au fil de la lecture."""
+        ...
@@ -0,0 +1,74 @@
+"""Encodage en flux des lignes d'export (CSV, NDJSON).
+
+Les lignes sont consommées au fil de l'eau et émises par paquets de
+``batch_size`` : la mémoire utilisée ne dépend pas de la période exportée.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+import orjson
+
+from .types import DailyExportRow, ExportFormat
+
+EXPORT_COLUMNS = (
+    "station_id",
+    "station_name",
+    "department",
+    "date",
+    "tn",
+    "tx",
+    "tntxm",
+)
+
+CONTENT_TYPES: dict[ExportFormat, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+DEFAULT_BATCH_SIZE = 1_000
+
+
+def _batches(
+    rows: Iterable[DailyExportRow], batch_size: int
+) -> Iterator[list[DailyExportRow]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def _csv_value(value) -> str:
+    return "" if value is None else str(value)
+
+
+def iter_csv(
+    rows: Iterable[DailyExportRow], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[bytes]:
+    yield (",".join(EXPORT_COLUMNS) + "\r\n").encode()
+    for batch in _batches(rows, batch_size):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(
+            [_csv_value(getattr(row, column)) for column in EXPORT_COLUMNS]
+            for row in batch
+        )
+        yield buffer.getvalue().encode()
+
+
+def iter_ndjson(
+    rows: Iterable[DailyExportRow], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[bytes]:
+    for batch in _batches(rows, batch_size):
+        yield b"".join(
+            orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in batch
+        )
+
+
+ENCODERS = {
+    "csv": iter_csv,
+    "ndjson": iter_ndjson,
+}
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass
+from typing import Literal
+
+ExportFormat = Literal["csv", "ndjson"]
+
+
+@dataclass(frozen=True)
+class DailyExportQuery:
+    date_start: dt.date
+    date_end: dt.date
+    territoire: str = "france"
+    territoire_id: str | None = None
+    station_ids: tuple[str, ...] = ()
+    departments: tuple[str, ...] = ()
+    regions: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class DailyExportRow:
+    station_id: str
+    station_name: str
+    department: int
+    date: dt.date
+    tn: float | None
+    tx: float | None
+    tntxm: float | None
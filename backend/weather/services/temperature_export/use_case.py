@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Iterator
+
+from .protocols import DailyExportDataSource
+from .service import ENCODERS
+from .types import DailyExportQuery, ExportFormat
+
+
+def export_daily_series(
+    *,
+    data_source: DailyExportDataSource,
+    output: ExportFormat,
+    date_start: dt.date,
+    date_end: dt.date,
+    territoire: str = "france",
+    territoire_id: str | None = None,
+    station_ids: tuple[str, ...] = (),
+    departments: tuple[str, ...] = (),
+    regions: tuple[str, ...] = (),
+) -> Iterator[bytes]:
+    query = DailyExportQuery(
+        date_start=date_start,
+        date_end=date_end,
+        territoire=territoire,
+        territoire_id=territoire_id,
+        station_ids=station_ids,
+        departments=departments,
+        regions=regions,
+    )
+    return ENCODERS[output](data_source.iter_daily_rows(query))
@@ -37,12 +37,18 @@ def _bucket_points_by_period(points: list[DailyMinMaxPoint], granularity: str) -
             continue
         start = period_start(p.date, granularity)
         if p.tmin is not None:
-            buckets[start]["tmin"].append(p.tmin)
+            buckets[start]["tmin"].append((p.tmin, p.tmin_count))
         if p.tmax is not None:
-            buckets[start]["tmax"].append(p.tmax)
+            buckets[start]["tmax"].append((p.tmax, p.tmax_count))
     return buckets
 
 
+def _weighted_mean(values: list[tuple[float, int]]) -> float:
+    return sum(value * count for value, count in values) / sum(
+        count for _, count in values
+    )
+
+
 def _average_buckets(buckets: dict, valid_starts: set) -> list[MinMaxGraphPoint]:
     result = []
     for start_date in sorted(buckets.keys()):
@@ -55,8 +61,8 @@ def _average_buckets(buckets: dict, valid_starts: set) -> list[MinMaxGraphPoint]
         result.append(
             MinMaxGraphPoint(
                 date=start_date,
-                tmin_mean=round(sum(tmin_vals) / len(tmin_vals), 2),
-                tmax_mean=round(sum(tmax_vals) / len(tmax_vals), 2),
+                tmin_mean=round(_weighted_mean(tmin_vals), 2),
+                tmax_mean=round(_weighted_mean(tmax_vals), 2),
             )
         )
     return result
@@ -27,6 +27,10 @@ class DailyMinMaxPoint:
     date: dt.date
     tmin: float | None
     tmax: float | None
+    # Nombre de jours agrégés dans tmin / tmax (> 1 pour un point pré-agrégé
+    # par mois ou par année) : pondère la moyenne du bucket.
+    tmin_count: int = 1
+    tmax_count: int = 1
 
 
 @dataclass(frozen=True)
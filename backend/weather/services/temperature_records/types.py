@@ -30,6 +30,9 @@ class TemperatureRecordsRequest:
     page: int = 1
     page_size: int = 50
     sort: str = "record_value"  # "record_value", "-record_value", "record_value,station_name", "-record_value,station_name",  "record_date", "department".
+    after: str | None = (
+        None  # curseur keyset opaque (next_cursor de la page précédente)
+    )
 
 
 @dataclass(frozen=True)
@@ -53,6 +56,7 @@ class Pagination:
     page: int
     page_size: int
     total_pages: int
+    next_cursor: str | None = None
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,45 @@
+"""
+Conftest commun aux tests unitaires et d'intégration.
+
+Ne touche pas la DB : isole seulement le cache de réponses /temperature/*
+(voir `weather/response_cache.py`) dans un LocMemCache vidé à chaque test,
+pour qu'une réponse calculée par un test ne soit pas resservie au suivant,
+fige le registre data_version pour les tests sans DB (il entre dans la clé
+du cache), et active le contrôle des réponses encodées par leur serializer
+(`weather/json_response.py`).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from weather.data_sources.data_version import DataVersionSnapshot, data_version
+from weather.response_cache import response_cache
+
+_EMPTY_DATA_VERSION = DataVersionSnapshot(refreshed_at={}, records_cutoff=None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_response_cache(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        settings.RESPONSE_CACHE_ALIAS: {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "weather-tests-responses",
+        },
+    }
+    response_cache().clear()
+    yield
+    response_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def static_data_version(request, monkeypatch):
+    # Les tests marqués django_db lisent la vraie table data_version.
+    if request.node.get_closest_marker("django_db") is None:
+        monkeypatch.setattr(data_version, "get", lambda: _EMPTY_DATA_VERSION)
+
+
+@pytest.fixture(autouse=True)
+def response_schema_check(settings):
+    settings.RESPONSE_SCHEMA_CHECK = True
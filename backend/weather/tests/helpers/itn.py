@@ -20,7 +20,8 @@ def insert_itn_daily(
     """Insère une ligne dans mv_itn_daily_all_years.
 
     Reproduit l'invariant de mv_itn_daily_all_years (006) : les données
-    antérieures au 1er janvier 1947 sont ignorées.
+    antérieures au 1er janvier 1947 sont ignorées. Comme le job pg_cron, met
+    ensuite à jour itn_absolute_extremes_daily (011) pour le jour inséré.
     """
     if year < 1947:
         return
@@ -40,6 +41,10 @@ def insert_itn_daily(
                 "itn": itn,
             },
         )
+        cur.execute(
+            "SELECT public.refresh_itn_absolute_extremes_daily(%(date)s)",
+            {"date": date},
+        )
 
 
 def insert_quotidienne(day: dt.date, code: str, tntxm: float) -> None:
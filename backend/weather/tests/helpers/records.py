@@ -3,10 +3,13 @@ Helpers d'insertion pour les pipelines de records :
 - `mv_records_battus`              : table des records battus progressifs
   (recréée comme table régulière par le conftest).
 - `mv_records_battus_meta`         : table de métadonnées contenant la
-  `cutoff_date`.
+  `cutoff_date` (recopiée par trigger dans le registre `data_version`, dont
+  le cache par process est invalidé ici).
 - `mv_records_absolus_par_mois`    : table des records absolus mensuels
   (recréée comme table régulière par le conftest ; source de
   v_records_absolus_par_type pour le period_type=month).
+- `records_battus_state` / `records_battus_recents` : état incrémental des
+  records post-cutoff, maintenu par `refresh_records_battus_state`.
 """
 
 from __future__ import annotations
@@ -15,6 +18,8 @@ import datetime as dt
 
 from django.db import connection
 
+from weather.data_sources.data_version import data_version
+
 
 def insert_mv_record(
     station_code: str,
@@ -57,12 +62,14 @@ def set_cutoff(date: dt.date) -> None:
             """,
             {"cutoff_date": date},
         )
+    data_version.invalidate()
 
 
 def clear_mv() -> None:
     with connection.cursor() as cur:
         cur.execute("TRUNCATE public.mv_records_battus;")
         cur.execute("TRUNCATE public.mv_records_battus_meta;")
+    data_version.invalidate()
 
 
 def insert_mv_records_absolus_par_mois(
@@ -93,3 +100,30 @@ def insert_mv_records_absolus_par_mois(
                 "tnn_min_date": tnn_min_date,
             },
         )
+
+
+def refresh_records_state(since: dt.date | None = None) -> int:
+    """
+    Exécute le job incrémental (since=None => ré-amorçage complet) et renvoie
+    le nombre de lignes du journal ajoutées ou retirées.
+    """
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT public.refresh_records_battus_state(%(since)s::date);",
+            {"since": since},
+        )
+        return cur.fetchone()[0]
+
+
+def fetch_records_recents() -> list[tuple[str, str | None, str, str, float, dt.date]]:
+    """(period_type, period_value, record_type, station_code, valeur, date) du journal."""
+    with connection.cursor() as cur:
+        cur.execute(
+            """
+            SELECT period_type, period_value, record_type, TRIM(station_code),
+                   record_value, record_date
+            FROM public.records_battus_recents
+            ORDER BY station_code, record_type, period_type, period_value, record_date
+            """
+        )
+        return cur.fetchall()
@@ -18,6 +18,9 @@ import pathlib
 import pytest
 from django.db import connection
 
+from weather.data_sources.data_version import data_version
+from weather.data_sources.reference_data import reference_data
+
 BASE_DIR = pathlib.Path(__file__).resolve().parents[3]  # = backend/
 
 
@@ -58,6 +61,12 @@ def setup_db_schema_and_views(django_db_setup, django_db_blocker):
     ref_department_region_sql = (
         BASE_DIR / "sql" / "tables" / "001_table_ref_department_region.sql"
     ).read_text()
+    data_version_sql = (
+        BASE_DIR / "sql" / "tables" / "002_table_data_version.sql"
+    ).read_text()
+    mv_records_battus_meta_sql = (
+        BASE_DIR / "sql" / "schemas" / "records" / "001_mv_records_battus_meta.sql"
+    ).read_text()
     v_station_qualifiee_hexagone_sql = (
         BASE_DIR / "sql" / "views" / "200_001_v_station_qualifiee_hexagone.sql"
     ).read_text()
@@ -97,6 +106,29 @@ def setup_db_schema_and_views(django_db_setup, django_db_blocker):
         / "test_tables"
         / "640_004_v_itn_baseline_monthly_1991_2020.sql"
     ).read_text()
+    station_temperature_rollups_sql = (
+        BASE_DIR / "sql" / "materialized_views" / "530_station_temperature_rollups.sql"
+    ).read_text()
+    station_deviation_cumsum_sql = (
+        BASE_DIR / "sql" / "materialized_views" / "540_station_deviation_cumsum.sql"
+    ).read_text()
+    v_station_itn_sql = (
+        BASE_DIR / "sql" / "views" / "600_002_v_station_itn.sql"
+    ).read_text()
+    v_itn_daily_all_years_sql = (
+        BASE_DIR
+        / "sql"
+        / "materialized_views"
+        / "itn"
+        / "710_006_v_itn_daily_all_years.sql"
+    ).read_text()
+    mv_itn_daily_all_years_sql = (
+        BASE_DIR
+        / "sql"
+        / "materialized_views"
+        / "itn"
+        / "711_006_mv_itn_daily_all_years.sql"
+    ).read_text()
     v_itn_daily_all_years_with_feb29_sql = (
         BASE_DIR
         / "sql"
@@ -125,6 +157,34 @@ def setup_db_schema_and_views(django_db_setup, django_db_blocker):
         / "itn"
         / "750_010_v_itn_absolute_extremes_yearly.sql"
     ).read_text()
+    itn_absolute_extremes_daily_sql = (
+        BASE_DIR
+        / "sql"
+        / "materialized_views"
+        / "itn"
+        / "760_011_itn_absolute_extremes_daily.sql"
+    ).read_text()
+    v_records_battus_sql = (
+        BASE_DIR
+        / "sql"
+        / "materialized_views"
+        / "records"
+        / "410_001_v_records_battus.sql"
+    ).read_text()
+    records_battus_single_scan_sql = (
+        BASE_DIR
+        / "sql"
+        / "materialized_views"
+        / "records"
+        / "405_009_records_battus_single_scan.sql"
+    ).read_text()
+    rebuild_records_battus_sql = (
+        BASE_DIR
+        / "sql"
+        / "materialized_views"
+        / "records"
+        / "412_008_rebuild_records_battus.sql"
+    ).read_text()
     v_records_absolus_par_saison_sql = (
         BASE_DIR
         / "sql"
@@ -146,6 +206,13 @@ def setup_db_schema_and_views(django_db_setup, django_db_blocker):
         / "records"
         / "450_006_v_records_absolus_par_type.sql"
     ).read_text()
+    records_battus_state_sql = (
+        BASE_DIR
+        / "sql"
+        / "materialized_views"
+        / "records"
+        / "460_007_records_battus_state.sql"
+    ).read_text()
 
     with django_db_blocker.unblock():
         with connection.cursor() as cur:
@@ -164,6 +231,8 @@ def setup_db_schema_and_views(django_db_setup, django_db_blocker):
             )
             cur.execute(schema_sql)
             cur.execute(ref_department_region_sql)
+            cur.execute("DROP TABLE IF EXISTS public.data_version;")
+            cur.execute(data_version_sql)
             cur.execute("""
                 CREATE TABLE public.mv_first_temperature_date (
                     station_code           char(8),
@@ -193,6 +262,21 @@ def setup_db_schema_and_views(django_db_setup, django_db_blocker):
             cur.execute(v_station_records_sql)
             cur.execute(v_quotidienne_deviation)
             cur.execute(baseline_station_table_sql)
+            cur.execute(
+                "DROP TABLE IF EXISTS public.station_temperature_rollups,"
+                " public.national_minmax_rollups,"
+                " public.temperature_rollups_meta CASCADE;"
+            )
+            cur.execute(station_temperature_rollups_sql)
+            # Rollups et cumuls désactivés par défaut (lecture journalière) :
+            # les tests qui les exercent appellent leur fonction de refresh.
+            cur.execute("DELETE FROM public.temperature_rollups_meta;")
+            cur.execute(
+                "DROP TABLE IF EXISTS public.station_deviation_cumsum,"
+                " public.station_deviation_cumsum_meta CASCADE;"
+            )
+            cur.execute(station_deviation_cumsum_sql)
+            cur.execute("DELETE FROM public.station_deviation_cumsum_meta;")
             cur.execute(itn_baseline_tables_sql)
             cur.execute(
                 get_drop_mv_or_table_sql(mv_or_table_name="mv_itn_daily_all_years_sql")
@@ -208,13 +292,20 @@ def setup_db_schema_and_views(django_db_setup, django_db_blocker):
                     itn          double precision NOT NULL
                 );
             """)
+            # Table créée ci-dessus (types date / double precision) : le
+            # script 006 n'y ajoute que les index et la fonction de refresh.
+            cur.execute(v_station_itn_sql)
+            cur.execute(v_itn_daily_all_years_sql)
+            cur.execute(mv_itn_daily_all_years_sql)
             cur.execute(v_itn_daily_all_years_with_feb29_sql)
             cur.execute(v_itn_absolute_extremes_daily_sql)
             cur.execute(v_itn_absolute_extremes_monthly_sql)
             cur.execute(v_itn_absolute_extremes_yearly_sql)
             cur.execute(
-                "CREATE TABLE public.mv_records_battus_meta (cutoff_date DATE NOT NULL);"
+                "DROP TABLE IF EXISTS public.itn_absolute_extremes_daily CASCADE;"
             )
+            cur.execute(itn_absolute_extremes_daily_sql)
+            cur.execute(mv_records_battus_meta_sql)
             cur.execute("""
                 CREATE TABLE public.mv_records_battus (
                     period_type   text,
@@ -227,6 +318,13 @@ def setup_db_schema_and_views(django_db_setup, django_db_blocker):
                     record_date   timestamp
                 );
             """)
+            cur.execute(
+                "DROP TABLE IF EXISTS public.mv_records_battus_shadow,"
+                " public.mv_records_battus_old;"
+            )
+            cur.execute(v_records_battus_sql)
+            cur.execute(records_battus_single_scan_sql)
+            cur.execute(rebuild_records_battus_sql)
             cur.execute("""
                 CREATE TABLE public.mv_records_absolus_par_mois (
                     station_code  char(8),
@@ -241,3 +339,23 @@ def setup_db_schema_and_views(django_db_setup, django_db_blocker):
             cur.execute(v_records_absolus_par_saison_sql)
             cur.execute(v_records_absolus_sql)
             cur.execute(v_records_absolus_par_type_sql)
+            cur.execute(
+                "DROP TABLE IF EXISTS public.records_battus_state,"
+                " public.records_battus_recents,"
+                " public.records_battus_state_meta CASCADE;"
+            )
+            cur.execute(records_battus_state_sql)
+
+
+@pytest.fixture(autouse=True)
+def reset_reference_data():
+    """
+    Le référentiel 1991-2020 et le registre data_version sont lus une fois par
+    process : chaque test insère ses propres données, on force donc une
+    relecture.
+    """
+    reference_data.invalidate()
+    data_version.invalidate()
+    yield
+    reference_data.invalidate()
+    data_version.invalidate()
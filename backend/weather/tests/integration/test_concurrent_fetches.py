@@ -0,0 +1,45 @@
+"""
+Tests d'intégration des lectures parallèles (`run_concurrently`) : une
+connexion par lecture hors transaction, repli séquentiel dans une transaction.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from django.db import connection
+
+from weather import db_pool
+from weather.utils.concurrency import run_concurrently
+
+
+def _backend_pid() -> int:
+    with connection.cursor() as cur:
+        cur.execute("SELECT pg_backend_pid()")
+        return cur.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_fetches_use_their_own_pooled_connection_outside_transactions():
+    # Les trois lectures ne rendent la main qu'une fois toutes en cours.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def pid_when_all_running() -> int:
+        pid = _backend_pid()
+        barrier.wait()
+        return pid
+
+    pids = run_concurrently(*[pid_when_all_running] * 3)
+
+    assert len(set(pids)) == 3
+    stats = db_pool.pool_stats()
+    # Connexions des threads rendues au pool ; celle de l'appelant reste prise.
+    assert stats["pool_available"] >= 2
+
+
+@pytest.mark.django_db
+def test_fetches_share_the_connection_inside_a_transaction():
+    pids = run_concurrently(_backend_pid, _backend_pid)
+
+    assert pids[0] == pids[1]
@@ -0,0 +1,56 @@
+"""
+Tests d'intégration du registre data_version (sql/tables/002) : cutoff_date
+recopiée depuis mv_records_battus_meta par trigger, token renouvelé par
+touch_data_version, lecture gardée DATA_VERSION_TTL_S secondes par process.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from django.db import connection
+
+from weather.data_sources.data_version import SOURCE_RECORDS, data_version
+from weather.tests.helpers.records import clear_mv, set_cutoff
+
+pytestmark = pytest.mark.django_db
+
+
+def _touch(source: str) -> None:
+    with connection.cursor() as cur:
+        cur.execute("SELECT public.touch_data_version(%s)", [source])
+
+
+def test_meta_trigger_mirrors_cutoff_into_registry():
+    set_cutoff(dt.date(2025, 6, 30))
+
+    snapshot = data_version.get()
+
+    assert snapshot.records_cutoff == dt.date(2025, 6, 30)
+    assert SOURCE_RECORDS in snapshot.refreshed_at
+
+    clear_mv()
+    assert data_version.get().records_cutoff is None
+
+
+def test_registry_is_cached_until_ttl_or_invalidation(settings):
+    settings.DATA_VERSION_TTL_S = 3600
+    before = data_version.get()
+
+    _touch("ingestion")
+
+    assert data_version.get() is before
+    data_version.invalidate()
+    after = data_version.get()
+    assert "ingestion" in after.refreshed_at
+    assert after.token != before.token
+
+
+def test_zero_ttl_rereads_registry(settings):
+    settings.DATA_VERSION_TTL_S = 0
+    before = data_version.get()
+
+    _touch("mv_quotidienne_realtime")
+
+    assert data_version.get().token != before.token
@@ -0,0 +1,66 @@
+"""
+Tests d'intégration du pool de connexions (settings DB_POOL_*), de ses
+statistiques et de la commande benchmark_db_connections.
+"""
+
+from __future__ import annotations
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from psycopg_pool import ConnectionPool
+
+from weather import db_pool
+
+pytestmark = pytest.mark.django_db
+
+
+def test_connections_come_from_a_checked_pool():
+    pool = db_pool.connection_pool()
+
+    assert isinstance(pool, ConnectionPool)
+    assert pool.name == "weather"
+    assert pool._check == ConnectionPool.check_connection
+    assert connection.settings_dict["CONN_MAX_AGE"] == 0
+
+    with connection.cursor() as cur:
+        cur.execute("SELECT 1")
+    stats = db_pool.pool_stats()
+    assert stats["pool_min"] == 1
+    assert stats["pool_size"] >= 1
+
+
+def test_pool_stats_are_logged_every_n_requests(monkeypatch):
+    logged = []
+    monkeypatch.setattr(db_pool, "_finished_requests", iter(range(1, 10)))
+    monkeypatch.setattr(db_pool.logger, "info", lambda *args: logged.append(args))
+
+    with override_settings(DB_POOL_STATS_EVERY=3):
+        for _ in range(7):
+            db_pool.log_pool_stats()
+
+    assert len(logged) == 2
+    assert logged[0][1] == "weather"
+    assert "requests_num=" in logged[0][2]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_command_compares_fresh_and_pooled_connections():
+    out = StringIO()
+    call_command(
+        "benchmark_db_connections",
+        "--path",
+        "/api/v1/stations/",
+        "--requests",
+        "3",
+        stdout=out,
+    )
+
+    output = out.getvalue()
+    assert "connexion par requête" in output
+    assert "pool" in output
+    assert "requests_num=3" in output
+    assert db_pool.connection_pool().name == "weather"
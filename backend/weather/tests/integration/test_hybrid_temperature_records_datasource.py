@@ -4,13 +4,16 @@ import datetime as dt
 from unittest.mock import patch
 
 import pytest
+from django.db import DatabaseError, connection
 
 from weather.data_sources.timescale import HybridTemperatureRecordsDataSource
 from weather.services.temperature_records.types import TemperatureRecordsRequest
 from weather.tests.helpers.horaire import insert_mv_quotidienne_realtime
 from weather.tests.helpers.records import (
+    fetch_records_recents,
     insert_mv_record,
     insert_mv_records_absolus_par_mois,
+    refresh_records_state,
     set_cutoff,
 )
 from weather.tests.helpers.stations import insert_station
@@ -372,28 +375,22 @@ def test_after_cutoff_date_filter_excludes_outside_range():
 
 
 @pytest.mark.django_db
-def test_meta_table_absent_falls_back_to_mv():
-    """Erreur DB sur la méta table → pas d'exception, retourne les données MV seules."""
-    code = "76116010"
-    insert_station(code, "Station Hybrid 10", departement=76)
-    insert_mv_record(
-        code, "Station Hybrid 10", "all_time", None, "TX", 38.0, dt.date(2003, 7, 15)
-    )
-
+def test_data_version_errors_are_not_swallowed():
+    """Erreur DB sur le registre data_version → l'exception remonte (pas de
+    repli silencieux sur la MV seule)."""
     ds = HybridTemperatureRecordsDataSource()
 
-    # Simuler une erreur DB (ex. table absente) sur _get_cutoff_date
-    with patch.object(
-        ds, "_get_cutoff_date", side_effect=Exception("table does not exist")
+    with (
+        patch(
+            "weather.data_sources.data_version._load_snapshot",
+            side_effect=DatabaseError("relation does not exist"),
+        ),
+        pytest.raises(DatabaseError),
     ):
-        result = ds.fetch_records(
+        ds.fetch_records(
             TemperatureRecordsRequest(period_type="all_time", type_records="hot")
         )
 
-    entries = [e for e in result.entries if e.station_id.strip() == code]
-    assert len(entries) == 1
-    assert entries[0].record_value == 38.0
-
 
 @pytest.mark.django_db
 @pytest.mark.skip(reason=_MV_RECORDS_BATTUS_REALTIME_SKIP_REASON)
@@ -457,7 +454,7 @@ def test_record_on_cutoff_date_is_detected():
     entries = [e for e in result.entries if e.station_id.strip() == code]
     values = {(e.record_date, e.record_value) for e in entries}
     assert (cutoff, 45.0) in values, (
-        f"Le record du jour de cutoff ({cutoff}) manque dans la réponse : " f"{entries}"
+        f"Le record du jour de cutoff ({cutoff}) manque dans la réponse : {entries}"
     )
 
 
@@ -481,9 +478,9 @@ def test_record_present_in_mv_and_realtime_is_not_counted_twice():
 
     entries = [e for e in result.entries if e.station_id.strip() == code]
     on_same_day = [e for e in entries if e.record_date == same_day]
-    assert (
-        len(on_same_day) == 1
-    ), f"Le record du {same_day} apparaît {len(on_same_day)} fois : {on_same_day}"
+    assert len(on_same_day) == 1, (
+        f"Le record du {same_day} apparaît {len(on_same_day)} fois : {on_same_day}"
+    )
     assert on_same_day[0].record_value == 42.0
 
 
@@ -509,9 +506,9 @@ def test_stale_mv_record_does_not_duplicate_with_fresher_realtime():
 
     entries = [e for e in result.entries if e.station_id.strip() == code]
     on_same_day = [e for e in entries if e.record_date == same_day]
-    assert (
-        len(on_same_day) == 1
-    ), f"Le record du {same_day} apparaît {len(on_same_day)} fois : {on_same_day}"
+    assert len(on_same_day) == 1, (
+        f"Le record du {same_day} apparaît {len(on_same_day)} fois : {on_same_day}"
+    )
     assert on_same_day[0].record_value == 45.0
 
 
@@ -556,3 +553,225 @@ def test_absolute_record_predates_50_year_filter_seeds_correctly():
         "12.3°C ne doit pas battre le record absolu May de 0°C, "
         f"mais le hybride retourne : {entries}"
     )
+
+
+# =========================
+# État incrémental (records_battus_state)
+# =========================
+
+
+def _entries_for(result, code: str) -> list[tuple[dt.date, float]]:
+    return sorted(
+        (e.record_date, e.record_value)
+        for e in result.entries
+        if e.station_id.strip() == code
+    )
+
+
+def _setup_state_station(code: str) -> None:
+    insert_station(code, f"Station State {code}", departement=76)
+    insert_mv_record(
+        code,
+        f"Station State {code}",
+        "all_time",
+        None,
+        "TX",
+        38.0,
+        dt.date(2003, 7, 15),
+    )
+    set_cutoff(dt.date(2025, 12, 31))
+
+
+@pytest.mark.django_db
+def test_records_state_matches_live_computation():
+    """Journal + état incrémental == window function à chaud sur tout le post-cutoff."""
+    code = "76116020"
+    _setup_state_station(code)
+    for day, tx in [(1, 39.0), (2, 37.0), (3, 41.0), (4, 40.0)]:
+        insert_mv_quotidienne_realtime(
+            code, dt.date(2026, 7, day), tn=_FILLER_TN, tx=tx
+        )
+    request = TemperatureRecordsRequest(period_type="all_time", type_records="hot")
+
+    live = _entries_for(
+        HybridTemperatureRecordsDataSource().fetch_records(request), code
+    )
+    refresh_records_state()
+    from_state = _entries_for(
+        HybridTemperatureRecordsDataSource().fetch_records(request), code
+    )
+
+    assert (
+        from_state
+        == live
+        == [
+            (dt.date(2003, 7, 15), 38.0),
+            (dt.date(2026, 7, 1), 39.0),
+            (dt.date(2026, 7, 3), 41.0),
+        ]
+    )
+    assert ("all_time", None, "TX", code, 41.0, dt.date(2026, 7, 3)) in (
+        fetch_records_recents()
+    )
+
+
+@pytest.mark.django_db
+def test_records_state_tail_and_incremental_refresh():
+    """Jours > processed_through calculés à chaud, puis absorbés par le job."""
+    code = "76116021"
+    _setup_state_station(code)
+    insert_mv_quotidienne_realtime(code, dt.date(2026, 7, 1), tn=_FILLER_TN, tx=39.0)
+    refresh_records_state()
+
+    insert_mv_quotidienne_realtime(code, dt.date(2026, 7, 2), tn=_FILLER_TN, tx=40.0)
+    request = TemperatureRecordsRequest(period_type="all_time", type_records="hot")
+    expected = [
+        (dt.date(2003, 7, 15), 38.0),
+        (dt.date(2026, 7, 1), 39.0),
+        (dt.date(2026, 7, 2), 40.0),
+    ]
+
+    ds = HybridTemperatureRecordsDataSource()
+    assert _entries_for(ds.fetch_records(request), code) == expected
+
+    refresh_records_state(since=dt.date(2026, 7, 2))
+    recents = [
+        r for r in fetch_records_recents() if r[:4] == ("all_time", None, "TX", code)
+    ]
+    assert [(r[5], r[4]) for r in recents] == expected[1:]
+    assert _entries_for(ds.fetch_records(request), code) == expected
+
+
+@pytest.mark.django_db
+def test_records_state_rewinds_revised_days():
+    """Un jour déjà traité révisé à la baisse : le record est retiré au rejeu."""
+    code = "76116022"
+    _setup_state_station(code)
+    insert_mv_quotidienne_realtime(code, dt.date(2026, 7, 1), tn=_FILLER_TN, tx=39.0)
+    insert_mv_quotidienne_realtime(code, dt.date(2026, 7, 2), tn=_FILLER_TN, tx=42.0)
+    refresh_records_state()
+
+    with connection.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE public.mv_quotidienne_realtime SET tx = 36.0
+            WHERE station_code = %s AND date = %s
+            """,
+            [code, dt.date(2026, 7, 2)],
+        )
+    refresh_records_state(since=dt.date(2026, 7, 2))
+
+    ds = HybridTemperatureRecordsDataSource()
+    result = ds.fetch_records(
+        TemperatureRecordsRequest(period_type="all_time", type_records="hot")
+    )
+    assert _entries_for(result, code) == [
+        (dt.date(2003, 7, 15), 38.0),
+        (dt.date(2026, 7, 1), 39.0),
+    ]
+
+
+@pytest.mark.django_db
+def test_records_state_refresh_reports_changed_rows():
+    """Rejeu sans nouveauté => 0 (le job pg_cron ne touche pas data_version)."""
+    code = "76116024"
+    _setup_state_station(code)
+    insert_mv_quotidienne_realtime(code, dt.date(2026, 7, 1), tn=_FILLER_TN, tx=39.0)
+    refresh_records_state()
+
+    assert refresh_records_state(since=dt.date(2026, 7, 1)) == 0
+
+    insert_mv_quotidienne_realtime(code, dt.date(2026, 7, 2), tn=_FILLER_TN, tx=40.0)
+    assert refresh_records_state(since=dt.date(2026, 7, 1)) > 0
+    assert refresh_records_state(since=dt.date(2026, 7, 1)) == 0
+
+
+@pytest.mark.django_db
+def test_records_state_ignored_for_another_cutoff():
+    """État amorcé pour une ancienne cutoff : calcul à chaud complet."""
+    code = "76116023"
+    _setup_state_station(code)
+    insert_mv_quotidienne_realtime(code, dt.date(2026, 7, 1), tn=_FILLER_TN, tx=39.0)
+    refresh_records_state()
+    set_cutoff(dt.date(2026, 1, 31))
+
+    ds = HybridTemperatureRecordsDataSource()
+    result = ds.fetch_records(
+        TemperatureRecordsRequest(period_type="all_time", type_records="hot")
+    )
+    assert _entries_for(result, code) == [
+        (dt.date(2003, 7, 15), 38.0),
+        (dt.date(2026, 7, 1), 39.0),
+    ]
+
+
+# =========================
+# Pagination SQL
+# =========================
+
+
+def _insert_five_mv_records() -> None:
+    for i, value in enumerate([36.0, 41.0, 38.5, 39.0, 40.0]):
+        code = f"7611610{i}"
+        name = f"Station Page {i}"
+        insert_station(code, name, departement=76)
+        insert_mv_record(
+            code, name, "all_time", None, "TX", value, dt.date(2003, 7, 10 + i)
+        )
+
+
+@pytest.mark.django_db
+def test_sql_pagination_returns_requested_page_and_total():
+    _insert_five_mv_records()
+    set_cutoff(dt.date(2025, 12, 31))
+
+    ds = HybridTemperatureRecordsDataSource()
+    result = ds.fetch_records(
+        TemperatureRecordsRequest(
+            period_type="all_time",
+            type_records="hot",
+            sort="-record_value",
+            page=2,
+            page_size=2,
+        )
+    )
+
+    assert [e.record_value for e in result.entries] == [39.0, 38.5]
+    assert result.pagination.total_count == 5
+    assert result.pagination.total_pages == 3
+
+
+@pytest.mark.django_db
+def test_sql_pagination_page_past_end_keeps_total():
+    _insert_five_mv_records()
+
+    ds = HybridTemperatureRecordsDataSource()
+    result = ds.fetch_records(
+        TemperatureRecordsRequest(
+            period_type="all_time", type_records="hot", page=4, page_size=2
+        )
+    )
+
+    assert result.entries == []
+    assert result.pagination.total_count == 5
+    assert result.pagination.total_pages == 3
+
+
+@pytest.mark.django_db
+def test_sql_pagination_matches_python_pagination():
+    _insert_five_mv_records()
+    set_cutoff(dt.date(2025, 12, 31))
+    insert_mv_quotidienne_realtime(
+        "76116100", dt.date(2026, 7, 15), tn=_FILLER_TN, tx=42.0
+    )
+
+    for sort in ("-record_value", "record_date", "-station_name,record_value"):
+        request = TemperatureRecordsRequest(
+            period_type="all_time", type_records="hot", sort=sort, page_size=50
+        )
+        in_sql = HybridTemperatureRecordsDataSource().fetch_records(request)
+        in_python = HybridTemperatureRecordsDataSource(
+            paginate_in_sql=False
+        ).fetch_records(request)
+
+        assert in_sql == in_python, sort
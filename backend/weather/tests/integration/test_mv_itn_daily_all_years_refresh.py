@@ -0,0 +1,114 @@
+"""
+Tests d'intégration de `refresh_itn_daily_all_years(p_since)` (006).
+
+La fonction recalcule via `v_itn_daily_all_years` les seuls jours >= p_since et
+les upserte dans la table `mv_itn_daily_all_years` ; les jours de la fenêtre
+qui ne passent plus le seuil de 29 stations sont supprimés, ceux d'avant la
+fenêtre ne sont pas touchés. Sans p_since, la fenêtre couvre
+mv_quotidienne_realtime et au moins les 7 derniers jours.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from django.db import connection
+
+from weather.services.national_indicator.stations import expected_station_codes
+from weather.tests.helpers.horaire import insert_mv_quotidienne_realtime
+from weather.tests.helpers.itn import (
+    insert_complete_itn_day,
+    insert_itn_daily,
+    insert_quotidienne,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+DAY = dt.date(2020, 6, 10)
+
+
+def _refresh(since: dt.date) -> tuple[dt.date, int, int]:
+    with connection.cursor() as cur:
+        cur.execute(
+            """
+            SELECT window_start, upserted, deleted
+            FROM public.refresh_itn_daily_all_years(%s)
+            """,
+            [since],
+        )
+        return cur.fetchone()
+
+
+def _itn_by_date() -> dict[dt.date, float]:
+    with connection.cursor() as cur:
+        cur.execute("SELECT date, itn FROM public.mv_itn_daily_all_years")
+        return {row[0]: row[1] for row in cur.fetchall()}
+
+
+def test_refresh_inserts_complete_days_of_the_window():
+    insert_complete_itn_day(DAY, 12.0)
+
+    assert _refresh(DAY) == (DAY, 1, 0)
+    assert _itn_by_date() == {DAY: pytest.approx(12.0)}
+
+
+def test_refresh_only_rewrites_changed_days():
+    insert_complete_itn_day(DAY, 12.0)
+    insert_complete_itn_day(DAY + dt.timedelta(days=1), 14.0)
+    _refresh(DAY)
+
+    assert _refresh(DAY) == (DAY, 0, 0)
+
+    code = sorted(expected_station_codes(DAY))[0]
+    insert_quotidienne(DAY, code, 42.0)
+    assert _refresh(DAY) == (DAY, 1, 0)
+    assert _itn_by_date()[DAY] == pytest.approx((29 * 12.0 + 42.0) / 30)
+
+
+def test_refresh_deletes_days_below_station_threshold():
+    insert_itn_daily(DAY.year, DAY.month, DAY.day, 12.0)
+    for code in sorted(expected_station_codes(DAY))[:28]:
+        insert_quotidienne(DAY, code, 12.0)
+
+    assert _refresh(DAY) == (DAY, 0, 1)
+    assert _itn_by_date() == {}
+
+
+def test_refresh_leaves_days_before_the_window_untouched():
+    before = DAY - dt.timedelta(days=1)
+    insert_itn_daily(before.year, before.month, before.day, 3.0)
+    insert_complete_itn_day(DAY, 12.0)
+
+    _refresh(DAY)
+
+    assert _itn_by_date() == {before: 3.0, DAY: pytest.approx(12.0)}
+
+
+def test_default_window_revisits_days_before_the_realtime_window():
+    """
+    Le jour qui vient de quitter la fenêtre temps réel (ITN calculé depuis
+    le temps réel) est recalculé depuis Quotidienne par le refresh sans
+    argument du job pg_cron.
+    """
+    today = dt.date.today()
+    insert_mv_quotidienne_realtime(
+        sorted(expected_station_codes(today))[0],
+        today - dt.timedelta(days=3),
+        tn=10.0,
+        tx=20.0,
+    )
+    day = today - dt.timedelta(days=4)
+    insert_itn_daily(day.year, day.month, day.day, 5.0)
+    insert_complete_itn_day(day, 12.0)
+
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT window_start, upserted FROM public.refresh_itn_daily_all_years()"
+        )
+        window_start, upserted = cur.fetchone()
+
+    assert window_start == today - dt.timedelta(days=7)
+    assert upserted == 1
+    assert _itn_by_date()[day] == pytest.approx(12.0)
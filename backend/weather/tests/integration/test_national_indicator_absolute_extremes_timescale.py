@@ -2,7 +2,8 @@
 Tests d'intégration pour TimescaleNationalIndicatorAbsoluteExtremesDataSource.
 
 Ces tests vérifient que la data source lit correctement les valeurs
-depuis les vues v_itn_absolute_extremes_daily/monthly/yearly.
+depuis la table itn_absolute_extremes_daily et les vues
+v_itn_absolute_extremes_monthly/yearly.
 
 Patterns :
 - pytestmark = pytest.mark.django_db pour l'accès base de données
@@ -10,7 +11,10 @@ Patterns :
 
 from __future__ import annotations
 
+import datetime as dt
+
 import pytest
+from django.db import connection
 
 from weather.data_sources.timescale import (
     TimescaleNationalIndicatorAbsoluteExtremesDataSource,
@@ -134,3 +138,67 @@ def test_yearly_absolute_extremes_no_data_raises():
     ds = TimescaleNationalIndicatorAbsoluteExtremesDataSource()
     with pytest.raises(ValueError, match="extremes annuels"):
         ds.fetch_yearly_absolute_extremes()
+
+
+# ---------------------------------------------------------------------------
+# itn_absolute_extremes_daily : maintenance incrémentale
+# ---------------------------------------------------------------------------
+
+
+def test_daily_absolute_extremes_refresh_only_touches_recent_days():
+    """
+    refresh_itn_absolute_extremes_daily(since) ne recalcule que les jours
+    calendaires ayant une ligne datée >= since ; une reconstruction complète
+    (since NULL) rattrape le reste.
+    """
+    insert_itn_daily(2000, 4, 1, 10.0)
+    insert_itn_daily(2000, 4, 2, 10.0)
+    with connection.cursor() as cur:
+        cur.execute("""
+            UPDATE public.mv_itn_daily_all_years SET itn = 3.0
+            WHERE month = 4 AND day_of_month = 2
+        """)
+        cur.execute("""
+            INSERT INTO public.mv_itn_daily_all_years
+                   (date, year, month, day_of_month, itn)
+            VALUES ('2025-04-01', 2025, 4, 1, 15.0)
+        """)
+        cur.execute(
+            "SELECT public.refresh_itn_absolute_extremes_daily(%s)",
+            [dt.date(2025, 1, 1)],
+        )
+
+    ds = TimescaleNationalIndicatorAbsoluteExtremesDataSource()
+    result = ds.fetch_daily_absolute_extremes({(4, 1), (4, 2)})
+    assert result[(4, 1)].absolute_max == pytest.approx(15.0)
+    # (4, 2) n'a pas de ligne récente : valeur précédente conservée.
+    assert result[(4, 2)].absolute_min == pytest.approx(10.0)
+
+    with connection.cursor() as cur:
+        cur.execute("SELECT public.refresh_itn_absolute_extremes_daily()")
+    result = ds.fetch_daily_absolute_extremes({(4, 2)})
+    assert result[(4, 2)].absolute_min == pytest.approx(3.0)
+
+
+def test_daily_absolute_extremes_refresh_reports_changed_rows():
+    """Renvoie le nombre de jours calendaires modifiés : 0 si rien n'a changé."""
+    insert_itn_daily(2000, 4, 1, 10.0)
+
+    def _refresh(since=None) -> int:
+        with connection.cursor() as cur:
+            cur.execute(
+                "SELECT public.refresh_itn_absolute_extremes_daily(%s)", [since]
+            )
+            return cur.fetchone()[0]
+
+    _refresh()
+    assert _refresh(dt.date(2000, 1, 1)) == 0
+
+    with connection.cursor() as cur:
+        cur.execute("""
+            INSERT INTO public.mv_itn_daily_all_years
+                   (date, year, month, day_of_month, itn)
+            VALUES ('2025-04-01', 2025, 4, 1, 15.0)
+        """)
+    assert _refresh(dt.date(2025, 1, 1)) == 1
+    assert _refresh(dt.date(2025, 1, 1)) == 0
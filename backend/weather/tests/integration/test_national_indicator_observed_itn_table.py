@@ -0,0 +1,105 @@
+"""
+Tests d'intégration de `TimescaleNationalIndicatorObservedDataSource` lue
+depuis mv_itn_daily_all_years.
+
+Le calcul Python depuis Quotidienne (compute_itn_for_day) reste le fallback
+quand la table est vide et pour les jours postérieurs à son dernier jour :
+les deux chemins doivent renvoyer la même série.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from django.db import connection
+
+from weather.data_sources.timescale import TimescaleNationalIndicatorObservedDataSource
+from weather.services.national_indicator.stations import (
+    REIMS_COURCY,
+    REIMS_PRUNAY,
+    expected_station_codes,
+)
+from weather.services.national_indicator.types import DailySeriesQuery
+from weather.tests.helpers.itn import (
+    insert_complete_itn_day,
+    insert_itn_daily,
+    insert_quotidienne,
+)
+from weather.tests.helpers.stations import insert_station
+from weather.utils.date_range import iter_days_intersecting
+
+pytestmark = pytest.mark.django_db
+
+
+START = dt.date(2012, 5, 1)
+END = dt.date(2012, 5, 20)
+
+
+def _refresh() -> None:
+    with connection.cursor() as cur:
+        cur.execute("SELECT * FROM public.refresh_itn_daily_all_years('1947-01-01')")
+
+
+def _series(**kwargs):
+    defaults = {"date_start": START, "date_end": END}
+    return TimescaleNationalIndicatorObservedDataSource().fetch_daily_series(
+        DailySeriesQuery(**{**defaults, **kwargs})
+    )
+
+
+def _as_dict(points) -> dict[dt.date, float]:
+    return {p.date: p.temperature for p in points}
+
+
+@pytest.fixture
+def itn_days():
+    for i, day in enumerate(iter_days_intersecting(START, END)):
+        codes = sorted(expected_station_codes(day))
+        # Le 3 : deux stations manquantes, jour rejeté.
+        # Le 4 : une station manquante, jour accepté.
+        missing = {3: 2, 4: 1}.get(day.day, 0)
+        for n, code in enumerate(codes[missing:]):
+            insert_station(code)
+            insert_quotidienne(day, code, 5.0 + (i * 7 + n * 3) % 11)
+        # Les deux Reims observées : seule celle attendue pour le jour compte.
+        other_reims = REIMS_PRUNAY if REIMS_COURCY in codes else REIMS_COURCY
+        insert_station(other_reims)
+        insert_quotidienne(day, other_reims, 40.0)
+
+
+@pytest.mark.parametrize(
+    "target_dates",
+    [
+        None,
+        (dt.date(2012, 5, 3), dt.date(2012, 5, 4), dt.date(2012, 5, 8)),
+    ],
+)
+def test_table_matches_python_fallback(itn_days, target_dates):
+    computed = _series(target_dates=target_dates)
+
+    _refresh()
+    read = _series(target_dates=target_dates)
+
+    assert list(_as_dict(read)) == list(_as_dict(computed))
+    assert _as_dict(read) == pytest.approx(_as_dict(computed))
+    assert dt.date(2012, 5, 3) not in _as_dict(read)
+
+
+def test_values_are_read_from_table():
+    day = dt.date(2020, 6, 10)
+    insert_complete_itn_day(day, 12.0)
+    insert_itn_daily(year=2020, month=6, day_of_month=10, itn=13.5)
+
+    assert _as_dict(_series(date_start=day, date_end=day)) == {day: 13.5}
+
+
+def test_days_after_last_table_day_are_computed(itn_days):
+    _refresh()
+    late_day = END + dt.timedelta(days=2)
+    insert_complete_itn_day(late_day, 21.0)
+
+    points = _as_dict(_series(date_end=late_day))
+
+    assert points[late_day] == pytest.approx(21.0)
+    assert list(points) == sorted(points)
@@ -175,3 +175,35 @@ def test_fetch_yearly_baseline_happy_path():
     assert result.baseline_mean == 30.0
     assert result.baseline_std_dev_upper == 34.0
     assert result.baseline_std_dev_lower == 26.0
+
+
+def test_fetch_daily_baselines_returns_only_requested_pairs():
+    ds = TimescaleNationalIndicatorBaselineDataSource()
+
+    insert_daily_baseline(month=1, day=15, mean=10.0, std=2.0)
+    insert_daily_baseline(month=2, day=29, mean=5.0, std=1.0)
+    insert_daily_baseline(month=2, day=15, mean=7.0, std=1.0)
+
+    result = ds.fetch_daily_baselines({(1, 15), (2, 29)})
+
+    assert set(result) == {(1, 15), (2, 29)}
+    assert result[(1, 15)].baseline_std_dev_upper == 12.0
+    assert result[(2, 29)].baseline_mean == 5.0
+
+
+def test_fetch_daily_baselines_empty_input_returns_empty():
+    ds = TimescaleNationalIndicatorBaselineDataSource()
+
+    assert ds.fetch_daily_baselines(set()) == {}
+
+
+def test_fetch_monthly_baselines_happy_path():
+    ds = TimescaleNationalIndicatorBaselineDataSource()
+
+    insert_monthly_baseline(month=2, mean=20.0, std=3.0)
+    insert_monthly_baseline(month=3, mean=25.0, std=3.0)
+
+    result = ds.fetch_monthly_baselines({2})
+
+    assert set(result) == {2}
+    assert result[2].baseline_std_dev_lower == 17.0
@@ -0,0 +1,95 @@
+"""
+Tests d'intégration de `records_battus_single_scan` (405_009) : mêmes lignes
+que la vue de référence v_records_battus (égalités non comptées, jours sans TX
+ou TN, saisons à cheval sur l'année, filtre 50 ans, stations exclues), bornes
+de plages de stations.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from django.db import connection
+
+from weather.tests.helpers.quotidienne import insert_quotidienne
+from weather.tests.helpers.stations import insert_station
+
+pytestmark = pytest.mark.django_db
+
+_COLUMNS = """
+    period_type, period_value, record_type, station_code,
+    station_name, department, record_value, record_date
+"""
+
+
+def _rows(source: str, params: list | None = None) -> list[tuple]:
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT {_COLUMNS} FROM {source} ORDER BY {_COLUMNS}", params)
+        return cur.fetchall()
+
+
+def _insert_series(code: str, start: dt.date, values: list[tuple]) -> None:
+    # TNTXM renseigné même si TX ou TN manque : insert_quotidienne le laisserait
+    # NULL et v_quotidienne écarterait le jour.
+    for offset, (tx, tn) in enumerate(values):
+        day = start + dt.timedelta(days=offset)
+        with connection.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO public."Quotidienne"
+                    ("NUM_POSTE", "NOM_USUEL", "LAT", "LON", "ALTI",
+                     "AAAAMMJJ", "TX", "TN", "TNTXM")
+                VALUES (%s, 'ST', 0, 0, 0, %s, %s, %s, 10)
+                """,
+                [code, day, tx, tn],
+            )
+
+
+@pytest.fixture
+def stations():
+    insert_station("07149001", "Lyon", departement=7)
+    insert_station("13054001", "Marseille", departement=13)
+    # Filtre 50 ans : aucun record émis avant 2040.
+    insert_station(
+        "31069001",
+        "Toulouse",
+        departement=31,
+        first_temperature_date=dt.date(1990, 1, 1),
+    )
+    # Classe 4 : absente de v_station_records.
+    insert_station("33281001", "Bordeaux", departement=33, classe_recente=4)
+
+    # Du 28 novembre 2001 au 10 mars 2002 : automne, hiver (décembre -> janvier)
+    # et printemps ; égalités, TX ou TN manquants, hausse après le 1er janvier.
+    values = []
+    for offset in range(103):
+        tx = 10.0 + (offset % 17) * 0.5 - (offset // 40)
+        tn = -2.0 - (offset % 11) * 0.5 + (offset // 30)
+        if offset % 13 == 0:
+            tx = None
+        if offset % 19 == 0:
+            tn = None
+        values.append((tx, tn))
+    for code in ("07149001", "31069001", "33281001"):
+        _insert_series(code, dt.date(2001, 11, 28), values)
+    for day, tx in enumerate((20.0, 20.0, 25.0, 23.0, 25.0), start=1):
+        insert_quotidienne(dt.date(2024, 7, day), "13054001", tn=10.0, tx=tx)
+
+
+def test_single_scan_matches_reference_view(stations):
+    expected = _rows("public.v_records_battus")
+
+    assert expected
+    assert _rows("public.records_battus_single_scan()") == expected
+    assert {row[3] for row in expected} == {"07149001", "13054001"}
+
+
+def test_single_scan_counts_strict_improvements_only(stations):
+    rows = _rows("public.records_battus_single_scan(%s, %s)", ["13054001", "13054002"])
+
+    all_time_tx = [
+        (row[6], row[7].date()) for row in rows if row[:3] == ("all_time", None, "TX")
+    ]
+    assert all_time_tx == [(20.0, dt.date(2024, 7, 1)), (25.0, dt.date(2024, 7, 3))]
+    assert {row[3] for row in rows} == {"13054001"}
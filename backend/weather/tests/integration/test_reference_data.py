@@ -0,0 +1,74 @@
+import pytest
+
+from weather.data_sources.reference_data import (
+    ReferenceDataStore,
+    month_day_index,
+)
+from weather.tests.helpers.itn_baseline import (
+    insert_daily_baseline,
+    insert_monthly_baseline,
+    insert_yearly_baseline,
+)
+from weather.tests.helpers.stations_baseline import insert_station_daily_baseline
+
+pytestmark = pytest.mark.django_db
+
+
+def test_month_day_index_covers_leap_year():
+    assert month_day_index(1, 1) == 0
+    assert month_day_index(2, 29) == 59
+    assert month_day_index(3, 1) == 60
+    assert month_day_index(12, 31) == 365
+
+    with pytest.raises(ValueError):
+        month_day_index(2, 30)
+
+
+def test_snapshot_loads_itn_and_station_baselines():
+    insert_daily_baseline(month=2, day=29, mean=5.0, std=1.5)
+    insert_monthly_baseline(month=7, mean=21.0, std=1.0)
+    insert_yearly_baseline(sample_size=30, mean=12.5, std=0.5)
+    insert_station_daily_baseline("07510001", 7, 14, 22.0)
+
+    snapshot = ReferenceDataStore().get()
+
+    assert snapshot.itn_daily(2, 29) == (5.0, 1.5)
+    assert snapshot.itn_daily(3, 1) is None
+    assert snapshot.itn_daily_items() == [(2, 29, 5.0, 1.5)]
+    assert snapshot.itn_monthly(7) == (21.0, 1.0)
+    assert snapshot.itn_monthly_items() == [(7, 21.0, 1.0)]
+    assert snapshot.itn_yearly() == (12.5, 0.5)
+    assert snapshot.station_daily("07510001", 7, 14) == 22.0
+    assert snapshot.station_daily("07510001", 7, 15) is None
+    assert snapshot.station_daily("99999999", 7, 14) is None
+
+
+def test_snapshot_is_cached_until_invalidated():
+    store = ReferenceDataStore()
+    insert_monthly_baseline(month=1, mean=4.0, std=1.0)
+
+    first = store.get()
+    insert_monthly_baseline(month=2, mean=5.0, std=1.0)
+
+    assert store.get() is first
+    assert store.get().itn_monthly(2) is None
+    assert store.version == 1
+
+    store.invalidate()
+    reloaded = store.get()
+
+    assert reloaded is not first
+    assert reloaded.itn_monthly(2) == (5.0, 1.0)
+    assert reloaded.version == store.version == 2
+
+
+def test_memory_footprint_reports_each_table():
+    insert_station_daily_baseline("07510001", 1, 1, 3.0)
+    insert_station_daily_baseline("07510002", 1, 1, 4.0)
+
+    snapshot = ReferenceDataStore().get()
+    footprint = snapshot.memory_footprint()
+
+    assert set(footprint) == {"itn_daily", "itn_monthly", "station_daily"}
+    assert footprint["station_daily"] >= 2 * 366 * 8
+    assert snapshot.nbytes == sum(footprint.values())
@@ -0,0 +1,139 @@
+"""
+Tests d'intégration de la commande refresh_records_mv : calcul dans
+mv_records_battus_shadow par plages de stations, échange par renommage avec la
+mise à jour de mv_records_battus_meta, index recréés, temps par étape.
+
+Dans la transaction du test, le calcul est séquentiel sur la connexion
+courante (les autres connexions ne verraient pas les données insérées).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import pathlib
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from weather.management.commands.refresh_records_mv import _station_ranges
+from weather.tests.helpers.quotidienne import insert_quotidienne
+from weather.tests.helpers.records import insert_mv_record, set_cutoff
+from weather.tests.helpers.stations import insert_station
+
+pytestmark = pytest.mark.django_db
+
+_MV_RECORDS_BATTUS_SQL = (
+    pathlib.Path(__file__).resolve().parents[3]
+    / "sql"
+    / "materialized_views"
+    / "records"
+    / "411_001_mv_records_battus.sql"
+)
+
+_COLUMNS = """
+    period_type, period_value, record_type, station_code,
+    station_name, department, record_value, record_date
+"""
+
+
+def _rows(relation: str) -> list[tuple]:
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT {_COLUMNS} FROM public.{relation} ORDER BY {_COLUMNS}")
+        return cur.fetchall()
+
+
+def _relations_like(pattern: str) -> set[str]:
+    with connection.cursor() as cur:
+        cur.execute(
+            """
+            SELECT relname FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND relname LIKE %s
+            """,
+            [pattern],
+        )
+        return {row[0] for row in cur.fetchall()}
+
+
+def test_station_ranges_cover_all_codes_without_overlap():
+    codes = [f"0100000{i}" for i in range(7)]
+
+    ranges = _station_ranges(codes, 3)
+
+    assert ranges == [
+        ("01000000", "01000003"),
+        ("01000003", "01000006"),
+        ("01000006", None),
+    ]
+    assert _station_ranges(codes, 20)[-1] == ("01000006", None)
+    assert _station_ranges([], 4) == []
+
+
+def test_rebuild_swaps_in_view_records_and_cutoff():
+    for code, name in (("07149001", "Lyon"), ("13054001", "Marseille")):
+        insert_station(code, name, departement=int(code[:2]))
+        for day, tx in enumerate((20.0, 25.0, 23.0, 30.0), start=1):
+            insert_quotidienne(dt.date(2024, 7, day), code, tn=10.0, tx=tx)
+    insert_mv_record(
+        "07149001", "Lyon", "all_time", None, "TX", 99.0, dt.date(1990, 1, 1)
+    )
+    set_cutoff(dt.date(2000, 1, 1))
+    out = StringIO()
+
+    call_command("refresh_records_mv", "--partitions", "2", stdout=out)
+
+    expected = _rows("v_records_battus")
+    assert expected
+    assert _rows("mv_records_battus") == expected
+    assert (
+        "all_time",
+        None,
+        "TX",
+        "07149001",
+        "Lyon",
+        7,
+        30.0,
+        dt.datetime(2024, 7, 4),
+    ) in expected
+    with connection.cursor() as cur:
+        cur.execute("SELECT cutoff_date FROM public.mv_records_battus_meta")
+        assert cur.fetchall() == [(dt.date(2024, 7, 4),)]
+    assert _relations_like("mv_records_battus%") == {
+        "mv_records_battus",
+        "mv_records_battus_meta",
+    }
+    assert _relations_like("idx_%mv_records_battus%") == {
+        "idx_uq_mv_records_battus_query",
+        "idx_mv_records_battus_query",
+        "idx_mv_records_battus_station",
+    }
+    output = out.getvalue()
+    assert "2 plages" in output
+    assert "Échange atomique" in output
+
+
+def test_rebuild_requires_daily_data():
+    with pytest.raises(CommandError, match="Quotidienne est vide"):
+        call_command("refresh_records_mv", stdout=StringIO())
+
+
+def test_seed_sql_rebuilds_existing_table():
+    """Rejouer 411 (seed_records_mv.sh) recalcule la table, même déjà créée."""
+    insert_station("07149001", "Lyon", departement=7)
+    insert_mv_record(
+        "07149001", "Lyon", "all_time", None, "TX", 99.0, dt.date(1990, 1, 1)
+    )
+    for day, tx in enumerate((20.0, 25.0), start=1):
+        insert_quotidienne(dt.date(2024, 7, day), "07149001", tn=10.0, tx=tx)
+
+    with connection.cursor() as cur:
+        cur.execute(_MV_RECORDS_BATTUS_SQL.read_text())
+
+    assert _rows("mv_records_battus") == _rows("v_records_battus")
+    assert _relations_like("idx_%mv_records_battus%") == {
+        "idx_uq_mv_records_battus_query",
+        "idx_mv_records_battus_query",
+        "idx_mv_records_battus_station",
+    }
@@ -0,0 +1,96 @@
+"""
+Tests d'intégration du registre des formes SQL (`sql_shapes`) : forme
+canonique, préparation côté serveur dès la première exécution, compteurs, et
+commande benchmark_prepared_statements.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from weather.data_sources.sql_shapes import SqlShapeRegistry, canonical_sql
+from weather.tests.helpers.quotidienne import insert_quotidienne
+from weather.tests.helpers.stations import insert_station
+
+pytestmark = pytest.mark.django_db
+
+_SQL = """
+    SELECT %(value)s::int + 1
+    -- commentaire conservé
+    WHERE TRUE
+"""
+
+
+def _prepared_statements(cur) -> list[str]:
+    cur.execute(
+        "SELECT statement FROM pg_prepared_statements WHERE statement LIKE %s",
+        ["%commentaire conservé%"],
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def test_canonical_sql_ignores_indentation_and_blank_lines():
+    built = "\n\n        SELECT 1\n        -- note\n            FROM t   \n"
+
+    assert canonical_sql(built) == "SELECT 1\n-- note\nFROM t"
+    assert canonical_sql(_SQL) == canonical_sql(_SQL.replace("    ", "  "))
+
+
+def test_shape_is_prepared_on_first_execution_and_counted():
+    registry = SqlShapeRegistry()
+
+    with connection.cursor() as cur:
+        registry.execute(cur, "test.shape", _SQL, {"value": 1})
+        assert cur.fetchone() == (2,)
+        registry.execute(cur, "test.shape", "  " + _SQL, {"value": 41})
+        assert cur.fetchone() == (42,)
+
+        assert _prepared_statements(cur) == [
+            "SELECT $1::int + 1\n-- commentaire conservé\nWHERE TRUE"
+        ]
+
+    [shape] = registry.snapshot()
+    assert (shape.name, shape.preparations, shape.executions) == ("test.shape", 1, 1)
+    assert shape.mean_prepare_ms > 0
+    assert shape.mean_execute_ms > 0
+
+    registry.reset()
+    [shape] = registry.snapshot()
+    assert (shape.preparations, shape.executions) == (0, 0)
+
+
+def test_shape_is_not_prepared_when_prepared_statements_are_disabled():
+    registry = SqlShapeRegistry()
+    connection.ensure_connection()
+    raw_conn = connection.connection
+    threshold = raw_conn.prepare_threshold
+    raw_conn.prepare_threshold = None
+    try:
+        with connection.cursor() as cur:
+            registry.execute(cur, "test.shape", _SQL, {"value": 1})
+            assert cur.fetchone() == (2,)
+            assert raw_conn.prepare_threshold is None
+            assert _prepared_statements(cur) == []
+    finally:
+        raw_conn.prepare_threshold = threshold
+
+    [shape] = registry.snapshot()
+    assert (shape.preparations, shape.executions) == (0, 1)
+
+
+def test_benchmark_command_compares_unprepared_and_prepared():
+    insert_station("07149001", "Station Lyon", departement=69)
+    for day in range(1, 11):
+        insert_quotidienne(dt.date(2024, 7, day), "07149001", tn=14.0, tx=20.0 + day)
+    out = StringIO()
+
+    call_command("benchmark_prepared_statements", "--repeat", "2", stdout=out)
+
+    output = out.getvalue()
+    assert "records (progressifs)" in output
+    assert "records.page" in output
@@ -291,6 +291,29 @@ def test_records_serializes_pagination(client: APIClient):
     assert p["total_pages"] == 13
 
 
+def test_records_serializes_next_cursor_and_forwards_after(client: APIClient):
+    seen: list[TemperatureRecordsRequest] = []
+
+    class _Recording(_FakeTemperatureAbsoluteRecordsDataSource):
+        def fetch_records(self, request):
+            seen.append(request)
+            return super().fetch_records(request)
+
+    result = TemperatureRecordsResult(
+        entries=[_entry()],
+        pagination=Pagination(
+            total_count=3, page=1, page_size=1, total_pages=3, next_cursor="abc"
+        ),
+    )
+    TemperatureAbsoluteRecordsDependencyProvider.set_builder(lambda: _Recording(result))
+
+    resp = client.get(ENDPOINT, {"page_size": "1", "after": "xyz"})
+
+    assert resp.status_code == 200
+    assert resp.json()["pagination"]["next_cursor"] == "abc"
+    assert seen[0].after == "xyz"
+
+
 def test_records_serializes_empty_results(client: APIClient):
     given_this_data(_result([]))
 
@@ -4,6 +4,7 @@ import datetime as dt
 
 import pytest
 from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from weather.data_sources.timescale import (
     TimescaleTemperatureAbsoluteRecordsDataSource,
@@ -486,6 +487,162 @@ def test_fetch_records_pagination_page_and_page_size():
     assert result.entries[0].record_value == 41.0
 
 
+@pytest.mark.django_db
+def test_fetch_records_page_past_end_keeps_total_count():
+    insert_station("76200045", "Station Past End", departement=76)
+    insert_mv_records_absolus_par_mois(
+        station_code="76200045",
+        month=7,
+        txx_max=40.0,
+        txx_max_date="2010-07-15",
+        tnn_min=-10.0,
+        tnn_min_date="1980-07-01",
+    )
+
+    ds = TimescaleTemperatureAbsoluteRecordsDataSource()
+    result = ds.fetch_records(
+        TemperatureRecordsRequest(
+            period_type="all_time",
+            type_records="hot",
+            territoire="department",
+            territoire_id="76",
+            page=3,
+            page_size=1,
+        )
+    )
+
+    assert result.entries == []
+    assert result.pagination.total_count == 1
+
+
+# =========================
+# Pagination keyset (after=)
+# =========================
+
+
+def _insert_keyset_stations() -> None:
+    # Deux valeurs identiques (41°C) pour vérifier le départage par station.
+    for code, value in [
+        ("76200050", 41.0),
+        ("76200051", 43.0),
+        ("76200052", 41.0),
+        ("76200053", 39.0),
+        ("76200054", 44.0),
+    ]:
+        insert_station(code, f"Station Keyset {code[-2:]}", departement=76)
+        insert_mv_records_absolus_par_mois(
+            station_code=code,
+            month=7,
+            txx_max=value,
+            txx_max_date="2015-07-15",
+            tnn_min=-10.0,
+            tnn_min_date="1980-07-01",
+        )
+
+
+def _keyset_request(sort: str, after: str | None = None) -> TemperatureRecordsRequest:
+    return TemperatureRecordsRequest(
+        period_type="all_time",
+        type_records="hot",
+        territoire="department",
+        territoire_id="76",
+        page_size=2,
+        sort=sort,
+        after=after,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("sort", ["-record_value", "station_name", "record_date"])
+def test_keyset_cursor_walks_same_rows_as_offset_pages(sort):
+    _insert_keyset_stations()
+    ds = TimescaleTemperatureAbsoluteRecordsDataSource()
+
+    by_offset = []
+    for page in (1, 2, 3):
+        result = ds.fetch_records(
+            TemperatureRecordsRequest(
+                period_type="all_time",
+                type_records="hot",
+                territoire="department",
+                territoire_id="76",
+                page=page,
+                page_size=2,
+                sort=sort,
+            )
+        )
+        by_offset += [e.station_id for e in result.entries]
+
+    by_cursor = []
+    cursor = None
+    for _ in range(3):
+        result = ds.fetch_records(_keyset_request(sort, after=cursor))
+        assert result.pagination.total_count == 5
+        by_cursor += [e.station_id for e in result.entries]
+        cursor = result.pagination.next_cursor
+
+    assert cursor is None
+    assert by_cursor == by_offset
+    assert len(set(by_cursor)) == 5
+
+
+@pytest.mark.django_db
+def test_keyset_cursor_descending_value_order():
+    _insert_keyset_stations()
+    ds = TimescaleTemperatureAbsoluteRecordsDataSource()
+
+    first = ds.fetch_records(_keyset_request("-record_value"))
+    second = ds.fetch_records(
+        _keyset_request("-record_value", after=first.pagination.next_cursor)
+    )
+
+    assert [e.record_value for e in first.entries] == [44.0, 43.0]
+    assert [e.record_value for e in second.entries] == [41.0, 41.0]
+
+
+@pytest.mark.django_db
+def test_keyset_cursor_not_available_for_department_sort():
+    _insert_keyset_stations()
+    ds = TimescaleTemperatureAbsoluteRecordsDataSource()
+
+    result = ds.fetch_records(_keyset_request("department"))
+    assert result.pagination.next_cursor is None
+
+    cursor = ds.fetch_records(_keyset_request("station_name")).pagination.next_cursor
+    with pytest.raises(ValueError, match="after"):
+        ds.fetch_records(_keyset_request("department", after=cursor))
+
+
+@pytest.mark.django_db
+def test_keyset_cursor_rejects_invalid_or_mismatched_cursor():
+    _insert_keyset_stations()
+    ds = TimescaleTemperatureAbsoluteRecordsDataSource()
+    cursor = ds.fetch_records(_keyset_request("station_name")).pagination.next_cursor
+
+    with pytest.raises(ValueError, match="after"):
+        ds.fetch_records(_keyset_request("station_name", after="pas-un-curseur"))
+    with pytest.raises(ValueError, match="after"):
+        ds.fetch_records(_keyset_request("-record_value", after=cursor))
+
+
+@pytest.mark.django_db
+def test_keyset_page_filters_in_source_query_and_reuses_total():
+    _insert_keyset_stations()
+    ds = TimescaleTemperatureAbsoluteRecordsDataSource()
+    cursor = ds.fetch_records(_keyset_request("station_name")).pagination.next_cursor
+
+    with CaptureQueriesContext(connection) as queries:
+        result = ds.fetch_records(_keyset_request("station_name", after=cursor))
+
+    assert len(queries) == 1
+    assert "OVER" not in queries[0]["sql"]
+    assert result.pagination.total_count == 5
+    assert [e.station_name for e in result.entries] == [
+        "Station Keyset 52",
+        "Station Keyset 53",
+    ]
+
+
 # =========================
 # Sorting
 # =========================
@@ -0,0 +1,131 @@
+"""
+Tests d'intégration des deux chemins de `fetch_stations_daily_series` :
+jointure ensembliste sur la baseline en SQL (défaut) et baselines lues dans
+le référentiel en mémoire. Les séries renvoyées doivent être identiques.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from weather.data_sources.timescale import TimescaleTemperatureDeviationDailyDataSource
+from weather.services.temperature_deviation.types import DailyDeviationSeriesQuery
+from weather.tests.helpers.itn import insert_quotidienne
+from weather.tests.helpers.stations import insert_station
+from weather.tests.helpers.stations_baseline import insert_station_daily_baseline
+from weather.utils.date_range import iter_days_intersecting
+
+pytestmark = pytest.mark.django_db
+
+
+STATIONS = ("07149001", "07500001", "13054001")
+
+
+@pytest.fixture
+def three_stations():
+    for n, code in enumerate(STATIONS):
+        insert_station(code, f"Station {n}")
+        # Pas de baseline pour la dernière station.
+        if n == 2:
+            continue
+        for day in iter_days_intersecting(dt.date(2020, 1, 1), dt.date(2020, 12, 31)):
+            # Pas de baseline le 5 du mois pour la première station.
+            if n or day.day != 5:
+                insert_station_daily_baseline(
+                    code, day.month, day.day, 8.0 + n + day.day
+                )
+
+    for i, day in enumerate(
+        iter_days_intersecting(dt.date(2019, 11, 1), dt.date(2021, 3, 31))
+    ):
+        for n, code in enumerate(STATIONS):
+            if (i + n) % 3:
+                insert_quotidienne(day, code, ((i * (n + 3)) % 23) - 2.5)
+
+
+def _series(baseline_in_sql: bool, **kwargs):
+    defaults = {
+        "date_start": dt.date(2019, 11, 1),
+        "date_end": dt.date(2021, 3, 31),
+        "station_ids": STATIONS,
+        "include_national": False,
+    }
+    return TimescaleTemperatureDeviationDailyDataSource(
+        baseline_in_sql=baseline_in_sql
+    ).fetch_stations_daily_series(DailyDeviationSeriesQuery(**{**defaults, **kwargs}))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"date_start": dt.date(2020, 2, 28), "date_end": dt.date(2020, 3, 5)},
+        {
+            "target_dates": (
+                dt.date(2020, 1, 5),
+                dt.date(2020, 2, 29),
+                dt.date(2021, 3, 1),
+            )
+        },
+        {"bucket": "month"},
+    ],
+)
+def test_baseline_join_matches_reference_snapshot(three_stations, kwargs):
+    joined = _series(True, **kwargs)
+    snapshot = _series(False, **kwargs)
+
+    assert [(s.station_id, s.station_name) for s in joined] == [
+        (s.station_id, s.station_name) for s in snapshot
+    ]
+    for j, ref in zip(joined, snapshot, strict=True):
+        assert [p.date for p in j.points] == [p.date for p in ref.points]
+        assert [p.temperature for p in j.points] == [p.temperature for p in ref.points]
+        assert [p.baseline_mean for p in j.points] == pytest.approx(
+            [p.baseline_mean for p in ref.points]
+        )
+
+
+def test_baseline_join_skips_days_without_baseline(three_stations):
+    series = {s.station_id: s for s in _series(True)}
+
+    assert STATIONS[2] not in series
+    assert all(p.date.day != 5 for p in series[STATIONS[0]].points)
+    assert series[STATIONS[0]].station_name == "Station 0"
+
+
+def test_baseline_join_names_stations_read_only_from_rollups(three_stations):
+    with connection.cursor() as cur:
+        cur.execute("SELECT * FROM public.refresh_temperature_rollups()")
+
+    [series, _] = _series(
+        True,
+        date_start=dt.date(2020, 1, 1),
+        date_end=dt.date(2020, 12, 31),
+        bucket="year",
+    )
+
+    assert [p.date for p in series.points] == [dt.date(2020, 1, 1)]
+    assert series.station_name == "Station 0"
+
+
+def test_benchmark_command_compares_both_paths(three_stations):
+    out = StringIO()
+
+    call_command(
+        "benchmark_deviation_series",
+        stations=",".join(STATIONS),
+        date_start=dt.date(2020, 1, 1),
+        date_end=dt.date(2020, 12, 31),
+        repeat=2,
+        stdout=out,
+    )
+
+    output = out.getvalue()
+    assert "jointure SQL" in output
+    assert "référentiel en mémoire" in output
+    assert "Séries identiques" in output
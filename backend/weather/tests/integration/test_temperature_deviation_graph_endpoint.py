@@ -7,6 +7,7 @@ from weather.bootstrap_temperature_deviation import (
 from weather.data_sources.temperature_deviation_fake import (
     FakeTemperatureDeviationDailyDataSource,
 )
+from weather.json_response import COLUMNAR_MEDIA_TYPE
 
 
 @pytest.fixture
@@ -307,3 +308,42 @@ def test_get_temperature_deviation_graph_returns_400_for_year_day_of_month_slice
 
     assert body["error"]["code"] == "INVALID_PARAMETER"
     assert "month_of_year" in body["error"]["details"]
+
+
+@pytest.mark.usefixtures("fake_temperature_deviation_dep")
+def test_get_temperature_deviation_graph_columnar(client: APIClient):
+    params = {
+        "date_start": "2024-01-01",
+        "date_end": "2024-01-03",
+        "granularity": "day",
+        "station_ids": "07149",
+    }
+
+    rows = client.get("/api/v1/temperature/deviation/graph", params)
+    resp = client.get(
+        "/api/v1/temperature/deviation/graph",
+        params,
+        HTTP_ACCEPT=COLUMNAR_MEDIA_TYPE,
+    )
+
+    assert rows["Content-Type"] == "application/json"
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == COLUMNAR_MEDIA_TYPE
+    assert "Accept" in resp["Vary"]
+
+    body = resp.json()
+    expected = rows.json()
+    assert body["metadata"] == expected["metadata"]
+    assert body["national"]["data"]["date"] == [19723, 19724, 19725]
+    station = body["stations"][0]
+    assert station["station_id"] == "07149"
+    assert station["data"]["deviation"] == [
+        p["deviation"] for p in expected["stations"][0]["data"]
+    ]
+
+    # Même représentation via ?format=columnar.
+    by_format = client.get(
+        "/api/v1/temperature/deviation/graph", {**params, "format": "columnar"}
+    )
+    assert by_format["Content-Type"] == COLUMNAR_MEDIA_TYPE
+    assert by_format.json() == body
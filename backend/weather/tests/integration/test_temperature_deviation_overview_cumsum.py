@@ -0,0 +1,176 @@
+"""
+Tests d'intégration de la vue d'ensemble des écarts lue via les sommes
+cumulées par station (540).
+
+Avec les cumuls calculés, `fetch_station_overview` doit renvoyer exactement
+le même résultat que l'agrégation à chaud de v_quotidienne (cumuls non
+calculés), y compris quand la période chevauche closed_before.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from django.db import connection
+
+from weather.data_sources.timescale import TimescaleTemperatureDeviationDailyDataSource
+from weather.services.temperature_deviation.types import (
+    TemperatureDeviationOverviewQuery,
+)
+from weather.tests.helpers.itn import insert_quotidienne
+from weather.tests.helpers.stations import insert_station
+from weather.tests.helpers.stations_baseline import insert_station_daily_baseline
+from weather.utils.date_range import iter_days_intersecting
+
+pytestmark = pytest.mark.django_db
+
+
+STATIONS = ("07149001", "07500001", "13054001")
+
+
+def _refresh(since: dt.date | None = None) -> dt.date:
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT window_start FROM public.refresh_station_deviation_cumsum(%s)",
+            [since],
+        )
+        return cur.fetchone()[0]
+
+
+def _set_closed_before(day: dt.date | None) -> None:
+    with connection.cursor() as cur:
+        cur.execute("DELETE FROM public.station_deviation_cumsum_meta")
+        if day is not None:
+            cur.execute(
+                "INSERT INTO public.station_deviation_cumsum_meta (closed_before)"
+                " VALUES (%s)",
+                [day],
+            )
+
+
+def _overview(**kwargs):
+    defaults = {"ordering": "station_name", "limit": 10, "offset": 0}
+    return TimescaleTemperatureDeviationDailyDataSource().fetch_station_overview(
+        TemperatureDeviationOverviewQuery(**{**defaults, **kwargs})
+    )
+
+
+def _assert_same_overview(cumulated, live):
+    assert cumulated.pagination == live.pagination
+    assert [s.station_id for s in cumulated.stations] == [
+        s.station_id for s in live.stations
+    ]
+    for c, ref in zip(cumulated.stations, live.stations, strict=True):
+        assert c.temperature_mean == pytest.approx(ref.temperature_mean)
+        assert c.baseline_mean == pytest.approx(ref.baseline_mean)
+        assert c.deviation == pytest.approx(ref.deviation)
+
+
+@pytest.fixture
+def three_stations():
+    for n, code in enumerate(STATIONS):
+        insert_station(code, f"Station {n}")
+        for day in iter_days_intersecting(dt.date(2020, 1, 1), dt.date(2020, 12, 31)):
+            # Pas de baseline le 5 du mois pour la première station.
+            if n or day.day != 5:
+                insert_station_daily_baseline(
+                    code, day.month, day.day, 8.0 + n + day.month
+                )
+
+    for i, day in enumerate(
+        iter_days_intersecting(dt.date(2019, 6, 1), dt.date(2021, 12, 31))
+    ):
+        for n, code in enumerate(STATIONS):
+            # Trous d'observation différents par station.
+            if (i + n) % (4 + n):
+                insert_quotidienne(day, code, ((i * (n + 3)) % 23) - 2.5)
+
+
+@pytest.mark.parametrize(
+    ("date_start", "date_end"),
+    [
+        (dt.date(2019, 6, 1), dt.date(2021, 12, 31)),
+        (dt.date(2020, 2, 10), dt.date(2020, 2, 10)),
+        (dt.date(2018, 1, 1), dt.date(2019, 6, 15)),
+        (dt.date(2021, 3, 1), dt.date(2022, 1, 31)),
+        (dt.date(2023, 1, 1), dt.date(2023, 12, 31)),
+    ],
+)
+def test_overview_from_cumsum_matches_live_aggregation(
+    three_stations, date_start, date_end
+):
+    live = _overview(date_start=date_start, date_end=date_end)
+
+    _refresh()
+
+    _assert_same_overview(_overview(date_start=date_start, date_end=date_end), live)
+
+
+def test_overview_aggregates_days_after_closed_before_live(three_stations):
+    _refresh()
+    _set_closed_before(dt.date(2021, 6, 15))
+    # Révision dans la partie non close, sans refresh.
+    insert_quotidienne(dt.date(2021, 7, 2), STATIONS[1], 45.0)
+
+    cumulated = _overview(
+        date_start=dt.date(2021, 1, 1), date_end=dt.date(2021, 12, 31)
+    )
+    _set_closed_before(None)
+    live = _overview(date_start=dt.date(2021, 1, 1), date_end=dt.date(2021, 12, 31))
+
+    _assert_same_overview(cumulated, live)
+
+
+def test_refresh_since_shifts_following_cumulative_sums(three_stations):
+    _refresh()
+    insert_quotidienne(dt.date(2020, 3, 3), STATIONS[0], 40.0)
+
+    assert _refresh(dt.date(2020, 3, 1)) == dt.date(2020, 3, 1)
+
+    cumulated = _overview(
+        date_start=dt.date(2020, 1, 1), date_end=dt.date(2021, 12, 31)
+    )
+    _set_closed_before(None)
+    live = _overview(date_start=dt.date(2020, 1, 1), date_end=dt.date(2021, 12, 31))
+
+    _assert_same_overview(cumulated, live)
+
+
+def test_overview_total_count_comes_with_the_page(three_stations):
+    _refresh()
+
+    page = _overview(
+        date_start=dt.date(2020, 1, 1),
+        date_end=dt.date(2020, 12, 31),
+        limit=1,
+        offset=1,
+    )
+    assert [s.station_id for s in page.stations] == [STATIONS[1]]
+    assert page.pagination.total_count == 3
+
+    beyond = _overview(
+        date_start=dt.date(2020, 1, 1), date_end=dt.date(2020, 12, 31), offset=10
+    )
+    assert beyond.stations == []
+    assert beyond.pagination.total_count == 3
+
+
+def test_refresh_reports_only_changed_cumulative_sums(three_stations):
+    _refresh()
+
+    def _changes(since: dt.date) -> int:
+        with connection.cursor() as cur:
+            cur.execute(
+                "SELECT upserted + deleted"
+                " FROM public.refresh_station_deviation_cumsum(%s)",
+                [since],
+            )
+            return cur.fetchone()[0]
+
+    # Rejeu sans révision : le job pg_cron ne touche pas data_version.
+    assert _changes(dt.date(2021, 12, 1)) == 0
+
+    insert_quotidienne(dt.date(2021, 12, 30), STATIONS[2], 40.0)
+    assert _changes(dt.date(2021, 12, 1)) > 0
+    assert _changes(dt.date(2021, 12, 1)) == 0
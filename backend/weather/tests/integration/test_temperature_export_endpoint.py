@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+
+import pytest
+from django.http import StreamingHttpResponse
+from rest_framework.test import APIClient
+
+from weather.bootstrap_temperature_export import TemperatureExportDependencyProvider
+from weather.data_sources.temperature_export_fake import FakeDailyExportDataSource
+
+
+@pytest.fixture
+def fake_temperature_export_dep():
+    TemperatureExportDependencyProvider.set_builder(lambda: FakeDailyExportDataSource())
+    try:
+        yield
+    finally:
+        TemperatureExportDependencyProvider.reset()
+
+
+def _body(resp) -> str:
+    assert isinstance(resp, StreamingHttpResponse)
+    return b"".join(resp.streaming_content).decode()
+
+
+@pytest.mark.usefixtures("fake_temperature_export_dep")
+def test_get_temperature_export_csv(client: APIClient):
+    resp = client.get(
+        "/api/v1/temperature/export",
+        {
+            "date_start": "2024-01-01",
+            "date_end": "2024-01-03",
+            "station_ids": "07149,07222",
+        },
+    )
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "text/csv; charset=utf-8"
+    assert resp["Content-Disposition"] == (
+        'attachment; filename="temperature_quotidienne_2024-01-01_2024-01-03.csv"'
+    )
+
+    rows = list(csv.DictReader(io.StringIO(_body(resp))))
+    assert len(rows) == 6
+    assert [(r["station_id"], r["date"]) for r in rows[:3]] == [
+        ("07149", "2024-01-01"),
+        ("07149", "2024-01-02"),
+        ("07149", "2024-01-03"),
+    ]
+    assert set(rows[0]) == {
+        "station_id",
+        "station_name",
+        "department",
+        "date",
+        "tn",
+        "tx",
+        "tntxm",
+    }
+
+
+@pytest.mark.usefixtures("fake_temperature_export_dep")
+def test_get_temperature_export_ndjson(client: APIClient):
+    resp = client.get(
+        "/api/v1/temperature/export",
+        {
+            "date_start": "2024-01-01",
+            "date_end": "2024-01-02",
+            "station_ids": "07149",
+            "output": "ndjson",
+        },
+    )
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in _body(resp).splitlines()]
+    assert [line["date"] for line in lines] == ["2024-01-01", "2024-01-02"]
+    assert lines[0]["station_name"] == "Station 07149"
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"date_start": "2024-01-02", "date_end": "2024-01-01"},
+        {"date_start": "2024-01-01", "date_end": "2024-01-02", "output": "xlsx"},
+        {
+            "date_start": "2024-01-01",
+            "date_end": "2024-01-02",
+            "territoire": "department",
+        },
+    ],
+)
+def test_get_temperature_export_invalid_params(client: APIClient, params):
+    resp = client.get("/api/v1/temperature/export", params)
+
+    assert resp.status_code == 400
+    assert resp.json()["error"]["code"] == "INVALID_PARAMETER"
@@ -0,0 +1,73 @@
+"""
+Tests d'intégration de l'export des séries quotidiennes
+(`TimescaleDailyExportDataSource`) : filtres et lecture par curseur côté
+serveur.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+
+from weather.data_sources.timescale import TimescaleDailyExportDataSource
+from weather.services.temperature_export.types import DailyExportQuery
+from weather.tests.helpers.quotidienne import insert_quotidienne
+from weather.tests.helpers.stations import insert_station
+from weather.utils.date_range import iter_days_intersecting
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def stations():
+    insert_station("07149001", "Station Lyon", departement=69)
+    insert_station("07500001", "Station Paris", departement=75)
+    insert_station("13054001", "Station Marignane", departement=13)
+    for i, day in enumerate(
+        iter_days_intersecting(dt.date(2020, 1, 1), dt.date(2020, 1, 10))
+    ):
+        for code in ("07149001", "07500001", "13054001"):
+            insert_quotidienne(day, code, tn=float(i), tx=float(i + 10))
+
+
+def _rows(**kwargs):
+    defaults = {"date_start": dt.date(2020, 1, 1), "date_end": dt.date(2020, 1, 10)}
+    ds = TimescaleDailyExportDataSource(fetch_size=3)
+    return list(ds.iter_daily_rows(DailyExportQuery(**{**defaults, **kwargs})))
+
+
+def test_rows_are_ordered_by_station_and_date(stations):
+    rows = _rows(date_start=dt.date(2020, 1, 2), date_end=dt.date(2020, 1, 4))
+
+    assert [(r.station_id, r.date.day) for r in rows] == [
+        (code, day)
+        for code in ("07149001", "07500001", "13054001")
+        for day in (2, 3, 4)
+    ]
+    first = rows[0]
+    assert first.station_name == "Station Lyon"
+    assert first.department == 69
+    assert (first.tn, first.tx, first.tntxm) == (1.0, 11.0, 6.0)
+
+
+def test_rows_are_read_in_several_fetches(stations):
+    # fetch_size=3 : 30 lignes lues en 10 paquets, sans perte ni doublon.
+    rows = _rows()
+
+    assert len(rows) == 30
+    assert len({(r.station_id, r.date) for r in rows}) == 30
+
+
+@pytest.mark.parametrize(
+    ("filters", "expected"),
+    [
+        ({"station_ids": ("07500001",)}, {"07500001"}),
+        ({"departments": ("13", "69")}, {"07149001", "13054001"}),
+        ({"regions": ("Île-de-France",)}, {"07500001"}),
+        ({"territoire": "department", "territoire_id": "69"}, {"07149001"}),
+        ({"territoire": "station", "territoire_id": "13054001"}, {"13054001"}),
+    ],
+)
+def test_rows_are_filtered(stations, filters, expected):
+    assert {r.station_id for r in _rows(**filters)} == expected
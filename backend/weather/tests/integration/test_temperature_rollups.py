@@ -0,0 +1,243 @@
+"""
+Tests d'intégration des rollups mensuels / annuels (530).
+
+Les graphes d'écart à la normale et min/max lisent les buckets clos dans
+`station_temperature_rollups` / `national_minmax_rollups` et le reste de la
+période jour par jour : le résultat doit être identique à la lecture
+journalière complète (rollups non calculés).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from django.db import connection
+
+from weather.data_sources.timescale import (
+    TimescaleTemperatureDeviationDailyDataSource,
+    TimescaleTemperatureMinMaxDataSource,
+)
+from weather.services.temperature_deviation.service import (
+    compute_temperature_deviation_series,
+)
+from weather.services.temperature_deviation.types import DailyDeviationSeriesQuery
+from weather.services.temperature_minmax.service import compute_minmax_graph
+from weather.services.temperature_minmax.types import MinMaxGraphQuery
+from weather.tests.helpers.quotidienne import insert_quotidienne
+from weather.tests.helpers.stations import insert_station
+from weather.tests.helpers.stations_baseline import insert_station_daily_baseline
+from weather.utils.date_range import iter_days_intersecting
+
+pytestmark = pytest.mark.django_db
+
+
+LYON = "07149001"
+PARIS = "07500001"
+START = dt.date(2020, 1, 1)
+END = dt.date(2021, 12, 31)
+
+
+def _refresh(since: dt.date | None = None) -> tuple[dt.date, dt.date]:
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT window_start, closed_before"
+            " FROM public.refresh_temperature_rollups(%s)",
+            [since],
+        )
+        return cur.fetchone()
+
+
+def _set_closed_before(day: dt.date | None) -> None:
+    with connection.cursor() as cur:
+        cur.execute("DELETE FROM public.temperature_rollups_meta")
+        if day is not None:
+            cur.execute(
+                "INSERT INTO public.temperature_rollups_meta (closed_before) VALUES (%s)",
+                [day],
+            )
+
+
+def _rollup(granularity: str, station_code: str, bucket_start: dt.date) -> tuple:
+    with connection.cursor() as cur:
+        cur.execute(
+            """
+            SELECT n_tntxm, n_tn, min_tn, n_tx, max_tx
+            FROM public.station_temperature_rollups
+            WHERE granularity = %s AND station_code = %s AND bucket_start = %s
+            """,
+            [granularity, station_code, bucket_start],
+        )
+        return cur.fetchone()
+
+
+@pytest.fixture
+def two_stations():
+    insert_station(LYON, "Station Lyon", departement=69)
+    insert_station(PARIS, "Station Paris", departement=75)
+
+    for month_day in iter_days_intersecting(dt.date(2020, 1, 1), dt.date(2020, 12, 31)):
+        # Pas de baseline le 5 du mois : ces jours sont exclus de l'écart.
+        if month_day.day != 5:
+            insert_station_daily_baseline(
+                LYON, month_day.month, month_day.day, 10.0 + month_day.month / 10
+            )
+
+    for i, day in enumerate(iter_days_intersecting(START, END)):
+        tn = (i % 17) - 3.3
+        insert_quotidienne(day, LYON, tn=tn, tx=tn + 9.7 + (i % 5))
+        if i % 3:
+            insert_quotidienne(day, PARIS, tn=tn + 1.2, tx=None if i % 7 == 0 else 20.1)
+
+
+def _deviation_series(**kwargs):
+    return compute_temperature_deviation_series(
+        data_source=TimescaleTemperatureDeviationDailyDataSource(),
+        station_ids=(LYON,),
+        include_national=False,
+        **kwargs,
+    ).stations
+
+
+def _assert_same_deviation(rolled, daily):
+    assert [[p.date for p in s.data] for s in rolled] == [
+        [p.date for p in s.data] for s in daily
+    ]
+    for rolled_station, daily_station in zip(rolled, daily, strict=True):
+        for r, d in zip(rolled_station.data, daily_station.data, strict=True):
+            assert r.temperature == pytest.approx(d.temperature)
+            assert r.baseline_mean == pytest.approx(d.baseline_mean)
+
+
+@pytest.mark.parametrize(
+    ("granularity", "slice_type", "month_of_year"),
+    [
+        ("month", "full", None),
+        ("year", "full", None),
+        ("year", "month_of_year", 3),
+    ],
+)
+def test_deviation_buckets_match_daily_aggregation(
+    two_stations, granularity, slice_type, month_of_year
+):
+    kwargs = {
+        "date_start": dt.date(2020, 3, 10),
+        "date_end": END,
+        "granularity": granularity,
+        "slice_type": slice_type,
+        "month_of_year": month_of_year,
+    }
+    daily = _deviation_series(**kwargs)
+
+    _refresh()
+
+    _assert_same_deviation(_deviation_series(**kwargs), daily)
+
+
+def test_deviation_reads_one_point_per_closed_bucket(two_stations):
+    _refresh()
+
+    [series] = (
+        TimescaleTemperatureDeviationDailyDataSource().fetch_stations_daily_series(
+            DailyDeviationSeriesQuery(
+                date_start=START,
+                date_end=END,
+                station_ids=(LYON,),
+                include_national=False,
+                bucket="year",
+            )
+        )
+    )
+
+    # 2020 et 2021 sont closes : un point par année, daté du 1er janvier.
+    assert [p.date for p in series.points] == [dt.date(2020, 1, 1), dt.date(2021, 1, 1)]
+
+
+def test_deviation_reads_days_after_closed_before(two_stations):
+    _refresh()
+    _set_closed_before(dt.date(2021, 7, 1))
+    # Révision postérieure au dernier refresh, dans la partie non close.
+    insert_quotidienne(dt.date(2021, 8, 3), LYON, tn=30.0, tx=40.0)
+
+    rolled = _deviation_series(date_start=START, date_end=END, granularity="month")
+    _set_closed_before(None)
+    daily = _deviation_series(date_start=START, date_end=END, granularity="month")
+
+    _assert_same_deviation(rolled, daily)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"station_ids": (LYON, PARIS)},
+        {"departments": ("69", "75")},
+        {},
+    ],
+)
+@pytest.mark.parametrize("granularity", ["month", "year"])
+def test_minmax_buckets_match_daily_aggregation(two_stations, filters, granularity):
+    query = MinMaxGraphQuery(
+        date_start=dt.date(2020, 2, 15),
+        date_end=END,
+        granularity=granularity,
+        **filters,
+    )
+    ds = TimescaleTemperatureMinMaxDataSource()
+    daily = compute_minmax_graph(data_source=ds, query=query)
+
+    _refresh()
+
+    assert compute_minmax_graph(data_source=ds, query=query) == daily
+
+
+def test_minmax_partial_edge_buckets_are_read_daily(two_stations):
+    _refresh()
+
+    [series] = TimescaleTemperatureMinMaxDataSource().fetch_daily_series(
+        MinMaxGraphQuery(
+            date_start=dt.date(2020, 1, 30),
+            date_end=dt.date(2020, 3, 1),
+            granularity="month",
+            station_ids=(LYON,),
+        )
+    )
+
+    assert [(p.date, p.tmin_count) for p in series.points] == [
+        (dt.date(2020, 1, 30), 1),
+        (dt.date(2020, 1, 31), 1),
+        (dt.date(2020, 2, 1), 29),
+        (dt.date(2020, 3, 1), 1),
+    ]
+
+
+def test_refresh_since_rebuilds_touched_months_and_years(two_stations):
+    _refresh()
+    before = _rollup("month", LYON, dt.date(2021, 2, 1))
+
+    insert_quotidienne(dt.date(2021, 3, 3), LYON, tn=-25.0, tx=41.0)
+    window_start, _ = _refresh(dt.date(2021, 3, 20))
+
+    assert window_start == dt.date(2021, 3, 1)
+    assert _rollup("month", LYON, dt.date(2021, 2, 1)) == before
+    assert _rollup("month", LYON, dt.date(2021, 3, 1))[2] == -25.0
+    assert _rollup("year", LYON, dt.date(2021, 1, 1)) == (353, 365, -25.0, 365, 41.0)
+
+
+def test_refresh_reports_only_changed_buckets(two_stations):
+    _refresh()
+
+    def _changes(since: dt.date) -> int:
+        with connection.cursor() as cur:
+            cur.execute(
+                "SELECT upserted + deleted FROM public.refresh_temperature_rollups(%s)",
+                [since],
+            )
+            return cur.fetchone()[0]
+
+    # Rejeu sans révision : le job pg_cron ne touche pas data_version.
+    assert _changes(dt.date(2021, 3, 1)) == 0
+
+    insert_quotidienne(dt.date(2021, 3, 3), LYON, tn=-25.0, tx=41.0)
+    # Mois station + mois national + année station + année nationale.
+    assert _changes(dt.date(2021, 3, 1)) == 4
+    assert _changes(dt.date(2021, 3, 1)) == 0
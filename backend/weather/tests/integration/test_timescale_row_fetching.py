@@ -0,0 +1,62 @@
+"""
+Tests d'intégration de la lecture typée des lignes (`_fetch_all`,
+`_fetch_all_by_name`) et de la commande benchmark_row_fetching.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from weather.data_sources.timescale import (
+    _fetch_all,
+    _fetch_all_by_name,
+    _minmax_point,
+)
+from weather.services.temperature_minmax.types import DailyMinMaxPoint
+from weather.tests.helpers.quotidienne import insert_quotidienne
+from weather.tests.helpers.stations import insert_station
+
+pytestmark = pytest.mark.django_db
+
+
+def test_rows_are_built_directly_and_cursor_is_left_unchanged():
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT '2024-01-02 00:00'::timestamp::date, 1.5::numeric, NULL, 1, 1"
+        )
+        points = _fetch_all(cur, _minmax_point)
+
+        cur.execute("SELECT 1 AS a, 2 AS b")
+        by_name = _fetch_all_by_name(cur, lambda *, a, b: a + b)
+
+        cur.execute("SELECT 3, 4")
+        raw = cur.fetchall()
+
+    assert points == [DailyMinMaxPoint(dt.date(2024, 1, 2), 1.5, None, 1, 1)]
+    assert isinstance(points[0].tmin, float)
+    assert by_name == [3]
+    assert raw == [(3, 4)]
+
+
+def test_benchmark_command_compares_both_readings():
+    insert_station("07149001", "Station Lyon", departement=69)
+    for day in range(1, 11):
+        insert_quotidienne(dt.date(2020, 1, day), "07149001", tn=1.0, tx=9.0)
+    out = StringIO()
+
+    call_command(
+        "benchmark_row_fetching",
+        date_start=dt.date(2020, 1, 1),
+        date_end=dt.date(2020, 1, 31),
+        repeat=1,
+        stdout=out,
+    )
+
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 3
+    assert all("dict" in line and "row factory" in line for line in lines)
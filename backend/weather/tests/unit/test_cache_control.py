@@ -15,6 +15,13 @@ from rest_framework.test import APIRequestFactory
 from rest_framework.views import APIView
 
 from weather.cache_control import CacheControlMixin
+from weather.data_sources.data_version import (
+    SOURCE_INGESTION,
+    SOURCE_ITN_DAILY,
+    SOURCE_QUOTIDIENNE_REALTIME,
+    DataVersionSnapshot,
+    data_version,
+)
 
 FIXED_TODAY = dt.date(2026, 5, 22)
 
@@ -166,3 +173,139 @@ class TestHeaderGuards:
         view = _make_view(cache_profile="long").as_view()
         response = view(factory.options("/x"))
         assert _cache_control(response) is None
+
+
+class TestETag:
+    @pytest.fixture
+    def counting_view(self):
+        calls = []
+
+        class _Counting(CacheControlMixin, APIView):
+            authentication_classes: list = []
+            permission_classes: list = []
+            cache_profile = "long"
+
+            def get(self, request, *args, **kwargs):
+                calls.append(request.query_params.dict())
+                return Response({"ok": True}, status=200)
+
+        return _Counting.as_view(), calls
+
+    def test_matching_if_none_match_returns_304_without_calling_view(
+        self, factory, counting_view
+    ):
+        view, calls = counting_view
+        etag = view(factory.get("/x?b=2&a=1"))["ETag"]
+
+        response = view(factory.get("/x?a=1&b=2", HTTP_IF_NONE_MATCH=etag))
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert _cache_control(response) == "public, s-maxage=86400, max-age=3600"
+        assert not response.render().content
+        assert len(calls) == 1
+
+    def test_weak_and_listed_etags_match(self, factory, counting_view):
+        view, calls = counting_view
+        etag = view(factory.get("/x"))["ETag"]
+
+        response = view(factory.get("/x", HTTP_IF_NONE_MATCH=f'"other", W/{etag}'))
+
+        assert response.status_code == 304
+        assert len(calls) == 1
+
+    def test_etag_depends_on_path_and_params(self, factory, counting_view):
+        view, _ = counting_view
+        etags = {
+            view(factory.get(url))["ETag"]
+            for url in ("/x?a=1", "/x?a=2", "/y?a=1", "/x?a=1&a=2")
+        }
+        assert len(etags) == 4
+
+    def test_data_version_change_invalidates_etag(
+        self, factory, counting_view, monkeypatch
+    ):
+        view, calls = counting_view
+        etag = view(factory.get("/x"))["ETag"]
+        refreshed = DataVersionSnapshot(
+            refreshed_at={"ingestion": dt.datetime(2026, 5, 22, 6, 0)},
+            records_cutoff=None,
+        )
+        monkeypatch.setattr(data_version, "get", lambda: refreshed)
+
+        response = view(factory.get("/x", HTTP_IF_NONE_MATCH=etag))
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert len(calls) == 2
+
+    def test_no_etag_without_profile(self, factory):
+        view = _make_view(cache_profile=None).as_view()
+        response = view(factory.get("/x"))
+        assert not response.has_header("ETag")
+
+
+class TestETagDataVersionSources:
+    def _etag_after_touch(self, monkeypatch, view, url, source) -> tuple[str, str]:
+        before = DataVersionSnapshot(
+            refreshed_at={
+                SOURCE_INGESTION: dt.datetime(2026, 5, 21, 6, 0),
+                SOURCE_QUOTIDIENNE_REALTIME: dt.datetime(2026, 5, 22, 9, 0),
+            },
+            records_cutoff=None,
+        )
+        after = DataVersionSnapshot(
+            refreshed_at={
+                **before.refreshed_at,
+                source: dt.datetime(2026, 5, 22, 9, 6),
+            },
+            records_cutoff=None,
+        )
+        monkeypatch.setattr(data_version, "get", lambda: before)
+        etag = view(APIRequestFactory().get(url))["ETag"]
+        monkeypatch.setattr(data_version, "get", lambda: after)
+        return etag, view(APIRequestFactory().get(url))["ETag"]
+
+    def test_undeclared_source_keeps_etag(self, monkeypatch):
+        view = _make_view(
+            cache_profile="long", cache_data_version_sources=(SOURCE_INGESTION,)
+        ).as_view()
+
+        before, after = self._etag_after_touch(
+            monkeypatch, view, "/x", SOURCE_QUOTIDIENNE_REALTIME
+        )
+
+        assert before == after
+
+    def test_historical_date_end_ignores_realtime_sources(self, monkeypatch):
+        view = _make_view(
+            cache_profile="by_date_end",
+            cache_data_version_sources=(SOURCE_INGESTION, SOURCE_QUOTIDIENNE_REALTIME),
+        ).as_view()
+
+        historical = self._etag_after_touch(
+            monkeypatch, view, "/x?date_end=2026-05-14", SOURCE_QUOTIDIENNE_REALTIME
+        )
+        recent = self._etag_after_touch(
+            monkeypatch, view, "/x?date_end=2026-05-15", SOURCE_QUOTIDIENNE_REALTIME
+        )
+        touched_ingestion = self._etag_after_touch(
+            monkeypatch, view, "/x?date_end=2026-05-14", SOURCE_INGESTION
+        )
+
+        assert historical[0] == historical[1]
+        assert recent[0] != recent[1]
+        assert touched_ingestion[0] != touched_ingestion[1]
+
+    def test_view_can_keep_a_realtime_source_for_historical_ranges(self, monkeypatch):
+        view = _make_view(
+            cache_profile="by_date_end",
+            cache_data_version_sources=(SOURCE_INGESTION, SOURCE_ITN_DAILY),
+            cache_realtime_window_sources=frozenset(),
+        ).as_view()
+
+        before, after = self._etag_after_touch(
+            monkeypatch, view, "/x?date_end=2020-01-31", SOURCE_ITN_DAILY
+        )
+
+        assert before != after
@@ -1,3 +1,5 @@
+import warnings
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -9,10 +11,12 @@ from weather.calcul_itn import (
     correct_temperatures_Reims,
     itn,
     itn_calculation,
+    itn_summary,
     monthly_itn,
     separate_by_station,
 )
 from weather.itn.gateway_tests import (
+    ReadLongTemperaturesTests,
     ReadMonthlyTemperaturesTests,
     ReadTemperaturesTests,
     ReadYearlyTemperaturesTests,
@@ -45,6 +49,25 @@ def _make_pivoted(index, columns_data):
     return df
 
 
+def _loop_average_itn(daily_records_by_station, freq):
+    """
+    Previous implementation of average_itn_calculation: one `.loc` and one
+    `np.nanmean` per period label, kept as the reference of the vectorized one.
+    """
+    daterange = daily_records_by_station.index
+    fmt = "%Y-%m" if freq == "monthly" else "%Y"
+    index = np.unique(daterange.strftime(fmt))
+    avg_itn = pd.DataFrame(columns=["avg_itn"], index=index, dtype=float)
+    for id in index:
+        temp_min = daily_records_by_station["temp_min"].loc[id].values
+        temp_max = daily_records_by_station["temp_max"].loc[id].values
+        with warnings.catch_warnings():
+            # "Mean of empty slice" sur une période sans aucune valeur.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            avg_itn.loc[id] = np.nanmean((temp_min + temp_max) / 2)
+    return avg_itn
+
+
 # == separate_by_station =============================================
 
 
@@ -224,6 +247,63 @@ def test_average_itn_calculation():
     pd.testing.assert_frame_equal(results, expected_avg_itn)
 
 
+def test_average_itn_calculation_matches_loop_implementation():
+    daily_records_by_station = compute_itn(ReadLongTemperaturesTests)[0]
+
+    for freq in ("monthly", "yearly"):
+        result = average_itn_calculation(
+            read_protocol=ReadLongTemperaturesTests, freq=freq
+        )
+        expected = _loop_average_itn(daily_records_by_station, freq)
+        pd.testing.assert_frame_equal(result, expected, rtol=1e-12)
+
+    monthly = average_itn_calculation(
+        read_protocol=ReadLongTemperaturesTests, freq="monthly"
+    )
+    assert np.isnan(monthly.loc["2000-02", "avg_itn"])
+    assert monthly["avg_itn"].notna().sum() == len(monthly) - 1
+
+
+# == itn_summary =====================================================
+
+
+def test_itn_summary_matches_separate_computations():
+    summary = itn_summary(read_protocol=ReadLongTemperaturesTests)
+
+    daily = compute_itn(ReadLongTemperaturesTests)[1]
+    monthly = average_itn_calculation(
+        read_protocol=ReadLongTemperaturesTests, freq="monthly"
+    )
+    yearly = average_itn_calculation(
+        read_protocol=ReadLongTemperaturesTests, freq="yearly"
+    )
+    pd.testing.assert_series_equal(summary.daily, daily)
+    pd.testing.assert_frame_equal(summary.monthly, monthly)
+    pd.testing.assert_frame_equal(summary.yearly, yearly)
+
+    baseline_days = daily["1991":"2020"]
+    expected_daily = baseline_days.groupby(baseline_days.index.strftime("%m-%d")).mean()
+    pd.testing.assert_series_equal(
+        summary.baseline_daily,
+        expected_daily,
+        check_names=False,
+        check_index_type=False,
+    )
+    assert len(summary.baseline_daily) == 366
+
+    baseline_months = monthly.loc["1991-01":"2020-12", "avg_itn"]
+    expected_monthly = baseline_months.groupby(
+        [int(label[5:]) for label in baseline_months.index]
+    ).mean()
+    pd.testing.assert_series_equal(
+        summary.baseline_monthly, expected_monthly, check_names=False
+    )
+
+    baseline_years = yearly.loc["1991":"2020", "avg_itn"]
+    assert len(baseline_years) == 30
+    np.testing.assert_allclose(summary.baseline_yearly, baseline_years.mean())
+
+
 # == itn =============================================================
 
 
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from django.test import override_settings
+
+from weather.utils.concurrency import run_concurrently
+
+
+def _thread_name() -> str:
+    return threading.current_thread().name
+
+
+def test_results_keep_call_order_and_run_in_other_threads():
+    names = run_concurrently(_thread_name, _thread_name, _thread_name)
+
+    assert names[0] == threading.current_thread().name
+    assert all(name.startswith("weather-fetch") for name in names[1:])
+
+
+@override_settings(CONCURRENT_FETCHES_MAX_WORKERS=0)
+def test_disabled_runs_sequentially_in_calling_thread():
+    assert (
+        run_concurrently(_thread_name, _thread_name)
+        == [threading.current_thread().name] * 2
+    )
+
+
+def test_nested_calls_run_sequentially_in_pool_thread():
+    def nested():
+        return run_concurrently(_thread_name, _thread_name)
+
+    _, inner = run_concurrently(lambda: None, nested)
+
+    assert inner[0] == inner[1]
+    assert inner[0].startswith("weather-fetch")
+
+
+def test_errors_propagate_after_other_calls_finish():
+    finished = threading.Event()
+
+    def slow():
+        finished.wait(0.05)
+        finished.set()
+
+    def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        run_concurrently(failing, slow)
+    assert finished.is_set()
+
+    with pytest.raises(ValueError, match="boom"):
+        run_concurrently(lambda: 1, failing)
@@ -4,11 +4,13 @@ import pytest
 
 from weather.utils.date_range import (
     clamp_day_to_month_end,
+    complete_periods_span,
     days_in_month_in_range,
     iter_days_intersecting,
     iter_month_starts_intersecting,
     iter_year_starts_intersecting,
     monthly_points_in_range,
+    next_period_start,
     yearly_points_in_range,
 )
 
@@ -115,3 +117,18 @@ def test_yearly_points_in_range_excludes_candidates_outside_window():
     )
     # 2024-01-01 exclu (avant start), 2025-01-01 ok, 2026-01-01 ok (<= end)
     assert out == (dt.date(2025, 1, 1), dt.date(2026, 1, 1))
+
+
+def test_next_period_start_rolls_over_year_end():
+    assert next_period_start(dt.date(2024, 12, 15), "month") == dt.date(2025, 1, 1)
+    assert next_period_start(dt.date(2024, 2, 29), "year") == dt.date(2025, 1, 1)
+
+
+def test_complete_periods_span_excludes_partial_edges():
+    out = complete_periods_span(dt.date(2024, 1, 15), dt.date(2024, 4, 30), "month")
+    assert out == (dt.date(2024, 2, 1), dt.date(2024, 5, 1))
+
+
+def test_complete_periods_span_none_without_complete_period():
+    out = complete_periods_span(dt.date(2024, 1, 2), dt.date(2024, 12, 31), "year")
+    assert out is None
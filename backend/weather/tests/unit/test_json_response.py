@@ -0,0 +1,277 @@
+"""Tests unitaires de l'encodage direct des réponses (``weather/json_response.py``).
+
+La sortie de ``encode_response`` doit être identique à celle du chemin DRF
+(``serializer.data`` rendu par ``JSONRenderer``) pour tout payload valide.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+from io import StringIO
+
+import orjson
+import pytest
+from django.core.management import call_command
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from weather.json_response import (
+    COLUMNAR_MEDIA_TYPE,
+    JSONBytesResponse,
+    check_response_schema,
+    encode_response,
+    json_response,
+)
+from weather.serializers import (
+    RecordsGraphResponseSerializer,
+    TemperatureDeviationOverviewResponseSerializer,
+    TemperatureDeviationResponseSerializer,
+    TemperatureRecordsResponseSerializer,
+)
+from weather.services.records_graph.types import (
+    RecordsGraphBucket,
+    RecordsGraphRecord,
+    RecordsGraphResult,
+)
+
+
+def _drf_output(serializer_class, payload):
+    serializer = serializer_class(data=payload)
+    serializer.is_valid(raise_exception=True)
+    return json.loads(JSONRenderer().render(serializer.data))
+
+
+def test_encoding_matches_serializer_output():
+    payload = {
+        "metadata": {
+            "date_start": dt.date(2024, 1, 1),
+            "date_end": "2024-01-31",
+            "baseline": "1991-2020",
+            "granularity": "day",
+            "slice_type": "full",
+            "ignored": "absent de la sortie",
+        },
+        "stations": [
+            {
+                "station_id": 7149001,
+                "station_name": "Lyon",
+                "data": [
+                    {
+                        "date": dt.date(2024, 1, 1),
+                        "deviation": 1,
+                        "temperature": 5.25,
+                        "baseline_mean": 4.25,
+                    }
+                ],
+            }
+        ],
+    }
+
+    out = orjson.loads(encode_response(TemperatureDeviationResponseSerializer, payload))
+
+    assert out == _drf_output(TemperatureDeviationResponseSerializer, payload)
+    assert "national" not in out
+    assert out["stations"][0]["station_id"] == "7149001"
+    assert isinstance(out["stations"][0]["data"][0]["deviation"], float)
+
+
+def test_encoding_keeps_nulls_and_dict_fields():
+    payload = {
+        "metadata": {
+            "date_start": dt.date(2024, 1, 1),
+            "date_end": dt.date(2024, 1, 31),
+            "baseline": "1991-2020",
+            "filters": {"date_de_creation_min": dt.date(1990, 1, 1), "alt_max": None},
+            "ordering": "-deviation",
+        },
+        "national": {"deviation_mean": 0.5},
+        "pagination": {"total_count": 1, "limit": 50, "offset": 0},
+        "stations": [
+            {
+                "station_id": "07149001",
+                "station_name": "Lyon",
+                "temperature_mean": 12.0,
+                "baseline_mean": 11.0,
+                "deviation": 1.0,
+                "lat": None,
+                "lon": None,
+                "department": "69",
+                "alt": None,
+                "region": None,
+                "classe_recente": 1,
+                "date_de_creation": dt.date(1920, 1, 1),
+                "date_de_fermeture": None,
+            }
+        ],
+    }
+
+    assert orjson.loads(
+        encode_response(TemperatureDeviationOverviewResponseSerializer, payload)
+    ) == _drf_output(TemperatureDeviationOverviewResponseSerializer, payload)
+
+
+def test_encoding_reads_dataclasses_and_fills_missing_nullable_fields():
+    result = RecordsGraphResult(
+        buckets=[RecordsGraphBucket(bucket="2024-01", nb_records_battus=3)],
+        records=[
+            RecordsGraphRecord(
+                date=dt.date(2024, 1, 2),
+                station_id="07149001",
+                station_name="Lyon",
+                department="69",
+                type_records="hot",
+                valeur=18.5,
+            )
+        ],
+    )
+    out = orjson.loads(encode_response(RecordsGraphResponseSerializer, result))
+    assert out["records"][0] == {
+        "date": "2024-01-02",
+        "station_id": "07149001",
+        "station_name": "Lyon",
+        "department": "69",
+        "type_records": "hot",
+        "valeur": 18.5,
+    }
+
+    # next_cursor (required=False, allow_null=True) absent => null, comme DRF.
+    pagination = {"total_count": 0, "page": 1, "page_size": 50, "total_pages": 0}
+    out = orjson.loads(
+        encode_response(
+            TemperatureRecordsResponseSerializer,
+            {"pagination": pagination, "results": []},
+        )
+    )
+    assert out["pagination"]["next_cursor"] is None
+
+
+def test_schema_check_rejects_invalid_payload():
+    class _Point(serializers.Serializer):
+        date = serializers.DateField()
+        value = serializers.FloatField()
+
+    payload = {"date": dt.date(2024, 1, 1), "value": "n/a"}
+
+    with pytest.raises(ValidationError):
+        check_response_schema(_Point, payload, b"{}")
+
+
+def test_json_response_skips_schema_check_when_disabled(settings):
+    class _Point(serializers.Serializer):
+        value = serializers.CharField()
+
+    settings.RESPONSE_SCHEMA_CHECK = False
+    response = json_response(_Point, {"value": ""})
+
+    assert isinstance(response, JSONBytesResponse)
+    assert response["Content-Type"] == "application/json"
+    assert orjson.loads(response.content) == {"value": ""}
+
+
+def test_columnar_json_response_encodes_once_when_check_disabled(settings, monkeypatch):
+    calls = []
+
+    def _spy(serializer_class, payload, *, columnar=False):
+        calls.append(columnar)
+        return encode_response(serializer_class, payload, columnar=columnar)
+
+    monkeypatch.setattr("weather.json_response.encode_response", _spy)
+    settings.RESPONSE_SCHEMA_CHECK = False
+    response = json_response(
+        TemperatureDeviationResponseSerializer,
+        {"stations": [], "national": None, "pagination": None},
+        columnar=True,
+    )
+
+    assert calls == [True]
+    assert response["Content-Type"] == COLUMNAR_MEDIA_TYPE
+
+
+def test_benchmark_command_checks_every_endpoint():
+    out = StringIO()
+
+    call_command(
+        "benchmark_response_encoding", points=50, series=2, repeat=1, stdout=out
+    )
+
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 8
+    assert all("serializer" in line and "direct" in line for line in lines)
+
+
+def test_columnar_encoding_turns_point_lists_into_parallel_arrays():
+    payload = {
+        "metadata": {
+            "date_start": dt.date(2024, 1, 1),
+            "date_end": dt.date(2024, 1, 2),
+            "baseline": "1991-2020",
+            "granularity": "day",
+            "slice_type": "full",
+        },
+        "stations": [
+            {
+                "station_id": "07149001",
+                "station_name": "Lyon",
+                "data": [
+                    {
+                        "date": dt.date(2024, 1, 1),
+                        "deviation": 1.0,
+                        "temperature": 5.25,
+                        "baseline_mean": 4.25,
+                    },
+                    {
+                        "date": "2024-01-02",
+                        "deviation": -0.5,
+                        "temperature": 3.75,
+                        "baseline_mean": 4.25,
+                    },
+                ],
+            }
+        ],
+    }
+    rows = orjson.loads(
+        encode_response(TemperatureDeviationResponseSerializer, payload)
+    )
+
+    out = orjson.loads(
+        encode_response(TemperatureDeviationResponseSerializer, payload, columnar=True)
+    )
+
+    assert out["metadata"] == rows["metadata"]
+    station = out["stations"][0]
+    assert station["station_id"] == "07149001"
+    assert station["data"] == {
+        "date": [19723, 19724],
+        "deviation": [1.0, -0.5],
+        "temperature": [5.25, 3.75],
+        "baseline_mean": [4.25, 4.25],
+    }
+    epoch = dt.date(1970, 1, 1)
+    assert [epoch + dt.timedelta(days=d) for d in station["data"]["date"]] == [
+        dt.date.fromisoformat(p["date"]) for p in rows["stations"][0]["data"]
+    ]
+
+
+def test_columnar_encoding_fills_missing_values_with_null():
+    result = RecordsGraphResult(
+        buckets=[],
+        records=[
+            {
+                "date": dt.date(2024, 1, 2),
+                "station_id": "07149001",
+                "station_name": "Lyon",
+                "type_records": "hot",
+                "valeur": 18.5,
+            }
+        ],
+    )
+
+    out = orjson.loads(
+        encode_response(RecordsGraphResponseSerializer, result, columnar=True)
+    )
+
+    assert out["buckets"] == {"bucket": [], "nb_records_battus": []}
+    assert out["records"]["department"] == [None]
+    assert out["records"]["valeur"] == [18.5]
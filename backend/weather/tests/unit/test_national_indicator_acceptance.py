@@ -143,3 +143,60 @@ def test_itn_acceptance_year_day_of_month_with_month_and_clamp_leap_year():
     # year + day_of_month => baseline journalière sur la date réelle après clamp
     assert ts[0]["baseline_mean"] == 1029.0
     assert ts[1]["baseline_mean"] == 1028.0
+
+
+class CountingBaselineDataSource(FakeNationalIndicatorDataSource):
+    """Compte les appels aux API baseline pour vérifier le regroupement."""
+
+    def __init__(self, day_to_temp_func: Callable[[dt.date], float]):
+        super().__init__(day_to_temp_func)
+        self.calls: list[str] = []
+
+    def fetch_daily_baselines(
+        self, month_day_pairs: set[tuple[int, int]]
+    ) -> dict[tuple[int, int], BaselinePoint]:
+        self.calls.append("daily_bulk")
+        return super().fetch_daily_baselines(month_day_pairs)
+
+    def fetch_monthly_baselines(self, months: set[int]) -> dict[int, BaselinePoint]:
+        self.calls.append("monthly_bulk")
+        return super().fetch_monthly_baselines(months)
+
+    def fetch_yearly_baseline(self) -> BaselinePoint:
+        self.calls.append("yearly")
+        return super().fetch_yearly_baseline()
+
+
+def test_itn_day_granularity_resolves_baselines_in_a_single_bulk_call():
+    ds = CountingBaselineDataSource(lambda d: d.day)
+
+    res = compute_national_indicator(
+        observed_data_source=ds,
+        baseline_data_source=ds,
+        absolute_extremes_data_source=stub_absolute_extremes,
+        date_start=dt.date(2024, 1, 1),
+        date_end=dt.date(2024, 12, 31),
+        granularity="day",
+    )
+
+    assert len(res["time_series"]) == 366
+    assert ds.calls == ["daily_bulk"]
+    assert res["time_series"][59]["date"] == "2024-02-29"
+    assert res["time_series"][59]["baseline_mean"] == 1029.0
+
+
+def test_itn_month_granularity_resolves_baselines_in_a_single_bulk_call():
+    ds = CountingBaselineDataSource(lambda d: d.day)
+
+    res = compute_national_indicator(
+        observed_data_source=ds,
+        baseline_data_source=ds,
+        absolute_extremes_data_source=stub_absolute_extremes,
+        date_start=dt.date(2020, 1, 1),
+        date_end=dt.date(2024, 12, 31),
+        granularity="month",
+    )
+
+    assert len(res["time_series"]) == 60
+    assert ds.calls == ["monthly_bulk"]
+    assert res["time_series"][0]["baseline_mean"] == 2001.0
@@ -0,0 +1,279 @@
+"""Tests unitaires de ``ResponseCacheMixin``.
+
+Même approche que ``test_cache_control`` : une ``APIView`` factice dont le
+calcul incrémente un compteur, appelée via ``APIRequestFactory``. Le cache est
+un LocMemCache isolé par test (voir ``weather/tests/conftest.py``).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import time
+
+import pytest
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from weather.data_sources.data_version import (
+    SOURCE_INGESTION,
+    SOURCE_QUOTIDIENNE_REALTIME,
+    DataVersionSnapshot,
+    data_version,
+)
+from weather.json_response import (
+    COLUMNAR_MEDIA_TYPE,
+    ColumnarResponseMixin,
+    JSONBytesResponse,
+)
+from weather.response_cache import (
+    TAG_REALTIME,
+    TAG_RECORDS,
+    ResponseCacheMixin,
+    invalidate_response_cache,
+    params_fingerprint,
+    response_cache,
+)
+
+
+def _make_view(*, status_code: int = 200, delay_s: float = 0.0, **class_attrs):
+    calls: list[dict] = []
+
+    class _DummyView(ResponseCacheMixin, APIView):
+        authentication_classes: list = []
+        permission_classes: list = []
+        cache_profile = "long"
+
+        def get(self, request, *args, **kwargs):
+            params = dict(request.query_params.items())
+            return self.cached_response(params, lambda: self._build(params))
+
+        def _build(self, params):
+            calls.append(params)
+            time.sleep(delay_s)
+            return Response({"n": len(calls)}, status=status_code)
+
+    for name, value in class_attrs.items():
+        setattr(_DummyView, name, value)
+
+    return _DummyView.as_view(), calls
+
+
+@pytest.fixture
+def factory():
+    return APIRequestFactory()
+
+
+def test_identical_requests_are_computed_once(factory):
+    view, calls = _make_view()
+
+    first = view(factory.get("/x?a=1&b=2"))
+    second = view(factory.get("/x?b=2&a=1"))
+
+    assert first.data == second.data == {"n": 1}
+    assert len(calls) == 1
+    # Le Cache-Control est toujours émis sur une réponse servie depuis le cache.
+    assert second["Cache-Control"] == "public, s-maxage=86400, max-age=3600"
+
+
+def test_different_params_are_cached_separately(factory):
+    view, calls = _make_view()
+
+    view(factory.get("/x?a=1"))
+    view(factory.get("/x?a=2"))
+
+    assert len(calls) == 2
+
+
+def test_error_responses_are_not_cached(factory):
+    view, calls = _make_view(status_code=400)
+
+    view(factory.get("/x?a=1"))
+    response = view(factory.get("/x?a=1"))
+
+    assert response.status_code == 400
+    assert len(calls) == 2
+
+
+def test_invalidating_a_tag_forces_recomputation(factory):
+    view, calls = _make_view(response_cache_tags=(TAG_RECORDS, TAG_REALTIME))
+
+    view(factory.get("/x?a=1"))
+    invalidate_response_cache(TAG_RECORDS)
+    response = view(factory.get("/x?a=1"))
+
+    assert response.data == {"n": 2}
+
+
+def test_invalidating_an_unrelated_tag_keeps_entries(factory):
+    view, calls = _make_view(response_cache_tags=(TAG_REALTIME,))
+
+    view(factory.get("/x?a=1"))
+    invalidate_response_cache(TAG_RECORDS)
+    view(factory.get("/x?a=1"))
+
+    assert len(calls) == 1
+
+
+def test_realtime_refresh_keeps_entries_before_the_realtime_window(
+    factory, monkeypatch
+):
+    view, calls = _make_view(
+        cache_profile="by_date_end",
+        cache_data_version_sources=(SOURCE_INGESTION, SOURCE_QUOTIDIENNE_REALTIME),
+        _today=lambda self: dt.date(2026, 5, 22),
+    )
+    refreshed_at = {
+        SOURCE_INGESTION: dt.datetime(2026, 5, 21, 6, 0),
+        SOURCE_QUOTIDIENNE_REALTIME: dt.datetime(2026, 5, 22, 9, 0),
+    }
+    monkeypatch.setattr(
+        data_version, "get", lambda: DataVersionSnapshot(refreshed_at, None)
+    )
+    view(factory.get("/x?date_end=2026-05-14"))
+    view(factory.get("/x?date_end=2026-05-21"))
+
+    touched = {
+        **refreshed_at,
+        SOURCE_QUOTIDIENNE_REALTIME: dt.datetime(2026, 5, 22, 9, 6),
+    }
+    monkeypatch.setattr(data_version, "get", lambda: DataVersionSnapshot(touched, None))
+    view(factory.get("/x?date_end=2026-05-14"))
+    view(factory.get("/x?date_end=2026-05-21"))
+
+    assert [c["date_end"] for c in calls] == ["2026-05-14", "2026-05-21", "2026-05-21"]
+
+
+def test_realtime_invalidation_keeps_entries_before_the_realtime_window(factory):
+    view, calls = _make_view(
+        cache_profile="by_date_end",
+        response_cache_tags=(TAG_RECORDS, TAG_REALTIME),
+        _today=lambda self: dt.date(2026, 5, 22),
+    )
+    view(factory.get("/x?date_end=2026-05-14"))
+    view(factory.get("/x?date_end=2026-05-21"))
+
+    invalidate_response_cache(TAG_REALTIME)
+    view(factory.get("/x?date_end=2026-05-14"))
+    view(factory.get("/x?date_end=2026-05-21"))
+    invalidate_response_cache(TAG_RECORDS)
+    view(factory.get("/x?date_end=2026-05-14"))
+
+    assert [c["date_end"] for c in calls] == [
+        "2026-05-14",
+        "2026-05-21",
+        "2026-05-21",
+        "2026-05-14",
+    ]
+
+
+def test_disabled_setting_bypasses_cache(factory, settings):
+    settings.RESPONSE_CACHE_ENABLED = False
+    view, calls = _make_view()
+
+    view(factory.get("/x?a=1"))
+    view(factory.get("/x?a=1"))
+
+    assert len(calls) == 2
+
+
+def test_concurrent_identical_misses_compute_once(factory):
+    view, calls = _make_view(delay_s=0.2)
+    results = []
+
+    def worker():
+        results.append(view(factory.get("/x?a=1")).data)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"n": 1}] * 8
+
+
+def test_waits_for_result_computed_under_another_workers_lease(factory):
+    """Bail posé par un autre process : on attend son résultat sans recalculer."""
+    view, calls = _make_view(response_cache_poll_s=0.01)
+    cache = response_cache()
+    original_add = cache.add
+
+    def add_taken_by_other_worker(key, value, timeout=None, version=None):
+        if key.endswith(":lease"):
+            # Bail déjà détenu par l'autre worker, qui publie son résultat peu après.
+            cache.set(key, 1)
+            threading.Timer(0.05, cache.set, (key[: -len(":lease")], {"n": 0})).start()
+            return False
+        return original_add(key, value, timeout=timeout, version=version)
+
+    cache.add = add_taken_by_other_worker
+    try:
+        response = view(factory.get("/x?a=1"))
+    finally:
+        cache.add = original_add
+
+    assert response.data == {"n": 0}
+    assert calls == []
+
+
+def test_fingerprint_normalizes_sets_and_dates():
+    a = {"ids": {"b", "a"}, "date_end": dt.date(2025, 1, 31)}
+    b = {"date_end": dt.date(2025, 1, 31), "ids": {"a", "b"}}
+    assert params_fingerprint(a) == params_fingerprint(b)
+    assert params_fingerprint(a) != params_fingerprint({**a, "ids": {"a"}})
+
+
+def test_encoded_responses_are_cached_as_bytes(factory):
+    calls: list[int] = []
+
+    class _EncodedView(ResponseCacheMixin, APIView):
+        authentication_classes: list = []
+        permission_classes: list = []
+        cache_profile = "long"
+
+        def get(self, request, *args, **kwargs):
+            return self.cached_response({}, self._build)
+
+        def _build(self):
+            calls.append(1)
+            return JSONBytesResponse(b'{"n":1}')
+
+    view = _EncodedView.as_view()
+    first = view(factory.get("/x"))
+    second = view(factory.get("/x"))
+
+    assert len(calls) == 1
+    assert first.content == second.content == b'{"n":1}'
+    assert isinstance(second, JSONBytesResponse)
+
+
+def test_negotiated_representations_are_cached_separately(factory):
+    calls: list[bool] = []
+
+    class _ColumnarView(ColumnarResponseMixin, ResponseCacheMixin, APIView):
+        authentication_classes: list = []
+        permission_classes: list = []
+        cache_profile = "long"
+
+        def get(self, request, *args, **kwargs):
+            return self.cached_response({}, self._build)
+
+        def _build(self):
+            columnar = self.columnar_requested()
+            calls.append(columnar)
+            return JSONBytesResponse(
+                b"{}",
+                content_type=COLUMNAR_MEDIA_TYPE if columnar else "application/json",
+            )
+
+    view = _ColumnarView.as_view()
+    view(factory.get("/x"))
+    view(factory.get("/x", HTTP_ACCEPT=COLUMNAR_MEDIA_TYPE))
+    hit = view(factory.get("/x", HTTP_ACCEPT=COLUMNAR_MEDIA_TYPE))
+
+    assert calls == [False, True]
+    assert hit["Content-Type"] == COLUMNAR_MEDIA_TYPE
+    assert "Accept" in hit["Vary"]
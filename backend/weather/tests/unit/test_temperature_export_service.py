@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+
+from weather.services.temperature_export.service import iter_csv, iter_ndjson
+from weather.services.temperature_export.types import DailyExportRow
+
+
+def _row(day: int, tn: float | None = 1.5) -> DailyExportRow:
+    return DailyExportRow(
+        station_id="07149001",
+        station_name="Lyon, Bron",
+        department=69,
+        date=dt.date(2024, 1, day),
+        tn=tn,
+        tx=10.0,
+        tntxm=5.75 if tn is not None else None,
+    )
+
+
+def test_csv_has_header_quotes_names_and_leaves_nulls_empty():
+    out = b"".join(iter_csv([_row(1), _row(2, tn=None)])).decode()
+
+    assert out.splitlines() == [
+        "station_id,station_name,department,date,tn,tx,tntxm",
+        '07149001,"Lyon, Bron",69,2024-01-01,1.5,10.0,5.75',
+        '07149001,"Lyon, Bron",69,2024-01-02,,10.0,',
+    ]
+
+
+def test_encoders_emit_one_chunk_per_batch():
+    rows = (_row(day) for day in range(1, 6))
+
+    chunks = list(iter_ndjson(rows, batch_size=2))
+
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert json.loads(lines[0]) == {
+        "station_id": "07149001",
+        "station_name": "Lyon, Bron",
+        "department": 69,
+        "date": "2024-01-01",
+        "tn": 1.5,
+        "tx": 10.0,
+        "tntxm": 5.75,
+    }
+    assert len(list(iter_csv(iter([]), batch_size=2))) == 1
@@ -16,6 +16,7 @@ from .views import (
     TemperatureAbsoluteRecordsAPIView,
     TemperatureDeviationGraphAPIView,
     TemperatureDeviationOverviewAPIView,
+    TemperatureExportAPIView,
     TemperatureMinMaxGraphAPIView,
     TemperatureRecordsAPIView,
 )
@@ -84,4 +85,9 @@ urlpatterns = [
         TemperatureMinMaxGraphAPIView.as_view(),
         name="temperature-extremes-graph",
     ),
+    path(
+        "temperature/export",
+        TemperatureExportAPIView.as_view(),
+        name="temperature-export",
+    ),
 ]
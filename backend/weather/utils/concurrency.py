@@ -0,0 +1,74 @@
+"""
+Lectures indépendantes d'une même requête HTTP exécutées en parallèle.
+
+``run_concurrently(f, g, ...)`` exécute ``f`` dans le thread appelant et les
+suivantes dans un pool de threads partagé par le process : chaque thread a sa
+propre connexion Django (empruntée au pool psycopg, voir weather/db_pool.py,
+et rendue à la fin de l'appel), les requêtes SQL avancent donc en même temps
+côté PostgreSQL.
+
+Repli séquentiel, dans l'ordre :
+- ``CONCURRENT_FETCHES_MAX_WORKERS = 0`` ;
+- appel depuis un thread du pool (pas d'imbrication, qui pourrait bloquer) ;
+- connexion courante dans une transaction (``atomic``, tests) : les autres
+  connexions ne verraient pas ses écritures non validées.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, connections
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="weather-fetch",
+                initializer=_mark_worker,
+            )
+        return _executor
+
+
+def _mark_worker() -> None:
+    _worker.active = True
+
+
+def _with_own_connection(call: Callable[[], Any]) -> Any:
+    try:
+        return call()
+    finally:
+        connections.close_all()
+
+
+def run_concurrently(*calls: Callable[[], Any]) -> list[Any]:
+    """Résultats de ``calls`` (dans l'ordre), exécutés en parallèle si possible."""
+    max_workers = settings.CONCURRENT_FETCHES_MAX_WORKERS
+    if (
+        len(calls) < 2
+        or not max_workers
+        or getattr(_worker, "active", False)
+        or connection.in_atomic_block
+    ):
+        return [call() for call in calls]
+
+    executor = _get_executor(max_workers)
+    futures = [executor.submit(_with_own_connection, call) for call in calls[1:]]
+    try:
+        first = calls[0]()
+    except BaseException:
+        # Les autres lectures se terminent avant de propager l'erreur.
+        wait(futures)
+        raise
+    return [first, *(future.result() for future in futures)]
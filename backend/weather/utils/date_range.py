@@ -86,3 +86,33 @@ def period_start(d: dt.date, granularity: str) -> dt.date:
     if granularity == "year":
         return dt.date(d.year, 1, 1)
     raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def next_period_start(d: dt.date, granularity: str) -> dt.date:
+    """Début de la période suivant celle qui contient d."""
+    start = period_start(d, granularity)
+    if granularity == "day":
+        return start + dt.timedelta(days=1)
+    if granularity == "month":
+        if start.month == 12:
+            return dt.date(start.year + 1, 1, 1)
+        return dt.date(start.year, start.month + 1, 1)
+    return dt.date(start.year + 1, 1, 1)
+
+
+def complete_periods_span(
+    date_start: dt.date, date_end: dt.date, granularity: str
+) -> tuple[dt.date, dt.date] | None:
+    """
+    Intervalle [début, fin) des périodes entièrement comprises dans
+    [date_start, date_end], ou None s'il n'y en a aucune.
+    """
+    first = period_start(date_start, granularity)
+    if first < date_start:
+        first = next_period_start(first, granularity)
+    end = next_period_start(date_end, granularity)
+    if end - dt.timedelta(days=1) > date_end:
+        end = period_start(date_end, granularity)
+    if first >= end:
+        return None
+    return first, end
@@ -2,6 +2,7 @@
 DRF ViewSets for weather data API endpoints.
 """
 
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status, viewsets
 from rest_framework.response import Response
@@ -17,6 +18,7 @@ from weather.bootstrap_temperature_deviation import (
     TemperatureDeviationDependencyProvider,
     TemperatureDeviationOverviewDependencyProvider,
 )
+from weather.bootstrap_temperature_export import TemperatureExportDependencyProvider
 from weather.bootstrap_temperature_minmax import TemperatureMinMaxDependencyProvider
 from weather.bootstrap_temperature_records import TemperatureRecordsDependencyProvider
 from weather.services.national_indicator.kpi_use_case import get_national_indicator_kpi
@@ -30,6 +32,8 @@ from weather.services.temperature_deviation.use_case import (
     get_temperature_deviation,
     get_temperature_deviation_overview,
 )
+from weather.services.temperature_export.service import CONTENT_TYPES
+from weather.services.temperature_export.use_case import export_daily_series
 from weather.services.temperature_minmax.use_case import get_minmax_graph
 from weather.services.temperature_records.types import TemperatureRecordsRequest
 from weather.services.temperature_records.use_case import (
@@ -41,8 +45,21 @@ from .bootstrap_temperature_absolute_records_graph import (
     TemperatureAbsoluteRecordsGraphDependencyProvider,
 )
 from .cache_control import CacheControlMixin
+from .data_sources.data_version import (
+    REALTIME_WINDOW_SOURCES,
+    SOURCE_DEVIATION_CUMSUM,
+    SOURCE_INGESTION,
+    SOURCE_ITN_DAILY,
+    SOURCE_ITN_EXTREMES,
+    SOURCE_QUOTIDIENNE_REALTIME,
+    SOURCE_RECORDS,
+    SOURCE_RECORDS_STATE,
+    SOURCE_ROLLUPS,
+)
 from .filters import StationDeviationFilter, StationFilter, StationRecordsFilter
+from .json_response import ColumnarResponseMixin, json_response
 from .models import StationDeviation, StationQualifieeHexagone, StationRecords
+from .response_cache import TAG_REALTIME, TAG_RECORDS, ResponseCacheMixin
 from .serializers import (
     AbsoluteRecordsGraphResponseSerializer,
     ErrorSerializer,
@@ -62,6 +79,7 @@ from .serializers import (
     TemperatureDeviationOverviewQuerySerializer,
     TemperatureDeviationOverviewResponseSerializer,
     TemperatureDeviationResponseSerializer,
+    TemperatureExportQuerySerializer,
     TemperatureMinMaxGraphQuerySerializer,
     TemperatureMinMaxGraphResponseSerializer,
     TemperatureRecordsQuerySerializer,
@@ -84,6 +102,7 @@ class BaseStationViewSet(CacheControlMixin, viewsets.ReadOnlyModelViewSet):
     cache_profile = "long"
     cache_long_s_maxage = 604_800  # 7 j
     cache_long_max_age = 3_600
+    cache_data_version_sources = (SOURCE_INGESTION,)
 
     def get_serializer_class(self):
         if self.action == "retrieve" and self.detail_serializer_class is not None:
@@ -187,7 +206,7 @@ class StationDeviationViewSet(BaseStationViewSet):
     filterset_class = StationDeviationFilter
 
 
-class NationalIndicatorAPIView(CacheControlMixin, APIView):
+class NationalIndicatorAPIView(ColumnarResponseMixin, ResponseCacheMixin, APIView):
     """
     GET /api/v1/temperature/national-indicator
     Implémentation mock (sans BDD), conforme au contrat OpenAPI.
@@ -196,6 +215,15 @@ class NationalIndicatorAPIView(CacheControlMixin, APIView):
     authentication_classes = []
     permission_classes = []
     cache_profile = "by_date_end"
+    cache_data_version_sources = (
+        SOURCE_INGESTION,
+        SOURCE_QUOTIDIENNE_REALTIME,
+        SOURCE_ITN_DAILY,
+        SOURCE_ITN_EXTREMES,
+    )
+    # Les extrêmes mensuels et annuels sont lus sur tout mv_itn_daily_all_years :
+    # son rafraîchissement compte aussi pour une plage historique.
+    cache_realtime_window_sources = REALTIME_WINDOW_SOURCES - {SOURCE_ITN_DAILY}
 
     def get(self, request):
         q = NationalIndicatorQuerySerializer(data=request.query_params)
@@ -210,6 +238,9 @@ class NationalIndicatorAPIView(CacheControlMixin, APIView):
             )
 
         params = q.validated_data
+        return self.cached_response(params, lambda: self._build_response(params))
+
+    def _build_response(self, params) -> Response:
         deps = ITNDependencyProvider.get_dep()
         data = get_national_indicator(
             observed_data_source=deps.observed_data_source,
@@ -235,13 +266,16 @@ class NationalIndicatorAPIView(CacheControlMixin, APIView):
             "metadata": metadata,
             "time_series": data["time_series"],
         }
-        out = NationalIndicatorResponseSerializer(data=full_payload)
-        out.is_valid(raise_exception=True)
-
-        return Response(out.data, status=status.HTTP_200_OK)
+        return json_response(
+            NationalIndicatorResponseSerializer,
+            full_payload,
+            columnar=self.columnar_requested(),
+        )
 
 
-class TemperatureDeviationGraphAPIView(CacheControlMixin, APIView):
+class TemperatureDeviationGraphAPIView(
+    ColumnarResponseMixin, ResponseCacheMixin, APIView
+):
     """
     GET /api/v1/temperature/deviation/graph
     Implémentation mock, alignée sur le pattern ITN.
@@ -250,6 +284,12 @@ class TemperatureDeviationGraphAPIView(CacheControlMixin, APIView):
     authentication_classes = []
     permission_classes = []
     cache_profile = "by_date_end"
+    cache_data_version_sources = (
+        SOURCE_INGESTION,
+        SOURCE_QUOTIDIENNE_REALTIME,
+        SOURCE_ROLLUPS,
+        SOURCE_DEVIATION_CUMSUM,
+    )
 
     def get(self, request):
         q = TemperatureDeviationGraphQuerySerializer(data=request.query_params)
@@ -264,6 +304,9 @@ class TemperatureDeviationGraphAPIView(CacheControlMixin, APIView):
             )
 
         params = q.validated_data
+        return self.cached_response(params, lambda: self._build_response(params))
+
+    def _build_response(self, params) -> Response:
         ds = TemperatureDeviationDependencyProvider.get_dep()
         try:
             data = get_temperature_deviation(data_source=ds, **params)
@@ -294,13 +337,14 @@ class TemperatureDeviationGraphAPIView(CacheControlMixin, APIView):
             **data,
         }
 
-        out = TemperatureDeviationResponseSerializer(data=full_payload)
-        out.is_valid(raise_exception=True)
-
-        return Response(out.data, status=status.HTTP_200_OK)
+        return json_response(
+            TemperatureDeviationResponseSerializer,
+            full_payload,
+            columnar=self.columnar_requested(),
+        )
 
 
-class TemperatureRecordsAPIView(CacheControlMixin, APIView):
+class TemperatureRecordsAPIView(ResponseCacheMixin, APIView):
     """
     GET /api/v1/temperature/records
     Retourne les records battus de température par station (liste progressive, pas uniquement le record absolu).
@@ -313,6 +357,13 @@ class TemperatureRecordsAPIView(CacheControlMixin, APIView):
     # `date_end` est absent (cas `period_type=all_time`).
     cache_profile = "by_date_end"
     cache_by_date_end_fallback = "short"
+    cache_data_version_sources = (
+        SOURCE_INGESTION,
+        SOURCE_QUOTIDIENNE_REALTIME,
+        SOURCE_RECORDS,
+        SOURCE_RECORDS_STATE,
+    )
+    response_cache_tags = (TAG_RECORDS, TAG_REALTIME)
 
     @extend_schema(
         summary="Records de température",
@@ -373,6 +424,9 @@ class TemperatureRecordsAPIView(CacheControlMixin, APIView):
             )
 
         params = q.validated_data
+        return self.cached_response(params, lambda: self._build_response(params))
+
+    def _build_response(self, params) -> Response:
         ds = TemperatureRecordsDependencyProvider.get_dep()
 
         req = TemperatureRecordsRequest(
@@ -409,7 +463,8 @@ class TemperatureRecordsAPIView(CacheControlMixin, APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        out = TemperatureRecordsResponseSerializer(
+        return json_response(
+            TemperatureRecordsResponseSerializer,
             {
                 "pagination": {
                     "total_count": result.pagination.total_count,
@@ -417,29 +472,12 @@ class TemperatureRecordsAPIView(CacheControlMixin, APIView):
                     "page_size": result.pagination.page_size,
                     "total_pages": result.pagination.total_pages,
                 },
-                "results": [
-                    {
-                        "station_id": e.station_id,
-                        "station_name": e.station_name,
-                        "department": e.department,
-                        "record_value": e.record_value,
-                        "record_date": e.record_date,
-                        "lat": e.lat,
-                        "lon": e.lon,
-                        "alt": e.alt,
-                        "classe_recente": e.classe_recente,
-                        "date_de_creation": e.date_de_creation,
-                        "date_de_fermeture": e.date_de_fermeture,
-                    }
-                    for e in result.entries
-                ],
-            }
+                "results": result.entries,
+            },
         )
 
-        return Response(out.data, status=status.HTTP_200_OK)
 
-
-class TemperatureAbsoluteRecordsAPIView(CacheControlMixin, APIView):
+class TemperatureAbsoluteRecordsAPIView(ResponseCacheMixin, APIView):
     """
     GET /api/v1/temperature/records/absolute
     Retourne les records absolus de température par station.
@@ -450,6 +488,8 @@ class TemperatureAbsoluteRecordsAPIView(CacheControlMixin, APIView):
     # Même source matview que les records battus (rafraîchie en continu).
     cache_profile = "by_date_end"
     cache_by_date_end_fallback = "short"
+    cache_data_version_sources = (SOURCE_INGESTION,)
+    response_cache_tags = (TAG_RECORDS, TAG_REALTIME)
 
     @extend_schema(
         summary="Records de température",
@@ -494,7 +534,19 @@ class TemperatureAbsoluteRecordsAPIView(CacheControlMixin, APIView):
                     "- `record_value,station_name` : tri par valeur puis nom croissant\n"
                     "- `-record_value,station_name` : tri par valeur décroissante puis nom croissant"
                 ),
-            )
+            ),
+            OpenApiParameter(
+                name="after",
+                type=str,
+                location="query",
+                required=False,
+                description=(
+                    "Curseur de pagination keyset : valeur de `pagination.next_cursor` "
+                    "renvoyée par la page précédente. Disponible pour les tris sur "
+                    "`record_value`, `record_date` et `station_name` ; `page` est "
+                    "alors ignoré."
+                ),
+            ),
         ],
     )
     def get(self, request):
@@ -510,6 +562,9 @@ class TemperatureAbsoluteRecordsAPIView(CacheControlMixin, APIView):
             )
 
         params = q.validated_data
+        return self.cached_response(params, lambda: self._build_response(params))
+
+    def _build_response(self, params) -> Response:
         ds = TemperatureAbsoluteRecordsDependencyProvider.get_dep()
 
         req = TemperatureRecordsRequest(
@@ -530,6 +585,7 @@ class TemperatureAbsoluteRecordsAPIView(CacheControlMixin, APIView):
             page=params.get("page", 1),
             page_size=params.get("page_size", 50),
             sort=params.get("sort", "record_value"),
+            after=params.get("after"),
         )
 
         try:
@@ -546,37 +602,22 @@ class TemperatureAbsoluteRecordsAPIView(CacheControlMixin, APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        out = TemperatureRecordsResponseSerializer(
+        return json_response(
+            TemperatureRecordsResponseSerializer,
             {
                 "pagination": {
                     "total_count": result.pagination.total_count,
                     "page": result.pagination.page,
                     "page_size": result.pagination.page_size,
                     "total_pages": result.pagination.total_pages,
+                    "next_cursor": result.pagination.next_cursor,
                 },
-                "results": [
-                    {
-                        "station_id": e.station_id,
-                        "station_name": e.station_name,
-                        "department": e.department,
-                        "record_value": e.record_value,
-                        "record_date": e.record_date,
-                        "lat": e.lat,
-                        "lon": e.lon,
-                        "alt": e.alt,
-                        "classe_recente": e.classe_recente,
-                        "date_de_creation": e.date_de_creation,
-                        "date_de_fermeture": e.date_de_fermeture,
-                    }
-                    for e in result.entries
-                ],
-            }
+                "results": result.entries,
+            },
         )
 
-        return Response(out.data, status=status.HTTP_200_OK)
-
 
-class TemperatureMinMaxGraphAPIView(CacheControlMixin, APIView):
+class TemperatureMinMaxGraphAPIView(ColumnarResponseMixin, ResponseCacheMixin, APIView):
     """
     GET /api/v1/temperature/extremes/graph
     Retourne la moyenne de Tmin et Tmax sur une période,
@@ -586,6 +627,7 @@ class TemperatureMinMaxGraphAPIView(CacheControlMixin, APIView):
     authentication_classes = []
     permission_classes = []
     cache_profile = "by_date_end"
+    cache_data_version_sources = (SOURCE_INGESTION, SOURCE_ROLLUPS)
 
     @extend_schema(
         parameters=[
@@ -620,6 +662,9 @@ class TemperatureMinMaxGraphAPIView(CacheControlMixin, APIView):
             )
 
         params = q.validated_data
+        return self.cached_response(params, lambda: self._build_response(params))
+
+    def _build_response(self, params) -> Response:
         ds = TemperatureMinMaxDependencyProvider.get_dep()
         data = get_minmax_graph(data_source=ds, **params)
 
@@ -632,13 +677,54 @@ class TemperatureMinMaxGraphAPIView(CacheControlMixin, APIView):
             **data,
         }
 
-        out = TemperatureMinMaxGraphResponseSerializer(data=full_payload)
-        out.is_valid(raise_exception=True)
+        return json_response(
+            TemperatureMinMaxGraphResponseSerializer,
+            full_payload,
+            columnar=self.columnar_requested(),
+        )
 
-        return Response(out.data, status=status.HTTP_200_OK)
 
+class TemperatureExportAPIView(CacheControlMixin, APIView):
+    """
+    GET /api/v1/temperature/export
+    Export brut des séries quotidiennes TN / TX / TNTXM par station, en CSV
+    ou NDJSON (`output`). La réponse est produite en flux au fil de la
+    lecture de la base : pas de cache serveur, mémoire constante.
+    """
 
-class TemperatureDeviationOverviewAPIView(CacheControlMixin, APIView):
+    authentication_classes = []
+    permission_classes = []
+    cache_profile = "by_date_end"
+    cache_data_version_sources = (SOURCE_INGESTION, SOURCE_QUOTIDIENNE_REALTIME)
+
+    def get(self, request):
+        q = TemperatureExportQuerySerializer(data=request.query_params)
+        if not q.is_valid():
+            return Response(
+                ErrorSerializer.build(
+                    code="INVALID_PARAMETER",
+                    message="Paramètre invalide ou manquant",
+                    details=q.errors,
+                ),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        params = q.validated_data
+        output = params["output"]
+        chunks = export_daily_series(
+            data_source=TemperatureExportDependencyProvider.get_dep(),
+            **params,
+        )
+        response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[output])
+        filename = (
+            f"temperature_quotidienne_{params['date_start']}_{params['date_end']}"
+            f".{output}"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class TemperatureDeviationOverviewAPIView(ResponseCacheMixin, APIView):
     """
     GET /api/v1/temperature/deviation
     """
@@ -646,6 +732,12 @@ class TemperatureDeviationOverviewAPIView(CacheControlMixin, APIView):
     authentication_classes = []
     permission_classes = []
     cache_profile = "by_date_end"
+    cache_data_version_sources = (
+        SOURCE_INGESTION,
+        SOURCE_QUOTIDIENNE_REALTIME,
+        SOURCE_ROLLUPS,
+        SOURCE_DEVIATION_CUMSUM,
+    )
 
     def get(self, request):
         q = TemperatureDeviationOverviewQuerySerializer(data=request.query_params)
@@ -660,6 +752,9 @@ class TemperatureDeviationOverviewAPIView(CacheControlMixin, APIView):
             )
 
         params = q.validated_data
+        return self.cached_response(params, lambda: self._build_response(params))
+
+    def _build_response(self, params) -> Response:
 
         ds = TemperatureDeviationOverviewDependencyProvider.get_dep()
 
@@ -696,13 +791,12 @@ class TemperatureDeviationOverviewAPIView(CacheControlMixin, APIView):
             **data,
         }
 
-        out = TemperatureDeviationOverviewResponseSerializer(data=full_payload)
-        out.is_valid(raise_exception=True)
-
-        return Response(out.data, status=status.HTTP_200_OK)
+        return json_response(
+            TemperatureDeviationOverviewResponseSerializer, full_payload
+        )
 
 
-class NationalIndicatorKpiAPIView(CacheControlMixin, APIView):
+class NationalIndicatorKpiAPIView(ResponseCacheMixin, APIView):
     """
     GET /api/v1/temperature/national-indicator/kpi
     Retourne les jours de pic chaud ou froid sur une période donnée.
@@ -712,6 +806,7 @@ class NationalIndicatorKpiAPIView(CacheControlMixin, APIView):
     authentication_classes = []
     permission_classes = []
     cache_profile = "by_date_end"
+    cache_data_version_sources = (SOURCE_INGESTION, SOURCE_ITN_DAILY)
 
     def get(self, request):
         q = NationalIndicatorKpiQuerySerializer(data=request.query_params)
@@ -726,6 +821,9 @@ class NationalIndicatorKpiAPIView(CacheControlMixin, APIView):
             )
 
         params = q.validated_data
+        return self.cached_response(params, lambda: self._build_response(params))
+
+    def _build_response(self, params) -> Response:
         kpi_data_source = ITNKpiDependencyProvider.get_dep()
 
         result = get_national_indicator_kpi(
@@ -749,13 +847,10 @@ class NationalIndicatorKpiAPIView(CacheControlMixin, APIView):
             "previous": period_payload(result.previous),
         }
 
-        out = NationalIndicatorKpiResponseSerializer(data=payload)
-        out.is_valid(raise_exception=True)
+        return json_response(NationalIndicatorKpiResponseSerializer, payload)
 
-        return Response(out.data, status=status.HTTP_200_OK)
 
-
-class RecordsGraphAPIView(CacheControlMixin, APIView):
+class RecordsGraphAPIView(ColumnarResponseMixin, ResponseCacheMixin, APIView):
     """
     GET /api/v1/temperature/records/graph
     Retourne les records de température battus : compte par bucket (histogramme)
@@ -766,6 +861,13 @@ class RecordsGraphAPIView(CacheControlMixin, APIView):
     permission_classes = []
     # `date_end` est requis ici (le fallback ne se déclenche jamais).
     cache_profile = "by_date_end"
+    cache_data_version_sources = (
+        SOURCE_INGESTION,
+        SOURCE_QUOTIDIENNE_REALTIME,
+        SOURCE_RECORDS,
+        SOURCE_RECORDS_STATE,
+    )
+    response_cache_tags = (TAG_RECORDS, TAG_REALTIME)
 
     def get(self, request):
         q = RecordsGraphQuerySerializer(data=request.query_params)
@@ -780,6 +882,9 @@ class RecordsGraphAPIView(CacheControlMixin, APIView):
             )
 
         params = q.validated_data
+        return self.cached_response(params, lambda: self._build_response(params))
+
+    def _build_response(self, params) -> Response:
         ds = RecordsGraphDependencyProvider.get_dep()
 
         req = RecordsGraphRequest(
@@ -805,29 +910,14 @@ class RecordsGraphAPIView(CacheControlMixin, APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer = RecordsGraphResponseSerializer(
-            {
-                "buckets": [
-                    {"bucket": b.bucket, "nb_records_battus": b.nb_records_battus}
-                    for b in result.buckets
-                ],
-                "records": [
-                    {
-                        "date": r.date,
-                        "station_id": r.station_id,
-                        "station_name": r.station_name,
-                        "department": r.department,
-                        "type_records": r.type_records,
-                        "valeur": r.valeur,
-                    }
-                    for r in result.records
-                ],
-            }
+        return json_response(
+            RecordsGraphResponseSerializer,
+            result,
+            columnar=self.columnar_requested(),
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class AbsoluteRecordsGraphAPIView(CacheControlMixin, APIView):
+class AbsoluteRecordsGraphAPIView(ColumnarResponseMixin, ResponseCacheMixin, APIView):
     """
     GET /api/v1/temperature/records/absolute/graph
     Retourne les records de température absolus : compte par bucket (histogramme)
@@ -837,6 +927,8 @@ class AbsoluteRecordsGraphAPIView(CacheControlMixin, APIView):
     authentication_classes = []
     permission_classes = []
     cache_profile = "by_date_end"
+    cache_data_version_sources = (SOURCE_INGESTION,)
+    response_cache_tags = (TAG_RECORDS, TAG_REALTIME)
 
     def get(self, request):
         q = RecordsGraphQuerySerializer(data=request.query_params)
@@ -851,6 +943,9 @@ class AbsoluteRecordsGraphAPIView(CacheControlMixin, APIView):
             )
 
         params = q.validated_data
+        return self.cached_response(params, lambda: self._build_response(params))
+
+    def _build_response(self, params) -> Response:
         ds = TemperatureAbsoluteRecordsGraphDependencyProvider.get_dep()
 
         req = RecordsGraphRequest(
@@ -876,26 +971,8 @@ class AbsoluteRecordsGraphAPIView(CacheControlMixin, APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer = AbsoluteRecordsGraphResponseSerializer(
-            {
-                "buckets": [
-                    {
-                        "bucket": b.bucket,
-                        "nb_records_absolus": b.nb_records_absolus,
-                    }
-                    for b in result.buckets
-                ],
-                "records": [
-                    {
-                        "date": r.date,
-                        "station_id": r.station_id,
-                        "station_name": r.station_name,
-                        "department": r.department,
-                        "type_records": r.type_records,
-                        "valeur": r.valeur,
-                    }
-                    for r in result.records
-                ],
-            }
+        return json_response(
+            AbsoluteRecordsGraphResponseSerializer,
+            result,
+            columnar=self.columnar_requested(),
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)